@@ -0,0 +1,3 @@
+"""
+Performance benchmarks (see benchmarks/run.py).
+"""
@@ -0,0 +1,190 @@
+"""
+Benchmark registry, timing and baseline comparison.
+
+A benchmark is a setup function registered with ``@benchmark``. It receives
+the BenchContext, does its (untimed) setup and returns ``(run, units)``:
+``run`` is the zero-argument callable that gets timed and ``units`` the
+amount of work one call does (bars, messages, trials), so throughput is
+``units / median seconds``.
+"""
+
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+from benchmarks.synthetic import synthetic_ohlc, write_backtest_csv
+from src.models.timeframe import Timeframe
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# Date range of the synthetic backtest CSVs (only used for their file names)
+START_DATE = datetime(2025, 1, 1)
+END_DATE = datetime(2025, 12, 15)
+
+
+class Benchmark:
+    def __init__(self, name: str, group: str, setup: Callable, unit: str, repeat: int):
+        self.name = name
+        self.group = group
+        self.setup = setup
+        self.unit = unit
+        self.repeat = repeat
+
+
+_REGISTRY: Dict[str, Benchmark] = {}
+
+
+def benchmark(name: str, group: str, unit: str = 'bars', repeat: int = 5):
+    """Register a benchmark setup function (see the module docstring)."""
+    def register(setup: Callable[['BenchContext'], Tuple[Callable[[], object], int]]):
+        if name in _REGISTRY:
+            raise ValueError(f"Duplicate benchmark name: {name}")
+        _REGISTRY[name] = Benchmark(name, group, setup, unit, repeat)
+        return setup
+    return register
+
+
+def registered(groups: List[str] = None, pattern: str = None) -> List[Benchmark]:
+    return [
+        bench for bench in _REGISTRY.values()
+        if (not groups or bench.group in groups) and (not pattern or pattern in bench.name)
+    ]
+
+
+class BenchContext:
+    """
+    Shared inputs of a benchmark run: bar counts, the seed and a scratch
+    working directory holding the synthetic backtest CSVs, a copy of .env and
+    whatever files the code under test writes (chart overlays, notebooks/).
+    """
+
+    def __init__(self, bars: int, seed: int = 0, timeframe: Timeframe = Timeframe.H1):
+        self.bars = bars
+        self.seed = seed
+        self.timeframe = timeframe
+        self.start_date = START_DATE
+        self.end_date = END_DATE
+        self.workdir = Path(tempfile.mkdtemp(prefix='benchmarks-'))
+        self._frames = {}
+        self._csv_files = {}
+
+    def __enter__(self):
+        self._previous_cwd = os.getcwd()
+        env_file = Path(self._previous_cwd) / '.env'
+        if not env_file.exists():
+            env_file = REPO_ROOT / '.env'
+        if env_file.exists():
+            shutil.copy(env_file, self.workdir / '.env')
+        os.chdir(self.workdir)
+        return self
+
+    def __exit__(self, *exc):
+        os.chdir(self._previous_cwd)
+        shutil.rmtree(self.workdir, ignore_errors=True)
+
+    def frame(self, symbol: str, bars: int = None):
+        """Synthetic OHLC frame of a symbol (seeded per symbol)."""
+        bars = bars or self.bars
+        key = (symbol, bars)
+        if key not in self._frames:
+            self._frames[key] = synthetic_ohlc(symbol, bars, self.timeframe, self.start_date, self._symbol_seed(symbol))
+        return self._frames[key]
+
+    def backtest_csv(self, symbol: str) -> Path:
+        """Write the synthetic CSV main.backtesting loads for ``symbol`` (once per run)."""
+        if symbol not in self._csv_files:
+            self._csv_files[symbol] = write_backtest_csv(symbol, self.timeframe, self.start_date, self.end_date,
+                                                         self.bars, self._symbol_seed(symbol))
+        return self._csv_files[symbol]
+
+    def _symbol_seed(self, symbol: str) -> int:
+        return self.seed * 1_000_003 + sum(ord(c) * 31 ** i for i, c in enumerate(symbol)) % 1_000_003
+
+
+def measure(bench: Benchmark, ctx: BenchContext, repeat: int = None) -> dict:
+    """Run one benchmark: setup, one warm-up call, then ``repeat`` timed calls."""
+    run, units = bench.setup(ctx)
+    repeat = repeat or bench.repeat
+    run()
+    seconds = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        seconds.append(time.perf_counter() - start)
+    median = statistics.median(seconds)
+    return {
+        'group': bench.group,
+        'unit': bench.unit,
+        'units': units,
+        'repeat': repeat,
+        'seconds': seconds,
+        'median_seconds': median,
+        'min_seconds': min(seconds),
+        'throughput': units / median if median > 0 else float('inf'),
+    }
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(benches: List[Benchmark], bars: int, seed: int = 0, repeat: int = None,
+                   progress: Callable[[str, dict], None] = None) -> dict:
+    """Run benchmarks in a scratch directory; returns the JSON-serializable results document."""
+    results = {}
+    with BenchContext(bars, seed) as ctx:
+        for bench in benches:
+            results[bench.name] = measure(bench, ctx, repeat)
+            if progress:
+                progress(bench.name, results[bench.name])
+    return {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'commit': _git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'bars': bars,
+        'seed': seed,
+        'results': results,
+    }
+
+
+def save_results(document: dict, path: str):
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    Path(path).write_text(json.dumps(document, indent=2), encoding='utf-8')
+
+
+def load_results(path: str) -> dict:
+    return json.loads(Path(path).read_text(encoding='utf-8'))
+
+
+def compare(baseline: dict, current: dict, threshold: float = 0.10) -> List[dict]:
+    """
+    Throughput of each benchmark in both documents relative to the baseline.
+    A row is a regression when the throughput dropped by more than ``threshold``
+    (0.10 = 10%). Benchmarks missing from either side are listed with ratio None.
+    """
+    rows = []
+    names = list(baseline['results']) + [name for name in current['results'] if name not in baseline['results']]
+    for name in names:
+        base = baseline['results'].get(name)
+        cur = current['results'].get(name)
+        if base is None or cur is None:
+            rows.append({'name': name, 'baseline': base and base['throughput'], 'current': cur and cur['throughput'],
+                         'ratio': None, 'regression': False})
+            continue
+        ratio = cur['throughput'] / base['throughput'] if base['throughput'] > 0 else float('inf')
+        rows.append({'name': name, 'unit': cur['unit'], 'baseline': base['throughput'], 'current': cur['throughput'],
+                     'ratio': ratio, 'regression': ratio < 1.0 - threshold})
+    return rows
@@ -0,0 +1,122 @@
+"""
+Macro-benchmarks: complete backtests through main.backtesting and the fast
+engine, and a 20-trial tuning run, all on synthetic CSVs in the scratch
+working directory.
+"""
+
+import contextlib
+import os
+
+from benchmarks.harness import BenchContext, benchmark
+from src.brokers.backtesting_broker import BacktestingBroker
+from src.engine import fast_backtesting, load_frames
+from src.utils.config import Config
+from src.utils.logging import restore_levels, silence
+
+SINGLE = ['EURUSD']
+MULTI = ['EURUSD', 'XAUUSD']
+SPREAD_PIPS = 2.0
+CHART_BARS = 150  # the charted backtest rewrites its overlay JSON on every update, so it runs on fewer bars
+TUNING_TRIALS = 20
+
+
+@contextlib.contextmanager
+def _quiet():
+    """Silence logs and stdout of the code under test (as the tuner does)."""
+    levels = silence()
+    try:
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            yield
+    finally:
+        restore_levels(levels)
+
+
+def _backtest_run(ctx: BenchContext, symbols, lean: bool = True, max_candles: int = None, low_memory: bool = False,
+                  precompute: bool = False):
+    from main import backtesting
+    for symbol in symbols:
+        ctx.backtest_csv(symbol)
+
+    def run():
+        previous = Config.precompute_indicators
+        Config.precompute_indicators = precompute
+        try:
+            with _quiet():
+                backtesting(symbols, ctx.timeframe, ctx.start_date, ctx.end_date, max_candles=max_candles,
+                            spread_pips=SPREAD_PIPS, broker=BacktestingBroker(spread_pips=SPREAD_PIPS), lean=lean,
+                            low_memory=low_memory)
+        finally:
+            Config.precompute_indicators = previous
+    return run, (max_candles or ctx.bars) * len(symbols)
+
+
+@benchmark('backtest.single', 'macro', repeat=3)
+def backtest_single(ctx: BenchContext):
+    return _backtest_run(ctx, SINGLE)
+
+
+@benchmark('backtest.multi', 'macro', repeat=3)
+def backtest_multi(ctx: BenchContext):
+    return _backtest_run(ctx, MULTI)
+
+
+@benchmark('backtest.multi.low_memory', 'macro', repeat=3)
+def backtest_multi_low_memory(ctx: BenchContext):
+    """Bounded-memory backtest: exactbars, streamed CSV feeds, capped zone look-back."""
+    return _backtest_run(ctx, MULTI, low_memory=True)
+
+
+@benchmark('backtest.multi.precompute', 'macro', repeat=3)
+def backtest_multi_precompute(ctx: BenchContext):
+    """Indicator arrays precomputed per symbol in a process pool before cerebro.run."""
+    return _backtest_run(ctx, MULTI, precompute=True)
+
+
+@benchmark('backtest.single.charts', 'macro', repeat=1)
+def backtest_single_charts(ctx: BenchContext):
+    """Non-lean backtest: observer, chart overlays, strategy logs, reports and CSV export."""
+    return _backtest_run(ctx, SINGLE, lean=False, max_candles=min(ctx.bars, CHART_BARS))
+
+
+@benchmark('backtest.fast_engine.multi', 'macro', repeat=3)
+def backtest_fast_engine_multi(ctx: BenchContext):
+    for symbol in MULTI:
+        ctx.backtest_csv(symbol)
+    with _quiet():
+        frames = load_frames(MULTI, ctx.timeframe, ctx.start_date, ctx.end_date)
+
+    def run():
+        with _quiet():
+            fast_backtesting(MULTI, ctx.timeframe, ctx.start_date, ctx.end_date,
+                             spread_pips=SPREAD_PIPS, frames=frames)
+    return run, ctx.bars * len(MULTI)
+
+
+@benchmark('tuning.grid_20_trials', 'macro', unit='trials', repeat=1)
+def tuning_grid(ctx: BenchContext):
+    """ParameterTuner grid search over 20 ZONE_INVERSION_MARGIN_ATR values on the backtrader engine."""
+    from tune_parameters import ParameterTuner
+    symbol = SINGLE[0]
+    ctx.backtest_csv(symbol)
+    parameter = 'ZONE_INVERSION_MARGIN_ATR'
+    tuner = ParameterTuner(
+        symbols=SINGLE, timeframe=ctx.timeframe, start_date=ctx.start_date, end_date=ctx.end_date,
+        tuning_parameters={symbol: {parameter: {'start': 0.25, 'end': 5.0, 'step': 0.25}}},
+        max_candles=ctx.bars, show_progress=False,
+    )
+
+    def run():
+        previous = os.environ.get(parameter)
+        try:
+            with _quiet():
+                results = tuner.tune_pair(symbol)
+        finally:
+            # The tuner applies trial parameters through the environment and reloads Config
+            if previous is None:
+                os.environ.pop(parameter, None)
+            else:
+                os.environ[parameter] = previous
+            tuner._apply_parameters(symbol, {})
+        if len(results) != TUNING_TRIALS:
+            raise RuntimeError(f"Expected {TUNING_TRIALS} tuning trials, got {len(results)}")
+    return run, TUNING_TRIALS
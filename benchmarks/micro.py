@@ -0,0 +1,176 @@
+"""
+Micro-benchmarks: indicators, candle access, the strategy's file loggers and
+chart export, each on synthetic bars.
+"""
+
+import backtrader as bt
+import numpy as np
+
+from benchmarks.harness import BenchContext, benchmark
+from src.engine import indicators as fast_indicators
+from src.indicators import BreakoutIndicator, BreakRetestIndicator
+from src.infrastructure.ChartOverlayManager import ChartOverlayManager
+from src.infrastructure.Logger import LogLevel, RepositoryName, RepositoryType, StrategyLogger
+from src.models.candlestick import Candlestick
+from src.models.chart_markers import ChartDataType
+from src.utils.chart_data_exporter import ChartDataExporter
+from src.utils.config import Config
+from src.utils.strategy_utils.general_utils import get_total_movement_from_continuous_candles
+
+SYMBOL = 'EURUSD'
+
+
+class _IndicatorHost(bt.Strategy):
+    """Strategy that only builds one indicator on the first data feed."""
+    params = dict(indicator=None, symbol=SYMBOL)
+
+    def __init__(self):
+        self.indicator = self.p.indicator(self.data, symbol=self.p.symbol)
+
+
+def _feed(ctx: BenchContext, symbol: str = SYMBOL) -> bt.feeds.PandasData:
+    frame = ctx.frame(symbol).set_index('time')
+    return bt.feeds.PandasData(dataname=frame, volume='tick_volume', openinterest=None)
+
+
+def _loaded_feed(ctx: BenchContext, symbol: str = SYMBOL) -> bt.feeds.PandasData:
+    """A feed run through cerebro, left positioned on its last bar (index 0 = last, -1 = previous, ...)."""
+    data = _feed(ctx, symbol)
+    cerebro = bt.Cerebro(stdstats=False)
+    cerebro.adddata(data)
+    cerebro.addstrategy(bt.Strategy)
+    cerebro.run()
+    return data
+
+
+def _indicator_run(ctx: BenchContext, indicator):
+    def run():
+        cerebro = bt.Cerebro(stdstats=False)
+        cerebro.adddata(_feed(ctx))
+        cerebro.addstrategy(_IndicatorHost, indicator=indicator)
+        cerebro.run()
+    return run, ctx.bars
+
+
+@benchmark('indicators.breakout', 'micro')
+def indicators_breakout(ctx: BenchContext):
+    return _indicator_run(ctx, BreakoutIndicator)
+
+
+@benchmark('indicators.break_retest', 'micro')
+def indicators_break_retest(ctx: BenchContext):
+    return _indicator_run(ctx, BreakRetestIndicator)
+
+
+@benchmark('indicators.fast_engine', 'micro')
+def indicators_fast_engine(ctx: BenchContext):
+    """ATR, EMA and RSI arrays of src.engine (the fast engine's precompute)."""
+    frame = ctx.frame(SYMBOL)
+    high, low, close = (frame[column].to_numpy(np.float64) for column in ('high', 'low', 'close'))
+
+    def run():
+        fast_indicators.atr(high, low, close, Config.atr_length)
+        fast_indicators.ema(close, Config.ema_length)
+        fast_indicators.rsi(close, 14)
+    return run, ctx.bars
+
+
+@benchmark('candlestick.from_bt', 'micro')
+def candlestick_from_bt(ctx: BenchContext):
+    data = _loaded_feed(ctx)
+    offsets = range(-(len(data) - 1), 1)
+
+    def run():
+        for index in offsets:
+            Candlestick.from_bt(data, index)
+    return run, len(offsets)
+
+
+@benchmark('movement.continuous_candles', 'micro')
+def continuous_candles(ctx: BenchContext):
+    """get_total_movement_from_continuous_candles from every bar, as Zones.next calls it."""
+    data = _loaded_feed(ctx)
+    candle_index = len(data) - 1
+    frame = ctx.frame(SYMBOL)
+    atr = fast_indicators.atr(frame['high'].to_numpy(), frame['low'].to_numpy(), frame['close'].to_numpy(),
+                              Config.atr_length)
+    atr_value = float(np.nanmedian(atr))
+    offsets = range(-(len(data) - 2), 1)
+
+    def run():
+        for index in offsets:
+            get_total_movement_from_continuous_candles(data, index, candle_index, SYMBOL, atr_value,
+                                                       skip_small_movements=True)
+    return run, len(offsets)
+
+
+@benchmark('strategy_logger.log', 'micro', unit='messages', repeat=3)
+def strategy_logger(ctx: BenchContext):
+    """StrategyLogger.log over a fresh repository (the file is rewritten on every message)."""
+    messages = min(ctx.bars, 500)
+    logger = StrategyLogger(repositories={RepositoryName.WIP: RepositoryType.FILE})
+    path = logger.repositories[RepositoryName.WIP]
+
+    def run():
+        open(path, 'w').close()
+        for i in range(messages):
+            logger.log(LogLevel.INFO, f"Support 1.{i:05d} confirmed by candle {i}", RepositoryName.WIP,
+                       date="2025-01-01 00:00:00")
+    return run, messages
+
+
+def _overlay_bars(ctx: BenchContext):
+    frame = ctx.frame(SYMBOL)
+    times = (frame['time'].astype('int64') // 10 ** 9).tolist()
+    return times, frame['low'].tolist(), frame['high'].tolist(), frame['close'].tolist()
+
+
+@benchmark('overlay.add', 'micro')
+def overlay_add(ctx: BenchContext):
+    """ChartOverlayManager.add_overlay_data for support, resistance and EMA on every bar (no file I/O)."""
+    times, lows, highs, closes = _overlay_bars(ctx)
+
+    def run():
+        manager = ChartOverlayManager('overlay_add.json')
+        for time_s, low, high, close in zip(times, lows, highs, closes):
+            manager.add_overlay_data(time_s, ChartDataType.SUPPORT, points=[{'value': low}])
+            manager.add_overlay_data(time_s, ChartDataType.RESISTANCE, points=[{'value': high}])
+            manager.add_overlay_data(time_s, ChartDataType.EMA, points=[{'value': close}])
+    return run, len(times)
+
+
+@benchmark('overlay.save', 'micro', unit='saves', repeat=3)
+def overlay_save(ctx: BenchContext):
+    """ChartOverlayManager.save_to_file of a full backtest's overlays, as the strategy saves after each update."""
+    times, lows, highs, closes = _overlay_bars(ctx)
+    manager = ChartOverlayManager('overlay_save.json')
+    for time_s, low, high, close in zip(times, lows, highs, closes):
+        manager.add_overlay_data(time_s, ChartDataType.SUPPORT, points=[{'value': low}])
+        manager.add_overlay_data(time_s, ChartDataType.RESISTANCE, points=[{'value': high}])
+        manager.add_overlay_data(time_s, ChartDataType.EMA, points=[{'value': close}])
+    saves = 20
+
+    def run():
+        for _ in range(saves):
+            manager.save_to_file()
+    return run, saves
+
+
+@benchmark('export.chart_json', 'micro')
+def export_chart_json(ctx: BenchContext):
+    """ChartDataExporter.export_chart_data and JSON serialization of one symbol."""
+    frame = ctx.frame(SYMBOL)
+    times = (frame['time'].astype('int64') // 10 ** 9).tolist()
+    opens, highs, lows, closes = (frame[column].tolist() for column in ('open', 'high', 'low', 'close'))
+    # Zones hold for a while and are NaN in between, like the Zones indicator lines
+    blocks = np.arange(len(times)) // 24
+    support = np.where(blocks % 3 == 2, np.nan, frame['low'].groupby(blocks).transform('min')).tolist()
+    resistance = np.where(blocks % 3 == 1, np.nan, frame['high'].groupby(blocks).transform('max')).tolist()
+    ema = fast_indicators.ema(frame['close'].to_numpy(), Config.ema_length).tolist()
+    markers = [{'time': times[i], 'value': closes[i]} for i in range(0, len(times), 50)]
+
+    def run():
+        data = ChartDataExporter.export_chart_data(SYMBOL, times, opens, highs, lows, closes,
+                                                   support, resistance, ema, markers)
+        ChartDataExporter.to_json(data)
+    return run, len(times)
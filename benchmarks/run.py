@@ -0,0 +1,130 @@
+"""
+Performance benchmarks and regression gate.
+
+Usage (from the repository root, where .env lives):
+    python benchmarks/run.py run --output benchmarks/results/latest.json
+    python benchmarks/run.py run --group micro --filter indicators --bars 500
+    python benchmarks/run.py compare benchmarks/baseline.json benchmarks/results/latest.json --threshold 0.15
+    python benchmarks/run.py run --baseline benchmarks/baseline.json
+
+``compare`` (and ``run --baseline``) exit with status 1 when the throughput
+of any benchmark dropped by more than the threshold against the baseline.
+No baseline is committed: record one on the reference machine with
+``--output benchmarks/baseline.json``. A missing baseline, or one without
+any of the benchmarks that ran, is an error (exit status 2), not a pass.
+
+Run it as a script: load_config() switches to live mode when "-m" is in sys.argv.
+"""
+
+import argparse
+import os
+import sys
+
+# Add the project root and src to the Python path (as main.py does)
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.append(os.path.join(ROOT, 'src'))
+
+from benchmarks.harness import compare, load_results, registered, run_benchmarks, save_results
+import benchmarks.micro  # noqa: F401  (registers the micro-benchmarks)
+import benchmarks.macro  # noqa: F401  (registers the macro-benchmarks)
+
+DEFAULT_BARS = 1000
+QUICK_BARS = 300
+
+
+def print_result(name: str, result: dict):
+    print(f"{name:<32} {result['throughput']:>12.1f} {result['unit']}/s  "
+          f"median {result['median_seconds']:.4f}s  min {result['min_seconds']:.4f}s  (x{result['repeat']})",
+          flush=True)
+
+
+def load_baseline(path: str) -> dict:
+    """Baseline results; exits with status 2 when the file does not exist."""
+    if not os.path.exists(path):
+        print(f"Baseline {path} not found: record one on the reference machine with "
+              f"'run --output {path}'", file=sys.stderr)
+        sys.exit(2)
+    return load_results(path)
+
+
+def gate(rows: list, threshold: float):
+    """Exit with 1 on a regression, 2 when no benchmark could be compared, 0 otherwise."""
+    regression = print_comparison(rows, threshold)
+    if not any(row['ratio'] is not None for row in rows):
+        print("\nNo benchmark in common with the baseline: nothing was compared", file=sys.stderr)
+        sys.exit(2)
+    sys.exit(1 if regression else 0)
+
+
+def print_comparison(rows: list, threshold: float) -> bool:
+    """Print the comparison table; returns True when there is a regression."""
+    print('=' * 80)
+    print(f'BENCHMARK COMPARISON (regression: throughput drop > {threshold:.0%})')
+    print('=' * 80)
+    for row in rows:
+        if row['ratio'] is None:
+            side = 'current results' if row['current'] is None else 'baseline'
+            print(f"{row['name']:<32} missing from {side}")
+            continue
+        status = 'REGRESSION' if row['regression'] else 'ok'
+        print(f"{row['name']:<32} {row['baseline']:>12.1f} -> {row['current']:>12.1f} {row['unit']}/s "
+              f"{row['ratio'] - 1:>+8.1%}  {status}")
+    regressions = [row['name'] for row in rows if row['regression']]
+    if regressions:
+        print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+    return bool(regressions)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run the performance benchmarks or compare results with a baseline')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = commands.add_parser('run', help='Run benchmarks and write the results as JSON')
+    run_parser.add_argument('--group', '-g', nargs='+', choices=['micro', 'macro'], default=None,
+                            help='Benchmark groups to run (default: all)')
+    run_parser.add_argument('--filter', '-k', default=None, help='Only run benchmarks whose name contains this text')
+    run_parser.add_argument('--bars', type=int, default=None,
+                            help=f'Synthetic bars per symbol (default: {DEFAULT_BARS}, {QUICK_BARS} with --quick)')
+    run_parser.add_argument('--quick', action='store_true', help='Fewer bars for a fast smoke run')
+    run_parser.add_argument('--repeat', type=int, default=None, help='Timed repetitions (default: per benchmark)')
+    run_parser.add_argument('--seed', type=int, default=0, help='Seed of the synthetic data')
+    run_parser.add_argument('--output', '-o', default='benchmarks/results/latest.json', help='Results JSON path')
+    run_parser.add_argument('--baseline', default=None, help='Compare with this baseline after the run')
+    run_parser.add_argument('--threshold', type=float, default=0.10,
+                            help='Allowed throughput drop against the baseline (default: 0.10 = 10%%)')
+    run_parser.add_argument('--list', action='store_true', help='List the selected benchmarks and exit')
+
+    compare_parser = commands.add_parser('compare', help='Compare results with a baseline')
+    compare_parser.add_argument('baseline', help='Baseline results JSON')
+    compare_parser.add_argument('current', help='Current results JSON')
+    compare_parser.add_argument('--threshold', type=float, default=0.10,
+                                help='Allowed throughput drop (default: 0.10 = 10%%)')
+    args = parser.parse_args()
+
+    if args.command == 'compare':
+        rows = compare(load_baseline(args.baseline), load_results(args.current), args.threshold)
+        gate(rows, args.threshold)
+
+    benches = registered(args.group, args.filter)
+    if args.list or not benches:
+        for bench in benches:
+            print(f"{bench.name:<32} {bench.group:<6} {bench.unit}")
+        if not benches:
+            print('No benchmarks selected')
+        return
+
+    baseline = load_baseline(args.baseline) if args.baseline else None  # Checked before the (long) run
+    bars = args.bars or (QUICK_BARS if args.quick else DEFAULT_BARS)
+    print(f"Running {len(benches)} benchmark(s) on {bars} synthetic bars (seed {args.seed})")
+    document = run_benchmarks(benches, bars, seed=args.seed, repeat=args.repeat, progress=print_result)
+    save_results(document, args.output)
+    print(f"Results written to {args.output}")
+
+    if baseline is not None:
+        rows = compare(baseline, document, args.threshold)
+        gate(rows, args.threshold)
+
+
+if __name__ == '__main__':
+    main()
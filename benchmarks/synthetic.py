@@ -0,0 +1,122 @@
+"""
+Seeded synthetic FX OHLC data for the benchmarks.
+
+``synthetic_ohlc`` draws bars from a regime-switching random walk: a Markov
+chain moves between up-trend, down-trend and range regimes, each with its own
+drift and volatility. The market is closed from Friday 22:00 to Sunday 22:00
+UTC like spot FX, and the first bar of each week opens with a gap. The same
+seed always gives the same frame, so benchmark runs are comparable.
+"""
+
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.models.timeframe import Timeframe
+from src.utils.backtesting import generate_csv_filename
+
+BAR_MINUTES = {'M1': 1, 'M5': 5, 'M15': 15, 'M30': 30, 'H1': 60, 'H4': 240, 'D1': 1440}
+
+# Regimes: up-trend, down-trend, range. Drift and volatility are in units of
+# the symbol's per-bar volatility.
+REGIME_DRIFT = np.array([0.08, -0.08, 0.0])
+REGIME_VOLATILITY = np.array([1.0, 1.1, 0.6])
+REGIME_STAY = 0.985  # probability of staying in the current regime on each bar
+WEEKEND_GAP = 3.0  # std of the weekly open gap, in per-bar volatilities
+
+
+def base_price(symbol: str) -> float:
+    symbol = symbol.upper()
+    if symbol.startswith('XAU'):
+        return 2000.0
+    if symbol.startswith('XAG'):
+        return 25.0
+    if symbol.endswith('JPY'):
+        return 150.0
+    return 1.1
+
+
+def hourly_volatility(symbol: str) -> float:
+    """Relative std of one hour's return (metals move about twice as much as FX majors)."""
+    symbol = symbol.upper()
+    return 0.002 if symbol.startswith(('XAU', 'XAG')) else 0.001
+
+
+def trading_times(start: datetime, n_bars: int, timeframe: Timeframe) -> pd.DatetimeIndex:
+    """The first ``n_bars`` bar times from ``start`` outside the FX weekend (Fri 22:00 - Sun 22:00)."""
+    step = timedelta(minutes=BAR_MINUTES[str(timeframe)])
+    # Over-generate, then drop the weekend bars (at most 2/7 of a week is closed)
+    candidates = pd.date_range(start, periods=int(n_bars * 1.5) + 64, freq=step)
+    weekday = candidates.weekday
+    hour = candidates.hour
+    closed = ((weekday == 4) & (hour >= 22)) | (weekday == 5) | ((weekday == 6) & (hour < 22))
+    times = candidates[~closed]
+    while len(times) < n_bars:
+        extra = trading_times(times[-1] + step, n_bars - len(times), timeframe)
+        times = times.append(extra)
+    return times[:n_bars]
+
+
+def synthetic_ohlc(symbol: str, n_bars: int, timeframe: Timeframe = Timeframe.H1,
+                   start: datetime = datetime(2025, 1, 1), seed: int = 0) -> pd.DataFrame:
+    """
+    Synthetic OHLC bars of a symbol.
+
+    Returns:
+        DataFrame with the columns of the cached backtest CSVs:
+        time, open, high, low, close, tick_volume
+    """
+    rng = np.random.default_rng(seed)
+    times = trading_times(start, n_bars, timeframe)
+    sigma = hourly_volatility(symbol) * np.sqrt(BAR_MINUTES[str(timeframe)] / 60)
+
+    # Regime path: stay with REGIME_STAY, otherwise jump to one of the other two
+    regimes = np.empty(n_bars, dtype=np.int64)
+    regime = int(rng.integers(3))
+    switches = rng.random(n_bars) > REGIME_STAY
+    jumps = rng.integers(1, 3, size=n_bars)
+    for i in range(n_bars):
+        if switches[i]:
+            regime = (regime + jumps[i]) % 3
+        regimes[i] = regime
+
+    returns = sigma * (REGIME_DRIFT[regimes] + REGIME_VOLATILITY[regimes] * rng.standard_normal(n_bars))
+    close = base_price(symbol) * np.exp(np.cumsum(returns))
+
+    # Open at the previous close, except after a weekend where the market gaps
+    open_ = np.empty(n_bars)
+    open_[0] = base_price(symbol)
+    open_[1:] = close[:-1]
+    week_open = np.zeros(n_bars, dtype=bool)
+    week_open[1:] = (times[1:] - times[:-1]) > pd.Timedelta(days=1)
+    open_[week_open] *= np.exp(WEEKEND_GAP * sigma * rng.standard_normal(int(week_open.sum())))
+
+    # Wicks beyond the body, scaled by the bar volatility
+    wick = sigma * REGIME_VOLATILITY[regimes] * np.abs(rng.standard_normal((2, n_bars))) * 0.5
+    high = np.maximum(open_, close) * (1 + wick[0])
+    low = np.minimum(open_, close) * (1 - wick[1])
+    tick_volume = rng.integers(100, 2000, size=n_bars)
+
+    return pd.DataFrame({
+        'time': times,
+        'open': open_,
+        'high': high,
+        'low': low,
+        'close': close,
+        'tick_volume': tick_volume,
+    })
+
+
+def write_backtest_csv(symbol: str, timeframe: Timeframe, start_date: datetime, end_date: datetime,
+                       n_bars: int, seed: int = 0) -> Path:
+    """
+    Write synthetic bars where ``prepare_backtesting`` looks for cached data
+    (``data/backtests/data`` under the current directory), so main.backtesting
+    runs on them without fetching.
+    """
+    path = generate_csv_filename(symbol, timeframe, start_date, end_date)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    synthetic_ohlc(symbol, n_bars, timeframe, start_date, seed).to_csv(path, index=False)
+    return path
@@ -249,6 +249,7 @@ class LiveRunner:
         from strategies.BreakRetestStrategy import BreakRetestStrategy
         from indicators.TestIndicator import TestIndicator
         from src.brokers.ForexLeverage import ForexLeverage
+        from src.data.timeframes import build_timeframes_from_frame
 
         # Point the global ChartOverlayManager at our session directory
         reset_chart_overlay_manager()
@@ -285,45 +286,30 @@ class LiveRunner:
             print("  No data feeds added – skipping strategy run")
             return
 
-        # ── Add daily-resampled feeds for daily RSI (if enough data) ──
-        # RSI(14) needs at least 15 daily bars. With limited H1 candles
-        # (e.g. 200 H1 = ~8 days) we may not have enough. Check ALL
-        # symbols first, then add daily feeds only if every symbol passes.
+        # ── Daily bars for daily RSI (if enough data) ──
+        # Built from the H1 candles by src.data.timeframes and read by the
+        # strategy per H1 bar (no extra daily feeds). RSI(14) needs at least
+        # 15 closed daily bars. With limited H1 candles (e.g. 200 H1 = ~8
+        # days) we may not have enough. Check ALL symbols first, then use
+        # the daily bars only if every symbol passes.
         MIN_DAILY_BARS = 15  # RSI period (14) + 1
-        cerebro.daily_data_mapping = {}
+        cerebro.timeframes = {}
 
-        # Phase 1: build daily DataFrames and check bar counts
-        daily_dfs: Dict[int, Any] = {}  # index -> (symbol, daily DataFrame)
         has_enough_daily = True
         for i, symbol in enumerate(self.symbols):
             candles = all_candles.get(symbol, [])
             if not candles:
                 continue
-            df = pd.DataFrame(candles)
-            df["datetime"] = pd.to_datetime(df["time"], unit="s", utc=True)
-            df = df.set_index("datetime")
-            daily = df.resample("1D").agg({
-                "open": "first", "high": "max",
-                "low": "min", "close": "last", "volume": "sum",
-            }).dropna(subset=["open"]).reset_index()
-            if len(daily) < MIN_DAILY_BARS:
-                print(f"  {symbol}: only {len(daily)} daily bars (need {MIN_DAILY_BARS}) – skipping daily RSI for all")
+            timeframes = build_timeframes_from_frame(pd.DataFrame(candles), ("D1",))
+            closed_daily_bars = int(timeframes["D1"].closed_index[-1]) + 1
+            if closed_daily_bars < MIN_DAILY_BARS:
+                print(f"  {symbol}: only {closed_daily_bars} daily bars (need {MIN_DAILY_BARS}) – skipping daily RSI for all")
                 has_enough_daily = False
                 break
-            daily_dfs[i] = (symbol, daily)
-
-        # Phase 2: add daily feeds only if ALL symbols passed
-        if has_enough_daily and daily_dfs:
-            for i, (sym_name, daily) in daily_dfs.items():
-                daily_feed = bt.feeds.PandasData(
-                    dataname=daily, datetime="datetime",
-                    open="open", high="high", low="low", close="close",
-                    volume="volume", openinterest=-1,
-                )
-                daily_feed._name = f"{sym_name}_DAILY"
-                cerebro.adddata(daily_feed, name=f"{sym_name}_DAILY")
-                cerebro.daily_data_mapping[i] = daily_feed
-        else:
+            cerebro.timeframes[i] = timeframes
+
+        if not has_enough_daily or not cerebro.timeframes:
+            cerebro.timeframes = {}
             # Disable daily RSI check so strategy treats daily_rsi=None
             Config.check_for_daily_rsi = False
             print("  Daily RSI disabled (insufficient daily bars)")
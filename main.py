@@ -2,11 +2,9 @@ from datetime import datetime
 import backtrader as bt
 import sys
 import os
-import pandas as pd
 import argparse
-import time
 import threading
-from loguru import logger
+import signal
 
 # Add the src directory to the Python path
 sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
@@ -14,18 +12,27 @@ sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
 sys.path.append(os.path.dirname(__file__))
 
 from src.utils.config import Config, load_config
-from src.data.csv_data_feed import CSVDataFeed
+from src.utils.logging import configure_logging_from_config, get_logger
+from src.data.csv_data_feed import CSVDataFeed, CSVStreamFeed
+from src.engine.precompute import IndicatorSettings, precompute_indicators
 from indicators.TestIndicator import TestIndicator
 from strategies.BreakRetestStrategy import BreakRetestStrategy
 from src.observers.buy_sell_observer import BuySellObserver
 from src.utils.backtesting import prepare_backtesting
+from src.infrastructure.ChartOverlayManager import set_chart_overlay_streaming
+from src.utils.analytics import performance_stats
+from src.utils.monte_carlo import monte_carlo
+from src.utils.profiling import format_summary, get_phase_timer, time_broker
 from src.models.timeframe import Timeframe
 from src.utils.plot import render_tv_chart
 from src.brokers.backtesting_broker import BacktestingBroker
-from src.utils.strategy_utils.general_utils import convert_pips_to_price, convert_micropips_to_price
+from src.utils.strategy_utils.general_utils import convert_pips_to_price
+from src.utils.symbol_specs import get_spec
 from src.brokers.ForexLeverage import ForexLeverage
 
-def backtesting(symbols: list[str], timeframe: Timeframe, start_date: datetime, end_date: datetime, max_candles: int = None, print_trades: bool = False, spread_pips: float = 0.0):
+log = get_logger('live')
+
+def backtesting(symbols: list[str], timeframe: Timeframe, start_date: datetime, end_date: datetime, max_candles: int = None, print_trades: bool = False, spread_pips: float = 0.0, broker: bt.BrokerBase = None, lean: bool = False, profile: bool = False, low_memory: bool = False):
     """
     Run backtesting with optional spread simulation.
     
@@ -37,12 +44,33 @@ def backtesting(symbols: list[str], timeframe: Timeframe, start_date: datetime,
         max_candles: Maximum number of candles to process
         print_trades: Whether to print trade details
         spread_pips: Spread in pips (default: 0.0 for no spread)
+        broker: Broker to run the backtest with (default: BacktestingBroker with ``spread_pips``,
+            which matches resting orders through its price-indexed order book)
+        lean: Headless run (tuning, batch backtests): no observer, chart overlays, logs,
+            reports or CSV export; only the trade ledger, equity curve and stats are returned
+        profile: Time the backtest phases and the strategy bars; the summary is
+            returned under 'timings' (see src/utils/profiling.py)
+        low_memory: Bounded memory for very long runs: backtrader's exactbars (lines
+            keep only the bars indicators look back over), CSVs streamed row by row,
+            zone look-back capped at Config.low_memory_lookback, chart overlays
+            streamed to chart_overlays.jsonl and a daily equity curve. The returned
+            data feeds hold only their last bars, so they cannot be charted
     """
+    timer = get_phase_timer()
+    if profile:
+        timer.start()
+    else:
+        timer.stop()
     symbols_list = prepare_backtesting(symbols, timeframe, start_date, end_date)
-    print(f"symbols_list: {symbols_list}")
+    if not lean:
+        print(f"symbols_list: {symbols_list}")
 
     config = load_config()
-    cerebro = bt.Cerebro(stdstats=False)
+    # exactbars=1 also turns off preload and runonce (indicators compute bar by bar)
+    cerebro = bt.Cerebro(stdstats=False, exactbars=1) if low_memory else bt.Cerebro(stdstats=False)
+    cerebro.broker = broker if broker is not None else BacktestingBroker(spread_pips=spread_pips)
+    if profile:
+        time_broker(cerebro.broker, timer)
     
     cerebro.data_indicators = {}
     cerebro.data_state = {}
@@ -51,25 +79,43 @@ def backtesting(symbols: list[str], timeframe: Timeframe, start_date: datetime,
     data_feeds = []
     data_for_plotly = {}
     original_data_feeds = []  # Store references to original data feeds for resampling
-    print(f"symbols_list: {symbols_list}")
+    if not lean:
+        print(f"symbols_list: {symbols_list}")
     for config in symbols_list:
-        csv_feed = CSVDataFeed(
-            csv_file_path=config['csv_file'],
-            max_candles=max_candles
-        )
-        data = csv_feed.get_backtrader_feed()
+        if low_memory:
+            csv_feed = None
+            data = CSVStreamFeed(dataname=str(config['csv_file']), max_candles=max_candles)
+        else:
+            csv_feed = CSVDataFeed(
+                csv_file_path=config['csv_file'],
+                max_candles=max_candles
+            )
+            data = csv_feed.get_backtrader_feed()
         data._name = config['symbol']  # Set name for identification
         data_for_plotly[config['symbol']] = data
         cerebro.adddata(data, name=config['symbol'])
         data_feeds.append({'feed': csv_feed, 'symbol': config['symbol']})
         original_data_feeds.append(data)  # Store reference for resampling
+    timer.lap('load_data')
+
+    if Config.precompute_indicators and not low_memory:
+        # Indicator arrays of every symbol before the run, in parallel; read per bar by the strategy
+        precomputed = precompute_indicators({info['symbol']: info['feed'].get_dataframe() for info in data_feeds},
+                                            IndicatorSettings.from_config(Config), Config.precompute_processes)
+        cerebro.precomputed_indicators = dict(enumerate(precomputed.values()))
+        timer.lap('precompute')
     
     # Resample all data feeds to daily timeframe for RSI calculation
     # Use replaydata instead of resampledata to avoid synchronization issues
     # replaydata replays data at a different timeframe without interfering with main feed synchronization
     # IMPORTANT: replaydata must be called BEFORE adding the strategy
     cerebro.daily_data_mapping = {}  # Maps original data index to daily data feed
+    cerebro.timeframes = {}  # Maps original data index to its higher-timeframe bars (src.data.timeframes)
     for i, (original_data, feed_info) in enumerate(zip(original_data_feeds, data_feeds)):
+        if Config.daily_rsi_from_timeframes and feed_info['feed'] is not None:
+            # Daily RSI from the D1 bars built from the loaded candles (no extra feed)
+            cerebro.timeframes[i] = feed_info['feed'].get_timeframes()
+            continue
         # Use replaydata - it replays the data at daily timeframe without affecting synchronization
         # replaydata creates a separate data feed that replays at daily intervals
         daily_data = cerebro.replaydata(
@@ -92,28 +138,36 @@ def backtesting(symbols: list[str], timeframe: Timeframe, start_date: datetime,
         'end_date': end_date
     }
 
-    cerebro.addobserver(BuySellObserver)
-    
-    # Print data summary for all feeds
-    print(f"Data Summary:")
-    for feed_info in data_feeds:
-        summary = feed_info['feed'].get_summary()
-        print(f"  {feed_info['symbol']}:")
-        print(f"    CSV File: {summary['csv_file']}")
-        print(f"    Total rows: {summary['total_rows']}")
-        print(f"    Data range: {summary['date_range']['start']} to {summary['date_range']['end']}")
-        print(f"    Price range: {summary['price_range']['min']:.5f} to {summary['price_range']['max']:.5f}")
-    print()
-    
-    cerebro.addstrategy(BreakRetestStrategy, symbol=symbol, rr=Config.rr)
-    cerebro.addindicator(TestIndicator)
+    if not lean:
+        cerebro.addobserver(BuySellObserver)
+        
+        # Print data summary for all feeds
+        print(f"Data Summary:")
+        for feed_info in data_feeds:
+            if feed_info['feed'] is None:
+                print(f"  {feed_info['symbol']}: streamed from CSV (low-memory)")
+                continue
+            summary = feed_info['feed'].get_summary()
+            print(f"  {feed_info['symbol']}:")
+            print(f"    CSV File: {summary['csv_file']}")
+            print(f"    Total rows: {summary['total_rows']}")
+            print(f"    Data range: {summary['date_range']['start']} to {summary['date_range']['end']}")
+            print(f"    Price range: {summary['price_range']['min']:.5f} to {summary['price_range']['max']:.5f}")
+        print()
+    
+    set_chart_overlay_streaming(low_memory and not lean)
+    cerebro.addstrategy(BreakRetestStrategy, symbol=symbol, rr=Config.rr, lean=lean, low_memory=low_memory)
+    if not lean:
+        cerebro.addindicator(TestIndicator)
     
     cerebro.broker.set_checksubmit(False)
     cerebro.broker.set_cash(Config.initial_equity)
     
     initial_cash = cerebro.broker.getcash()
+    timer.lap('setup')
     
     results = cerebro.run()
+    timer.lap('run')
     strat = results[0]
     cerebro.strategy = strat
     final_equity = cerebro.broker.getvalue()
@@ -122,14 +176,49 @@ def backtesting(symbols: list[str], timeframe: Timeframe, start_date: datetime,
     pnl_percentage = (pnl / initial_cash) * 100
     
     # Calculate statistical metrics
-    completed_trades = strat.completed_trades
-    
-    # Initialize default values for when there are no trades
-    win_rate = 0.0
-    avg_win = 0.0
-    avg_loss = 0.0
-    profit_factor = 0.0
-    sharpe_ratio = 0.0
+    completed_trades = strat.trades.completed_array()
+    symbols_by_index = [feed_info['symbol'] for feed_info in data_feeds]
+    summary = performance_stats(completed_trades, initial_cash, strat.portfolio.equity_curve(), symbols=symbols_by_index,
+                                drawdown=strat.portfolio.drawdown()) if len(completed_trades) else None
+    
+    # Default values for when there are no trades
+    win_rate = summary['win_rate'] if summary else 0.0
+    avg_win = summary['avg_win'] if summary else 0.0
+    avg_loss = summary['avg_loss'] if summary else 0.0
+    profit_factor = summary['profit_factor'] if summary else 0.0
+    sharpe_ratio = summary['sharpe_ratio'] if summary else 0.0
+    sortino_ratio = summary['sortino_ratio'] if summary else 0.0
+    calmar_ratio = summary['calmar_ratio'] if summary else 0.0
+    max_drawdown = summary['max_drawdown'] if summary else 0.0
+    exposure = summary['exposure'] if summary else 0.0
+    
+    stats = {
+        'initial_cash': initial_cash,
+        'final_equity': final_equity,
+        'pnl': pnl,
+        'pnl_percentage': pnl_percentage,
+        'total_trades': len(completed_trades),
+        'win_rate': win_rate,
+        'avg_win': avg_win,
+        'avg_loss': avg_loss,
+        'profit_factor': profit_factor,
+        'sharpe_ratio': sharpe_ratio,
+        'sortino_ratio': sortino_ratio,
+        'calmar_ratio': calmar_ratio,
+        'max_drawdown': max_drawdown,
+        'exposure': exposure,
+        'per_symbol': summary['per_symbol'] if summary else {},
+    }
+    timer.lap('stats')
+    if lean:
+        results = {
+            'trades': strat.trades,
+            'equity_curve': strat.portfolio.equity_curve(),
+            'stats': stats,
+        }
+        if profile:
+            results['timings'] = timer.summary()
+        return results
     
     print('=' * 80)
     print('BACKTEST RESULTS')
@@ -140,50 +229,7 @@ def backtesting(symbols: list[str], timeframe: Timeframe, start_date: datetime,
     print('PnL%%: %.2f%%' % pnl_percentage)
     print(f'TPs/SLs: {strat.counter["tp"]}/{strat.counter["sl"]}')
     
-    if completed_trades:
-        winning_trades = [t for t in completed_trades if t['pnl'] > 0]
-        losing_trades = [t for t in completed_trades if t['pnl'] < 0]
-        
-        win_rate = len(winning_trades) / len(completed_trades) if completed_trades else 0
-        max_win = max(t['pnl'] for t in winning_trades) if winning_trades else 0
-        max_win_candle = max(t['placed_candle'] for t in winning_trades) if winning_trades else 0
-        max_loss = min(t['pnl'] for t in losing_trades) if losing_trades else 0
-        max_loss_candle = min(t['placed_candle'] for t in losing_trades) if losing_trades else 0
-        avg_win = sum(t['pnl'] for t in winning_trades) / len(winning_trades) if winning_trades else 0
-        avg_loss = sum(t['pnl'] for t in losing_trades) / len(losing_trades) if losing_trades else 0
-        profit_factor = abs(sum(t['pnl'] for t in winning_trades) / sum(t['pnl'] for t in losing_trades)) if losing_trades and sum(t['pnl'] for t in losing_trades) != 0 else float('inf')
-        
-        
-        # Calculate equity curve for drawdown
-        # Sort by close_candle (when PnL is realized) instead of open_candle
-        equity_curve = []
-        current_equity = initial_cash
-        for trade in sorted(completed_trades, key=lambda x: x.get('close_candle', x.get('open_candle', 0))):
-            equity_curve.append(current_equity)
-            if 'pnl' in trade:
-                current_equity += trade['pnl']
-        equity_curve.append(final_equity)
-        
-        # Calculate max drawdown
-        max_dd = 0.0
-        peak = initial_cash  # Start peak at initial cash
-        max_dd_value = 0.0
-        for value in equity_curve:
-            if value > peak:
-                peak = value
-            dd = (peak - value) / peak if peak > 0 else 0.0
-            dd_value = peak - value
-            if dd > max_dd:
-                max_dd = dd
-                max_dd_value = dd_value
-        
-        # Calculate slippage statistics
-        total_entry_slippage = sum([t.get('entry_slippage', 0) or 0 for t in completed_trades])
-        total_close_slippage = sum([t.get('close_slippage', 0) or 0 for t in completed_trades])
-        total_slippage_all = sum([t.get('total_slippage', 0) or 0 for t in completed_trades])
-        avg_entry_slippage = total_entry_slippage / len(completed_trades) if completed_trades else 0
-        avg_close_slippage = total_close_slippage / len(completed_trades) if completed_trades else 0
-        
+    if summary:
         print()
         print('=' * 80)
         print('STATISTICAL METRICS')
@@ -193,41 +239,33 @@ def backtesting(symbols: list[str], timeframe: Timeframe, start_date: datetime,
         print(f'Average Win: ${avg_win:.2f}')
         print(f'Average Loss: ${abs(avg_loss):.2f}')
         print(f'Profit Factor: {profit_factor:.2f}')
-        print(f'Max Win: ${max_win:.2f} (Candle {max_win_candle})')
-        print(f'Max Loss: ${max_loss:.2f} (Candle {max_loss_candle})')
-        print(f'Max Drawdown: {max_dd:.2%} (${max_dd_value:.2f})')
+        print(f'Max Win: ${summary["max_win"]:.2f} (Candle {summary["max_win_candle"]})')
+        print(f'Max Loss: ${summary["max_loss"]:.2f} (Candle {summary["max_loss_candle"]})')
+        print(f'Max Drawdown: {summary["max_drawdown"]:.2%} (${summary["max_drawdown_value"]:.2f})')
         print(f'Sharpe Ratio: {sharpe_ratio:.2f}')
+        print(f'Sortino Ratio: {sortino_ratio:.2f}')
+        print(f'Calmar Ratio: {calmar_ratio:.2f}')
+        print(f'Exposure: {exposure:.2%}')
+        if len(summary['per_symbol']) > 1:
+            for symbol_name, symbol_stats in summary['per_symbol'].items():
+                print(f'  {symbol_name}: {symbol_stats["total_trades"]} trades, '
+                      f'Win Rate {symbol_stats["win_rate"]:.2%}, PnL ${symbol_stats["total_pnl"]:.2f}, '
+                      f'Profit Factor {symbol_stats["profit_factor"]:.2f}')
         print()
         print('EXECUTION COSTS')
         print('=' * 80)
         # Convert slippage to pips based on symbol type using utility functions
         symbol = cerebro.backtest_metadata.get('symbol', '')
         
-        # Helper function to get pip value for a symbol (inverse of conversion functions)
-        def get_pip_value(symbol: str) -> float:
-            """
-            Get pip value for a symbol (price per pip).
-            Uses utility functions to avoid hardcoding values.
-            """
-            symbol_upper = symbol.upper()
-            if symbol_upper.startswith("XAU") or symbol_upper.startswith("XAG"):
-                # Metals: 1 pip = 0.001 (same as 1 micropip for metals)
-                return convert_micropips_to_price(1.0, symbol)
-            elif symbol_upper.endswith("JPY"):
-                # JPY pairs: 1 pip = 0.01 (which is 10 micropips)
-                # convert_micropips_to_price(10.0, symbol) = 10 * 0.001 = 0.01
-                return convert_micropips_to_price(10.0, symbol)
-            else:
-                # Standard forex: 1 pip = 0.0001
-                return convert_pips_to_price(1.0)
-        
-        pip_value = get_pip_value(symbol) if symbol else convert_pips_to_price(1.0)
+        pip_value = get_spec(symbol).pip_size if symbol else convert_pips_to_price(1.0)
+        avg_entry_slippage = summary['avg_entry_slippage']
+        avg_close_slippage = summary['avg_close_slippage']
         entry_slippage_pips = avg_entry_slippage / pip_value if pip_value > 0 else 0
         close_slippage_pips = avg_close_slippage / pip_value if pip_value > 0 else 0
         
         print(f'Avg Entry Slippage: {avg_entry_slippage:.5f} ({entry_slippage_pips:.2f} pips)')
         print(f'Avg Close Slippage: {avg_close_slippage:.5f} ({close_slippage_pips:.2f} pips)')
-        print(f'Total Slippage Cost: ${total_slippage_all:.2f}')
+        print(f'Total Slippage Cost: ${summary["total_slippage"]:.2f}')
         
         # Get execution stats from broker if using realistic execution
         if hasattr(cerebro.broker, 'get_execution_stats'):
@@ -247,54 +285,46 @@ def backtesting(symbols: list[str], timeframe: Timeframe, start_date: datetime,
     csv_file = strat.export_trades_to_csv()
     if csv_file:
         print(f"Trades exported to: {csv_file}")
+    timer.lap('report')
     
-    # Calculate Sharpe ratio if we have trades
-    if completed_trades:
-        returns = pd.Series([t['pnl'] / initial_cash for t in completed_trades])
-        if len(returns) > 0 and returns.std() > 0:
-            sharpe_ratio = (returns.mean() / returns.std()) * (252 ** 0.5)  # Annualized
-    
-    return {
+    results = {
         'cerebro': cerebro,
         'data': data_for_plotly,
-        'stats': {
-            'initial_cash': initial_cash,
-            'final_equity': final_equity,
-            'pnl': pnl,
-            'pnl_percentage': pnl_percentage,
-            'total_trades': len(completed_trades),
-            'win_rate': win_rate,
-            'avg_win': avg_win,
-            'avg_loss': avg_loss,
-            'profit_factor': profit_factor,
-            'sharpe_ratio': sharpe_ratio,
-        }
+        'stats': stats,
     }
+    if profile:
+        results['timings'] = timer.summary()
+    return results
 
 
 def live_trading():
     from src.brokers.mt5_broker import MT5Broker
+    from src.data.candle_store import CandleStore
     from src.data.mt5_data_feed import MT5LiveFeed
+    from src.data.live_bars import LiveBarGate
+    from src.data.mt5_poller import MT5BarPoller
+    from src.infrastructure.LiveCheckpoint import LiveCheckpoint, session_key
+    from src.infrastructure.StateManager import StateManager
     
     config = load_config()
     
     # Validate MT5 credentials
     if not config.mt5_login or not config.mt5_password or not config.mt5_server or not config.mt5_symbol or not config.mt5_timeframe:
-        logger.error("MT5 data misconfigured in .env file!")
+        log.error("MT5 data misconfigured in .env file!")
         sys.exit(1)
     
     # Parse symbols (support comma-separated list)
     symbols = [s.strip() for s in config.mt5_symbol.split(',')]
     timeframe = config.mt5_timeframe or 'H1'
     
-    logger.info("=" * 80)
-    logger.info("STARTING LIVE TRADING WITH METATRADER 5")
-    logger.info("=" * 80)
-    logger.info(f"Symbols: {', '.join(symbols)}")
-    logger.info(f"Timeframe: {timeframe}")
-    logger.info(f"Account: {config.mt5_login}")
-    logger.info(f"Server: {config.mt5_server}")
-    logger.info("=" * 80)
+    log.info("=" * 80)
+    log.info("STARTING LIVE TRADING WITH METATRADER 5")
+    log.info("=" * 80)
+    log.info("Symbols: {}", ', '.join(symbols))
+    log.info("Timeframe: {}", timeframe)
+    log.info("Account: {}", config.mt5_login)
+    log.info("Server: {}", config.mt5_server)
+    log.info("=" * 80)
     
     # Initialize MT5 connection first
     import MetaTrader5 as mt5
@@ -308,31 +338,30 @@ def live_trading():
         
         if not initialized:
             error = mt5.last_error()
-            logger.error(f"MT5 initialization failed: {error}")
+            log.error("MT5 initialization failed: {}", error)
             sys.exit(1)
         
-        logger.info(f"MT5 initialized successfully. Version: {mt5.version()}")
+        log.info("MT5 initialized successfully. Version: {}", mt5.version())
     except Exception as e:
-        logger.error(f"MT5 initialization error: {e}")
+        log.error("MT5 initialization error: {}", e)
         sys.exit(1)
     
     # Login to MT5
     if not mt5.login(config.mt5_login, password=config.mt5_password, server=config.mt5_server):
         error = mt5.last_error()
         mt5.shutdown()
-        logger.error(f"MT5 login failed: {error}")
+        log.error("MT5 login failed: {}", error)
         sys.exit(1)
-    logger.info("MT5 login successful")
+    log.info("MT5 login successful")
     
     # Verify symbols exist
     updated_symbols = []
     for i, symbol in enumerate(symbols):
-        original_symbol = symbol
         symbol_info = mt5.symbol_info(symbol)
         
         # If symbol not found, try common variations
         if symbol_info is None:
-            logger.warning(f"Symbol {symbol} not found, trying variations...")
+            log.warning("Symbol {} not found, trying variations...", symbol)
             variations = [
                 symbol + "#",  # Some brokers add #
                 symbol + ".",  # Some brokers add .
@@ -340,56 +369,54 @@ def live_trading():
                 symbol.replace("USD", ".USD"),  # Some brokers use .USD
             ]
             
-            found_variation = None
             for variation in variations:
                 test_info = mt5.symbol_info(variation)
                 if test_info is not None:
-                    logger.info(f"Found symbol variation: {variation} (instead of {symbol})")
+                    log.info("Found symbol variation: {} (instead of {})", variation, symbol)
                     symbol_info = test_info
                     symbol = variation  # Update symbol to use the found variation
-                    found_variation = variation
                     break
             
             # If still not found, list available symbols
             if symbol_info is None:
-                logger.error(f"Symbol {symbol} not found in MT5")
-                logger.error(f"Last Error: {mt5.last_error()}")
-                logger.info("Fetching available symbols from MT5...")
+                log.error("Symbol {} not found in MT5", symbol)
+                log.error("Last Error: {}", mt5.last_error())
+                log.info("Fetching available symbols from MT5...")
                 
                 # Get all available symbols
                 all_symbols = mt5.symbols_get()
                 if all_symbols:
-                    logger.info(f"Found {len(all_symbols)} symbols available on this broker:")
+                    log.info("Found {} symbols available on this broker:", len(all_symbols))
                     # Filter symbols that might be related (contain part of the requested symbol)
                     base_symbol = symbol.replace("USD", "").replace("#", "").replace(".", "")
                     related_symbols = [s.name for s in all_symbols if base_symbol.upper() in s.name.upper()]
                     
                     if related_symbols:
-                        logger.info(f"Symbols containing '{base_symbol}':")
+                        log.info("Symbols containing '{}':", base_symbol)
                         for s in sorted(related_symbols)[:20]:  # Show first 20 matches
-                            logger.info(f"  - {s}")
+                            log.info("  - {}", s)
                     else:
-                        logger.info("No similar symbols found. Showing first 50 available symbols:")
+                        log.info("No similar symbols found. Showing first 50 available symbols:")
                         for s in sorted([s.name for s in all_symbols])[:50]:
-                            logger.info(f"  - {s}")
+                            log.info("  - {}", s)
                 else:
-                    logger.error("Could not retrieve symbol list from MT5")
+                    log.error("Could not retrieve symbol list from MT5")
                 
                 mt5.shutdown()
-                logger.error(f"\nPlease check your symbol name. The symbol '{symbol}' is not available on broker '{config.mt5_server}'.")
-                logger.error("You may need to:")
-                logger.error("  1. Check the symbol name in MT5 Market Watch")
-                logger.error("  2. Add the symbol to Market Watch in MT5")
-                logger.error("  3. Use a different symbol name if your broker uses a different naming convention")
+                log.error("\nPlease check your symbol name. The symbol '{}' is not available on broker '{}'.", symbol, config.mt5_server)
+                log.error("You may need to:")
+                log.error("  1. Check the symbol name in MT5 Market Watch")
+                log.error("  2. Add the symbol to Market Watch in MT5")
+                log.error("  3. Use a different symbol name if your broker uses a different naming convention")
                 sys.exit(1)
         
         if not symbol_info.visible:
-            logger.warning(f"Symbol {symbol} is not visible. Attempting to enable...")
+            log.warning("Symbol {} is not visible. Attempting to enable...", symbol)
             if not mt5.symbol_select(symbol, True):
                 mt5.shutdown()
-                logger.error(f"Failed to enable symbol {symbol}")
+                log.error("Failed to enable symbol {}", symbol)
                 sys.exit(1)
-        logger.info(f"Symbol {symbol} verified. Bid: {symbol_info.bid}, Ask: {symbol_info.ask}")
+        log.info("Symbol {} verified. Bid: {}, Ask: {}", symbol, symbol_info.bid, symbol_info.ask)
         
         # Store the verified symbol (may be a variation if original wasn't found)
         updated_symbols.append(symbol)
@@ -403,16 +430,28 @@ def live_trading():
     cerebro.data_indicators = {}
     cerebro.data_state = {}
     
+    # Checkpoint after every live bar; a saved one makes the feeds load only warm-up and missed bars
+    state = StateManager(config.live_state_db) if config.live_state_db else None
+    checkpoint = LiveCheckpoint(state, session_key(symbols, timeframe), resume=config.warm_restart) if state else None
+    if checkpoint is not None and checkpoint.saved:
+        log.info("Resuming from the checkpoint of {}", checkpoint.resume_from)
+    
+    # History is read from disk; only bars newer than the stored ones are fetched
+    candle_store = CandleStore(config.candle_store_dir) if config.candle_store_dir else None
+    
     # Add live data feeds for all symbols
     live_feeds = []
     for i, symbol in enumerate(symbols):
         try:
-            logger.info(f"Initializing live data feed for {symbol}...")
+            log.info("Initializing live data feed for {}...", symbol)
             live_feed = MT5LiveFeed(
                 symbol=symbol,
                 timeframe=timeframe,
                 max_candles=1000,
-                check_interval=1.0  # Check for new bars every second
+                check_interval=1.0,  # Check for new bars every second
+                resume_from=checkpoint.resume_time(symbol) if checkpoint is not None else None,
+                warmup_candles=config.warmup_candles,
+                candle_store=candle_store,
             )
             live_feed._name = symbol  # Set name for identification
             
@@ -427,23 +466,39 @@ def live_trading():
                 cerebro.adddata(live_feed, name=symbol)
             
             live_feeds.append(live_feed)
-            logger.info(f"✓ {symbol} live feed initialized")
+            log.info("✓ {} live feed initialized", symbol)
         except Exception as e:
-            logger.error(f"Failed to initialize live feed for {symbol}: {e}")
+            log.error("Failed to initialize live feed for {}: {}", symbol, e)
             import traceback
             traceback.print_exc()
             continue
     
     if not live_feeds:
-        logger.error("No live feeds could be initialized!")
+        log.error("No live feeds could be initialized!")
         mt5.shutdown()
         sys.exit(1)
     
+    # One gate for all feeds: each live timestamp reaches every feed in the same cerebro loop.
+    # One poller for all feeds: a single thread checks every symbol for new bars around its bar closes
+    gate = LiveBarGate([feed.symbol for feed in live_feeds])
+    server_offset = config.mt5_server_utc_offset * 3600 if config.mt5_server_utc_offset is not None else None
+    # A simulated terminal (src.sim.fake_mt5) replays on its own accelerated clock
+    clock_options = mt5.replay_clock() if hasattr(mt5, 'replay_clock') else {}
+    poller = MT5BarPoller(interval=1.0, server_offset=server_offset, **clock_options)
+    for feed in live_feeds:
+        feed.gate = gate
+        feed.poller = poller
+    
     # For backward compatibility, use first symbol for strategy
     symbol = symbols[0]
     
+    # Live feeds have no daily feed to compute the daily RSI from (as in fastapi-app/run_live.py)
+    if Config.check_for_daily_rsi:
+        log.warning("Daily RSI check disabled: live feeds have no daily data")
+        Config.check_for_daily_rsi = False
+    
     # Add strategy (strategy will handle multiple data feeds automatically)
-    cerebro.addstrategy(BreakRetestStrategy, symbol=symbol, rr=config.rr)
+    cerebro.addstrategy(BreakRetestStrategy, symbol=symbol, rr=config.rr, checkpoint=checkpoint)
     cerebro.addindicator(TestIndicator)
     
     # Set MT5 broker (supports multiple symbols)
@@ -454,16 +509,16 @@ def live_trading():
     if account_info:
         initial_balance = float(account_info.balance)
         initial_equity = float(account_info.equity)
-        logger.info(f"Account Balance: ${initial_balance:.2f}")
-        logger.info(f"Account Equity: ${initial_equity:.2f}")
-        logger.info(f"Leverage: 1:{account_info.leverage}")
+        log.info("Account Balance: ${:.2f}", initial_balance)
+        log.info("Account Equity: ${:.2f}", initial_equity)
+        log.info("Leverage: 1:{}", account_info.leverage)
         
         # Set broker cash to match MT5 account balance
         cerebro.broker.set_cash(initial_balance)
-        logger.info(f"Broker cash set to: ${initial_balance:.2f}")
+        log.info("Broker cash set to: ${:.2f}", initial_balance)
     else:
-        logger.error("Could not retrieve account info from MT5!")
-        logger.error("Please ensure MT5 is connected and logged in.")
+        log.error("Could not retrieve account info from MT5!")
+        log.error("Please ensure MT5 is connected and logged in.")
         # Shutdown MT5 if any feed initialized it
         try:
             mt5.shutdown()
@@ -471,217 +526,80 @@ def live_trading():
             pass
         sys.exit(1)
     
-    logger.info("=" * 80)
-    logger.info("STARTING LIVE TRADING...")
-    logger.info("Press Ctrl+C to stop")
-    logger.info("=" * 80)
-    
+    log.info("=" * 80)
+    log.info("STARTING LIVE TRADING...")
+    log.info("Press Ctrl+C to stop")
+    log.info("=" * 80)
+    
+    # Ctrl+C stops the engine between bars: cerebro.run() then returns normally and stops the strategy
+    def request_stop(signum, frame):
+        log.info("\nStopping live trading...")
+        cerebro.runstop()
+        gate.close()
+    previous_sigint = signal.signal(signal.SIGINT, request_stop)
+
+    # Periodic status (cerebro.run() only returns when live trading stops)
+    stop_status = threading.Event()
+    def log_status():
+        while not stop_status.wait(60):
+            account_info = mt5.account_info()
+            if account_info:
+                current_equity = float(account_info.equity)
+                log.info("Status check - Equity: ${:.2f}, PnL: ${:.2f}", current_equity, current_equity - initial_equity)
+            strategies = getattr(cerebro, 'runningstrats', None)
+            if strategies and hasattr(strategies[0], 'completed_trades'):
+                log.info("Completed Trades: {}", len(strategies[0].completed_trades))
+            log.info("Polling (mean/max): {}", poller.format_stats())
+            log.info("Order requests (mean/max): {}", cerebro.broker.gateway.format_stats())
+    threading.Thread(target=log_status, daemon=True, name="LiveStatus").start()
+
     try:
-        # Run cerebro - this will process historical data first
-        # The MT5LiveFeed will handle feeding historical bars, then switch to live mode
-        logger.info("Starting backtrader engine...")
-        logger.info("Processing historical data first, then switching to live mode...")
-        
-        # First run: process all historical data
-        # This will initialize the strategy with historical context
-        # NOTE: backtrader calls start() on data feeds during cerebro.run()
-        logger.info("Processing historical data...")
-        logger.info("This will call strategy.next() for each historical bar.")
-        logger.info("You should see 'PLACING ORDER' prints if next() is being called.")
-        logger.info("NOTE: Data feed start() method will be called by backtrader during run()")
-        
-        results = cerebro.run()
-        strat = results[0]
-        logger.info(f"Historical data processing complete. Processed {len(strat.data)} bars.")
-        
-        # Check if all feeds have finished historical data
-        all_live = all(feed.live_mode for feed in live_feeds)
-        if not all_live:
-            logger.warning("Not all feeds have entered live mode. Some may still be processing historical data.")
-        
-        logger.info("Historical data processed. Entering live trading mode...")
-        logger.info("Starting monitoring threads manually...")
-        
-        # Start monitoring threads manually (more reliable than relying on start() method)
-        for feed in live_feeds:
-            try:
-                # Stop any existing thread
-                if feed.monitor_thread and feed.monitor_thread.is_alive():
-                    feed.stop_monitoring.set()
-                    feed.monitor_thread.join(timeout=1.0)
-                
-                # Start new monitoring thread
-                feed.stop_monitoring.clear()
-                feed.monitor_thread = threading.Thread(
-                    target=feed._monitor_new_bars, 
-                    daemon=True, 
-                    name=f"MT5Monitor-{feed.symbol}"
-                )
-                feed.monitor_thread.start()
-                logger.info(f"Started monitoring thread for {feed.symbol}")
-                
-                # Give it a moment to start
-                time.sleep(0.2)
-                
-                if feed.monitor_thread.is_alive():
-                    logger.info(f"✓ Monitoring thread for {feed.symbol} is running")
-                else:
-                    logger.error(f"✗ Monitoring thread for {feed.symbol} died immediately!")
-            except Exception as e:
-                logger.error(f"Failed to start monitoring thread for {feed.symbol}: {e}")
-                import traceback
-                traceback.print_exc()
-        
-        logger.info("Waiting for new bars and processing them as they arrive...")
-        
-        # Live trading loop: continuously check for new bars and process them
-        # We use a loop because cerebro.run() exits when all feeds return False
-        # Each iteration processes any new bars that arrived since last run
-        iteration = 0
-        last_status_log = time.time()
-        
-        while True:
-            try:
-                iteration += 1
-                
-                # Check if any feed has new bars in queue
-                has_new_bars = any(len(feed.live_bar_queue) > 0 for feed in live_feeds)
-                queue_sizes = {feed.symbol: len(feed.live_bar_queue) for feed in live_feeds}
-                
-                # Log queue status every 10 iterations for debugging (only if debug logs enabled)
-                if Config.show_debug_logs and iteration % 10 == 0:
-                    logger.debug(f"Live trading loop iteration {iteration}. Queue sizes: {queue_sizes}")
-                
-                if has_new_bars:
-                    # Check if all feeds have bars for the same timestamp (at the front of their queues)
-                    # IMPORTANT: Only proceed when all feeds have bars for the SAME timestamp
-                    all_have_bars = all(len(feed.live_bar_queue) > 0 for feed in live_feeds)
-                    
-                    if all_have_bars:
-                        # All feeds have bars - check if they're for the same timestamp
-                        bar_times = []
-                        bar_info = {}
-                        for feed in live_feeds:
-                            if len(feed.live_bar_queue) > 0:
-                                # Peek at the first bar without removing it
-                                bar = feed.live_bar_queue[0]
-                                bar_times.append(bar['datetime'])
-                                bar_info[feed.symbol] = bar['datetime']
-                        
-                        # If all bars are for the same timestamp, we're ready to process
-                        if len(set(bar_times)) == 1:
-                            logger.info(f"All feeds have bars for timestamp {bar_times[0]}, proceeding...")
-                        else:
-                            # Bars are for different timestamps - log and skip
-                            queue_sizes = {feed.symbol: len(feed.live_bar_queue) for feed in live_feeds}
-                            logger.warning(f"*** SKIPPING: Bars are for different timestamps. Queue sizes: {queue_sizes}, Timestamps: {bar_info}. Waiting... ***")
-                            time.sleep(0.5)  # Wait a bit before checking again
-                            continue
-                    else:
-                        # Not all feeds have bars yet - skip
-                        queue_sizes = {feed.symbol: len(feed.live_bar_queue) for feed in live_feeds}
-                        missing_feeds = [feed.symbol for feed in live_feeds if len(feed.live_bar_queue) == 0]
-                        logger.warning(f"*** SKIPPING: Not all feeds have bars yet. Queue sizes: {queue_sizes}. Missing: {missing_feeds}. Waiting... ***")
-                        time.sleep(0.5)  # Wait a bit before checking again
-                        continue
-                    
-                    # Prepare feeds and run cerebro to process them
-                    # Note: Strategy state will reset, but broker state (positions, cash) is preserved
-                    queue_sizes = {feed.symbol: len(feed.live_bar_queue) for feed in live_feeds}
-                    logger.info(f"*** PROCESSING NEW BARS (iteration {iteration}). Queue sizes: {queue_sizes} ***")
-                    
-                    # Ensure monitoring threads are still running before processing
-                    for feed in live_feeds:
-                        if feed.monitor_thread and not feed.monitor_thread.is_alive():
-                            logger.warning(f"Monitoring thread for {feed.symbol} died! Restarting...")
-                            feed.stop_monitoring.clear()
-                            feed.monitor_thread = threading.Thread(
-                                target=feed._monitor_new_bars, 
-                                daemon=True, 
-                                name=f"MT5Monitor-{feed.symbol}"
-                            )
-                            feed.monitor_thread.start()
-                            time.sleep(0.1)
-                    
-                    for feed in live_feeds:
-                        queue_size_before = len(feed.live_bar_queue)
-                        feed.prepare_for_next_run()
-                        logger.info(f"Prepared feed {feed.symbol} for next run. Queue size: {queue_size_before}")
-                    
-                    logger.info("Calling cerebro.run() to process new bars...")
-                    results = cerebro.run()
-                    strat = results[0]
-                    
-                    # Verify threads are still alive after run
-                    for feed in live_feeds:
-                        if feed.monitor_thread:
-                            if not feed.monitor_thread.is_alive():
-                                logger.warning(f"Monitoring thread for {feed.symbol} died after run()! Restarting...")
-                                feed.stop_monitoring.clear()
-                                feed.monitor_thread = threading.Thread(
-                                    target=feed._monitor_new_bars, 
-                                    daemon=True, 
-                                    name=f"MT5Monitor-{feed.symbol}"
-                                )
-                                feed.monitor_thread.start()
-                    
-                    logger.info(f"*** Finished processing bars. Strategy next() should have been called. ***")
-                else:
-                    # No new bars yet - wait a bit before checking again
-                    time.sleep(0.5)  # Check every 0.5 seconds
-                
-                # Log status periodically (every 60 seconds)
-                current_time = time.time()
-                if current_time - last_status_log >= 60:
-                    account_info = mt5.account_info()
-                    if account_info:
-                        current_equity = float(account_info.equity)
-                        pnl = current_equity - initial_equity
-                        logger.info(f"Status check - Equity: ${current_equity:.2f}, PnL: ${pnl:.2f}")
-                        if hasattr(strat, 'completed_trades'):
-                            logger.info(f"Completed Trades: {len(strat.completed_trades)}")
-                    last_status_log = current_time
-                
-            except KeyboardInterrupt:
-                raise
-            except Exception as e:
-                logger.error(f"Error in live trading loop: {e}")
-                import traceback
-                traceback.print_exc()
-                # Wait a bit before retrying
-                time.sleep(5)
+        # One long-running cerebro.run(): the feeds deliver their historical bars
+        # (backfill, orders rejected), then each new bar exactly once as it arrives.
+        # Strategy, indicator and broker state stay resident between bars.
+        log.info("Starting backtrader engine...")
+        log.info("Processing historical data first, then switching to live mode...")
+        cerebro.run()
         
     except KeyboardInterrupt:
-        logger.info("\nStopping live trading...")
+        log.info("\nStopping live trading...")
     except Exception as e:
-        logger.error(f"Error during live trading: {e}")
+        log.error("Error during live trading: {}", e)
         import traceback
         traceback.print_exc()
     finally:
+        signal.signal(signal.SIGINT, previous_sigint)
+        stop_status.set()
+        gate.close()
+        poller.stop()
+        if state is not None:
+            state.close()
+        strategies = getattr(cerebro, 'runningstrats', None)
+        strat = strategies[0] if strategies else None
+        
         # Get final account info
         account_info = mt5.account_info()
         if account_info:
-            final_balance = account_info.balance
             final_equity = account_info.equity
             pnl = final_equity - initial_equity
             pnl_percentage = (pnl / initial_equity) * 100 if initial_equity > 0 else 0
             
-            logger.info("=" * 80)
-            logger.info("LIVE TRADING SESSION ENDED")
-            logger.info("=" * 80)
-            logger.info(f"Initial Equity: ${initial_equity:.2f}")
-            logger.info(f"Final Equity: ${final_equity:.2f}")
-            logger.info(f"PnL: ${pnl:.2f}")
-            logger.info(f"PnL%: {pnl_percentage:.2f}%")
+            log.info("=" * 80)
+            log.info("LIVE TRADING SESSION ENDED")
+            log.info("=" * 80)
+            log.info("Initial Equity: ${:.2f}", initial_equity)
+            log.info("Final Equity: ${:.2f}", final_equity)
+            log.info("PnL: ${:.2f}", pnl)
+            log.info("PnL%: {:.2f}%", pnl_percentage)
             
-            if 'strat' in locals() and hasattr(strat, 'completed_trades'):
-                logger.info(f"Completed Trades: {len(strat.completed_trades)}")
+            if hasattr(strat, 'completed_trades'):
+                log.info("Completed Trades: {}", len(strat.completed_trades))
         
         # Export trades
-        if 'strat' in locals() and hasattr(strat, 'export_trades_to_csv'):
+        if hasattr(strat, 'export_trades_to_csv'):
             csv_file = strat.export_trades_to_csv()
             if csv_file:
-                logger.info(f"Trades exported to: {csv_file}")
+                log.info("Trades exported to: {}", csv_file)
         
         # Stop all live feeds
         for feed in live_feeds:
@@ -693,7 +611,7 @@ def live_trading():
         # Shutdown MT5 connection
         try:
             mt5.shutdown()
-            logger.info("MT5 connection closed")
+            log.info("MT5 connection closed")
         except:
             pass
 
@@ -723,19 +641,50 @@ if __name__ == '__main__':
     parser.add_argument('-mc', '--max-candles', type=int, help='Max Candles (backtesting only)', default=None)
     parser.add_argument('--spread-pips', type=float, default=0.0,
                         help='Spread in pips for backtesting (default: 0.0 for no spread)')
+    parser.add_argument('--monte-carlo', type=int, default=0, metavar='N_SIMS',
+                        help='Run N_SIMS Monte Carlo simulations over the completed trades (default: 0, disabled)')
+    parser.add_argument('--mc-method', choices=['shuffle', 'bootstrap'], default='shuffle',
+                        help='Monte Carlo resampling: shuffle the trade order or bootstrap with replacement')
+    parser.add_argument('--mc-seed', type=int, default=None, help='Seed for the Monte Carlo RNG')
+    parser.add_argument('--profile', action='store_true',
+                        help='Time the backtest phases and print bars/sec and per-bar latency percentiles')
+    parser.add_argument('--low-memory', action='store_true',
+                        help='Bounded-memory backtest for very long runs (exactbars, streamed CSVs and chart overlays; no --chart)')
     
     
     
     args = parser.parse_args()
-    
+    if args.low_memory and args.chart:
+        parser.error('--chart needs the full data feeds and cannot be combined with --low-memory')
+    configure_logging_from_config(Config)
         
     if args.metatrader:
         live_trading()
     else:
-        results = backtesting(args.symbols, args.timeframe, args.start_date, args.end_date, max_candles=args.max_candles, spread_pips=args.spread_pips)
+        results = backtesting(args.symbols, args.timeframe, args.start_date, args.end_date, max_candles=args.max_candles, spread_pips=args.spread_pips, profile=args.profile, low_memory=args.low_memory)
         cerebro = results['cerebro']
         data = results['data']
         stats = results['stats']
+        if args.monte_carlo:
+            completed_trades = cerebro.strategy.trades.completed_array()
+            if len(completed_trades):
+                mc = monte_carlo(completed_trades['pnl'], stats['initial_cash'], n_sims=args.monte_carlo,
+                                 method=args.mc_method, seed=args.mc_seed)
+                print()
+                print('=' * 80)
+                print(f'MONTE CARLO ({mc["n_sims"]} {mc["method"]} simulations of {mc["n_trades"]} trades)')
+                print('=' * 80)
+                for key, fmt in (('final_equity', '{:.2f}'), ('max_drawdown', '{:.2%}'), ('longest_losing_streak', '{:.0f}')):
+                    percentiles = mc[key]['percentiles']
+                    print(f'{key}: ' + ', '.join(f'{name}={fmt.format(value)}' for name, value in percentiles.items()))
+                print(f'Risk of Ruin ({mc["ruin_fraction"]:.0%} loss): {mc["risk_of_ruin"]:.2%}')
+        if args.profile:
+            print()
+            print('=' * 80)
+            print('TIMINGS')
+            print('=' * 80)
+            for line in format_summary(results['timings']):
+                print(line)
         if args.chart:
             for symbol_index, (symbol, pair_data) in enumerate(data.items()):
                 render_tv_chart(cerebro, pair_data, symbol, symbol_index=symbol_index, height=700)
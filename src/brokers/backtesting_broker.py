@@ -1,5 +1,34 @@
 import backtrader as bt
-from src.utils.strategy_utils.general_utils import convert_pips_to_price, convert_micropips_to_price
+from src.brokers.order_book import OrderBook
+from src.utils.strategy_utils.general_utils import convert_pips_to_price
+from src.utils.symbol_specs import get_spec
+
+
+def spread_to_price(spread_pips: float, symbol: str = None) -> float:
+    """
+    Calculate spread price based on symbol type.
+    
+    Note: spread_pips is in PIPS (not micropips).
+    
+    Spread calculation (pip sizes from symbol_specs):
+    - Metals (XAGUSD/XAUUSD): 1 pip = 0.001 USD
+    - JPY pairs (USDJPY, EURJPY, etc.): 1 pip = 0.01 JPY
+    - Other forex (EURUSD, GBPUSD, etc.): 1 pip = 0.0001
+    
+    Examples:
+    - XAGUSD with spread_pips=20: 20 * 0.001 = 0.02 USD spread
+    - EURUSD with spread_pips=2: 2 * 0.0001 = 0.0002 USD spread
+    - USDJPY with spread_pips=2: 2 * 0.01 = 0.02 JPY spread
+    """
+    if spread_pips <= 0:
+        return 0.0
+    
+    # If no symbol provided, default to forex (most common case)
+    if symbol is None:
+        return convert_pips_to_price(spread_pips)  # Default to forex (1 pip = 0.0001)
+    
+    return spread_pips * get_spec(symbol).pip_size
+
 
 class BacktestingBroker(bt.brokers.BackBroker):
     def __init__(self, spread_pips: float = 0.0, *args, **kwargs):
@@ -13,53 +42,99 @@ class BacktestingBroker(bt.brokers.BackBroker):
         """
         super().__init__(*args, **kwargs)
         self.spread_pips = spread_pips
-    
-    def _get_spread_price(self, symbol: str = None):
+
+    def init(self):
+        # Called by BackBroker on construction and on start(), together with the pending queue reset
+        super().init()
+        self.order_book = OrderBook()
+
+    def submit_accept(self, order):
+        super().submit_accept(order)
+        self.order_book.add(order)
+
+    def cancel(self, order, bracket=False):
+        canceled = super().cancel(order, bracket=bracket)
+        if canceled:
+            self.order_book.remove(order)
+        return canceled
+
+    def _remove_pending(self, order):
+        """Take an order out of the pending queue and the order book."""
+        self.order_book.remove(order)
+        try:
+            self.pending.remove(order)
+        except ValueError:
+            pass
+
+    def next(self):
         """
-        Calculate spread price based on symbol type.
-        
-        Note: spread_pips is in PIPS (not micropips).
-        
-        Spread calculation:
-        - Metals (XAGUSD/XAUUSD): 1 pip = 0.001 USD
-          Note: For metals, 1 pip = 1 micropip = 0.001, so convert_micropips_to_price works
-        - JPY pairs (USDJPY, EURJPY, etc.): 1 pip = 0.01 JPY
-          Note: convert_micropips_to_price returns 0.001 (micropips), but we need 0.01 (pips)
-        - Other forex (EURUSD, GBPUSD, etc.): 1 pip = 0.0001
-          Note: convert_micropips_to_price returns 0.00001 (micropips), but we need 0.0001 (pips)
-        
-        Examples:
-        - XAGUSD with spread_pips=20: 20 * 0.001 = 0.02 USD spread
-        - EURUSD with spread_pips=2: 2 * 0.0001 = 0.0002 USD spread
-        - USDJPY with spread_pips=2: 2 * 0.01 = 0.02 JPY spread
+        Same bar processing as BackBroker.next, but pending orders are looked up
+        in the price-indexed order book: only LIMIT/STOP orders whose trigger
+        price the bar reached (plus orders that must be checked every bar) are
+        evaluated, in the same order as the pending queue. Fill rules and prices
+        are unchanged (_try_exec_limit / _execute below).
         """
-        if self.spread_pips <= 0:
-            return 0.0
-        
-        # If no symbol provided, default to forex (most common case)
-        if symbol is None:
-            return convert_pips_to_price(self.spread_pips)  # Default to forex (1 pip = 0.0001)
-        
-        symbol_upper = symbol.upper()
-        
-        # Metals: XAGUSD, XAUUSD, etc.
-        if symbol_upper.startswith("XAU") or symbol_upper.startswith("XAG"):
-            # For metals, 1 pip = 0.001 USD
-            # convert_micropips_to_price returns 0.001 per micropip, but for metals
-            # 1 pip = 1 micropip = 0.001, so it works correctly
-            return convert_micropips_to_price(self.spread_pips, symbol)
-        # JPY pairs: USDJPY, EURJPY, GBPJPY, etc.
-        elif symbol_upper.endswith("JPY"):
-            # For JPY pairs, 1 pip = 0.01 JPY
-            # convert_micropips_to_price returns 0.001 per micropip, but we need 0.01 per pip
-            # So we need to multiply by 10: spread_pips * 0.01
-            return self.spread_pips * 0.01
-        else:
-            # Standard forex pairs: EURUSD, GBPUSD, AUDUSD, etc.
-            # 1 pip = 0.0001
-            # convert_micropips_to_price returns 0.00001 per micropip, but we need 0.0001 per pip
-            # So we use convert_pips_to_price which correctly returns 0.0001 per pip
-            return convert_pips_to_price(self.spread_pips)
+        while self._toactivate:
+            self._toactivate.popleft().activate()
+
+        if self.p.checksubmit:
+            self.check_submitted()
+
+        # Discount any cash for positions hold
+        credit = 0.0
+        for data, pos in self.positions.items():
+            if pos:
+                comminfo = self.getcommissioninfo(data)
+                dt0 = data.datetime.datetime()
+                dcredit = comminfo.get_credit_interest(data, pos, dt0)
+                self.d_credit[data] += dcredit
+                credit += dcredit
+                pos.datetime = dt0  # mark last credit operation
+
+        self.cash -= credit
+
+        self._process_order_history()
+
+        for order in self.order_book.triggerable():
+            if not order.alive():
+                # Removed from the pending queue elsewhere (e.g. OCO cancel)
+                self.order_book.remove(order)
+
+            elif order.expire():
+                self._remove_pending(order)
+                self.notify(order)
+                self._ococheck(order)
+                self._bracketize(order, cancel=True)
+
+            elif order.active():
+                # Out of the pending queue while executing (as in BackBroker.next):
+                # _ococheck cancels every pending member of the order's OCO group
+                self.pending.remove(order)
+                self._try_exec(order)
+                if order.alive():
+                    self.pending.append(order)
+                else:
+                    self.order_book.remove(order)
+                    if order.status == bt.Order.Completed:
+                        # a bracket parent order may have been executed
+                        self._bracketize(order)
+
+        # Operations have been executed ... adjust cash end of bar
+        for data, pos in self.positions.items():
+            # futures change cash every bar
+            if pos:
+                comminfo = self.getcommissioninfo(data)
+                self.cash += comminfo.cashadjust(pos.size,
+                                                 pos.adjbase,
+                                                 data.close[0])
+                # record the last adjustment price
+                pos.adjbase = data.close[0]
+
+        self._get_value()  # update value
+    
+    def _get_spread_price(self, symbol: str = None):
+        """Spread in price units for ``symbol`` (see spread_to_price)."""
+        return spread_to_price(self.spread_pips, symbol)
     
     def _submit(self, order):
         """Override submit to allow very large position sizes and check immediate execution for LIMIT orders"""
@@ -0,0 +1,106 @@
+"""
+Cached MetaTrader 5 account state for the live broker.
+
+mt5.account_info() is a round trip to the terminal, serialised with every
+other MT5 call (the bar poller's included). Backtrader reads the broker's
+cash and value several times per loop, so MT5Broker keeps the last
+account_info() snapshot in an MT5AccountCache: it is refreshed at most once
+every ``ttl`` seconds (MT5Broker.next() asks once per cerebro loop) and
+invalidated after an order is sent, so the following loop sees the new
+balance. Reads between refreshes are plain attribute lookups.
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+import MetaTrader5 as mt5
+
+from src.utils.logging import get_logger
+
+log = get_logger('broker.mt5.account')
+
+DEFAULT_BALANCE = 10000.0  # Used until the terminal has reported the account once
+
+
+@dataclass(frozen=True)
+class AccountState:
+    """One account_info() snapshot."""
+    balance: float
+    equity: float
+    margin: float = 0.0
+    margin_free: float = 0.0
+    leverage: int = 0
+    currency: str = ''
+    fetched: bool = False  # False: defaults, the terminal has not answered yet
+
+
+class MT5AccountCache:
+    """The last account_info() snapshot, refreshed at most once per ``ttl`` seconds."""
+
+    def __init__(self, ttl: float = 1.0, default_balance: float = DEFAULT_BALANCE,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            ttl: Seconds a snapshot is served before account_info() is called again
+            default_balance: Balance and equity reported before the first successful call
+            clock: Monotonic time in seconds
+        """
+        self.ttl = ttl
+        self.clock = clock
+        self.fetches = 0  # account_info() calls
+        self.errors = 0
+        self._lock = threading.Lock()
+        self._state = AccountState(balance=float(default_balance), equity=float(default_balance))
+        self._expires: Optional[float] = None  # None: refresh on the next get()
+
+    @property
+    def state(self) -> AccountState:
+        """The current snapshot, without refreshing it."""
+        return self._state
+
+    def get(self) -> AccountState:
+        """The snapshot, refreshed first when it is older than ``ttl``."""
+        expires = self._expires
+        if expires is not None and self.clock() < expires:
+            return self._state
+        return self.refresh(force=True)
+
+    def refresh(self, force: bool = False) -> AccountState:
+        """
+        Call account_info() (unless the snapshot is fresh and not ``force``).
+
+        A failed call keeps the previous snapshot and is retried after ``ttl``.
+        """
+        with self._lock:
+            now = self.clock()
+            if not force and self._expires is not None and now < self._expires:
+                return self._state
+            self._expires = now + self.ttl
+            self.fetches += 1
+            try:
+                info = mt5.account_info()
+            except Exception as e:
+                info = None
+                log.error("account_info() failed: {}", e)
+            if info is None:
+                self.errors += 1
+                if self.errors == 1 or self.errors % 100 == 0:
+                    log.warning("No account info from MT5 ({} times), keeping balance ${:.2f}: {}",
+                                self.errors, self._state.balance, mt5.last_error())
+                return self._state
+            self._state = AccountState(
+                balance=float(info.balance),
+                equity=float(info.equity),
+                margin=float(info.margin),
+                margin_free=float(info.margin_free),
+                leverage=int(info.leverage),
+                currency=str(info.currency),
+                fetched=True,
+            )
+            return self._state
+
+    def invalidate(self):
+        """Make the next get() call account_info() (after an order changed the account)."""
+        self._expires = None
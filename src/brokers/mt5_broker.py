@@ -5,10 +5,18 @@ Handles order execution through MT5.
 
 import backtrader as bt
 import MetaTrader5 as mt5
-from loguru import logger
+from functools import partial
 from typing import Optional, List
 import time
 
+from src.brokers.mt5_account import AccountState, MT5AccountCache
+from src.brokers.mt5_gateway import MT5OrderGateway
+from src.brokers.mt5_reconciler import MT5Reconciler, TerminalEvent
+from src.utils.logging import get_logger
+from src.utils.symbol_specs import SymbolSpec, registry as symbol_specs
+
+log = get_logger('broker.mt5')
+
 
 class MT5Broker(bt.brokers.BackBroker):
     """
@@ -17,77 +25,19 @@ class MT5Broker(bt.brokers.BackBroker):
     Supports multiple symbols by detecting symbol from order's data feed.
     """
     
-    def __getattribute__(self, name):
-        """Override to ensure cash is always a valid float when accessed."""
-        # Intercept access to 'cash' or '_cash' attributes (parent may access either)
-        if name == 'cash' or name == '_cash':
-            # Get the actual value from parent, but ensure it's not None and is a float
-            try:
-                # Use object.__getattribute__ to avoid recursion
-                parent_dict = object.__getattribute__(self, '__dict__')
-                # Check both 'cash' and '_cash' attributes
-                parent_cash = parent_dict.get('cash') or parent_dict.get('_cash')
-                
-                # CRITICAL: Only return if it's actually a number, not an order object!
-                if parent_cash is not None:
-                    # Check if it's a number type (int, float) before converting
-                    if isinstance(parent_cash, (int, float)):
-                        cash_float = float(parent_cash)
-                        # Check for NaN
-                        if cash_float == cash_float:  # NaN != NaN, so this checks for NaN
-                            return cash_float
-            except:
-                pass
-            
-            # If cash is None, not set, or wrong type, get from MT5 or use default
-            try:
-                account_info = mt5.account_info()
-                if account_info:
-                    cash_value = float(account_info.balance)
-                else:
-                    cash_value = 10000.0
-            except:
-                cash_value = 10000.0
-            
-            # Ensure cash_value is valid
-            if cash_value is None:
-                cash_value = 10000.0
-            
-            # Ensure it's a float
-            try:
-                cash_value = float(cash_value)
-            except (TypeError, ValueError):
-                cash_value = 10000.0
-            
-            # Set it in the parent's state - use object.__setattr__ to bypass any descriptors
-            try:
-                # Use object.__setattr__ to directly set the attributes
-                object.__setattr__(self, '_cash', cash_value)
-                object.__setattr__(self, 'cash', cash_value)
-                # Also call parent's set_cash method
-                parent_class = object.__getattribute__(self, '__class__').__bases__[0]
-                parent_set_cash = getattr(parent_class, 'set_cash')
-                parent_set_cash(self, cash_value)
-            except:
-                try:
-                    # Try to set directly using object.__setattr__
-                    object.__setattr__(self, '_cash', cash_value)
-                    object.__setattr__(self, 'cash', cash_value)
-                except:
-                    pass
-            
-            return float(cash_value)
-        
-        # For all other attributes, use normal lookup
-        return object.__getattribute__(self, name)
-    
-    def __init__(self, symbols: Optional[list] = None, **kwargs):
+    def __init__(self, symbols: Optional[list] = None, account_ttl: float = 1.0, async_orders: bool = True,
+                 order_workers: int = 1, max_pending_orders: int = 256, reconcile_interval: float = 1.0, **kwargs):
         """
         Initialize MT5 broker.
         
         Args:
             symbols: List of trading symbols (e.g., ['AUDCHF', 'EURUSD']). 
                     If None, will detect from orders.
+            account_ttl: Seconds the cached MT5 account state is used before account_info() is called again
+            async_orders: Send order requests from the order gateway's worker threads instead of from next()
+            order_workers: Order gateway worker threads
+            max_pending_orders: Order requests queued or in flight before submitting waits (backpressure)
+            reconcile_interval: Minimum seconds between two reconciliations of the orders with MT5
         """
         super().__init__(**kwargs)
         self.symbols = symbols or []
@@ -95,37 +45,33 @@ class MT5Broker(bt.brokers.BackBroker):
         self.bracket_tp_sl = {}  # Track TP/SL for bracket orders: order.ref -> {'tp': price, 'sl': price}
         self.modified_orders = set()  # Track which orders have been modified to avoid duplicate modifications
         self.order_symbols = {}  # Track symbol for each order ref
-        
-        # Initialize cash from MT5
-        try:
-            account_info = mt5.account_info()
-            if account_info:
-                cash_value = float(account_info.balance)
-            else:
-                cash_value = 10000.0  # Default fallback
-        except:
-            cash_value = 10000.0
-        
-        # Ensure cash_value is valid
-        if cash_value is None:
-            cash_value = 10000.0
-        
-        # Set cash using parent's method
+        self.live_orders = {}  # order.ref -> main order sent to MT5, until its trade is done
+        self.bracket_children = {}  # parent order.ref -> {'tp': order, 'sl': order} (not sent, MT5 attaches TP/SL)
+        self.sending = set()  # order.refs whose placement is queued or in flight on the gateway
+        self.cancel_requested = set()  # order.refs cancelled while sending, cancelled in MT5 once placed
+        self.specs = symbol_specs  # Symbol specs (tick size, volume limits), loaded from MT5 in start()
+        self._spec_lookups = set()  # Symbols already looked up in MT5
+        
+        # Cash follows the MT5 balance (refreshed at most once per cycle, see next())
+        self.account = MT5AccountCache(ttl=account_ttl)
+        
+        # Terminal requests (place, modify, cancel) run in order per symbol on the gateway's
+        # workers; their results are applied to the orders in next() (see _on_order_sent)
+        self.gateway = MT5OrderGateway(workers=order_workers, max_pending=max_pending_orders,
+                                       synchronous=not async_orders)
+        
+        # Fills, cancels and SL/TP exits of the sent orders come from one orders_get() and one
+        # positions_get() per cycle (see _reconcile)
+        self.reconciler = MT5Reconciler(interval=reconcile_interval)
+        cash_value = self.account.refresh(force=True).balance
         super().set_cash(cash_value)
         
-        # Also set directly as attributes using object.__setattr__ to bypass any descriptors
-        try:
-            object.__setattr__(self, 'cash', cash_value)
-            object.__setattr__(self, '_cash', cash_value)
-        except:
-            pass
-        
-        logger.info(f"MT5Broker initialized for symbols: {self.symbols if self.symbols else 'auto-detect'}, cash: ${cash_value:.2f}")
+        log.info("MT5Broker initialized for symbols: {}, cash: ${:.2f}", self.symbols if self.symbols else 'auto-detect', cash_value)
     
     def store_bracket_tp_sl(self, order_ref, tp_price, sl_price):
         """Store TP/SL for a bracket order so it can be retrieved when order is submitted."""
         self.bracket_tp_sl[order_ref] = {'tp': tp_price, 'sl': sl_price}
-        logger.info(f"Stored bracket TP/SL for order {order_ref}: TP={tp_price}, SL={sl_price}")
+        log.info("Stored bracket TP/SL for order {}: TP={}, SL={}", order_ref, tp_price, sl_price)
         
         # Try to modify parent order if it was already submitted
         self._try_modify_parent_order(order_ref)
@@ -134,7 +80,7 @@ class MT5Broker(bt.brokers.BackBroker):
         """Try to modify parent order with TP/SL if available and order is submitted."""
         # Only modify once per order
         if parent_ref in self.modified_orders:
-            logger.debug(f"Order {parent_ref} already modified, skipping")
+            log.debug("Order {} already modified, skipping", parent_ref)
             return
         
         # Check if we have TP/SL stored
@@ -148,7 +94,7 @@ class MT5Broker(bt.brokers.BackBroker):
         # Only modify if we have BOTH TP and SL and the order is submitted
         # This ensures we modify once with complete information
         if tp_price is None or sl_price is None or parent_ref not in self.pending_orders:
-            logger.debug(f"Waiting for both TP and SL for order {parent_ref}. Current: TP={tp_price}, SL={sl_price}")
+            log.debug("Waiting for both TP and SL for order {}. Current: TP={}, SL={}", parent_ref, tp_price, sl_price)
             return
         
         mt5_order_ticket = self.pending_orders[parent_ref]
@@ -161,19 +107,21 @@ class MT5Broker(bt.brokers.BackBroker):
                 symbol = orders[0].symbol
                 self.order_symbols[parent_ref] = symbol
             else:
-                logger.warning(f"Could not get symbol for order {parent_ref}")
+                log.warning("Could not get symbol for order {}", parent_ref)
                 return
         
-        logger.info(f"Modifying parent order {parent_ref} (MT5 ticket={mt5_order_ticket}) with TP={tp_price}, SL={sl_price}")
-        print(f"*** MODIFYING PARENT ORDER {mt5_order_ticket} WITH TP={tp_price}, SL={sl_price} ***")
-        success = self._modify_order_tp_sl(mt5_order_ticket, symbol, tp_price, sl_price)
+        log.info("Modifying parent order {} (MT5 ticket={}) with TP={}, SL={}", parent_ref, mt5_order_ticket, tp_price, sl_price)
+        # Marked when queued: the modification runs after the order's placement (same symbol queue)
+        self.modified_orders.add(parent_ref)
         
-        # Mark as modified if successful
-        if success:
-            self.modified_orders.add(parent_ref)
-            logger.info(f"Order {parent_ref} successfully modified with both TP and SL")
-        else:
-            logger.warning(f"Failed to modify order {parent_ref}, will not retry")
+        def on_modified(success, error):
+            if success:
+                log.info("Order {} successfully modified with both TP and SL", parent_ref)
+            else:
+                log.warning("Failed to modify order {}, will not retry", parent_ref)
+        
+        if not self.gateway.submit('modify', symbol, partial(self._modify_order_tp_sl, mt5_order_ticket, symbol, tp_price, sl_price), on_modified):
+            log.warning("Failed to queue modification of order {}, will not retry", parent_ref)
     
     def _modify_order_tp_sl(self, order_ticket, symbol, tp_price, sl_price):
         """Modify an existing MT5 order or position to add or update TP/SL.
@@ -181,15 +129,10 @@ class MT5Broker(bt.brokers.BackBroker):
         Returns:
             bool: True if modification was successful, False otherwise
         """
-        # Get symbol info to check stops level and other constraints
-        symbol_info = mt5.symbol_info(symbol)
-        if symbol_info is None:
-            logger.error(f"Could not get symbol info for {symbol}")
-            return False
-        
         # Get stops level (minimum distance from price to TP/SL)
-        stops_level = getattr(symbol_info, 'stops_level', 0)
-        point = getattr(symbol_info, 'point', 0.00001)
+        spec = self._spec(symbol)
+        stops_level = spec.stops_level
+        point = spec.point or 0.00001
         min_distance = stops_level * point if stops_level > 0 else 0
         
         # First check if it's a pending order or a position
@@ -203,8 +146,7 @@ class MT5Broker(bt.brokers.BackBroker):
             # For pending orders, use price_open or price
             order_price = getattr(mt5_order, 'price_open', None) or getattr(mt5_order, 'price', None)
             if order_price is None:
-                logger.error(f"Could not get order price for order {order_ticket}")
-                print(f"*** ERROR: Could not get order price for order {order_ticket} ***")
+                log.error("Could not get order price for order {}", order_ticket)
                 return False
             
             normalized_sl = None
@@ -231,7 +173,7 @@ class MT5Broker(bt.brokers.BackBroker):
                         normalized_sl = self._normalize_price(order_price - min_distance, symbol)
                     else:
                         normalized_sl = self._normalize_price(order_price + min_distance, symbol)
-                    logger.warning(f"SL adjusted to meet stops level requirement: {sl_price} -> {normalized_sl} (min distance: {min_distance})")
+                    log.warning("SL adjusted to meet stops level requirement: {} -> {} (min distance: {})", sl_price, normalized_sl, min_distance)
                 request["sl"] = normalized_sl
             
             if tp_price is not None:
@@ -244,13 +186,13 @@ class MT5Broker(bt.brokers.BackBroker):
                         normalized_tp = self._normalize_price(order_price + min_distance, symbol)
                     else:
                         normalized_tp = self._normalize_price(order_price - min_distance, symbol)
-                    logger.warning(f"TP adjusted to meet stops level requirement: {tp_price} -> {normalized_tp} (min distance: {min_distance})")
+                    log.warning("TP adjusted to meet stops level requirement: {} -> {} (min distance: {})", tp_price, normalized_tp, min_distance)
                 request["tp"] = normalized_tp
             
-            logger.info(f"Modifying MT5 pending order {order_ticket} (price={order_price}, stops_level={stops_level}, min_distance={min_distance}) to add TP={tp_price} (normalized={normalized_tp}), SL={sl_price} (normalized={normalized_sl})")
-            print(f"*** MT5 MODIFY ORDER REQUEST: {request} ***")
-            print(f"*** Order price: {order_price}, Stops level: {stops_level} points ({min_distance} price units) ***")
-            print(f"*** TP: {tp_price}->{normalized_tp}, SL: {sl_price}->{normalized_sl} ***")
+            log.info("Modifying MT5 pending order {} (price={}, stops_level={}, min_distance={}) to add TP={} (normalized={}), SL={} (normalized={})", order_ticket, order_price, stops_level, min_distance, tp_price, normalized_tp, sl_price, normalized_sl)
+            log.debug("MT5 MODIFY ORDER REQUEST: {}", request)
+            log.debug("Order price: {}, Stops level: {} points ({} price units)", order_price, stops_level, min_distance)
+            log.debug("TP: {}->{}, SL: {}->{}", tp_price, normalized_tp, sl_price, normalized_sl)
         elif positions and len(positions) > 0:
             # It's a position - use TRADE_ACTION_SLTP
             position = positions[0]
@@ -289,66 +231,45 @@ class MT5Broker(bt.brokers.BackBroker):
                             normalized_tp = self._normalize_price(position_price - min_distance, symbol)
                 request["tp"] = normalized_tp
             
-            logger.info(f"Modifying MT5 position {order_ticket} (price={position_price}, stops_level={stops_level}) to add TP={tp_price} (normalized={normalized_tp}), SL={sl_price} (normalized={normalized_sl})")
-            print(f"*** MT5 MODIFY POSITION REQUEST: {request} ***")
+            log.info("Modifying MT5 position {} (price={}, stops_level={}) to add TP={} (normalized={}), SL={} (normalized={})", order_ticket, position_price, stops_level, tp_price, normalized_tp, sl_price, normalized_sl)
+            log.debug("MT5 MODIFY POSITION REQUEST: {}", request)
         else:
-            logger.warning(f"Order/position {order_ticket} not found in MT5")
-            print(f"*** ORDER/POSITION {order_ticket} NOT FOUND IN MT5 ***")
+            log.warning("Order/position {} not found in MT5", order_ticket)
             return False
         
         result = mt5.order_send(request)
         
         if result:
             if result.retcode == mt5.TRADE_RETCODE_DONE:
-                logger.info(f"✓ Successfully modified order/position {order_ticket} with TP/SL")
-                print(f"*** SUCCESSFULLY MODIFIED ORDER/POSITION {order_ticket} WITH TP/SL ***")
+                log.info("✓ Successfully modified order/position {} with TP/SL", order_ticket)
                 return True
             else:
-                logger.error(f"✗ Failed to modify order/position {order_ticket}: retcode={result.retcode}, comment={result.comment}")
-                print(f"*** FAILED TO MODIFY ORDER/POSITION: retcode={result.retcode}, comment={result.comment} ***")
+                log.error("✗ Failed to modify order/position {}: retcode={}, comment={}", order_ticket, result.retcode, result.comment)
                 return False
         else:
             error = mt5.last_error()
-            logger.error(f"Failed to modify order/position {order_ticket}: {error}")
-            print(f"*** FAILED TO MODIFY ORDER/POSITION: {error} ***")
+            log.error("Failed to modify order/position {}: {}", order_ticket, error)
             return False
     
     def start(self):
         """Called when broker starts - initialize cash from MT5."""
-        try:
-            account_info = mt5.account_info()
-            if account_info:
-                cash_value = float(account_info.balance)
-            else:
-                try:
-                    parent_cash = super().getcash()
-                    cash_value = float(parent_cash) if parent_cash is not None else 10000.0
-                except:
-                    cash_value = 10000.0
-        except:
-            cash_value = 10000.0
-        
-        # Ensure cash_value is valid
-        if cash_value is None:
-            cash_value = 10000.0
-        
-        super().set_cash(cash_value)
-        
-        # Also set directly as attributes using object.__setattr__ to bypass any descriptors
-        try:
-            object.__setattr__(self, 'cash', cash_value)
-            object.__setattr__(self, '_cash', cash_value)
-        except:
-            pass
+        cash_value = self.account.refresh(force=True).balance
+        self.set_cash(cash_value)
+        log.info("MT5Broker started with cash: ${:.2f}", cash_value)
+        self.gateway.start()
         
-        logger.info(f"MT5Broker started with cash: ${cash_value:.2f}")
+        # Symbol specs: saved table first, then the broker's current values
+        self.specs.load()
+        self._spec_lookups.update(self.symbols)
+        loaded = self.specs.load_mt5(self.symbols)
+        log.info("Loaded symbol specs from MT5 for {}/{} symbols", loaded, len(self.symbols))
         
         # ===== TEST TRADE - Set ENABLE_TEST_TRADE = True to enable =====
         ENABLE_TEST_TRADE = False  # Set to True to place a test trade on startup
         if ENABLE_TEST_TRADE:
             try:
                 test_symbol = self.symbols[0] if self.symbols else 'AUDCHF'
-                logger.info(f"Placing test trade for {test_symbol}...")
+                log.info("Placing test trade for {}...", test_symbol)
                 symbol_info = mt5.symbol_info(test_symbol)
                 if symbol_info:
                     # Determine the correct filling mode based on symbol's supported modes
@@ -383,11 +304,11 @@ class MT5Broker(bt.brokers.BackBroker):
                         "type_time": mt5.ORDER_TIME_GTC,
                         "type_filling": filling_mode,
                     }
-                    logger.info(f"Using filling mode: {filling_mode} (symbol supports: {symbol_info.filling_mode})")
+                    log.info("Using filling mode: {} (symbol supports: {})", filling_mode, symbol_info.filling_mode)
                     result = mt5.order_send(request)
                     if result:
                         if result.retcode == mt5.TRADE_RETCODE_DONE:
-                            logger.info(f"✓ TEST TRADE SUCCESS: BUY 0.01 {test_symbol} at {symbol_info.ask}, Order: {result.order}")
+                            log.info("✓ TEST TRADE SUCCESS: BUY 0.01 {} at {}, Order: {}", test_symbol, symbol_info.ask, result.order)
                         else:
                             error_msg = f"✗ TEST TRADE FAILED: retcode={result.retcode}, comment={result.comment}"
                             if result.retcode == 10027:
@@ -395,198 +316,56 @@ class MT5Broker(bt.brokers.BackBroker):
                                 error_msg += "\n   Please enable AutoTrading: Click 'AutoTrading' button (or press Ctrl+E) in MT5"
                             elif result.retcode == 10030:
                                 error_msg += f"\n   ⚠️  Unsupported filling mode. Symbol supports: {symbol_info.filling_mode}"
-                            logger.error(error_msg)
+                            log.error(error_msg)
                     else:
                         error = mt5.last_error()
-                        logger.error(f"✗ TEST TRADE FAILED: {error}")
+                        log.error("✗ TEST TRADE FAILED: {}", error)
                 else:
-                    logger.error(f"✗ Could not get symbol info for {test_symbol}")
+                    log.error("✗ Could not get symbol info for {}", test_symbol)
             except Exception as e:
-                logger.error(f"✗ Error placing test trade: {e}")
+                log.error("✗ Error placing test trade: {}", e)
         # ===== END TEST TRADE BLOCK =====
         
         super().start()
     
     def set_cash(self, cash):
         """Override set_cash to ensure it's never None."""
-        if cash is None:
-            cash = 10000.0  # Default value
-        cash = float(cash)
-        # Ensure it's valid
-        if cash is None:
-            cash = 10000.0
-        
-        # Call parent's set_cash to update its internal state
-        super().set_cash(cash)
-        
-        # Also set directly as attributes using object.__setattr__ to bypass any descriptors
-        try:
-            object.__setattr__(self, 'cash', cash)
-            object.__setattr__(self, '_cash', cash)
-        except:
-            pass
+        super().set_cash(float(cash) if cash is not None else self.account.state.balance)
+    
+    @property
+    def account_state(self) -> AccountState:
+        """Cached MT5 account snapshot (refreshed at most once per ``account_ttl`` seconds)."""
+        return self.account.get()
+    
+    @property
+    def balance(self) -> float:
+        return self.account.get().balance
+    
+    @property
+    def equity(self) -> float:
+        return self.account.get().equity
     
     def get_cash(self):
-        """Get current account balance - always returns a valid float."""
-        # First try to get from MT5
-        try:
-            account_info = mt5.account_info()
-            if account_info:
-                cash_value = float(account_info.balance)
-                # Ensure it's valid
-                if cash_value is None:
-                    cash_value = 10000.0
-                # Update parent's cash state
-                super().set_cash(cash_value)
-                # Also set directly using object.__setattr__ to bypass any descriptors
-                try:
-                    object.__setattr__(self, 'cash', cash_value)
-                    object.__setattr__(self, '_cash', cash_value)
-                except:
-                    pass
-                return cash_value
-        except:
-            pass
-        
-        # Fallback: get from parent, but ensure it's not None
-        try:
-            # Try to get from parent's internal state directly
-            parent_cash = None
-            try:
-                parent_cash = super().getcash()
-            except:
-                pass
-            
-            # Also try to get from parent's dict
-            if parent_cash is None:
-                try:
-                    parent_dict = super().__getattribute__('__dict__')
-                    parent_cash = parent_dict.get('cash') or parent_dict.get('_cash')
-                except:
-                    pass
-            
-            if parent_cash is None:
-                # If parent returns None, set a default and return it
-                default_cash = 10000.0
-                super().set_cash(default_cash)
-                try:
-                    object.__setattr__(self, 'cash', default_cash)
-                    object.__setattr__(self, '_cash', default_cash)
-                except:
-                    pass
-                return default_cash
-            
-            cash_float = float(parent_cash)
-            if cash_float is None:
-                cash_float = 10000.0
-                super().set_cash(cash_float)
-            return cash_float
-        except:
-            # Last resort: return default
-            default_cash = 10000.0
-            try:
-                super().set_cash(default_cash)
-                object.__setattr__(self, 'cash', default_cash)
-                object.__setattr__(self, '_cash', default_cash)
-            except:
-                pass
-            return default_cash
+        """Get current account balance (cached)."""
+        return self.account.get().balance
     
-    def getcash(self):
-        """Alias for get_cash() - Backtrader calls this method."""
-        return self.get_cash()
+    getcash = get_cash
     
     def next(self):
-        """Called each bar - update cash from MT5 to keep it in sync."""
-        # Update cash from MT5 before calling parent's next()
-        try:
-            account_info = mt5.account_info()
-            if account_info:
-                cash_value = float(account_info.balance)
-            else:
-                cash_value = 10000.0
-        except:
-            cash_value = 10000.0
-        
-        # Ensure cash_value is valid
-        if cash_value is None:
-            cash_value = 10000.0
-        
-        # Update parent's cash state
-        super().set_cash(cash_value)
-        
-        # Also set directly as attributes using object.__setattr__ to bypass any descriptors
-        try:
-            object.__setattr__(self, 'cash', cash_value)
-            object.__setattr__(self, '_cash', cash_value)
-        except:
-            pass
-        
+        """Called each cycle - apply finished order requests and MT5 order changes, sync cash with the cached MT5 balance."""
+        self.gateway.process_completions()
+        self._reconcile()
+        self.set_cash(self.account.get().balance)
         super().next()
     
-    
-    def check_submitted(self):
-        """
-        Override check_submitted to ensure cash is always valid.
-        Reimplements the parent's logic but with proper cash handling.
-        """
-        logger.debug("check_submitted() called")
-        # Get cash - ensure it's never None and is always a float
-        try:
-            # Use get_cash() which we know returns a float
-            cash = self.get_cash()
-            # Ensure it's a valid float
-            cash = float(cash)
-            if cash != cash:  # Check for NaN
-                cash = 10000.0
-        except (TypeError, ValueError, AttributeError) as e:
-            # If get_cash() fails or returns something weird, get from MT5
-            try:
-                account_info = mt5.account_info()
-                if account_info:
-                    cash = float(account_info.balance)
-                else:
-                    cash = 10000.0
-            except:
-                cash = 10000.0
-        
-        # Ensure cash is set in parent's internal state BEFORE calling parent's check_submitted
-        # This is critical - the parent accesses self.cash directly, so we need to set it properly
-        try:
-            # Set using object.__setattr__ to bypass our __getattribute__ override
-            object.__setattr__(self, '_cash', cash)
-            object.__setattr__(self, 'cash', cash)
-            # Also call parent's set_cash to update its internal state
-            super().set_cash(cash)
-        except Exception as e:
-            logger.warning(f"Error setting cash in check_submitted: {e}")
-            # Try direct assignment as fallback
-            try:
-                object.__setattr__(self, '_cash', cash)
-                object.__setattr__(self, 'cash', cash)
-            except:
-                pass
-        
-        # Now call parent's check_submitted - it should see cash as a float
-        try:
-            return super().check_submitted()
-        except TypeError as e:
-            error_str = str(e)
-            if "'>=' not supported" in error_str or "'BuyOrder'" in error_str or "'SellOrder'" in error_str:
-                # Parent is getting wrong type for cash - this shouldn't happen but handle it
-                logger.warning(f"Parent's check_submitted got wrong cash type: {e}. Cash should be {cash} (type: {type(cash)})")
-                # Force set cash again and retry once
-                try:
-                    object.__setattr__(self, '_cash', float(cash))
-                    object.__setattr__(self, 'cash', float(cash))
-                    super().set_cash(float(cash))
-                    return super().check_submitted()
-                except:
-                    # If still fails, skip the check - we handle validation in _submit()
-                    logger.debug(f"Skipping parent's check_submitted due to cash type issue")
-                    return
-            else:
-                raise
+    def stop(self):
+        """Let queued order requests reach MT5 and apply their results before the run ends."""
+        self.gateway.stop()
+        self.gateway.process_completions()
+        self._reconcile(force=True)
+        log.info("Order requests (mean/max): {}", self.gateway.format_stats())
+        log.info("Reconciled with MT5 in {} cycles ({} terminal calls)", self.reconciler.cycles, self.reconciler.calls)
+        super().stop()
     
     def _get_symbol_from_order(self, order):
         """Extract symbol from order's data feed."""
@@ -606,21 +385,20 @@ class MT5Broker(bt.brokers.BackBroker):
         if self.symbols:
             return self.symbols[0]
         
-        logger.warning("Could not determine symbol from order, using default")
+        log.warning("Could not determine symbol from order, using default")
         return None
     
     def submit(self, order, check=True):
         """Override submit to ensure _submit is called."""
-        print(f"*** MT5Broker.submit() CALLED: order.ref={order.ref}, type={order.exectype}, check={check} ***")
-        logger.info(f"submit() called (public method): order.ref={order.ref}, check={check}")
+        log.debug("MT5Broker.submit() CALLED: order.ref={}, type={}, check={}", order.ref, order.exectype, check)
+        log.info("submit() called (public method): order.ref={}, check={}", order.ref, check)
         
         # Check if we're in live mode - reject orders during historical backfill
         # Get the data feed from the order to check live_mode
         if hasattr(order, 'data') and order.data is not None:
             is_live = getattr(order.data, 'live_mode', False)
             if not is_live:
-                logger.warning(f"Rejecting order {order.ref} - not in live mode (still processing historical data)")
-                print(f"*** REJECTING ORDER {order.ref} - NOT IN LIVE MODE ***")
+                log.warning("Rejecting order {} - not in live mode (still processing historical data)", order.ref)
                 order.reject()
                 return order
         
@@ -632,8 +410,8 @@ class MT5Broker(bt.brokers.BackBroker):
     def _submit(self, order):
         """Submit order to MT5."""
         try:
-            print(f"*** MT5Broker._submit() CALLED: order.ref={order.ref}, type={order.exectype}, size={order.size}, isbuy={order.isbuy()} ***")
-            logger.info(f"_submit called: order.ref={order.ref}, type={order.exectype}, size={order.size}, isbuy={order.isbuy()}")
+            log.debug("MT5Broker._submit() CALLED: order.ref={}, type={}, size={}, isbuy={}", order.ref, order.exectype, order.size, order.isbuy())
+            log.info("_submit called: order.ref={}, type={}, size={}, isbuy={}", order.ref, order.exectype, order.size, order.isbuy())
             
             # Check if this is a bracket order TP or SL (child order)
             # These should be skipped since TP/SL are attached to the main order in MT5
@@ -649,6 +427,9 @@ class MT5Broker(bt.brokers.BackBroker):
                 if symbol and parent_ref:
                     # Store symbol for the parent order
                     self.order_symbols[parent_ref] = symbol
+                if parent_ref:
+                    kind = 'tp' if order.exectype == bt.Order.Limit else 'sl'
+                    self.bracket_children.setdefault(parent_ref, {})[kind] = order
                 
                 if order.exectype == bt.Order.Limit:
                     # This is a TP order
@@ -657,8 +438,7 @@ class MT5Broker(bt.brokers.BackBroker):
                         if parent_ref not in self.bracket_tp_sl:
                             self.bracket_tp_sl[parent_ref] = {}
                         self.bracket_tp_sl[parent_ref]['tp'] = tp_price
-                        logger.info(f"Extracted TP from child order: parent_ref={parent_ref}, TP={tp_price}")
-                        print(f"*** EXTRACTED TP FROM CHILD ORDER: parent_ref={parent_ref}, TP={tp_price} ***")
+                        log.info("Extracted TP from child order: parent_ref={}, TP={}", parent_ref, tp_price)
                         
                         # Try to modify parent order if both TP and SL are available
                         self._try_modify_parent_order(parent_ref)
@@ -669,14 +449,12 @@ class MT5Broker(bt.brokers.BackBroker):
                         if parent_ref not in self.bracket_tp_sl:
                             self.bracket_tp_sl[parent_ref] = {}
                         self.bracket_tp_sl[parent_ref]['sl'] = sl_price
-                        logger.info(f"Extracted SL from child order: parent_ref={parent_ref}, SL={sl_price}")
-                        print(f"*** EXTRACTED SL FROM CHILD ORDER: parent_ref={parent_ref}, SL={sl_price} ***")
+                        log.info("Extracted SL from child order: parent_ref={}, SL={}", parent_ref, sl_price)
                         
                         # Try to modify parent order if both TP and SL are available
                         self._try_modify_parent_order(parent_ref)
                 
-                logger.info(f"Skipping bracket child order {order.ref} (TP/SL) - already attached to main order in MT5")
-                print(f"*** SKIPPING BRACKET CHILD ORDER {order.ref} - TP/SL handled by MT5 ***")
+                log.info("Skipping bracket child order {} (TP/SL) - already attached to main order in MT5", order.ref)
                 # Accept the order in backtrader but don't place it in MT5
                 # MT5 will handle TP/SL automatically when the main order is placed
                 # We need to submit and accept it so backtrader tracks it properly
@@ -689,18 +467,11 @@ class MT5Broker(bt.brokers.BackBroker):
             # Get symbol from order's data feed
             symbol = self._get_symbol_from_order(order)
             if not symbol:
-                logger.error("Could not determine symbol for order")
+                log.error("Could not determine symbol for order")
                 order.reject()
                 return order
             
-            logger.info(f"Order symbol: {symbol}")
-            
-            # Get current symbol info
-            symbol_info = mt5.symbol_info(symbol)
-            if symbol_info is None:
-                logger.error(f"Symbol {symbol} not found in MT5")
-                order.reject()
-                return order
+            log.info("Order symbol: {}", symbol)
             
             # Check if this is a bracket order main order
             # Extract TP and SL prices if available
@@ -708,13 +479,11 @@ class MT5Broker(bt.brokers.BackBroker):
             sl_price = None
             
             # Debug: Check what attributes the order has
-            logger.debug(f"Order attributes: hasattr(info)={hasattr(order, 'info')}, hasattr(bracket)={hasattr(order, 'bracket')}")
+            log.debug("Order attributes: hasattr(info)={}, hasattr(bracket)={}", hasattr(order, 'info'), hasattr(order, 'bracket'))
             if hasattr(order, 'info'):
-                logger.debug(f"Order.info type: {type(order.info)}, value: {order.info}")
-                print(f"*** ORDER.INFO: {order.info} ***")
+                log.debug("Order.info type: {}, value: {}", type(order.info), order.info)
             if hasattr(order, 'bracket'):
-                logger.debug(f"Order.bracket type: {type(order.bracket)}, value: {order.bracket}")
-                print(f"*** ORDER.BRACKET: {order.bracket} ***")
+                log.debug("Order.bracket type: {}, value: {}", type(order.bracket), order.bracket)
             
             # First check our broker-level storage (most reliable)
             # print(f"*** CHECKING BROKER STORAGE: order.ref={order.ref}, storage keys={list(self.bracket_tp_sl.keys())} ***")
@@ -723,10 +492,9 @@ class MT5Broker(bt.brokers.BackBroker):
                 tp_price = bracket_info.get('tp')
                 sl_price = bracket_info.get('sl')
                 if tp_price or sl_price:
-                    logger.info(f"Bracket order detected via broker storage: TP={tp_price}, SL={sl_price}")
-                    print(f"*** BRACKET ORDER DETECTED (broker storage): TP={tp_price}, SL={sl_price} ***")
+                    log.info("Bracket order detected via broker storage: TP={}, SL={}", tp_price, sl_price)
             else:
-                print(f"*** ORDER.REF {order.ref} NOT FOUND IN BROKER STORAGE ***")
+                log.warning("ORDER.REF {} NOT FOUND IN BROKER STORAGE", order.ref)
             
             # Second check order.info (we explicitly store TP/SL there in BaseStrategy.place_order)
             if (tp_price is None or sl_price is None) and hasattr(order, 'info') and isinstance(order.info, dict):
@@ -735,8 +503,7 @@ class MT5Broker(bt.brokers.BackBroker):
                 if sl_price is None and 'sl' in order.info:
                     sl_price = order.info['sl']
                 if tp_price or sl_price:
-                    logger.info(f"Bracket order detected via order.info: TP={tp_price}, SL={sl_price}")
-                    print(f"*** BRACKET ORDER DETECTED (order.info): TP={tp_price}, SL={sl_price} ***")
+                    log.info("Bracket order detected via order.info: TP={}, SL={}", tp_price, sl_price)
             
             # Fallback: check order.bracket (backtrader's native bracket structure)
             if (tp_price is None or sl_price is None) and hasattr(order, 'bracket') and order.bracket:
@@ -745,8 +512,7 @@ class MT5Broker(bt.brokers.BackBroker):
                 if sl_price is None and hasattr(order.bracket, 'stop') and order.bracket.stop:
                     sl_price = order.bracket.stop.price
                 if tp_price or sl_price:
-                    logger.info(f"Bracket order detected via order.bracket: TP={tp_price}, SL={sl_price}")
-                    print(f"*** BRACKET ORDER DETECTED (order.bracket): TP={tp_price}, SL={sl_price} ***")
+                    log.info("Bracket order detected via order.bracket: TP={}, SL={}", tp_price, sl_price)
             
             # Another fallback: try to extract TP/SL from bracket child orders if they exist
             # When backtrader creates bracket orders, the child orders have a parent reference
@@ -757,16 +523,13 @@ class MT5Broker(bt.brokers.BackBroker):
                     if hasattr(order.bracket, 'limit') and order.bracket.limit:
                         if tp_price is None:
                             tp_price = order.bracket.limit.price
-                            logger.info(f"Extracted TP from order.bracket.limit: TP={tp_price}")
-                            print(f"*** EXTRACTED TP FROM order.bracket.limit: {tp_price} ***")
+                            log.info("Extracted TP from order.bracket.limit: TP={}", tp_price)
                     if hasattr(order.bracket, 'stop') and order.bracket.stop:
                         if sl_price is None:
                             sl_price = order.bracket.stop.price
-                            logger.info(f"Extracted SL from order.bracket.stop: SL={sl_price}")
-                            print(f"*** EXTRACTED SL FROM order.bracket.stop: {sl_price} ***")
+                            log.info("Extracted SL from order.bracket.stop: SL={}", sl_price)
                 except Exception as e:
-                    logger.debug(f"Could not extract TP/SL from order.bracket: {e}")
-                    print(f"*** ERROR EXTRACTING FROM order.bracket: {e} ***")
+                    log.debug("Could not extract TP/SL from order.bracket: {}", e)
             
             # Final fallback: Check if we can find child orders in backtrader's order tracking
             # This is a bit of a hack, but we can try to find orders with this order as parent
@@ -783,23 +546,15 @@ class MT5Broker(bt.brokers.BackBroker):
             
             # Final check: if we still don't have TP/SL, log a warning
             if tp_price is None and sl_price is None:
-                logger.warning(f"No TP/SL found for order {order.ref}. Order.info={getattr(order, 'info', None)}, Order.bracket={getattr(order, 'bracket', None)}, Broker storage={order.ref in self.bracket_tp_sl}")
-                print(f"*** WARNING: No TP/SL found for order {order.ref} ***")
-                print(f"*** Order.info: {getattr(order, 'info', 'N/A')} ***")
-                print(f"*** Order.bracket: {getattr(order, 'bracket', 'N/A')} ***")
-                print(f"*** Broker storage has this ref: {order.ref in self.bracket_tp_sl} ***")
+                log.warning("No TP/SL found for order {}. Order.info={}, Order.bracket={}, Broker storage={}", order.ref, getattr(order, 'info', None), getattr(order, 'bracket', None), order.ref in self.bracket_tp_sl)
             
             # Determine order type and price based on order execution type
             if order.exectype == bt.Order.Market:
-                # Market orders: use current market price
-                if order.isbuy():
-                    order_type = mt5.ORDER_TYPE_BUY
-                    price = symbol_info.ask
-                else:
-                    order_type = mt5.ORDER_TYPE_SELL
-                    price = symbol_info.bid
-                logger.info(f"Processing MARKET order: type={order_type}, price={price}, size={order.size}")
-                result = self._place_market_order(order, order_type, price, symbol, tp_price=tp_price, sl_price=sl_price)
+                # Market orders: use current market price (read when the request is sent)
+                order_type = mt5.ORDER_TYPE_BUY if order.isbuy() else mt5.ORDER_TYPE_SELL
+                log.info("Processing MARKET order: type={}, size={}", order_type, order.size)
+                kind = 'market'
+                send = partial(self._place_market_order, order, order_type, None, symbol, tp_price=tp_price, sl_price=sl_price)
             elif order.exectype == bt.Order.Stop:
                 # Stop orders: use order.price (stop price)
                 # For bracket orders, backtrader creates stop orders with opposite size
@@ -829,8 +584,9 @@ class MT5Broker(bt.brokers.BackBroker):
                     else:
                         order_type = mt5.ORDER_TYPE_SELL_STOP
                 price = order.price  # Use the stop price from the order
-                logger.info(f"Processing STOP order: type={order_type}, price={price}, size={order.size}, is_closing={is_closing}")
-                result = self._place_stop_order(order, order_type, symbol, tp_price=tp_price, sl_price=sl_price)
+                log.info("Processing STOP order: type={}, price={}, size={}, is_closing={}", order_type, price, order.size, is_closing)
+                kind = 'stop'
+                send = partial(self._place_stop_order, order, order_type, symbol, tp_price=tp_price, sl_price=sl_price)
             elif order.exectype == bt.Order.Limit:
                 # Limit orders: use order.price (limit price)
                 # For bracket orders, backtrader creates limit orders with opposite size
@@ -860,8 +616,9 @@ class MT5Broker(bt.brokers.BackBroker):
                     else:
                         order_type = mt5.ORDER_TYPE_SELL_LIMIT
                 price = order.price  # Use the limit price from the order
-                logger.info(f"Processing LIMIT order: type={order_type}, price={price}, size={order.size}, is_closing={is_closing}")
-                result = self._place_limit_order(order, order_type, symbol, tp_price=tp_price, sl_price=sl_price)
+                log.info("Processing LIMIT order: type={}, price={}, size={}, is_closing={}", order_type, price, order.size, is_closing)
+                kind = 'limit'
+                send = partial(self._place_limit_order, order, order_type, symbol, tp_price=tp_price, sl_price=sl_price)
             elif order.exectype == bt.Order.StopLimit:
                 # Stop limit order: use order.price (stop price) and order.plimit (limit price)
                 if order.isbuy():
@@ -869,89 +626,87 @@ class MT5Broker(bt.brokers.BackBroker):
                 else:
                     order_type = mt5.ORDER_TYPE_SELL_STOP_LIMIT
                 price = order.price  # Stop price
-                logger.info(f"Processing STOPLIMIT order: type={order_type}, stop_price={price}, size={order.size}")
-                result = self._place_stop_limit_order(order, order_type, symbol)
+                log.info("Processing STOPLIMIT order: type={}, stop_price={}, size={}", order_type, price, order.size)
+                kind = 'stoplimit'
+                send = partial(self._place_stop_limit_order, order, order_type, symbol)
             else:
-                logger.error(f"Unsupported order type: {order.exectype}")
+                log.error("Unsupported order type: {}", order.exectype)
                 order.reject()
                 return order
             
-            if result is None:
-                error = mt5.last_error()
-                logger.error(f"Order submission failed: {error}")
-                order.reject()
-            else:
-                if result.retcode == mt5.TRADE_RETCODE_DONE:
-                    order.submit()
-                    mt5_order_ticket = result.order
-                    self.pending_orders[order.ref] = mt5_order_ticket
-                    self.order_symbols[order.ref] = symbol  # Store symbol for this order
-                    logger.info(f"✓ Order submitted successfully: MT5 order={mt5_order_ticket}, ref={order.ref}, status={order.getstatusname()}")
-                    
-                    # Try to modify order with TP/SL if available (will only modify once due to modified_orders tracking)
-                    self._try_modify_parent_order(order.ref)
-                else:
-                    logger.error(f"✗ Order submission failed: retcode={result.retcode}, comment={result.comment}")
-                    order.reject()
+            # Send from the order gateway; _on_order_sent applies the result in a later next()
+            order.submit(self)
+            self.notify(order)
+            self.sending.add(order.ref)
+            if not self.gateway.submit(kind, symbol, send, partial(self._on_order_sent, order, symbol)):
+                self.sending.discard(order.ref)
+                order.reject(self)
+                self.notify(order)
             
             return order
             
         except Exception as e:
-            logger.error(f"Error submitting order: {e}")
+            log.error("Error submitting order: {}", e)
             import traceback
             traceback.print_exc()
             order.reject()
             return order
     
+    def _on_order_sent(self, order, symbol, result, error):
+        """Apply the MT5 reply to a submitted order (runs in next(), see MT5OrderGateway)."""
+        self.sending.discard(order.ref)
+        cancel_requested = order.ref in self.cancel_requested
+        self.cancel_requested.discard(order.ref)
+        if result is None:
+            log.error("Order submission failed: {}", error or "no result from MT5")
+            order.reject(self)
+        elif result.retcode == mt5.TRADE_RETCODE_DONE:
+            mt5_order_ticket = result.order
+            self.pending_orders[order.ref] = mt5_order_ticket
+            self.order_symbols[order.ref] = symbol  # Store symbol for this order
+            self.live_orders[order.ref] = order
+            self.reconciler.track(order.ref, mt5_order_ticket, symbol)
+            order.accept(self)
+            log.info("✓ Order submitted successfully: MT5 order={}, ref={}, status={}", mt5_order_ticket, order.ref, order.getstatusname())
+            
+            # Try to modify order with TP/SL if available (will only modify once due to modified_orders tracking)
+            self._try_modify_parent_order(order.ref)
+            if cancel_requested:
+                log.info("Order {} was cancelled while it was being sent, cancelling it in MT5", order.ref)
+                self.cancel(order)
+        else:
+            log.error("✗ Order submission failed: retcode={}, comment={}", result.retcode, result.comment)
+            order.reject(self)
+        self.notify(order)
+    
     def _place_market_order(self, order, order_type, price, symbol, tp_price=None, sl_price=None):
-        """Place a market order."""
-        # Get symbol info to determine correct filling mode and lot size
-        symbol_info = mt5.symbol_info(symbol)
-        if symbol_info is None:
-            logger.error(f"Could not get symbol info for {symbol}")
-            return None
-            
+        """Place a market order (at the current quote when ``price`` is None)."""
+        if price is None:
+            tick = mt5.symbol_info_tick(symbol)
+            if tick is None:
+                log.error("No quote for {} in MT5: {}", symbol, mt5.last_error())
+                return None
+            price = tick.ask if order_type == mt5.ORDER_TYPE_BUY else tick.bid
+        spec = self._spec(symbol)
+        
         # Determine the correct filling mode based on symbol's supported modes
         # filling_mode is a bitmask: 1=FOK, 2=IOC, 4=RETURN
-        if symbol_info.filling_mode & 4:  # RETURN supported
+        if spec.filling_mode & 4:  # RETURN supported
             filling_mode = mt5.ORDER_FILLING_RETURN
-        elif symbol_info.filling_mode & 2:  # IOC supported
+        elif spec.filling_mode & 2:  # IOC supported
             filling_mode = mt5.ORDER_FILLING_IOC
-        elif symbol_info.filling_mode & 1:  # FOK supported
+        elif spec.filling_mode & 1:  # FOK supported
             filling_mode = mt5.ORDER_FILLING_FOK
         else:
             filling_mode = mt5.ORDER_FILLING_RETURN  # Default
         
-        # Convert order.size (units) to volume (lots)
-        # symbol_info.volume_min = minimum lot size (e.g., 0.01)
-        # symbol_info.volume_step = lot step size (e.g., 0.01)
-        # symbol_info.volume_max = maximum lot size
-        # symbol_info.trade_contract_size = contract size (usually 100000 for forex, 1 for crypto)
-        
-        # If order.size is in units, convert to lots
-        # For forex: 1 lot = 100,000 units (contract_size)
-        # For crypto: 1 lot = 1 unit (contract_size = 1)
-        contract_size = symbol_info.trade_contract_size if hasattr(symbol_info, 'trade_contract_size') else 100000
-        volume_min = symbol_info.volume_min if hasattr(symbol_info, 'volume_min') else 0.01
-        volume_step = symbol_info.volume_step if hasattr(symbol_info, 'volume_step') else 0.01
-        volume_max = symbol_info.volume_max if hasattr(symbol_info, 'volume_max') else 100.0
-        
-        # Convert units to lots
-        volume = abs(order.size) / contract_size
-        
-        # Round to nearest step
-        if volume_step > 0:
-            volume = round(volume / volume_step) * volume_step
-        
-        # Ensure volume is within valid range
-        if volume < volume_min:
-            volume = volume_min
-            logger.warning(f"Order size {order.size} units ({volume} lots) too small, using minimum {volume_min} lot")
-        elif volume > volume_max:
-            volume = volume_max
-            logger.warning(f"Order size {order.size} units ({volume} lots) too large, using maximum {volume_max} lot")
+        # Convert order.size (units) to volume (lots): contract_size units per lot
+        # (100,000 for forex), rounded to volume_step and clamped to volume_min/max
+        volume = self._convert_volume_to_lots(order.size, symbol)
+        contract_size = spec.contract_size
+        volume_step = spec.volume_step
         
-        logger.info(f"Converted order size: {order.size} units -> {volume} lots (contract_size={contract_size}, step={volume_step})")
+        log.info("Converted order size: {} units -> {} lots (contract_size={}, step={})", order.size, volume, contract_size, volume_step)
         
         request = {
             "action": mt5.TRADE_ACTION_DEAL,
@@ -969,66 +724,40 @@ class MT5Broker(bt.brokers.BackBroker):
         # Add TP/SL if provided (from bracket order)
         if sl_price is not None:
             request["sl"] = self._normalize_price(sl_price, symbol)
-            logger.info(f"Adding SL to market order: {request['sl']}")
-            print(f"*** ADDING SL TO MARKET ORDER: {request['sl']} ***")
+            log.info("Adding SL to market order: {}", request['sl'])
         
         if tp_price is not None:
             request["tp"] = self._normalize_price(tp_price, symbol)
-            logger.info(f"Adding TP to market order: {request['tp']}")
-            print(f"*** ADDING TP TO MARKET ORDER: {request['tp']} ***")
+            log.info("Adding TP to market order: {}", request['tp'])
         
-        logger.info(f"Placing market order: {symbol} {order_type} {volume} lots at {price}, filling={filling_mode}, TP={tp_price}, SL={sl_price}")
-        print(f"*** MT5 REQUEST: {request} ***")
+        log.info("Placing market order: {} {} {} lots at {}, filling={}, TP={}, SL={}", symbol, order_type, volume, price, filling_mode, tp_price, sl_price)
+        log.debug("MT5 REQUEST: {}", request)
         result = mt5.order_send(request)
+        self.account.invalidate()
         
         if result:
             if result.retcode != mt5.TRADE_RETCODE_DONE:
-                logger.error(f"Market order failed: retcode={result.retcode}, comment={result.comment}")
+                log.error("Market order failed: retcode={}, comment={}", result.retcode, result.comment)
         else:
             error = mt5.last_error()
-            logger.error(f"Market order send failed: {error}")
+            log.error("Market order send failed: {}", error)
         
         return result
     
+    def _spec(self, symbol) -> SymbolSpec:
+        """Spec of ``symbol``; a symbol not loaded in start() is looked up in MT5 once."""
+        if symbol not in self._spec_lookups:
+            self._spec_lookups.add(symbol)
+            self.specs.load_mt5([symbol])
+        return self.specs.get(symbol)
+    
     def _normalize_price(self, price, symbol):
         """Normalize price to symbol's tick size."""
-        symbol_info = mt5.symbol_info(symbol)
-        if symbol_info is None:
-            return price
-        
-        tick_size = symbol_info.trade_tick_size if hasattr(symbol_info, 'trade_tick_size') else 0.00001
-        if tick_size > 0:
-            # Round to nearest tick
-            price = round(price / tick_size) * tick_size
-        
-        return price
+        return self._spec(symbol).normalize_price(price)
     
     def _convert_volume_to_lots(self, size, symbol):
-        """Convert order size (units) to volume (lots) for MT5."""
-        symbol_info = mt5.symbol_info(symbol)
-        if symbol_info is None:
-            logger.error(f"Could not get symbol info for {symbol}")
-            return 0.01  # Default fallback
-        
-        contract_size = symbol_info.trade_contract_size if hasattr(symbol_info, 'trade_contract_size') else 100000
-        volume_min = symbol_info.volume_min if hasattr(symbol_info, 'volume_min') else 0.01
-        volume_step = symbol_info.volume_step if hasattr(symbol_info, 'volume_step') else 0.01
-        volume_max = symbol_info.volume_max if hasattr(symbol_info, 'volume_max') else 100.0
-        
-        # Convert units to lots
-        volume = abs(size) / contract_size
-        
-        # Round to nearest step
-        if volume_step > 0:
-            volume = round(volume / volume_step) * volume_step
-        
-        # Ensure volume is within valid range
-        if volume < volume_min:
-            volume = volume_min
-        elif volume > volume_max:
-            volume = volume_max
-        
-        return volume
+        """Convert order size (units) to volume (lots) for MT5 (clamped to the volume limits, see SymbolSpec.units_to_lots)."""
+        return self._spec(symbol).units_to_lots(size)
     
     def _place_stop_order(self, order, order_type, symbol, tp_price=None, sl_price=None):
         """Place a stop order."""
@@ -1051,19 +780,19 @@ class MT5Broker(bt.brokers.BackBroker):
         # Add TP/SL if provided (from bracket order)
         if sl_price is not None:
             request["sl"] = self._normalize_price(sl_price, symbol)
-            logger.info(f"Adding SL to stop order: {request['sl']}")
-            print(f"*** ADDING SL TO STOP ORDER: {request['sl']} ***")
+            log.info("Adding SL to stop order: {}", request['sl'])
         
         if tp_price is not None:
             request["tp"] = self._normalize_price(tp_price, symbol)
-            logger.info(f"Adding TP to stop order: {request['tp']}")
-            print(f"*** ADDING TP TO STOP ORDER: {request['tp']} ***")
+            log.info("Adding TP to stop order: {}", request['tp'])
         
-        logger.info(f"Placing stop order: {symbol} {order_type} {volume} lots at {price}, TP={tp_price}, SL={sl_price}")
-        print(f"*** MT5 REQUEST: {request} ***")
+        log.info("Placing stop order: {} {} {} lots at {}, TP={}, SL={}", symbol, order_type, volume, price, tp_price, sl_price)
+        log.debug("MT5 REQUEST: {}", request)
         result = mt5.order_send(request)
         if result and result.retcode != mt5.TRADE_RETCODE_DONE:
-            logger.error(f"Stop order failed: retcode={result.retcode}, comment={result.comment}")
+            log.error("Stop order failed: retcode={}, comment={}", result.retcode, result.comment)
+        elif not result:
+            log.error("Stop order send failed: {}", mt5.last_error())
         return result
     
     def _place_limit_order(self, order, order_type, symbol, tp_price=None, sl_price=None):
@@ -1087,95 +816,175 @@ class MT5Broker(bt.brokers.BackBroker):
         # Add TP/SL if provided (from bracket order)
         if sl_price is not None:
             request["sl"] = self._normalize_price(sl_price, symbol)
-            logger.info(f"Adding SL to limit order: {request['sl']}")
-            print(f"*** ADDING SL TO LIMIT ORDER: {request['sl']} ***")
+            log.info("Adding SL to limit order: {}", request['sl'])
         
         if tp_price is not None:
             request["tp"] = self._normalize_price(tp_price, symbol)
-            logger.info(f"Adding TP to limit order: {request['tp']}")
-            print(f"*** ADDING TP TO LIMIT ORDER: {request['tp']} ***")
+            log.info("Adding TP to limit order: {}", request['tp'])
         
-        logger.info(f"Placing limit order: {symbol} {order_type} {volume} lots at {price}, TP={tp_price}, SL={sl_price}")
-        print(f"*** MT5 REQUEST: {request} ***")
+        log.info("Placing limit order: {} {} {} lots at {}, TP={}, SL={}", symbol, order_type, volume, price, tp_price, sl_price)
+        log.debug("MT5 REQUEST: {}", request)
         result = mt5.order_send(request)
         if result and result.retcode != mt5.TRADE_RETCODE_DONE:
-            logger.error(f"Limit order failed: retcode={result.retcode}, comment={result.comment}")
+            log.error("Limit order failed: retcode={}, comment={}", result.retcode, result.comment)
+        elif not result:
+            log.error("Limit order send failed: {}", mt5.last_error())
         return result
     
     def _place_stop_limit_order(self, order, order_type, symbol):
         """Place a stop limit order."""
         # MT5 doesn't directly support stop-limit, so we'll use stop order
-        logger.warning("Stop-limit orders not directly supported, using stop order")
+        log.warning("Stop-limit orders not directly supported, using stop order")
         return self._place_stop_order(order, order_type, symbol)
     
     def _execute(self, order, price=None, ago=0, **kwargs):
         """Execute order (called by Backtrader)."""
-        # For MT5, we don't want to execute orders immediately
-        # Orders should be submitted to MT5 first via _submit
-        # Only execute if the order was already submitted to MT5 and executed there
-        logger.info(f"_execute called: order.ref={order.ref}, status={order.getstatusname()}, pending_orders has ref: {order.ref in self.pending_orders}")
-        
-        # If order is already in pending_orders, it means it was submitted to MT5
-        # Check if it was executed in MT5
-        if order.ref in self.pending_orders:
-            mt5_order = self.pending_orders[order.ref]
-            # Get symbol from order
-            symbol = self._get_symbol_from_order(order)
-            
-            # Check if order was executed in MT5
-            positions = mt5.positions_get(symbol=symbol) if symbol else mt5.positions_get()
-            if positions:
-                for pos in positions:
-                    if pos.ticket == mt5_order:
-                        # Position opened from this order
-                        logger.info(f"Order {order.ref} executed in MT5 as position {pos.ticket}")
-                        order.execute(price=pos.price_open or price)
-                        del self.pending_orders[order.ref]
-                        return order
-            
-            # Check pending orders in MT5
-            orders = mt5.orders_get(symbol=symbol) if symbol else mt5.orders_get()
-            if orders:
-                for o in orders:
-                    if o.ticket == mt5_order:
-                        # Order still pending in MT5, don't execute yet
-                        logger.info(f"Order {order.ref} still pending in MT5 (ticket {mt5_order})")
-                        return order
+        # For MT5, we don't execute orders locally: fills of the orders sent to MT5
+        # are applied by _reconcile() once MT5 reports them
+        log.debug("_execute called: order.ref={}, status={}, pending_orders has ref: {}", order.ref, order.getstatusname(), order.ref in self.pending_orders)
+        return order
+    
+    def _reconcile(self, force=False):
+        """Apply the changes of the sent orders since the last cycle (fills, cancels, SL/TP exits)."""
+        for event in self.reconciler.reconcile(force=force):
+            try:
+                self._apply_event(event)
+            except Exception as e:
+                log.exception("Applying MT5 {} of order {} failed: {}", event.kind, event.ref, e)
+    
+    def _apply_event(self, event: TerminalEvent):
+        order = self.live_orders.get(event.ref)
+        if order is None:
+            return
+        children = self.bracket_children.get(event.ref, {})
+        if event.kind == 'fill':
+            log.info("Order {} filled in MT5 (ticket {}) at {}", event.ref, event.ticket, event.price)
+            self.pending_orders.pop(event.ref, None)
+            self._fill(order, event.price)
+            return
         
-        # If order hasn't been submitted to MT5 yet, don't execute it
-        # It should go through _submit first
-        if order.status == order.Submitted:
-            logger.info(f"Order {order.ref} is Submitted but not yet in pending_orders - waiting for MT5 execution")
-            return order
+        if event.kind == 'cancel':
+            log.info("Order {} (ticket {}) was cancelled in MT5", event.ref, event.ticket)
+            exit_order = None
+            order.cancel()
+            self.notify(order)
+        else:
+            # Position closed: by its SL or TP, or otherwise (closest of the two)
+            exit_order = children.get(event.kind)
+            if exit_order is None and children:
+                exit_order = min(children.values(), key=lambda child: abs((child.price or 0.0) - event.price))
+            log.info("Position {} of order {} closed in MT5 ({}) at {}", event.ticket, event.ref, event.kind, event.price)
+            if exit_order is not None:
+                self._fill(exit_order, event.price)
+            else:
+                log.warning("No exit order for position {} of order {}", event.ticket, event.ref)
+        for child in children.values():
+            if child is not exit_order and child.alive():
+                child.cancel()
+                self.notify(child)
+        self._release(event.ref)
+    
+    def _fill(self, order, price):
+        """Execute ``order`` in full at ``price`` on the backtrader side (position, notify_order)."""
+        size = order.size
+        comminfo = self.getcommissioninfo(order.data)
+        position = self.positions[order.data]
+        pprice_orig = position.price
+        psize, pprice, opened, closed = position.update(size, price, order.data.datetime.datetime())
+        pnl = comminfo.profitandloss(-closed, pprice_orig, price)
+        order.execute(order.data.datetime[0], size, price,
+                      closed, comminfo.getoperationcost(closed, pprice_orig), 0.0,
+                      opened, comminfo.getoperationcost(opened, price), 0.0,
+                      0.0, pnl, psize, pprice)
+        order.addcomminfo(comminfo)
+        order.completed()
+        self.notify(order)
+    
+    def _release(self, ref):
+        """Drop the tracking state of an order whose trade is done."""
+        self.live_orders.pop(ref, None)
+        self.bracket_children.pop(ref, None)
+        self.bracket_tp_sl.pop(ref, None)
+        self.modified_orders.discard(ref)
+        self.order_symbols.pop(ref, None)
+        self.pending_orders.pop(ref, None)
+    
+    def order_ticket(self, ref) -> Optional[int]:
+        """MT5 ticket of the order sent for ``ref`` (its position has the same ticket), None when untracked."""
+        return self.reconciler.ticket_of(ref)
+    
+    def adopt(self, order, ticket, symbol, children=None, filled=False):
+        """
+        Track an MT5 order placed by a previous session under the new ``order``.
         
-        # For orders that haven't been submitted to MT5, don't execute immediately
-        # This prevents backtrader from executing orders in simulation mode
-        logger.warning(f"Order {order.ref} execution attempted but not submitted to MT5 - skipping immediate execution")
-        return order
+        Args:
+            order: Main order standing for it (not sent; fills, cancels and exits are reported on it)
+            ticket: MT5 order ticket (also the ticket of its position)
+            symbol: Symbol of the order
+            children: {'tp': order, 'sl': order} filled when MT5 closes the position by its TP/SL
+            filled: The order is already a position (its size is added to the data's position)
+        """
+        self.order_symbols[order.ref] = symbol
+        self.live_orders[order.ref] = order
+        self.bracket_children[order.ref] = dict(children or {})
+        order.accept(self)
+        for child in self.bracket_children[order.ref].values():
+            child.accept(self)
+        if filled:
+            self.positions[order.data].update(order.size, order.price)
+            order.completed()
+            self.reconciler.track_position(order.ref, ticket, symbol)
+        else:
+            self.pending_orders[order.ref] = ticket
+            self.reconciler.track(order.ref, ticket, symbol)
+        log.info("Adopted MT5 {} {} of the previous session as order {}", "position" if filled else "order", ticket, order.ref)
     
     def cancel(self, order):
-        """Cancel an order."""
+        """Cancel an order (the MT5 request is sent from the order gateway)."""
         if order.ref in self.pending_orders:
             mt5_order = self.pending_orders[order.ref]
             request = {
                 "action": mt5.TRADE_ACTION_REMOVE,
                 "order": mt5_order,
             }
-            result = mt5.order_send(request)
-            if result:
-                del self.pending_orders[order.ref]
-                order.cancel()
-                logger.info(f"Order {order.ref} cancelled")
-            else:
-                logger.error(f"Failed to cancel order {order.ref}: {mt5.last_error()}")
+            symbol = self.order_symbols.get(order.ref) or self._get_symbol_from_order(order)
+            self.gateway.submit('cancel', symbol, partial(self._send_cancel, order.ref, request),
+                                partial(self._on_order_cancelled, order))
+        elif order.ref in self.sending:
+            # No ticket yet: the cancel is sent once the placement is applied (_on_order_sent)
+            self.cancel_requested.add(order.ref)
         
         return order
     
-    def get_value(self):
-        """Get current account equity."""
-        account_info = mt5.account_info()
-        if account_info:
-            return float(account_info.equity)
+    def _send_cancel(self, ref, request):
+        result = mt5.order_send(request)
+        if not result:
+            log.error("Failed to cancel order {}: {}", ref, mt5.last_error())
+        return result
+    
+    def _on_order_cancelled(self, order, result, error):
+        if not result:
+            return
+        if result.retcode != mt5.TRADE_RETCODE_DONE:
+            # E.g. the order filled in the meantime: it stays live, the reconciliation reports its fill
+            log.warning("✗ Cancel of order {} refused by MT5: retcode={}, comment={}", order.ref, result.retcode, result.comment)
+            return
+        if order.ref in self.pending_orders:
+            self.reconciler.forget(self.pending_orders[order.ref])
+            order.cancel()
+            self.notify(order)
+            for child in self.bracket_children.get(order.ref, {}).values():
+                if child.alive():
+                    child.cancel()
+                    self.notify(child)
+            self._release(order.ref)
+            log.info("Order {} cancelled", order.ref)
+    
+    def get_value(self, datas=None, mkt=False, lever=False):
+        """Get current account equity (cached)."""
+        state = self.account.get()
+        if datas is None and state.fetched:
+            return state.equity
         # Fallback to parent's get_value, but ensure it's not None
-        value = super().get_value()
+        value = super().get_value(datas=datas, mkt=mkt, lever=lever)
         return float(value) if value is not None else 0.0
@@ -0,0 +1,241 @@
+"""
+Asynchronous order gateway for the live MT5 broker.
+
+mt5.order_send() is a round trip to the terminal. Called from the
+strategy's next(), one slow reply stalls the bar for every other symbol.
+MT5Broker hands each terminal request (place, modify, cancel) to an
+MT5OrderGateway instead:
+
+- requests are queued per symbol and run by ``workers`` threads; a symbol
+  has at most one request in flight, so the requests of one symbol reach
+  the terminal in the order they were submitted (a TP/SL modification never
+  overtakes the order it modifies), while other symbols are not held up;
+- at most ``max_pending`` requests are queued or in flight; submit() waits
+  up to ``put_timeout`` seconds for room and then gives up (backpressure);
+- the result of each request is queued back and its callback runs on the
+  thread that calls process_completions() (MT5Broker.next(), i.e. the
+  cerebro thread), where it can touch backtrader orders and notify the
+  strategy through notify_order.
+
+Per request type, the queue wait and the terminal time of each request are
+recorded (stats()). ``synchronous=True`` runs every request and its
+callback inside submit(), as the broker did before.
+"""
+
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, Optional, Set
+
+from src.utils.logging import get_logger
+
+log = get_logger('broker.mt5.gateway')
+
+Callback = Callable[[Any, Optional[BaseException]], None]  # (result, error)
+
+
+@dataclass
+class RequestStats:
+    """Queue wait and terminal time of the requests of one type."""
+    requests: int = 0
+    errors: int = 0  # Requests that raised
+    dropped: int = 0  # Requests refused because the queue stayed full
+    last_ms: float = 0.0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    total_wait_ms: float = 0.0
+    max_wait_ms: float = 0.0
+
+    @property
+    def mean_ms(self) -> float:
+        return self.total_ms / self.requests if self.requests else 0.0
+
+    @property
+    def mean_wait_ms(self) -> float:
+        return self.total_wait_ms / self.requests if self.requests else 0.0
+
+    def record(self, wait_ms: float, elapsed_ms: float):
+        self.requests += 1
+        self.last_ms = elapsed_ms
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+        self.total_wait_ms += wait_ms
+        self.max_wait_ms = max(self.max_wait_ms, wait_ms)
+
+
+@dataclass
+class _Request:
+    kind: str  # 'market', 'stop', 'limit', 'modify', 'cancel', ...
+    symbol: str
+    send: Callable[[], Any]
+    callback: Optional[Callback]
+    queued_at: float
+
+
+class MT5OrderGateway:
+    """Runs terminal requests on worker threads, in order per symbol."""
+
+    def __init__(self, workers: int = 1, max_pending: int = 256, put_timeout: float = 5.0,
+                 synchronous: bool = False, clock: Callable[[], float] = time.perf_counter):
+        """
+        Args:
+            workers: Worker threads (the terminal serialises calls, more only help while one waits on the network)
+            max_pending: Requests queued or in flight before submit() waits
+            put_timeout: Seconds submit() waits for room before refusing a request
+            synchronous: Run requests and callbacks inside submit() (no threads)
+            clock: Monotonic time in seconds, for the latency metrics
+        """
+        self.workers = max(1, workers)
+        self.max_pending = max(1, max_pending)
+        self.put_timeout = put_timeout
+        self.synchronous = synchronous
+        self.clock = clock
+        self._cond = threading.Condition()
+        self._queues: Dict[str, Deque[_Request]] = {}
+        self._ready: Deque[str] = deque()  # Symbols with queued requests and none in flight
+        self._busy: Set[str] = set()  # Symbols with a request in flight
+        self._pending = 0
+        self._completions: Deque[tuple] = deque()  # (request, result, error), appended by the workers
+        self._stats: Dict[str, RequestStats] = {}
+        self._stop = False
+        self._threads = []
+
+    # ---- Threads ----
+    def start(self):
+        """Start the worker threads (no-op when running or synchronous)."""
+        if self.synchronous or self.running:
+            return
+        self._stop = False
+        self._threads = [threading.Thread(target=self._run, daemon=True, name=f"MT5OrderGateway-{i}")
+                         for i in range(self.workers)]
+        for thread in self._threads:
+            thread.start()
+        log.info("MT5 order gateway started ({} workers)", self.workers)
+
+    def stop(self, timeout: float = 10.0):
+        """Let the queued requests finish (up to ``timeout`` seconds), then stop the workers."""
+        self.flush(timeout)
+        with self._cond:
+            self._stop = True
+            self._cond.notify_all()
+        for thread in self._threads:
+            if thread is not threading.current_thread():
+                thread.join(timeout=1.0)
+        self._threads = []
+
+    @property
+    def running(self) -> bool:
+        return any(thread.is_alive() for thread in self._threads)
+
+    @property
+    def pending(self) -> int:
+        """Requests queued or in flight."""
+        return self._pending
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until no request is queued or in flight. Returns False on timeout."""
+        with self._cond:
+            return self._cond.wait_for(lambda: self._pending == 0 or not self.running, timeout)
+
+    # ---- Requests ----
+    def submit(self, kind: str, symbol: str, send: Callable[[], Any], callback: Optional[Callback] = None) -> bool:
+        """
+        Queue ``send`` (a function making the terminal calls of one request)
+        behind the earlier requests of ``symbol``. Its result, or the
+        exception it raised, is passed to ``callback(result, error)`` by
+        process_completions().
+
+        Returns False, without queueing, when the queue stayed full for
+        ``put_timeout`` seconds.
+        """
+        request = _Request(kind, symbol, send, callback, self.clock())
+        if self.synchronous or not self.running:
+            if not self.synchronous:
+                log.warning("MT5 order gateway is not running, sending {} {} inline", kind, symbol)
+            self._complete(*self._execute(request))
+            return True
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._pending < self.max_pending, self.put_timeout):
+                self._stats_for(kind).dropped += 1
+                log.error("MT5 order queue full ({} requests), refusing {} request for {}", self._pending, kind, symbol)
+                return False
+            queue = self._queues.setdefault(symbol, deque())
+            if not queue and symbol not in self._busy:
+                self._ready.append(symbol)
+            queue.append(request)
+            self._pending += 1
+            self._cond.notify_all()
+        return True
+
+    def process_completions(self) -> int:
+        """Run the callbacks of the finished requests on this thread. Returns how many ran."""
+        count = 0
+        while self._completions:
+            self._complete(*self._completions.popleft())
+            count += 1
+        return count
+
+    def _complete(self, request: _Request, result, error: Optional[BaseException]):
+        if request.callback is None:
+            return
+        try:
+            request.callback(result, error)
+        except Exception as e:
+            log.exception("Callback of {} request for {} failed: {}", request.kind, request.symbol, e)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._ready or self._stop)
+                if self._stop:
+                    return
+                symbol = self._ready.popleft()
+                request = self._queues[symbol].popleft()
+                self._busy.add(symbol)
+            completion = self._execute(request)
+            with self._cond:
+                self._busy.discard(symbol)
+                if self._queues[symbol]:
+                    self._ready.append(symbol)
+                self._completions.append(completion)
+                self._pending -= 1
+                self._cond.notify_all()
+
+    def _execute(self, request: _Request) -> tuple:
+        started = self.clock()
+        result, error = None, None
+        try:
+            result = request.send()
+        except Exception as e:
+            error = e
+            log.error("{} request for {} failed: {}", request.kind, request.symbol, e)
+        finished = self.clock()
+        with self._cond:
+            stats = self._stats_for(request.kind)
+            stats.record((started - request.queued_at) * 1000.0, (finished - started) * 1000.0)
+            if error is not None:
+                stats.errors += 1
+        return request, result, error
+
+    def _stats_for(self, kind: str) -> RequestStats:
+        stats = self._stats.get(kind)
+        if stats is None:
+            stats = self._stats[kind] = RequestStats()
+        return stats
+
+    # ---- Reporting ----
+    def stats(self) -> Dict[str, RequestStats]:
+        """Per request type statistics (copies)."""
+        with self._cond:
+            return {kind: RequestStats(**vars(stats)) for kind, stats in self._stats.items()}
+
+    def format_stats(self) -> str:
+        """One-line summary per request type: count, mean/max terminal time and mean/max queue wait."""
+        return ", ".join(
+            f"{kind} {stats.requests} sent {stats.mean_ms:.1f}/{stats.max_ms:.1f}ms"
+            f" wait {stats.mean_wait_ms:.1f}/{stats.max_wait_ms:.1f}ms"
+            + (f" ({stats.errors} errors)" if stats.errors else "")
+            + (f" ({stats.dropped} dropped)" if stats.dropped else "")
+            for kind, stats in self.stats().items()
+        )
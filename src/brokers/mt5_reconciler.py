@@ -0,0 +1,186 @@
+"""
+Per-cycle reconciliation of the live broker's orders with the MT5 terminal.
+
+Instead of asking the terminal about each order it sent (orders_get(ticket=),
+positions_get(ticket=) per order and per cycle), MT5Broker keeps the tickets
+it is waiting on in an MT5Reconciler: pending order tickets and the position
+tickets opened from them, both mapped to the backtrader order ref. Once per
+cycle reconcile() makes one orders_get() and one positions_get() call,
+indexes the replies by ticket and walks the tracked tickets once:
+
+- a pending ticket that is now a position was filled (``fill``);
+- a position ticket that is gone was closed (``sl``, ``tp`` or ``close``);
+- a pending ticket that is neither pending nor a position was cancelled or
+  expired (``cancel``), or filled and closed between two cycles (``fill``
+  followed by its close).
+
+Only tickets that disappeared cost a history_deals_get(position=) call, to
+read their fill and exit prices and the exit reason. Positions are matched
+by their identifier (the ticket of the order that opened them). Orders and
+positions the broker did not place are ignored.
+"""
+
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+import MetaTrader5 as mt5
+
+from src.utils.logging import get_logger
+
+log = get_logger('broker.mt5.reconcile')
+
+DEAL_ENTRY_IN = 0
+DEAL_ENTRY_OUT = 1
+DEAL_REASON_SL = 4
+DEAL_REASON_TP = 5
+
+
+@dataclass(frozen=True)
+class TerminalEvent:
+    """A change of a tracked order or position seen by reconcile()."""
+    kind: str  # 'fill', 'cancel', 'sl', 'tp' or 'close'
+    ref: int  # Backtrader ref of the order that was sent
+    ticket: int
+    symbol: str = ''
+    price: float = 0.0
+    volume: float = 0.0
+
+
+class MT5Reconciler:
+    """Ticket-indexed terminal state of the broker's orders, updated by one orders_get()/positions_get() per cycle."""
+
+    def __init__(self, interval: float = 1.0, clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            interval: Minimum seconds between two reconciliations
+            clock: Monotonic time in seconds
+        """
+        self.interval = interval
+        self.clock = clock
+        self.orders: Dict[int, int] = {}  # Pending order ticket -> ref
+        self.positions: Dict[int, int] = {}  # Position ticket -> ref of the order that opened it
+        self.symbols: Dict[int, str] = {}  # Ticket -> symbol
+        self.cycles = 0
+        self.calls = 0  # Terminal calls made by reconcile()
+        self._next = 0.0
+
+    def __len__(self) -> int:
+        return len(self.orders) + len(self.positions)
+
+    # ---- Local state ----
+    def track(self, ref: int, ticket: int, symbol: str = ''):
+        """Watch ``ticket``, the pending order (or the position of a market order) sent for ``ref``."""
+        self.orders[ticket] = ref
+        self.symbols[ticket] = symbol
+
+    def track_position(self, ref: int, ticket: int, symbol: str = ''):
+        """Watch the open position ``ticket`` (e.g. one adopted from a previous session) for ``ref``."""
+        self.positions[ticket] = ref
+        self.symbols[ticket] = symbol
+
+    def ticket_of(self, ref: int) -> Optional[int]:
+        """Ticket of the order or position tracked for ``ref`` (None when there is none)."""
+        for tickets in (self.orders, self.positions):
+            for ticket, tracked in tickets.items():
+                if tracked == ref:
+                    return ticket
+        return None
+
+    def forget(self, ticket: int):
+        self.orders.pop(ticket, None)
+        self.positions.pop(ticket, None)
+        self.symbols.pop(ticket, None)
+
+    # ---- Terminal ----
+    def due(self) -> bool:
+        """A reconciliation is due (and there is something to reconcile)."""
+        return bool(self.orders or self.positions) and self.clock() >= self._next
+
+    def reconcile(self, force: bool = False) -> List[TerminalEvent]:
+        """Fetch all orders and positions and return the changes since the last call."""
+        if not force and not self.due():
+            return []
+        self._next = self.clock() + self.interval
+        self.cycles += 1
+        self.calls += 2
+        try:
+            orders = mt5.orders_get()
+            positions = mt5.positions_get()
+        except Exception as e:
+            log.error("Fetching MT5 orders and positions failed: {}", e)
+            return []
+        if orders is None or positions is None:
+            # None is an error (no orders is an empty tuple): skip the cycle rather than report cancels
+            log.warning("No orders/positions from MT5, skipping reconciliation: {}", mt5.last_error())
+            return []
+        return self.diff(orders, positions)
+
+    def diff(self, orders, positions) -> List[TerminalEvent]:
+        """Events of the tracked tickets given the terminal's current orders and positions."""
+        pending = {order.ticket for order in orders}
+        open_positions = {getattr(position, 'identifier', position.ticket): position for position in positions}
+        events: List[TerminalEvent] = []
+
+        for ticket, ref in list(self.orders.items()):
+            if ticket in pending:
+                continue
+            del self.orders[ticket]
+            position = open_positions.get(ticket)
+            if position is not None:
+                self.positions[ticket] = ref
+                events.append(TerminalEvent('fill', ref, ticket, self.symbols.get(ticket, ''),
+                                            float(position.price_open), float(position.volume)))
+            else:
+                events.extend(self._vanished(ticket, ref))
+
+        for ticket, ref in list(self.positions.items()):
+            if ticket in open_positions:
+                continue
+            del self.positions[ticket]
+            close = self._exit(ticket, ref, self._deals(ticket))
+            if close is not None:
+                events.append(close)
+            self.symbols.pop(ticket, None)
+        return events
+
+    def _vanished(self, ticket: int, ref: int) -> List[TerminalEvent]:
+        """A pending order that is gone: cancelled, or filled and already closed."""
+        symbol = self.symbols.pop(ticket, '')
+        deals = self._deals(ticket)
+        entry = next((deal for deal in deals if deal.entry == DEAL_ENTRY_IN), None)
+        if entry is None:
+            return [TerminalEvent('cancel', ref, ticket, symbol)]
+        events = [TerminalEvent('fill', ref, ticket, symbol, float(entry.price), float(entry.volume))]
+        close = self._exit(ticket, ref, deals, symbol)
+        if close is not None:
+            events.append(close)
+        return events
+
+    def _deals(self, ticket: int) -> tuple:
+        self.calls += 1
+        try:
+            deals = mt5.history_deals_get(position=ticket)
+        except Exception as e:
+            log.error("history_deals_get(position={}) failed: {}", ticket, e)
+            deals = None
+        return tuple(deals) if deals else ()
+
+    def _exit(self, ticket: int, ref: int, deals: tuple, symbol: Optional[str] = None) -> Optional[TerminalEvent]:
+        symbol = symbol if symbol is not None else self.symbols.get(ticket, '')
+        exit_deal = next((deal for deal in reversed(deals) if deal.entry == DEAL_ENTRY_OUT), None)
+        if exit_deal is None:
+            log.warning("Position {} (ref {}) closed without an exit deal in the history", ticket, ref)
+            return None
+        return TerminalEvent(self._exit_kind(exit_deal), ref, ticket, symbol,
+                             float(exit_deal.price), float(exit_deal.volume))
+
+    @staticmethod
+    def _exit_kind(deal) -> str:
+        reason = getattr(deal, 'reason', None)
+        comment = str(getattr(deal, 'comment', '') or '').lower()
+        if reason == DEAL_REASON_SL or comment.startswith('[sl'):
+            return 'sl'
+        if reason == DEAL_REASON_TP or comment.startswith('[tp'):
+            return 'tp'
+        return 'close'
@@ -0,0 +1,110 @@
+"""
+Price-indexed book of resting orders for the backtesting broker.
+
+Backtrader's BackBroker walks its whole pending queue on every bar and asks
+each order whether it executes. With many resting retest limit orders (and
+their TP/SL children) across many symbols, almost all of those checks miss.
+OrderBook keeps plain LIMIT and STOP orders per data feed in two lists sorted
+by trigger price, so a bar only has to look at the orders whose trigger price
+it actually reached:
+
+- bids: orders that trigger when price trades down to them
+  (BUY LIMIT, SELL STOP) -> trigger price >= bar low
+- asks: orders that trigger when price trades up to them
+  (SELL LIMIT, BUY STOP) -> trigger price <= bar high
+
+Everything else (market/close orders, stop-limit and trailing orders, orders
+with an expiry) is checked on every bar exactly as before.
+"""
+
+import bisect
+import itertools
+import math
+from typing import Dict, List, Tuple
+
+import backtrader as bt
+
+# Order types indexed by price: (exectype, is_buy) -> side
+_INDEXED_SIDES = {
+    (bt.Order.Limit, True): 'bids',
+    (bt.Order.Stop, False): 'bids',
+    (bt.Order.Limit, False): 'asks',
+    (bt.Order.Stop, True): 'asks',
+}
+
+
+def bar_range(data) -> Tuple[float, float]:
+    """Low/high of the current bar, using the same tick_* fallbacks as BackBroker._try_exec."""
+    plow = getattr(data, 'tick_low', None)
+    if plow is None:
+        plow = data.low[0]
+    phigh = getattr(data, 'tick_high', None)
+    if phigh is None:
+        phigh = data.high[0]
+    return plow, phigh
+
+
+class OrderBook:
+    """Resting orders per data feed, sorted by trigger price with separate bid/ask sides."""
+
+    def __init__(self):
+        self._seq = itertools.count()
+        # data -> {'bids': [(price, seq, order)], 'asks': [(price, seq, order)]}
+        self._books: Dict[object, Dict[str, list]] = {}
+        # order.ref -> (side list, entry) for indexed orders
+        self._entries: Dict[int, Tuple[list, tuple]] = {}
+        # order.ref -> (seq, order) for orders checked on every bar
+        self._unindexed: Dict[int, Tuple[int, bt.Order]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries) + len(self._unindexed)
+
+    def add(self, order: bt.Order):
+        """Register an order accepted into the broker's pending queue."""
+        seq = next(self._seq)
+        side = _INDEXED_SIDES.get((order.exectype, order.isbuy()))
+        price = order.created.price
+        if side is None or order.valid or order.data is None or price is None or math.isnan(price):
+            self._unindexed[order.ref] = (seq, order)
+            return
+
+        book = self._books.get(order.data)
+        if book is None:
+            book = self._books[order.data] = {'bids': [], 'asks': []}
+        entry = (price, seq, order)
+        orders = book[side]
+        bisect.insort(orders, entry, key=lambda e: (e[0], e[1]))
+        self._entries[order.ref] = (orders, entry)
+
+    def remove(self, order: bt.Order):
+        """Drop an order that left the pending queue (executed, canceled or expired)."""
+        if self._unindexed.pop(order.ref, None) is not None:
+            return
+        found = self._entries.pop(order.ref, None)
+        if found is None:
+            return
+        orders, (price, seq, _) = found
+        i = bisect.bisect_left(orders, (price, seq), key=lambda e: (e[0], e[1]))
+        if i < len(orders) and orders[i][2] is order:
+            del orders[i]
+
+    def triggerable(self) -> List[bt.Order]:
+        """
+        Orders to evaluate on the current bar, in pending-queue order: indexed
+        orders whose trigger price lies within reach of the bar plus every
+        unindexed order.
+        """
+        candidates = list(self._unindexed.values())
+        for data, book in self._books.items():
+            bids, asks = book['bids'], book['asks']
+            if not bids and not asks:
+                continue
+            plow, phigh = bar_range(data)
+            if bids:
+                start = bisect.bisect_left(bids, plow, key=lambda e: e[0])
+                candidates.extend((seq, order) for _, seq, order in bids[start:])
+            if asks:
+                end = bisect.bisect_right(asks, phigh, key=lambda e: e[0])
+                candidates.extend((seq, order) for _, seq, order in asks[:end])
+        candidates.sort(key=lambda c: c[0])
+        return [order for _, order in candidates]
@@ -0,0 +1,141 @@
+"""
+Local on-disk store of MT5 candles for the live feeds.
+
+A live start used to pull ``max_candles`` bars per symbol from the terminal
+every time. CandleStore keeps the rates of each symbol and timeframe as one
+NumPy file (``<root>/<SYMBOL>_<TF>.npy``, the fields of mt5.copy_rates_*)
+and sync() asks the terminal only for the bars from the last stored bar on
+(copy_rates_range): the last stored bar may have been the forming one, so
+it is fetched again and replaced. Fetched bars win over stored bars of the
+same time. A store that is empty, unreadable or further behind than
+``max_bars`` bars is refilled with copy_rates_from_pos().
+
+Files are written to a temporary file and renamed, so a crash never leaves
+a truncated store behind. Each file is written only by the feed of its
+symbol.
+"""
+
+import os
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Optional, Union
+
+import numpy as np
+
+from src.data.timeframes import TIMEFRAME_SECONDS
+from src.utils.logging import get_logger
+
+log = get_logger('feed.candles')
+
+DEFAULT_ROOT = Path("data/candles")
+_EPOCH = datetime(1970, 1, 1)  # MT5 bar times are epoch seconds (server time)
+
+CANDLE_DTYPE = np.dtype([('time', '<i8'), ('open', '<f8'), ('high', '<f8'), ('low', '<f8'), ('close', '<f8'),
+                         ('tick_volume', '<u8'), ('spread', '<i4'), ('real_volume', '<u8')])
+
+
+def to_candles(rates) -> np.ndarray:
+    """Copy of MT5 rates (any field order, missing fields zero) with the store's dtype."""
+    candles = np.zeros(len(rates), dtype=CANDLE_DTYPE)
+    if len(rates):
+        for name in CANDLE_DTYPE.names:
+            if name in rates.dtype.names:
+                candles[name] = rates[name]
+    return candles
+
+
+def from_bars(bars) -> np.ndarray:
+    """Candles of bar dicts (naive ``datetime`` in server time, open/high/low/close/volume) as the feeds use them."""
+    candles = np.zeros(len(bars), dtype=CANDLE_DTYPE)
+    for i, bar in enumerate(bars):
+        candles[i] = (int((bar['datetime'] - _EPOCH).total_seconds()), bar['open'], bar['high'], bar['low'],
+                      bar['close'], bar['volume'], 0, 0)
+    return candles
+
+
+def merge_candles(stored: np.ndarray, fetched: np.ndarray) -> np.ndarray:
+    """Union of both, sorted by time; ``fetched`` wins where both have a bar."""
+    combined = np.concatenate([fetched, stored])
+    # np.unique returns the index of the first occurrence, i.e. the fetched bar
+    _, index = np.unique(combined['time'], return_index=True)
+    return combined[index]
+
+
+class CandleStore:
+    """Per symbol and timeframe candle files, kept up to date with delta fetches."""
+
+    def __init__(self, root: Union[str, Path] = DEFAULT_ROOT, max_bars: int = 5000):
+        """
+        Args:
+            root: Directory of the candle files
+            max_bars: Bars kept per file (the oldest are dropped)
+        """
+        self.root = Path(root)
+        self.max_bars = max_bars
+        self.fetched = 0  # Bars fetched from the terminal by sync()
+
+    def path(self, symbol: str, timeframe: str) -> Path:
+        return self.root / f"{symbol}_{timeframe.upper()}.npy"
+
+    def load(self, symbol: str, timeframe: str) -> np.ndarray:
+        """Stored candles (empty when there are none or the file is unreadable)."""
+        path = self.path(symbol, timeframe)
+        if not path.exists():
+            return np.zeros(0, dtype=CANDLE_DTYPE)
+        try:
+            candles = np.load(path, allow_pickle=False)
+        except (OSError, ValueError) as e:
+            log.warning("Ignoring unreadable candle file {}: {}", path, e)
+            return np.zeros(0, dtype=CANDLE_DTYPE)
+        if candles.dtype != CANDLE_DTYPE:
+            candles = to_candles(candles)
+        return candles
+
+    def save(self, symbol: str, timeframe: str, candles: np.ndarray):
+        path = self.path(symbol, timeframe)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, 'wb') as f:
+            np.save(f, candles[-self.max_bars:], allow_pickle=False)
+        os.replace(tmp, path)
+
+    def append(self, symbol: str, timeframe: str, rates) -> np.ndarray:
+        """Merge ``rates`` into the stored candles and save. Returns the stored candles."""
+        candles = merge_candles(self.load(symbol, timeframe), to_candles(rates))[-self.max_bars:]
+        self.save(symbol, timeframe, candles)
+        return candles
+
+    def sync(self, symbol: str, timeframe: str, mt5_timeframe: int) -> Optional[np.ndarray]:
+        """
+        Fetch the bars newer than the stored ones (or a full history when the
+        store cannot be extended), save and return all stored candles. None
+        when the terminal returned nothing and nothing is stored.
+        """
+        import MetaTrader5 as mt5
+
+        stored = self.load(symbol, timeframe)
+        rates = None
+        if len(stored):
+            last = int(stored['time'][-1])
+            now = datetime.now(timezone.utc)
+            behind = (now.timestamp() - last) / TIMEFRAME_SECONDS.get(timeframe.upper(), 60 * 60)
+            if behind <= self.max_bars:
+                # Server time may run ahead of UTC
+                rates = mt5.copy_rates_range(symbol, mt5_timeframe, datetime.fromtimestamp(last, timezone.utc),
+                                             now + timedelta(days=2))
+                if rates is None or len(rates) == 0:
+                    log.warning("No bars since {} for {} {}, reloading the history. MT5 error: {}",
+                                datetime.fromtimestamp(last, timezone.utc), symbol, timeframe, mt5.last_error())
+                    rates = None
+        if rates is None:
+            rates = mt5.copy_rates_from_pos(symbol, mt5_timeframe, 0, self.max_bars)
+            if rates is None or len(rates) == 0:
+                log.warning("copy_rates_from_pos failed for {} {}. MT5 error: {}", symbol, timeframe, mt5.last_error())
+                return stored if len(stored) else None
+            # A full history replaces the store: its gap to the stored bars is unknown
+            stored = stored[:0]
+        self.fetched += len(rates)
+        candles = merge_candles(stored, to_candles(rates))[-self.max_bars:]
+        self.save(symbol, timeframe, candles)
+        log.debug("{} {}: {} stored bars, {} fetched", symbol, timeframe, len(candles), len(rates))
+        return candles
@@ -6,11 +6,15 @@ Handles CSV files with OHLC data in various formats.
 import backtrader as bt
 import pandas as pd
 from datetime import datetime
-from typing import Optional
-from loguru import logger
+from typing import Optional, Sequence
 import os
 from pathlib import Path
 
+from src.data.timeframes import DEFAULT_TIMEFRAMES, MultiTimeframe, build_timeframes_from_frame
+from src.utils.logging import get_logger
+
+log = get_logger('feed.csv')
+
 
 class CSVDataFeed:
     """
@@ -36,12 +40,13 @@ class CSVDataFeed:
         self.count = count
         self.start_date = start_date
         self.end_date = end_date
+        self._timeframes = {}  # timeframes tuple -> MultiTimeframe (see get_timeframes)
         
         # Extract symbol and date info from filename if possible
         filename = os.path.basename(csv_file_path)
         self.symbol = self._extract_symbol_from_filename(filename)
         
-        logger.info(f"Loading CSV data from {csv_file_path}")
+        log.info("Loading CSV data from {}", csv_file_path)
         
         # Load data from CSV
         try:
@@ -50,8 +55,8 @@ class CSVDataFeed:
             if self.df.empty:
                 raise ValueError(f"No data found in CSV file {csv_file_path}")
             
-            logger.info(f"Loaded {len(self.df)} rows from CSV")
-            logger.info(f"Date range: {self.df.index.min()} to {self.df.index.max()}")
+            log.info("Loaded {} rows from CSV", len(self.df))
+            log.info("Date range: {} to {}", self.df.index.min(), self.df.index.max())
             
             # Validate required columns
             required_columns = ['Open', 'High', 'Low', 'Close']
@@ -63,12 +68,12 @@ class CSVDataFeed:
             price_columns = ['Open', 'High', 'Low', 'Close']
             for col in price_columns:
                 if self.df[col].dtype not in ['float64', 'int64']:
-                    logger.warning(f"Converting {col} to float64")
+                    log.warning("Converting {} to float64", col)
                     self.df[col] = pd.to_numeric(self.df[col], errors='coerce')
                 
                 # Check for negative prices
                 if (self.df[col] <= 0).any():
-                    logger.warning(f"Found non-positive values in {col} column")
+                    log.warning("Found non-positive values in {} column", col)
             
             # Validate OHLC relationships
             invalid_ohlc = (
@@ -80,7 +85,7 @@ class CSVDataFeed:
             )
             
             if invalid_ohlc.any():
-                logger.warning(f"Found {invalid_ohlc.sum()} rows with invalid OHLC relationships")
+                log.warning("Found {} rows with invalid OHLC relationships", invalid_ohlc.sum())
             
             # Fill any NaN values
             self.df = self.df.ffill().bfill()
@@ -90,11 +95,11 @@ class CSVDataFeed:
                 original_len = len(self.df)
                 if self.start_date is not None:
                     self.df = self.df[self.df.index >= self.start_date]
-                    logger.info(f"Filtered data: {original_len} -> {len(self.df)} rows (after start_date: {self.start_date})")
+                    log.info("Filtered data: {} -> {} rows (after start_date: {})", original_len, len(self.df), self.start_date)
                 if self.end_date is not None:
                     original_len = len(self.df)
                     self.df = self.df[self.df.index <= self.end_date]
-                    logger.info(f"Filtered data: {original_len} -> {len(self.df)} rows (after end_date: {self.end_date})")
+                    log.info("Filtered data: {} -> {} rows (after end_date: {})", original_len, len(self.df), self.end_date)
                 
                 if self.df.empty:
                     raise ValueError(f"No data found in CSV file {csv_file_path} after applying date range filter ({self.start_date} to {self.end_date})")
@@ -106,17 +111,17 @@ class CSVDataFeed:
                 if self.start_index >= len(self.df):
                     raise ValueError(f"start_index ({self.start_index}) is beyond available data length ({len(self.df)})")
                 if end_index > len(self.df):
-                    logger.warning(f"Requested end_index ({end_index}) exceeds data length ({len(self.df)}), using available data")
+                    log.warning("Requested end_index ({}) exceeds data length ({}), using available data", end_index, len(self.df))
                     end_index = len(self.df)
-                logger.info(f"Slicing data from index {self.start_index} to {end_index-1} ({end_index - self.start_index} points)")
+                log.info("Slicing data from index {} to {} ({} points)", self.start_index, end_index-1, end_index - self.start_index)
                 self.df = self.df.iloc[self.start_index:end_index]
             elif self.max_candles is not None and len(self.df) > self.max_candles:
                 # Fallback to max_candles behavior if start_index/count not specified
-                logger.info(f"Limiting data to last {self.max_candles} candlesticks (from {len(self.df)} total)")
+                log.info("Limiting data to last {} candlesticks (from {} total)", self.max_candles, len(self.df))
                 self.df = self.df.tail(self.max_candles)
             
         except Exception as e:
-            logger.error(f"Error loading CSV data: {e}")
+            log.error("Error loading CSV data: {}", e)
             raise
     
     def _extract_symbol_from_filename(self, filename: str) -> str:
@@ -220,6 +225,13 @@ class CSVDataFeed:
     def get_dataframe(self) -> pd.DataFrame:
         """Get the loaded dataframe."""
         return self.df
+
+    def get_timeframes(self, timeframes: Sequence[str] = DEFAULT_TIMEFRAMES) -> MultiTimeframe:
+        """Higher-timeframe bars of the loaded candles (built once per set of timeframes)."""
+        key = tuple(timeframes)
+        if key not in self._timeframes:
+            self._timeframes[key] = build_timeframes_from_frame(self.df, timeframes)
+        return self._timeframes[key]
     
     def get_summary(self) -> dict:
         """Get a summary of the loaded data."""
@@ -241,3 +253,89 @@ class CSVDataFeed:
                 'mean': self.df['Volume'].mean()
             }
         }
+
+
+class CSVStreamFeed(bt.CSVDataBase):
+    """
+    Backtrader feed reading a CSV row by row instead of loading it into a
+    DataFrame (low-memory backtests). Accepts the same column names as
+    CSVDataFeed; empty or invalid prices are forward-filled and rows before the
+    first complete one are skipped. ``max_candles`` keeps the last rows of the
+    file, like CSVDataFeed.
+    """
+
+    params = (
+        ('headers', False),  # the header is parsed in start() to locate the columns
+        ('max_candles', None),
+    )
+
+    TIME_COLUMNS = ('time', 'datetime', 'timestamp', 'date')
+    PRICE_COLUMNS = ('open', 'high', 'low', 'close')
+    VOLUME_COLUMNS = ('volume', 'tick_volume')
+
+    def start(self):
+        super().start()
+        header = [column.strip().lower() for column in self.f.readline().rstrip('\r\n').split(self.separator)]
+        time_columns = [header.index(name) for name in self.TIME_COLUMNS if name in header]
+        if not time_columns:
+            raise ValueError(
+                f"No time/datetime column found in CSV file: {self.p.dataname}\n"
+                f"Expected columns: ['time', 'open', 'high', 'low', 'close']\n"
+                f"Actual columns: {header}"
+            )
+        missing_columns = [name for name in self.PRICE_COLUMNS if name not in header]
+        if missing_columns:
+            raise ValueError(f"Missing required columns: {missing_columns}")
+        self._time_column = time_columns[0]
+        self._price_columns = [header.index(name) for name in self.PRICE_COLUMNS]
+        volume_columns = [header.index(name) for name in self.VOLUME_COLUMNS if name in header]
+        self._volume_column = volume_columns[0] if volume_columns else None
+        self._fill = [None] * (len(self.PRICE_COLUMNS) + 1)  # forward-fill values: OHLC, volume
+
+        # Skip to the last max_candles rows (counting the rows costs one pass over the file)
+        self._skip = 0
+        if self.p.max_candles is not None:
+            data_start = self.f.tell()
+            total_rows = sum(1 for line in self.f if line.strip())
+            self.f.seek(data_start)
+            self._skip = max(total_rows - self.p.max_candles, 0)
+            if self._skip:
+                log.info("Limiting data to last {} candlesticks (from {} total)", self.p.max_candles, total_rows)
+
+    def _load(self):
+        while True:
+            linetokens = self._getnextline()
+            if linetokens is None:
+                return False
+            if self._loadline(linetokens):
+                return True
+
+    def _loadline(self, linetokens):
+        if len(linetokens) == 1 and not linetokens[0].strip():
+            return False
+        values = self._parse(linetokens, self._price_columns + [self._volume_column])
+        for i, value in enumerate(values):
+            if value is not None:
+                self._fill[i] = value
+        if self._skip:
+            self._skip -= 1
+            return False
+        if any(value is None for value in self._fill[:len(self.PRICE_COLUMNS)]):
+            return False
+
+        dt = datetime.fromisoformat(linetokens[self._time_column].strip())
+        self.lines.datetime[0] = bt.date2num(dt)
+        self.lines.open[0], self.lines.high[0], self.lines.low[0], self.lines.close[0] = self._fill[:4]
+        self.lines.volume[0] = self._fill[4] if self._fill[4] is not None else 1000
+        self.lines.openinterest[0] = 0.0
+        return True
+
+    @staticmethod
+    def _parse(linetokens, columns):
+        values = []
+        for column in columns:
+            try:
+                values.append(float(linetokens[column]) if column is not None else None)
+            except (IndexError, ValueError):
+                values.append(None)
+        return values
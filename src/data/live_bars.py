@@ -0,0 +1,111 @@
+"""
+Alignment of live bars across the feeds of one cerebro run.
+
+Each live feed's monitor thread pushes the bars it detects into a shared
+LiveBarGate. The gate groups them into steps, one timestamp per step, and
+hands every step to the feeds exactly once: the first feed (data0, which
+cerebro asks first on each loop) takes the next step and blocks briefly when
+there is none, the other feeds read their bar of that step. A step is
+released once every feed has reported a bar at or after its timestamp, or
+after ``max_wait`` seconds, so a symbol without a bar (closed market) leaves
+its feed stale instead of holding the others back.
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional, Sequence, Tuple
+
+Bar = dict  # {'datetime': datetime, 'open', 'high', 'low', 'close', 'volume'}
+
+
+class LiveBarGate:
+    """Steps of same-timestamp live bars, shared by the live feeds of one run."""
+
+    def __init__(self, symbols: Sequence[str], max_wait: Optional[float] = 10.0):
+        self.symbols: List[str] = list(symbols)
+        self.leader = self.symbols[0]
+        self.max_wait = max_wait
+        self._cond = threading.Condition()
+        self._pending: Dict[str, Deque[Tuple[float, Bar]]] = {symbol: deque() for symbol in self.symbols}
+        self._latest = {symbol: None for symbol in self.symbols}  # datetime of the last bar pushed per symbol
+        self._steps: Deque[Dict[str, Bar]] = deque()
+        self._current: Dict[str, Bar] = {}  # step being delivered in the current cerebro loop
+        self._backfilled = set()
+        self._closed = False
+
+    # ---- Producers (monitor threads) ----
+    def push(self, symbol: str, bar: Bar):
+        """Queue a new bar of ``symbol`` (bars of one symbol arrive in time order)."""
+        with self._cond:
+            self._pending[symbol].append((time.monotonic(), bar))
+            self._latest[symbol] = bar['datetime']
+            self._release_steps()
+            self._cond.notify_all()
+
+    # ---- Consumers (MT5LiveFeed._load) ----
+    def mark_backfilled(self, symbol: str):
+        """``symbol`` has delivered all of its historical bars."""
+        with self._cond:
+            self._backfilled.add(symbol)
+
+    @property
+    def backfilled(self) -> bool:
+        return len(self._backfilled) == len(self.symbols)
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def close(self):
+        """Stop delivering bars and wake a waiting feed (the run then ends)."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def next_bar(self, symbol: str, timeout: float = 0.0) -> Optional[Bar]:
+        """
+        The bar of ``symbol`` in the current step, or None.
+
+        The leader starts a new step on each call, waiting up to ``timeout``
+        seconds for one; the other feeds are asked after it in the same loop.
+        A step is only replaced once every feed in it has taken its bar (a
+        feed still in its backfill takes it in a later loop).
+        """
+        with self._cond:
+            if symbol == self.leader:
+                if self._current:
+                    return None
+                self._current = self._take_step(timeout)
+            return self._current.pop(symbol, None)
+
+    # ---- Internals (lock held) ----
+    def _take_step(self, timeout: float) -> Dict[str, Bar]:
+        deadline = time.monotonic() + timeout
+        while not self._closed:
+            self._release_steps()
+            if self._steps:
+                return self._steps.popleft()
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            self._cond.wait(remaining)
+        return {}
+
+    def _release_steps(self):
+        now = time.monotonic()
+        while True:
+            heads = [queue[0] for queue in self._pending.values() if queue]
+            if not heads:
+                return
+            step_time = min(bar['datetime'] for _, bar in heads)
+            everyone_reported = all(latest is not None and latest >= step_time for latest in self._latest.values())
+            if not everyone_reported:
+                waited = now - min(arrival for arrival, bar in heads if bar['datetime'] == step_time)
+                if self.max_wait is None or waited < self.max_wait:
+                    return
+            self._steps.append({
+                symbol: queue.popleft()[1]
+                for symbol, queue in self._pending.items()
+                if queue and queue[0][1]['datetime'] == step_time
+            })
@@ -4,18 +4,22 @@ Provides real-time and historical data from MT5.
 """
 
 import backtrader as bt
+import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
 from typing import Optional
-from loguru import logger
 import MetaTrader5 as mt5
-import time
-import threading
-from collections import deque
 import sys
 import os
 
-from src.utils.config import Config
+from src.data.candle_store import from_bars
+from src.data.live_bars import LiveBarGate
+from src.data.mt5_poller import MT5BarPoller
+from src.utils.logging import get_logger
+
+log = get_logger('feed.mt5')
+
+_EPOCH = datetime(1970, 1, 1)  # MT5 bar times are epoch seconds (server time); bars use naive datetimes
 
 
 class MT5DataFeed:
@@ -60,7 +64,7 @@ class MT5DataFeed:
         
         self.timeframe = self.TIMEFRAME_MAP[self.timeframe_str]
         
-        logger.info(f"Setting up MT5 data feed for {symbol} - Timeframe: {timeframe}")
+        log.info("Setting up MT5 data feed for {} - Timeframe: {}", symbol, timeframe)
         
         # Track if we initialized MT5 (to avoid shutting down if initialized elsewhere)
         # Try to initialize - if it fails with "already initialized" error, we're good
@@ -72,12 +76,12 @@ class MT5DataFeed:
                 initialized = mt5.initialize()  # Let MT5 auto-detect the path
             if initialized:
                 self._initialized_here = True
-                logger.info(f"MT5 initialized successfully. Version: {mt5.version()}")
+                log.info("MT5 initialized successfully. Version: {}", mt5.version())
             else:
                 error = mt5.last_error()
                 if error[0] == 10004:  # Already initialized
                     self._initialized_here = False
-                    logger.info("MT5 already initialized, reusing connection")
+                    log.info("MT5 already initialized, reusing connection")
                 else:
                     self._initialized_here = True
                     raise ConnectionError(f"MT5 initialization failed: {error}")
@@ -86,7 +90,7 @@ class MT5DataFeed:
             account_info = mt5.account_info()
             if account_info is not None:
                 self._initialized_here = False
-                logger.info("MT5 already initialized, reusing connection")
+                log.info("MT5 already initialized, reusing connection")
             else:
                 raise
         
@@ -94,15 +98,15 @@ class MT5DataFeed:
         if login and password and server:
             account_info = mt5.account_info()
             if account_info is None or account_info.login != login:
-                logger.info(f"Logging in to MT5 account: {login}")
+                log.info("Logging in to MT5 account: {}", login)
                 if not mt5.login(login, password=password, server=server):
                     error = mt5.last_error()
                     if self._initialized_here:
                         mt5.shutdown()
                     raise ConnectionError(f"MT5 login failed: {error}")
-                logger.info("MT5 login successful")
+                log.info("MT5 login successful")
             else:
-                logger.info(f"Already logged in to account: {login}")
+                log.info("Already logged in to account: {}", login)
         
         # Verify symbol exists
         symbol_info = mt5.symbol_info(symbol)
@@ -112,13 +116,13 @@ class MT5DataFeed:
             raise ValueError(f"Symbol {symbol} not found in MT5")
         
         if not symbol_info.visible:
-            logger.warning(f"Symbol {symbol} is not visible. Attempting to enable...")
+            log.warning("Symbol {} is not visible. Attempting to enable...", symbol)
             if not mt5.symbol_select(symbol, True):
                 if self._initialized_here:
                     mt5.shutdown()
                 raise ValueError(f"Failed to enable symbol {symbol}")
         
-        logger.info(f"Symbol {symbol} verified. Bid: {symbol_info.bid}, Ask: {symbol_info.ask}")
+        log.info("Symbol {} verified. Bid: {}, Ask: {}", symbol, symbol_info.bid, symbol_info.ask)
         
         # Load historical data
         self.df = self._load_historical_data()
@@ -127,7 +131,7 @@ class MT5DataFeed:
             mt5.shutdown()
             raise ValueError(f"No historical data found for {symbol}")
         
-        logger.info(f"Loaded {len(self.df)} historical candles for {symbol}")
+        log.info("Loaded {} historical candles for {}", len(self.df), symbol)
     
     def _load_historical_data(self) -> pd.DataFrame:
         """Load historical data from MT5."""
@@ -155,25 +159,25 @@ class MT5DataFeed:
         
         to_date = now_utc
         
-        logger.info(f"Fetching historical data from {from_date} to {to_date}")
+        log.info("Fetching historical data from {} to {}", from_date, to_date)
         
         # Fetch rates
         rates = mt5.copy_rates_range(self.symbol, self.timeframe, from_date, to_date)
         
         if rates is None or len(rates) == 0:
-            logger.warning("No rates returned, trying with more days back")
+            log.warning("No rates returned, trying with more days back")
             from_date = now_utc - timedelta(days=365)  # Try 1 year
             rates = mt5.copy_rates_range(self.symbol, self.timeframe, from_date, to_date)
         
         # If still no data, try copy_rates_from_pos as fallback
         if rates is None or len(rates) == 0:
-            logger.warning(f"Still no rates for {self.symbol}, trying copy_rates_from_pos")
+            log.warning("Still no rates for {}, trying copy_rates_from_pos", self.symbol)
             num_bars = self.max_candles if self.max_candles else 1000
             rates = mt5.copy_rates_from_pos(self.symbol, self.timeframe, 0, num_bars)
         
         if rates is None or len(rates) == 0:
             error = mt5.last_error()
-            logger.error(f"No historical data found for {self.symbol}. MT5 error: {error}")
+            log.error("No historical data found for {}. MT5 error: {}", self.symbol, error)
             return pd.DataFrame()
         
         # Convert to DataFrame
@@ -243,15 +247,25 @@ class MT5DataFeed:
         """Shutdown MT5 connection (only if we initialized it)."""
         if hasattr(self, '_initialized_here') and self._initialized_here:
             mt5.shutdown()
-            logger.info("MT5 connection closed")
+            log.info("MT5 connection closed")
         else:
-            logger.debug("Skipping MT5 shutdown (connection initialized elsewhere)")
+            log.debug("Skipping MT5 shutdown (connection initialized elsewhere)")
 
 
 class MT5LiveFeed(bt.feeds.DataBase):
     """
     Live MetaTrader 5 data feed for Backtrader.
-    Extends DataBase to provide real-time bar updates without reloading historical data.
+
+    Feeds the historical bars first, then the live bars the MT5BarPoller
+    detects, within one long-running cerebro.run(): the feed reports itself as
+    live, so cerebro keeps looping (without preload/runonce) while no bar is
+    available, and strategy and indicator state stay resident. Live bars go
+    through a LiveBarGate shared by the feeds of the run, which delivers each
+    timestamp to all feeds in the same loop and exactly once.
+
+    With a ``candle_store`` the history is read from disk and only the bars
+    since the last stored one are fetched; the live bars are added to the
+    store when the feed stops. The backfill is fed from the rate arrays.
     """
     
     # MT5 timeframe mapping
@@ -269,12 +283,14 @@ class MT5LiveFeed(bt.feeds.DataBase):
         ('symbol', None),
         ('timeframe', 'H1'),
         ('max_candles', 1000),
-        ('check_interval', 1.0),  # Seconds between checks for new bars
+        ('check_interval', 1.0),  # Seconds between checks for new bars (own poller only)
+        ('resume_from', None),  # Warm restart: time of this symbol's checkpoint bar (see LiveCheckpoint)
+        ('warmup_candles', 500),  # Warm restart: bars loaded up to the checkpoint bar
+        ('candle_store', None),  # CandleStore: local history, delta-only fetches (None: full fetch each start)
     )
     
     def __init__(self):
-        import sys
-        print(f"[MT5LiveFeed.__init__] Initializing for symbol={self.p.symbol}, timeframe={self.p.timeframe}", file=sys.stderr, flush=True)
+        log.debug("MT5LiveFeed initializing for symbol={}, timeframe={}", self.p.symbol, self.p.timeframe)
         
         # Validate timeframe BEFORE calling super().__init__()
         timeframe_str = self.p.timeframe.upper()
@@ -328,54 +344,70 @@ class MT5LiveFeed(bt.feeds.DataBase):
         self._dataname = f"{self.symbol}_{self.timeframe_str}"
         
         # Historical data storage
-        self.historical_data = None
+        self.historical_data = None  # MT5 rates (structured array) of the closed historical bars
+        self._history_bars = []  # (datetime, open, high, low, close, volume) per historical bar
+        self._live_bars = []  # Live bars, added to the candle store on stop()
         self.current_bar_index = 0
         self.last_bar_time = None
         self.historical_fed = False  # Track if historical data has been fed
         
-        # Live data queue
-        self.live_bar_queue = deque()
-        self.live_mode = False  # True when we've finished feeding historical data
-        self.reset_flag = False  # Flag to reset for new run() call
-        self.last_fed_bar = None  # Store last bar fed to backtrader for stale data
-        self.fed_stale_this_run = False  # Track if we've fed stale data in this run()
-        
-        # Threading for live bar detection
-        self.monitor_thread = None
-        self.stop_monitoring = threading.Event()
+        # Live bars: pushed by the poller, delivered through the gate
+        # (main.live_trading replaces both with one gate and one poller shared by all feeds)
+        self.gate = LiveBarGate([self.symbol])
+        self.poller = None  # MT5BarPoller; a private one is started when none is set
+        self._own_poller = False
+        self.live_mode = False  # True once live bars are fed (orders are rejected during the backfill)
+        self.last_fed_bar = None  # Last bar fed to backtrader
         
         # MT5 initialization tracking
         self._initialized_here = False
     
+    def islive(self):
+        """Live feed: cerebro runs bar by bar and keeps looping while _load returns None."""
+        return True
+
     def start(self):
-        """Called when the feed starts. Load historical data and start monitoring."""
+        """Called when the feed starts. Load historical data and subscribe to the poller."""
         super(MT5LiveFeed, self).start()
         
-        # If historical data is already loaded, skip reloading (happens on subsequent cerebro.run() calls)
-        if self.historical_data is not None and len(self.historical_data) > 0:
-            logger.debug(f"Historical data already loaded for {self.symbol}, skipping reload")
-            return
-        
-        # Load historical data (only on first call)
-        logger.info(f"Loading historical data for {self.symbol}...")
+        log.info("Loading historical data for {}...", self.symbol)
         self.historical_data = self._load_historical_data()
         
         if self.historical_data is None or len(self.historical_data) == 0:
             raise ValueError(f"No historical data found for {self.symbol}")
+        # The newest bar is still forming: the poller delivers it once it has closed
+        self.historical_data = self.historical_data[:-1]
+        history = self.historical_data
+        self._history_bars = list(zip(
+            [_EPOCH + timedelta(seconds=t) for t in history['time'].tolist()],
+            history['open'].tolist(), history['high'].tolist(), history['low'].tolist(),
+            history['close'].tolist(), history['tick_volume'].tolist()))
         
         # Set last bar time from historical data
-        if len(self.historical_data) > 0:
-            self.last_bar_time = self.historical_data.index[-1]
-            logger.info(f"Loaded {len(self.historical_data)} historical bars. Last bar: {self.last_bar_time}")
-        
-        # Don't start monitoring thread here - it's started manually in main() after first run
+        if len(self._history_bars) > 0:
+            self.last_bar_time = self._history_bars[-1][0]
+            log.info("Loaded {} historical bars. Last bar: {}", len(self.historical_data), self.last_bar_time)
+        
+        # New bars are queued in the gate while the historical bars are fed
+        if self.poller is None:
+            self.poller = MT5BarPoller(interval=self.p.check_interval)
+            self._own_poller = True
+        last_time = int(pd.Timestamp(self.last_bar_time).timestamp()) if self.last_bar_time is not None else 0
+        self.poller.subscribe(self.symbol, self.timeframe, self.timeframe_str, last_time, self._on_new_bar)
+        self.poller.start()
     
     def stop(self):
-        """Called when the feed stops. Clean up resources."""
-        # Don't stop the monitoring thread here - we want it to keep running
-        # backtrader calls stop() when cerebro.run() completes, but we want
-        # the thread to keep monitoring for new bars
-        logger.debug(f"stop() called for {self.symbol}, but keeping monitoring thread alive")
+        """Called when cerebro.run() ends. Unsubscribe from the poller."""
+        if self.poller is not None:
+            self.poller.unsubscribe(self.symbol)
+            if self._own_poller:
+                self.poller.stop()
+        if self.p.candle_store is not None and self._live_bars:
+            try:
+                self.p.candle_store.append(self.symbol, self.timeframe_str, from_bars(self._live_bars))
+            except Exception as e:
+                log.error("Saving {} live bars of {} to the candle store failed: {}", len(self._live_bars), self.symbol, e)
+        log.debug("Stopped live feed for {}", self.symbol)
         super(MT5LiveFeed, self).stop()
     
     def getwriterinfo(self):
@@ -422,18 +454,18 @@ class MT5LiveFeed(bt.feeds.DataBase):
         return info
     
     
-    def _load_historical_data(self) -> Optional[pd.DataFrame]:
-        """Load historical data from MT5."""
+    def _load_historical_data(self) -> Optional[np.ndarray]:
+        """Load historical rates: from the candle store (delta fetch) or from MT5."""
         # Verify symbol is enabled
         symbol_info = mt5.symbol_info(self.symbol)
         if symbol_info is None:
-            logger.error(f"Symbol {self.symbol} not found in MT5")
+            log.error("Symbol {} not found in MT5", self.symbol)
             return None
         
         if not symbol_info.visible:
-            logger.warning(f"Symbol {self.symbol} is not visible. Attempting to enable...")
+            log.warning("Symbol {} is not visible. Attempting to enable...", self.symbol)
             if not mt5.symbol_select(self.symbol, True):
-                logger.error(f"Failed to enable symbol {self.symbol}")
+                log.error("Failed to enable symbol {}", self.symbol)
                 return None
         
         # Use UTC time for MT5 (MT5 uses UTC)
@@ -458,273 +490,147 @@ class MT5LiveFeed(bt.feeds.DataBase):
         
         to_date = now_utc
         
-        logger.debug(f"Fetching historical data for {self.symbol} from {from_date} to {to_date}")
+        log.debug("Fetching historical data for {} from {} to {}", self.symbol, from_date, to_date)
         
         # Ensure symbol is selected before fetching (sometimes needed even if done earlier)
         if not mt5.symbol_select(self.symbol, True):
-            logger.warning(f"Could not select symbol {self.symbol}, but continuing anyway")
+            log.warning("Could not select symbol {}, but continuing anyway", self.symbol)
         
         # Use copy_rates_from_pos as primary method to get the most recent complete bars
         # This ensures we get the latest bars available, not just bars up to now_utc (which excludes incomplete bars)
         num_bars = self.p.max_candles if self.p.max_candles else 1000
-        rates = mt5.copy_rates_from_pos(self.symbol, self.timeframe, 0, num_bars)
+        rates = None
+        if self.p.candle_store is not None:
+            rates = self.p.candle_store.sync(self.symbol, self.timeframe_str, self.timeframe)
+            if rates is not None and self.p.resume_from is not None:
+                rates = self._resume_slice(rates)
+        elif self.p.resume_from is not None:
+            rates = self._resume_rates(num_bars)
+        if rates is None:
+            rates = mt5.copy_rates_from_pos(self.symbol, self.timeframe, 0, num_bars)
         
         # Fallback to copy_rates_range if copy_rates_from_pos fails
         if rates is None or len(rates) == 0:
             error = mt5.last_error()
-            logger.warning(f"copy_rates_from_pos failed for {self.symbol}, trying copy_rates_range. MT5 error: {error}")
+            log.warning("copy_rates_from_pos failed for {}, trying copy_rates_range. MT5 error: {}", self.symbol, error)
             rates = mt5.copy_rates_range(self.symbol, self.timeframe, from_date, to_date)
             
             if rates is None or len(rates) == 0:
                 error = mt5.last_error()
-                logger.warning(f"No rates returned for {self.symbol} with date range, trying with more days back. MT5 error: {error}")
+                log.warning("No rates returned for {} with date range, trying with more days back. MT5 error: {}", self.symbol, error)
                 from_date = now_utc - timedelta(days=365)
                 rates = mt5.copy_rates_range(self.symbol, self.timeframe, from_date, to_date)
                 
                 if rates is None or len(rates) == 0:
                     error = mt5.last_error()
-                    logger.warning(f"Still no rates for {self.symbol} with date range. MT5 error: {error}")
+                    log.warning("Still no rates for {} with date range. MT5 error: {}", self.symbol, error)
                     # Try copy_rates_from_pos with fewer bars as last resort
                     rates = mt5.copy_rates_from_pos(self.symbol, self.timeframe, 0, 100)
                     
                     if rates is None or len(rates) == 0:
-                        logger.warning(f"Trying with just 10 bars...")
+                        log.warning("Trying with just 10 bars...")
                         rates = mt5.copy_rates_from_pos(self.symbol, self.timeframe, 0, 10)
         
         if rates is None or len(rates) == 0:
             error = mt5.last_error()
-            logger.error(f"No historical data found for {self.symbol} after all attempts. MT5 error: {error}")
+            log.error("No historical data found for {} after all attempts. MT5 error: {}", self.symbol, error)
             # Try to get symbol info to see what's available
             symbol_info = mt5.symbol_info(self.symbol)
             if symbol_info:
-                logger.error(f"Symbol info: visible={symbol_info.visible}, select={symbol_info.select}")
+                log.error("Symbol info: visible={}, select={}", symbol_info.visible, symbol_info.select)
             return None
         
-        # Convert to DataFrame
-        df = pd.DataFrame(rates)
-        df['time'] = pd.to_datetime(df['time'], unit='s')
-        df.set_index('time', inplace=True)
-        
-        # Rename columns
-        df.rename(columns={
-            'open': 'Open',
-            'high': 'High',
-            'low': 'Low',
-            'close': 'Close',
-            'tick_volume': 'Volume'
-        }, inplace=True)
-        
         # Limit to max_candles if specified
-        if self.p.max_candles and len(df) > self.p.max_candles:
-            df = df.tail(self.p.max_candles)
+        if self.p.max_candles and len(rates) > self.p.max_candles:
+            rates = rates[-self.p.max_candles:]
         
-        return df
+        return rates
     
-    def _monitor_new_bars(self):
-        """Monitor for new bars in a separate thread."""
-        # Use print() first to ensure we can see if thread is running
-        print(f"[_monitor_new_bars] THREAD FUNCTION CALLED for {self.symbol}")
-        
-        # Log immediately to confirm thread is running
-        try:
-            logger.info(f"*** Monitor thread FUNCTION CALLED for {self.symbol} ***")
-            print(f"[_monitor_new_bars] Logger works for {self.symbol}")
-        except Exception as e:
-            print(f"[_monitor_new_bars] CRITICAL: Cannot log! Error: {e}")
-            import traceback
-            traceback.print_exc()
-            return
-        
-        try:
-            print(f"[_monitor_new_bars] Thread STARTED for {self.symbol}. Waiting for historical data...")
-            logger.info(f"*** Monitor thread STARTED for {self.symbol}. Waiting for historical data... ***")
-            wait_count = 0
-            max_wait = 1000  # Max 100 seconds wait for last_bar_time
-            
-            # Verify we have access to required attributes
-            if not hasattr(self, 'symbol'):
-                logger.error(f"Monitor thread: self.symbol not found!")
-                return
-            if not hasattr(self, 'timeframe'):
-                logger.error(f"Monitor thread: self.timeframe not found!")
-                return
-            
-            logger.info(f"Monitor thread for {self.symbol} entering main loop...")
-            while not self.stop_monitoring.is_set():
-                try:
-                    # Wait for historical data to be loaded before monitoring
-                    if self.last_bar_time is None:
-                        wait_count += 1
-                        if wait_count % 10 == 0:  # Log every second (10 * 0.1s)
-                            logger.info(f"Monitor thread for {self.symbol} still waiting for last_bar_time to be set... (waited {wait_count * 0.1:.1f}s)")
-                        if wait_count > max_wait:
-                            logger.error(f"Monitor thread for {self.symbol} timed out waiting for last_bar_time!")
-                            break
-                        time.sleep(0.1)
-                        continue
-                    
-                    # Log that we're monitoring (first time only)
-                    if not hasattr(self, '_monitoring_started'):
-                        logger.info(f"Monitor thread for {self.symbol} is now actively checking for new bars. Last bar time: {self.last_bar_time}")
-                        self._monitoring_started = True
-                    
-                    # Fetch latest bars from MT5
-                    rates = mt5.copy_rates_from_pos(self.symbol, self.timeframe, 0, 2)
-                    
-                    if rates is not None and len(rates) > 0:
-                        # Convert to DataFrame
-                        df_new = pd.DataFrame(rates)
-                        df_new['time'] = pd.to_datetime(df_new['time'], unit='s')
-                        df_new.set_index('time', inplace=True)
-                        
-                        # Rename columns
-                        df_new.rename(columns={
-                            'open': 'Open',
-                            'high': 'High',
-                            'low': 'Low',
-                            'close': 'Close',
-                            'tick_volume': 'Volume'
-                        }, inplace=True)
-                        
-                        # Check if we have a new bar
-                        latest_bar_time = df_new.index[-1]
-                        
-                        if self.last_bar_time is None or latest_bar_time > self.last_bar_time:
-                            # New bar found!
-                            latest_bar = df_new.iloc[-1]
-                            
-                            logger.info(f"*** NEW {self.timeframe_str} BAR DETECTED for {self.symbol} at {latest_bar_time}: "
-                                      f"O={latest_bar['Open']:.5f}, H={latest_bar['High']:.5f}, "
-                                      f"L={latest_bar['Low']:.5f}, C={latest_bar['Close']:.5f} ***")
-                            
-                            # Add to queue
-                            self.live_bar_queue.append({
-                                'datetime': latest_bar_time,
-                                'open': float(latest_bar['Open']),
-                                'high': float(latest_bar['High']),
-                                'low': float(latest_bar['Low']),
-                                'close': float(latest_bar['Close']),
-                                'volume': int(latest_bar['Volume'])
-                            })
-                            
-                            logger.info(f"Bar added to queue. Queue size for {self.symbol}: {len(self.live_bar_queue)}")
-                            self.last_bar_time = latest_bar_time
-                        else:
-                            # Log when we check but no new bar (every 10 checks to avoid spam, only if debug logs enabled)
-                            if not hasattr(self, '_check_count'):
-                                self._check_count = 0
-                            self._check_count += 1
-                            if Config.show_debug_logs and self._check_count % 10 == 0:
-                                logger.debug(f"Monitor check {self._check_count} for {self.symbol}: No new bar yet. Latest: {latest_bar_time}, Last processed: {self.last_bar_time}")
-                    
-                    # Sleep before next check
-                    time.sleep(self.p.check_interval)
-                    
-                except Exception as e:
-                    logger.error(f"*** ERROR in monitor thread loop for {self.symbol}: {e} ***")
-                    import traceback
-                    logger.error(f"Traceback: {traceback.format_exc()}")
-                    time.sleep(self.p.check_interval)
-        except Exception as e:
-            logger.error(f"*** FATAL ERROR in monitor thread for {self.symbol}: {e} ***")
-            import traceback
-            logger.error(f"Traceback: {traceback.format_exc()}")
-        finally:
-            logger.warning(f"Monitor thread for {self.symbol} is exiting!")
+    def _resume_rates(self, max_bars: int):
+        """
+        Warm restart: ``warmup_candles`` bars up to the checkpoint bar and the
+        bars since then. None (full backfill) when the checkpoint bar is not
+        available or more than ``max_bars`` bars would be needed.
+        """
+        from datetime import timezone
+        resume_from = pd.Timestamp(self.p.resume_from).to_pydatetime().replace(tzinfo=timezone.utc)
+        history = mt5.copy_rates_from(self.symbol, self.timeframe, resume_from, self.p.warmup_candles)
+        if history is None or len(history) == 0 or int(history['time'][-1]) != int(resume_from.timestamp()):
+            log.warning("Checkpoint bar {} of {} not available, loading the full history", self.p.resume_from, self.symbol)
+            return None
+        missed = mt5.copy_rates_range(self.symbol, self.timeframe, resume_from + timedelta(seconds=1),
+                                      datetime.now(timezone.utc) + timedelta(days=2))  # Server time may run ahead of UTC
+        if missed is not None and len(missed):
+            if len(history) + len(missed) > max_bars:
+                log.warning("{} bars of {} missed since the checkpoint, loading the full history", len(missed), self.symbol)
+                return None
+            history = np.concatenate([history, missed])
+        log.info("Warm restart of {}: {} warm-up bars up to {} and {} missed bars", self.symbol, len(history) - (len(missed) if missed is not None else 0), self.p.resume_from, len(missed) if missed is not None else 0)
+        return history
+    
+    def _resume_slice(self, candles: np.ndarray) -> np.ndarray:
+        """Warm restart from stored candles: ``warmup_candles`` bars up to the checkpoint bar and the bars since then."""
+        resume_time = int(pd.Timestamp(self.p.resume_from).timestamp())
+        end = int(np.searchsorted(candles['time'], resume_time, side='right'))
+        if end == 0 or int(candles['time'][end - 1]) != resume_time:
+            log.warning("Checkpoint bar {} of {} not in the candle store, loading the full history", self.p.resume_from, self.symbol)
+            return candles
+        start = max(0, end - self.p.warmup_candles)
+        log.info("Warm restart of {}: {} warm-up bars up to {} and {} missed bars", self.symbol, end - start, self.p.resume_from, len(candles) - end)
+        return candles[start:]
+    
+    def _on_new_bar(self, symbol: str, bar: dict):
+        """Poller callback (poller thread): queue the bar that just closed in the gate."""
+        log.info("*** {} BAR CLOSED for {} at {}: O={:.5f}, H={:.5f}, L={:.5f}, C={:.5f} ***", self.timeframe_str, symbol, bar['datetime'], bar['open'], bar['high'], bar['low'], bar['close'])
+        self.last_bar_time = bar['datetime']
+        self._live_bars.append(bar)
+        self.gate.push(symbol, bar)
     
     def _load(self):
         """
         Load the next bar. Called by backtrader repeatedly.
-        Returns True if data was loaded, False if no more data available.
+        Returns True when a bar was loaded, None when no live bar is available
+        yet (cerebro keeps looping) and False once the gate is closed (the run ends).
         """
-        # Handle reset: if reset_flag is set, we're starting a new run() call
-        # Skip historical data and only feed new live bars
-        if self.reset_flag:
-            self.reset_flag = False
-            # Mark historical as fed, but don't set live_mode yet - only set it when we actually feed a live bar
-            self.historical_fed = True
-            self.live_mode = False  # Don't set to True until we actually feed a live bar
-            logger.debug(f"Feed {self.symbol} reset for new run - skipping historical data, waiting for live bars")
-        
-        # First run: feed all historical bars
+        # Historical backfill: one bar per call
         if not self.historical_fed and self.historical_data is not None:
-            # During historical backfill, live_mode should be False
-            self.live_mode = False
-            
-            if self.current_bar_index < len(self.historical_data):
-                # Feed next historical bar
-                bar = self.historical_data.iloc[self.current_bar_index]
-                
-                # Store as last fed bar for stale data support
-                self.last_fed_bar = {
-                    'datetime': bar.name,
-                    'open': float(bar['Open']),
-                    'high': float(bar['High']),
-                    'low': float(bar['Low']),
-                    'close': float(bar['Close']),
-                    'volume': int(bar['Volume'])
-                }
-                
-                # Populate lines
-                self.lines.datetime[0] = bt.date2num(bar.name)
-                self.lines.open[0] = float(bar['Open'])
-                self.lines.high[0] = float(bar['High'])
-                self.lines.low[0] = float(bar['Low'])
-                self.lines.close[0] = float(bar['Close'])
-                self.lines.volume[0] = int(bar['Volume'])
-                self.lines.openinterest[0] = 0
-                
+            if self.current_bar_index < len(self._history_bars):
+                bar_time, open_, high, low, close, volume = self._history_bars[self.current_bar_index]
+                self._fill_lines({
+                    'datetime': bar_time,
+                    'open': open_,
+                    'high': high,
+                    'low': low,
+                    'close': close,
+                    'volume': volume
+                })
                 self.current_bar_index += 1
                 if self.current_bar_index % 100 == 0:
-                    logger.debug(f"Fed {self.current_bar_index}/{len(self.historical_data)} historical bars for {self.symbol}")
-                return True
-            else:
-                # Finished feeding historical data
-                self.historical_fed = True
-                # Don't set live_mode to True yet - only set it when we actually feed a live bar
-                self.live_mode = False
-                logger.info(f"Finished feeding historical data for {self.symbol}. Waiting for live bars...")
-        
-        # Live mode: check for new bars in queue
-        # Only set live_mode to True when we actually feed a live bar
-        # IMPORTANT: Only return True if we have a new bar - don't use stale data
-        # This ensures we wait for all feeds to have bars before processing
-        if self.historical_fed:
-            if len(self.live_bar_queue) > 0:
-                # Feed next live bar - NOW we're in live mode
-                self.live_mode = True
-                bar = self.live_bar_queue.popleft()
-                self.last_fed_bar = bar  # Store for reference
-                
-                logger.info(f"*** FEEDING LIVE BAR to backtrader for {self.symbol} at {bar['datetime']}: "
-                           f"O={bar['open']:.5f}, H={bar['high']:.5f}, "
-                           f"L={bar['low']:.5f}, C={bar['close']:.5f} ***")
-                
-                # Populate lines
-                self.lines.datetime[0] = bt.date2num(bar['datetime'])
-                self.lines.open[0] = bar['open']
-                self.lines.high[0] = bar['high']
-                self.lines.low[0] = bar['low']
-                self.lines.close[0] = bar['close']
-                self.lines.volume[0] = bar['volume']
-                self.lines.openinterest[0] = 0
-                
+                    log.debug("Fed {}/{} historical bars for {}", self.current_bar_index, len(self._history_bars), self.symbol)
                 return True
-            else:
-                # No new bars - return False
-                # Backtrader will wait until all feeds have bars before calling next()
-                if Config.show_debug_logs:
-                    logger.debug(f"No bars in queue for {self.symbol}, returning False")
-                return False
-        
-        # No more data
-        return False
+            self.historical_fed = True
+            self.gate.mark_backfilled(self.symbol)
+            log.info("Finished feeding historical data for {}. Waiting for live bars...", self.symbol)
+        
+        if self.gate.closed:
+            return False
+        
+        # Live bars: only wait for one once every feed is done with its backfill
+        bar = self.gate.next_bar(self.symbol, timeout=self.p.check_interval if self.gate.backfilled else 0.0)
+        if bar is None:
+            return None
+        
+        self.live_mode = True
+        log.debug("*** FEEDING LIVE BAR to backtrader for {} at {}: O={:.5f}, H={:.5f}, L={:.5f}, C={:.5f} ***", self.symbol, bar['datetime'], bar['open'], bar['high'], bar['low'], bar['close'])
+        self._fill_lines(bar)
+        return True
     
-    def prepare_for_next_run(self):
-        """Call this before a new run() to prepare the feed."""
-        # Set reset flag so we skip re-feeding historical data
-        # Don't set live_mode to True yet - only set it when we actually feed a live bar
-        self.reset_flag = True
-        self.historical_fed = True
-        self.live_mode = False  # Don't set to True until we actually feed a live bar
-
+    def _fill_lines(self, bar: dict):
+        self.last_fed_bar = bar
+        self.lines.datetime[0] = bt.date2num(bar['datetime'])
+        self.lines.open[0] = bar['open']
+        self.lines.high[0] = bar['high']
+        self.lines.low[0] = bar['low']
+        self.lines.close[0] = bar['close']
+        self.lines.volume[0] = bar['volume']
+        self.lines.openinterest[0] = 0
@@ -0,0 +1,336 @@
+"""
+One market-data poller for all live MT5 feeds.
+
+The MetaTrader5 API talks to a single terminal and serialises calls, so one
+thread per symbol only queues up behind the same lock. MT5BarPoller runs one
+thread that asks the terminal for the latest bars of the subscribed symbols,
+reads the returned structured array directly (no pandas) and hands every
+newly closed bar to the subscriber's sink (MT5LiveFeed: the LiveBarGate,
+which keeps a queue per symbol).
+
+Polls follow the bar boundaries of each symbol's timeframe instead of a
+fixed interval: a new bar can only open at ``open time + timeframe`` (broker
+server time), so the poller sleeps until ``lead`` seconds before that
+moment, polls every ``burst_interval`` seconds until the new bar appears and
+then goes idle until the next boundary. Bars that do not appear within
+``burst_window`` seconds (closed market, no ticks yet) are polled every
+``interval`` seconds. Server time minus UTC is taken from ``server_offset``
+(Config.mt5_server_utc_offset). Otherwise it is measured whenever a new bar
+is seen, from the time of the symbol's last tick (symbol_info_tick): a new
+bar opens with a tick, so that tick is at most a poll old. The open time of
+the bar is no such clock, as the first tick may come long after it. Every
+new bar re-measures the offset, which follows DST changes of the server.
+A configured offset is checked the same way and a mismatch logged. Until an
+offset is known, symbols are polled every ``interval`` seconds.
+
+A bar is dispatched once a newer bar exists, i.e. once it is closed: the
+newest bar returned by copy_rates_from_pos(..., 0, n) is the forming one.
+
+Per symbol, the time of every copy_rates_from_pos call and the delay between
+the expected bar open and its detection are recorded (stats()).
+
+Schedules run on ``clock`` (UTC epoch seconds, time.time by default); a
+replayed terminal (src.sim.fake_mt5) passes its accelerated clock and
+``speed``, and the intervals above stay in wall seconds.
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+import MetaTrader5 as mt5
+
+from src.data.timeframes import TIMEFRAME_SECONDS
+from src.utils.logging import get_logger
+
+log = get_logger('feed.mt5.poller')
+
+_EPOCH = datetime(1970, 1, 1)  # MT5 bar times are epoch seconds (server time); bars use naive datetimes
+_OFFSET_STEP = 30 * 60  # Server offsets are whole half hours
+
+
+@dataclass
+class PollStats:
+    """copy_rates_from_pos timings and new-bar detection delays of one symbol."""
+    polls: int = 0
+    errors: int = 0
+    new_bars: int = 0
+    last_ms: float = 0.0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    detections: int = 0
+    last_detect_ms: float = 0.0
+    total_detect_ms: float = 0.0
+    max_detect_ms: float = 0.0
+
+    @property
+    def mean_ms(self) -> float:
+        return self.total_ms / self.polls if self.polls else 0.0
+
+    @property
+    def mean_detect_ms(self) -> float:
+        return self.total_detect_ms / self.detections if self.detections else 0.0
+
+    def record(self, elapsed_ms: float):
+        self.polls += 1
+        self.last_ms = elapsed_ms
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+
+    def record_detection(self, delay_ms: float):
+        self.detections += 1
+        self.last_detect_ms = delay_ms
+        self.total_detect_ms += delay_ms
+        self.max_detect_ms = max(self.max_detect_ms, delay_ms)
+
+
+@dataclass
+class _Subscription:
+    symbol: str
+    timeframe: int  # MT5 timeframe constant
+    seconds: int  # Bar length
+    last_time: int  # Server time of the last bar handed to the sink
+    sink: Callable[[str, dict], None]
+    forming_time: Optional[int] = None  # Server time of the newest (forming) bar seen
+    next_poll: float = 0.0  # Poller clock time of the next poll
+
+
+class MT5BarPoller:
+    """Polls the subscribed symbols from one thread, around their bar boundaries."""
+
+    def __init__(self, interval: float = 1.0, count: int = 3, server_offset: Optional[float] = None,
+                 lead: float = 0.5, burst_interval: float = 0.05, burst_window: float = 60.0,
+                 clock: Callable[[], float] = time.time, speed: float = 1.0):
+        """
+        Args:
+            interval: Seconds between polls while the next bar open is unknown or overdue
+            count: Bars requested per poll (the newest one is the forming bar)
+            server_offset: Broker server time minus UTC in seconds (measured from ticks when None)
+            lead: Seconds before the expected bar open at which burst polling starts
+            burst_interval: Seconds between polls while waiting for a bar to open
+            burst_window: Seconds after the expected bar open during which to burst-poll
+            clock: Current UTC time in epoch seconds
+            speed: Clock seconds per wall second
+        """
+        self.interval = interval
+        self.count = max(2, count)
+        self.server_offset = server_offset
+        self.fixed_offset = server_offset is not None
+        self._mismatch: Optional[int] = None  # Last measured offset that disagreed with the configured one
+        self.lead = lead
+        self.burst_interval = burst_interval
+        self.burst_window = burst_window
+        self.clock = clock
+        self.speed = speed
+        self._lock = threading.Lock()
+        self._subscriptions: Dict[str, _Subscription] = {}
+        self._stats: Dict[str, PollStats] = {}
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # ---- Subscriptions ----
+    def subscribe(self, symbol: str, timeframe: int, timeframe_str: str, last_time: int,
+                  sink: Callable[[str, dict], None]):
+        """
+        Start polling ``symbol``; closed bars newer than ``last_time`` (epoch
+        seconds, server time) are passed to ``sink(symbol, bar)`` from the
+        poller thread.
+
+        Args:
+            timeframe: MT5 timeframe constant
+            timeframe_str: Its name ('M1' ... 'D1'), for the bar length
+        """
+        with self._lock:
+            self._subscriptions[symbol] = _Subscription(symbol, timeframe, TIMEFRAME_SECONDS[timeframe_str.upper()],
+                                                        int(last_time), sink)
+            self._stats.setdefault(symbol, PollStats())
+        self._wake.set()
+
+    def unsubscribe(self, symbol: str):
+        with self._lock:
+            self._subscriptions.pop(symbol, None)
+
+    @property
+    def symbols(self) -> List[str]:
+        with self._lock:
+            return list(self._subscriptions)
+
+    # ---- Thread ----
+    def start(self):
+        """Start the polling thread (no-op when it is already running)."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True, name="MT5BarPoller")
+        self._thread.start()
+        log.info("MT5 bar poller started ({} symbols)", len(self.symbols))
+
+    def stop(self):
+        """Stop the polling thread and wait for the current poll to finish."""
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=max(self.interval, 1.0) * 2)
+        self._thread = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.poll_due()
+            except Exception as e:
+                log.exception("MT5 bar poller cycle failed: {}", e)
+            wake_at = self.next_poll_time()
+            timeout = self.interval if wake_at is None else max(0.0, (wake_at - self.clock()) / self.speed)
+            self._wake.wait(timeout)
+            self._wake.clear()
+        log.debug("MT5 bar poller stopped")
+
+    # ---- Polling ----
+    def next_poll_time(self) -> Optional[float]:
+        """Clock time of the earliest scheduled poll (None without subscriptions)."""
+        with self._lock:
+            return min((subscription.next_poll for subscription in self._subscriptions.values()), default=None)
+
+    def poll_due(self) -> int:
+        """Poll the symbols whose next poll is due. Returns the number of bars dispatched."""
+        now = self.clock()
+        with self._lock:
+            subscriptions = [s for s in self._subscriptions.values() if s.next_poll <= now]
+        return self._poll(subscriptions)
+
+    def poll_once(self) -> int:
+        """Poll every subscribed symbol now. Returns the number of bars dispatched."""
+        with self._lock:
+            subscriptions = list(self._subscriptions.values())
+        return self._poll(subscriptions)
+
+    def _poll(self, subscriptions: List[_Subscription]) -> int:
+        dispatched = 0
+        for subscription in subscriptions:
+            if self._stop.is_set():
+                break
+            for bar in self._poll_symbol(subscription):
+                try:
+                    subscription.sink(subscription.symbol, bar)
+                except Exception as e:
+                    log.error("Dispatching the new bar of {} failed: {}", subscription.symbol, e)
+                    continue
+                dispatched += 1
+        return dispatched
+
+    def _poll_symbol(self, subscription: _Subscription) -> List[dict]:
+        symbol = subscription.symbol
+        stats = self._stats[symbol]
+        started = time.perf_counter()
+        try:
+            rates = mt5.copy_rates_from_pos(symbol, subscription.timeframe, 0, self.count)
+        except Exception as e:
+            rates = None
+            stats.errors += 1
+            if self._should_report(stats):
+                log.error("copy_rates_from_pos failed for {} ({} times): {}", symbol, stats.errors, e)
+        finally:
+            stats.record((time.perf_counter() - started) * 1000.0)
+        now = self.clock()
+
+        if rates is None or len(rates) == 0:
+            if rates is not None:
+                stats.errors += 1
+                if self._should_report(stats):
+                    log.warning("No rates returned for {} ({} times): {}", symbol, stats.errors, mt5.last_error())
+            subscription.next_poll = now + self.interval * self.speed
+            return []
+
+        times = rates['time']
+        forming_time = int(times[-1])
+        if subscription.forming_time is not None and forming_time > subscription.forming_time:
+            self._on_bar_open(subscription, stats, forming_time, now)
+        subscription.forming_time = forming_time
+        subscription.next_poll = self._schedule(subscription, now)
+
+        # Every bar but the newest one is closed
+        bars = []
+        for row in rates[:-1]:
+            bar_time = int(row['time'])
+            if bar_time <= subscription.last_time:
+                continue
+            subscription.last_time = bar_time
+            stats.new_bars += 1
+            bars.append({
+                'datetime': _EPOCH + timedelta(seconds=bar_time),
+                'open': float(row['open']),
+                'high': float(row['high']),
+                'low': float(row['low']),
+                'close': float(row['close']),
+                'volume': int(row['tick_volume']),
+            })
+        return bars
+
+    def _on_bar_open(self, subscription: _Subscription, stats: PollStats, bar_time: int, now: float):
+        """A new bar opened at ``bar_time`` (server time) and was seen at ``now`` (UTC)."""
+        self._check_offset(subscription.symbol, bar_time, now)
+        if self.server_offset is not None:
+            stats.record_detection((now - (bar_time - self.server_offset)) / self.speed * 1000.0)
+
+    def _check_offset(self, symbol: str, bar_time: int, now: float):
+        """Measure the server offset from the last tick of ``symbol`` (which opened or followed ``bar_time``)."""
+        try:
+            tick = mt5.symbol_info_tick(symbol)
+        except Exception as e:
+            log.warning("symbol_info_tick failed for {}: {}", symbol, e)
+            return
+        if tick is None or int(tick.time) < bar_time:
+            return  # No tick of the new bar: its time says nothing about the clock
+        offset = round((int(tick.time) - now) / _OFFSET_STEP) * _OFFSET_STEP
+        if offset == self.server_offset:
+            return
+        if self.fixed_offset:
+            if offset != self._mismatch:
+                self._mismatch = offset
+                log.warning("Broker server time of {} is UTC{:+.1f}h, configured: UTC{:+.1f}h", symbol,
+                            offset / 3600, self.server_offset / 3600)
+            return
+        if self.server_offset is None:
+            log.info("Broker server time offset measured on {}: UTC{:+.1f}h", symbol, offset / 3600)
+        else:
+            log.warning("Broker server time offset of {} changed: UTC{:+.1f}h -> UTC{:+.1f}h", symbol,
+                        self.server_offset / 3600, offset / 3600)
+        self.server_offset = offset
+
+    def _schedule(self, subscription: _Subscription, now: float) -> float:
+        """Clock time of the next poll of ``subscription``."""
+        if self.server_offset is None or subscription.forming_time is None:
+            return now + self.interval * self.speed
+        expected = subscription.forming_time + subscription.seconds - self.server_offset
+        if now < expected - self.lead * self.speed:
+            return expected - self.lead * self.speed  # Idle until shortly before the next bar opens
+        if now < expected + self.burst_window * self.speed:
+            return now + self.burst_interval * self.speed
+        return now + self.interval * self.speed  # Overdue: market closed or no tick yet
+
+    @staticmethod
+    def _should_report(stats: PollStats) -> bool:
+        # A symbol failing every poll is logged on the first and every 100th failure
+        return stats.errors == 1 or stats.errors % 100 == 0
+
+    # ---- Reporting ----
+    def stats(self) -> Dict[str, PollStats]:
+        """Per-symbol poll statistics (copies)."""
+        with self._lock:
+            return {symbol: PollStats(**vars(stats)) for symbol, stats in self._stats.items()}
+
+    def format_stats(self) -> str:
+        """One-line summary per symbol: polls, mean/max poll time and mean/max detection delay."""
+        return ", ".join(
+            f"{symbol} {stats.polls} polls {stats.mean_ms:.1f}/{stats.max_ms:.1f}ms"
+            f" detect {stats.mean_detect_ms:.0f}/{stats.max_detect_ms:.0f}ms"
+            + (f" ({stats.errors} errors)" if stats.errors else "")
+            for symbol, stats in self.stats().items()
+        )
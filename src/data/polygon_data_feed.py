@@ -7,7 +7,10 @@ import pandas as pd
 import requests
 from datetime import datetime, timedelta
 from typing import Optional
-from loguru import logger
+
+from src.utils.logging import get_logger
+
+log = get_logger('feed.polygon')
 
 
 class PolygonDataFeed:
@@ -36,7 +39,7 @@ class PolygonDataFeed:
         self.api_key = api_key
         self.max_candles = max_candles
         
-        logger.info(f"Fetching Polygon.io data for {symbol} - Period: {start_date} to {end_date}, Interval: {interval}")
+        log.info("Fetching Polygon.io data for {} - Period: {} to {}, Interval: {}", symbol, start_date, end_date, interval)
         
         # Fetch data from Polygon.io
         try:
@@ -45,8 +48,8 @@ class PolygonDataFeed:
             if self.df.empty:
                 raise ValueError(f"No data returned for symbol {symbol}")
             
-            logger.info(f"Loaded {len(self.df)} rows from Polygon.io")
-            logger.info(f"Date range: {self.df.index.min()} to {self.df.index.max()}")
+            log.info("Loaded {} rows from Polygon.io", len(self.df))
+            log.info("Date range: {} to {}", self.df.index.min(), self.df.index.max())
             
             # Validate required columns
             required_columns = ['Open', 'High', 'Low', 'Close', 'Volume']
@@ -58,12 +61,12 @@ class PolygonDataFeed:
             price_columns = ['Open', 'High', 'Low', 'Close']
             for col in price_columns:
                 if self.df[col].dtype not in ['float64', 'int64']:
-                    logger.warning(f"Converting {col} to float64")
+                    log.warning("Converting {} to float64", col)
                     self.df[col] = pd.to_numeric(self.df[col], errors='coerce')
                 
                 # Check for negative prices
                 if (self.df[col] <= 0).any():
-                    logger.warning(f"Found non-positive values in {col} column")
+                    log.warning("Found non-positive values in {} column", col)
             
             # Validate OHLC relationships
             invalid_ohlc = (
@@ -75,18 +78,18 @@ class PolygonDataFeed:
             )
             
             if invalid_ohlc.any():
-                logger.warning(f"Found {invalid_ohlc.sum()} rows with invalid OHLC relationships")
+                log.warning("Found {} rows with invalid OHLC relationships", invalid_ohlc.sum())
             
             # Fill any NaN values
             self.df = self.df.ffill().bfill()
             
             # Limit the number of candlesticks if specified
             if self.max_candles is not None and len(self.df) > self.max_candles:
-                logger.info(f"Limiting data to last {self.max_candles} candlesticks (from {len(self.df)} total)")
+                log.info("Limiting data to last {} candlesticks (from {} total)", self.max_candles, len(self.df))
                 self.df = self.df.tail(self.max_candles)
             
         except Exception as e:
-            logger.error(f"Error fetching Polygon.io data: {e}")
+            log.error("Error fetching Polygon.io data: {}", e)
             raise
     
     def _format_symbol_for_polygon(self, symbol: str) -> str:
@@ -99,7 +102,7 @@ class PolygonDataFeed:
     def _fetch_data(self) -> pd.DataFrame:
         """Fetch data from Polygon.io API."""
         formatted_symbol = self._format_symbol_for_polygon(self.symbol)
-        logger.info(f"Using formatted symbol: {formatted_symbol}")
+        log.info("Using formatted symbol: {}", formatted_symbol)
         
         # Map interval to Polygon API format
         interval_map = {
@@ -122,7 +125,7 @@ class PolygonDataFeed:
             "limit": 50000  # High limit to ensure we get all data
         }
         
-        logger.info(f"Fetching {self.interval} data for {self.symbol} from {self.start_date} to {self.end_date}")
+        log.info("Fetching {} data for {} from {} to {}", self.interval, self.symbol, self.start_date, self.end_date)
         response = requests.get(url, params=params)
         
         if response.status_code != 200:
@@ -140,7 +143,7 @@ class PolygonDataFeed:
             raise ValueError(f"No data found or API returned an error: {data}")
         
         results = data["results"]
-        logger.info(f"Found {len(results)} bars for {self.symbol}")
+        log.info("Found {} bars for {}", len(results), self.symbol)
         
         # Convert data to pandas DataFrame
         df_data = []
@@ -0,0 +1,159 @@
+"""
+Higher-timeframe bars derived from one base OHLCV feed.
+
+build_timeframes() aggregates the base bars into H4, D1 and W1 bars (UTC
+buckets, weeks starting on Monday) and maps every base bar to the last
+higher-timeframe bar that had closed by the end of that base bar, so
+higher-timeframe values can be read bar by bar without lookahead and
+without extra backtrader feeds (replaydata / resampled PandasData).
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+TIMEFRAME_SECONDS = {
+    'M1': 60,
+    'M5': 5 * 60,
+    'M15': 15 * 60,
+    'M30': 30 * 60,
+    'H1': 60 * 60,
+    'H4': 4 * 60 * 60,
+    'D1': 24 * 60 * 60,
+    'W1': 7 * 24 * 60 * 60,
+}
+DEFAULT_TIMEFRAMES = ('H4', 'D1', 'W1')
+
+# 1970-01-01 was a Thursday: W1 buckets are shifted to start on Mondays
+_BUCKET_OFFSET = {'W1': 4 * 24 * 60 * 60}
+
+
+@dataclass(frozen=True)
+class TimeframeBars:
+    """Bars of one higher timeframe and the base bar -> last closed bar map."""
+    name: str
+    time: np.ndarray  # bucket start, epoch seconds (int64)
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+    closed_index: np.ndarray  # per base bar: index of the last closed bar, -1 before the first one closes
+
+    def __len__(self) -> int:
+        return len(self.time)
+
+    def closed_values(self, values: Sequence[float]) -> np.ndarray:
+        """Per base bar, ``values`` (one per bar of this timeframe) at its last closed bar (NaN before it)."""
+        values = np.append(np.asarray(values, dtype=np.float64), np.nan)
+        # index -1 picks the appended NaN
+        return values[self.closed_index]
+
+
+@dataclass
+class MultiTimeframe:
+    """Base bar times and the higher timeframes built from them."""
+    base_time: np.ndarray
+    base_seconds: int
+    frames: Dict[str, TimeframeBars] = field(default_factory=dict)
+
+    def __getitem__(self, name: str) -> TimeframeBars:
+        return self.frames[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.frames
+
+
+def build_timeframes(time: Sequence[int], open: Sequence[float], high: Sequence[float], low: Sequence[float],
+                     close: Sequence[float], volume: Optional[Sequence[float]] = None,
+                     timeframes: Sequence[str] = DEFAULT_TIMEFRAMES,
+                     base_seconds: Optional[int] = None) -> MultiTimeframe:
+    """
+    Aggregate base bars into higher-timeframe bars in one pass per timeframe.
+
+    Args:
+        time: Base bar open times in epoch seconds (UTC), ascending
+        open, high, low, close, volume: Base bar prices (volume defaults to zeros)
+        timeframes: Names from TIMEFRAME_SECONDS, each longer than the base timeframe
+        base_seconds: Base bar length (default: smallest gap between bars)
+
+    Returns:
+        MultiTimeframe: A higher-timeframe bar closes with the base bar whose end
+        reaches the end of its bucket; the last bar may still be forming.
+    """
+    time = np.asarray(time, dtype=np.int64)
+    prices = [np.asarray(values, dtype=np.float64) for values in (open, high, low, close)]
+    volume = np.zeros(len(time)) if volume is None else np.asarray(volume, dtype=np.float64)
+    if base_seconds is None:
+        gaps = np.diff(time)
+        gaps = gaps[gaps > 0]
+        base_seconds = int(gaps.min()) if len(gaps) else TIMEFRAME_SECONDS['M1']
+
+    result = MultiTimeframe(base_time=time, base_seconds=base_seconds)
+    for name in timeframes:
+        if name not in TIMEFRAME_SECONDS:
+            raise ValueError(f"Unknown timeframe {name!r} (expected one of {', '.join(TIMEFRAME_SECONDS)})")
+        seconds = TIMEFRAME_SECONDS[name]
+        if seconds <= base_seconds:
+            raise ValueError(f"Timeframe {name} is not longer than the base bars ({base_seconds}s)")
+        result.frames[name] = _aggregate(name, seconds, time, *prices, volume, base_seconds)
+    return result
+
+
+def build_timeframes_from_frame(df: pd.DataFrame, timeframes: Sequence[str] = DEFAULT_TIMEFRAMES,
+                                base_seconds: Optional[int] = None) -> MultiTimeframe:
+    """
+    build_timeframes() over a DataFrame: a DatetimeIndex (or a 'time' / 'datetime'
+    column) and open/high/low/close/volume columns in either case.
+    """
+    columns = {column.lower(): column for column in df.columns}
+    if isinstance(df.index, pd.DatetimeIndex):
+        times = df.index
+    else:
+        times = df[columns['time'] if 'time' in columns else columns['datetime']]
+        if pd.api.types.is_numeric_dtype(times):
+            times = pd.to_datetime(times, unit='s')
+        times = pd.DatetimeIndex(times)
+    if times.tz is not None:
+        times = times.tz_convert('UTC').tz_localize(None)
+    epoch = times.values.astype('datetime64[s]').astype(np.int64)
+
+    def column(name, default=None):
+        return df[columns[name]].to_numpy(np.float64) if name in columns else default
+
+    volume = column('volume', column('tick_volume'))
+    return build_timeframes(epoch, column('open'), column('high'), column('low'), column('close'), volume,
+                            timeframes=timeframes, base_seconds=base_seconds)
+
+
+def _aggregate(name: str, seconds: int, time: np.ndarray, open: np.ndarray, high: np.ndarray, low: np.ndarray,
+               close: np.ndarray, volume: np.ndarray, base_seconds: int) -> TimeframeBars:
+    offset = _BUCKET_OFFSET.get(name, 0)
+    if not len(time):
+        empty = np.empty(0)
+        return TimeframeBars(name, np.empty(0, dtype=np.int64), empty, empty, empty, empty, empty,
+                             np.empty(0, dtype=np.int64))
+
+    bucket = (time - offset) // seconds
+    new_bucket = np.r_[True, bucket[1:] != bucket[:-1]]
+    starts = np.flatnonzero(new_bucket)
+    ends = np.r_[starts[1:], len(time)] - 1
+    bucket_start = bucket[starts] * seconds + offset
+
+    # A bar has closed once the end of a base bar reaches the end of its bucket
+    current = np.cumsum(new_bucket) - 1
+    closes_bucket = time + base_seconds >= bucket_start[current] + seconds
+    closed_index = np.where(closes_bucket, current, current - 1)
+
+    return TimeframeBars(
+        name=name,
+        time=bucket_start,
+        open=open[starts],
+        high=np.maximum.reduceat(high, starts),
+        low=np.minimum.reduceat(low, starts),
+        close=close[ends],
+        volume=np.add.reduceat(volume, starts),
+        closed_index=closed_index.astype(np.int64),
+    )
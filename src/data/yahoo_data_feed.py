@@ -7,7 +7,10 @@ import yfinance as yf
 import pandas as pd
 from datetime import datetime, timedelta
 from typing import Optional
-from loguru import logger
+
+from src.utils.logging import get_logger
+
+log = get_logger('feed.yahoo')
 
 
 class YahooDataFeed:
@@ -27,7 +30,7 @@ class YahooDataFeed:
         self.period = period
         self.interval = interval
         self.max_candles = max_candles
-        logger.info(f"Fetching Yahoo Finance data for {symbol} - Period: {period}, Interval: {interval}")
+        log.info("Fetching Yahoo Finance data for {} - Period: {}, Interval: {}", symbol, period, interval)
         
         # Fetch data from Yahoo Finance
         try:
@@ -37,8 +40,8 @@ class YahooDataFeed:
             if self.df.empty:
                 raise ValueError(f"No data returned for symbol {symbol}")
             
-            logger.info(f"Loaded {len(self.df)} rows from Yahoo Finance")
-            logger.info(f"Date range: {self.df.index.min()} to {self.df.index.max()}")
+            log.info("Loaded {} rows from Yahoo Finance", len(self.df))
+            log.info("Date range: {} to {}", self.df.index.min(), self.df.index.max())
             
             # Validate required columns
             required_columns = ['Open', 'High', 'Low', 'Close', 'Volume']
@@ -50,12 +53,12 @@ class YahooDataFeed:
             price_columns = ['Open', 'High', 'Low', 'Close']
             for col in price_columns:
                 if self.df[col].dtype not in ['float64', 'int64']:
-                    logger.warning(f"Converting {col} to float64")
+                    log.warning("Converting {} to float64", col)
                     self.df[col] = pd.to_numeric(self.df[col], errors='coerce')
                 
                 # Check for negative prices
                 if (self.df[col] <= 0).any():
-                    logger.warning(f"Found non-positive values in {col} column")
+                    log.warning("Found non-positive values in {} column", col)
             
             # Validate OHLC relationships
             invalid_ohlc = (
@@ -67,18 +70,18 @@ class YahooDataFeed:
             )
             
             if invalid_ohlc.any():
-                logger.warning(f"Found {invalid_ohlc.sum()} rows with invalid OHLC relationships")
+                log.warning("Found {} rows with invalid OHLC relationships", invalid_ohlc.sum())
             
             # Fill any NaN values
             self.df = self.df.fillna(method='ffill').fillna(method='bfill')
             
             # Limit the number of candlesticks if specified
             if self.max_candles is not None and len(self.df) > self.max_candles:
-                logger.info(f"Limiting data to last {self.max_candles} candlesticks (from {len(self.df)} total)")
+                log.info("Limiting data to last {} candlesticks (from {} total)", self.max_candles, len(self.df))
                 self.df = self.df.tail(self.max_candles)
             
         except Exception as e:
-            logger.error(f"Error fetching Yahoo Finance data: {e}")
+            log.error("Error fetching Yahoo Finance data: {}", e)
             raise
     
     def get_backtrader_feed(self):
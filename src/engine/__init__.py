@@ -0,0 +1,7 @@
+"""
+Fast simulation engine for BreakRetestStrategy (NumPy arrays instead of backtrader's event loop).
+"""
+
+from .fast_engine import FastBreakRetestEngine, fast_backtesting, load_frames
+
+__all__ = ['FastBreakRetestEngine', 'fast_backtesting', 'load_frames']
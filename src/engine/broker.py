@@ -0,0 +1,210 @@
+"""
+Order simulation for the fast engine with BacktestingBroker fill semantics.
+
+SimBroker covers what BreakRetestStrategy needs from the backtesting broker:
+bracket orders (LIMIT entry, STOP loss, LIMIT take profit) per data feed,
+fills at the exact order price plus/minus half the spread, children activated
+on the step after their parent fills, OCO cancellation of the sibling when a
+child fills and the cash/value bookkeeping of backtrader's BackBroker
+(shortcash, leveraged margin, end-of-bar cash adjustment) using the same
+commission scheme object and ``bt.Position``.
+"""
+
+import itertools
+from collections import deque
+from typing import Dict, List, Optional
+
+import backtrader as bt
+
+from src.brokers.ForexLeverage import ForexLeverage
+
+
+class OrderStatus:
+    ACCEPTED = 'Accepted'
+    COMPLETED = 'Completed'
+    CANCELED = 'Canceled'
+    MARGIN = 'Margin'
+
+
+class SimOrder:
+    """A resting LIMIT/STOP order of a bracket."""
+
+    __slots__ = ('ref', 'data_index', 'is_buy', 'is_stop', 'price', 'size',
+                 'parent', 'children', 'active', 'status', 'executed_price', 'trade_id')
+
+    LIMIT = 'limit'
+    STOP = 'stop'
+
+    def __init__(self, ref: int, data_index: int, is_buy: bool, is_stop: bool, price: float, size: float,
+                 parent: Optional['SimOrder'] = None):
+        self.ref = ref
+        self.data_index = data_index
+        self.is_buy = is_buy
+        self.is_stop = is_stop
+        self.price = price
+        self.size = size if is_buy else -size
+        self.parent = parent
+        self.children: List['SimOrder'] = []
+        self.active = parent is None
+        self.status = OrderStatus.ACCEPTED
+        self.executed_price = None
+        self.trade_id = None
+
+    def alive(self) -> bool:
+        return self.status == OrderStatus.ACCEPTED
+
+    def triggered(self, popen: float, phigh: float, plow: float) -> bool:
+        """BacktestingBroker._try_exec_limit / BackBroker._try_exec_stop trigger rules."""
+        price = self.price
+        if self.is_stop:
+            return popen >= price or phigh >= price if self.is_buy else popen <= price or plow <= price
+        return popen <= price or plow <= price if self.is_buy else popen >= price or phigh >= price
+
+    def __repr__(self) -> str:
+        side = 'BUY' if self.is_buy else 'SELL'
+        kind = 'STOP' if self.is_stop else 'LIMIT'
+        return f"SimOrder(ref={self.ref}, {side} {kind} {abs(self.size)} @ {self.price}, status={self.status})"
+
+
+class SimBroker:
+    """Cash, positions and resting bracket orders for a set of data feeds."""
+
+    def __init__(self, n_feeds: int, cash: float, spread_prices: List[float], comminfo: bt.CommInfoBase = None):
+        self.cash = cash
+        self.value = cash
+        self.comminfo = comminfo or ForexLeverage()
+        self.spread_prices = spread_prices
+        self.positions = [bt.Position() for _ in range(n_feeds)]
+        self.pending: Dict[int, SimOrder] = {}  # ref -> order, in submission order
+        self._to_activate = deque()
+        self._refs = itertools.count(1)
+        self.notifications: List[SimOrder] = []  # orders whose status changed during the last step
+
+    # ---- Orders ----
+    def bracket(self, data_index: int, is_buy: bool, price: float, size: float, stopprice: float, limitprice: float) -> List[SimOrder]:
+        """Submit a LIMIT entry with its STOP loss and LIMIT take profit: [main, stop, limit] like buy_bracket."""
+        main = SimOrder(next(self._refs), data_index, is_buy, False, price, size)
+        stop = SimOrder(next(self._refs), data_index, not is_buy, True, stopprice, size, parent=main)
+        limit = SimOrder(next(self._refs), data_index, not is_buy, False, limitprice, size, parent=main)
+        main.children = [stop, limit]
+        for order in (main, stop, limit):
+            self.pending[order.ref] = order
+        return [main, stop, limit]
+
+    def cancel(self, order: SimOrder) -> bool:
+        """Cancel a resting order; cancelling an entry also cancels its children."""
+        if self.pending.pop(order.ref, None) is None:
+            return False
+        order.status = OrderStatus.CANCELED
+        self.notifications.append(order)
+        if order.parent is None:
+            for child in order.children:
+                self.cancel(child)
+        return True
+
+    # ---- Bar processing (BacktestingBroker.next) ----
+    def next(self, bars: List[Optional[tuple]]):
+        """
+        Process one engine step. ``bars[i]`` is the (open, high, low, close) of
+        feed i's current bar, or None before the feed's first bar.
+        """
+        self.notifications = []
+        while self._to_activate:
+            self._to_activate.popleft().active = True
+
+        for order in list(self.pending.values()):
+            if not order.alive() or not order.active:
+                continue
+            bar = bars[order.data_index]
+            if bar is None or not order.triggered(bar[0], bar[1], bar[2]):
+                continue
+            del self.pending[order.ref]
+            self._execute(order, bar)
+            if order.status == OrderStatus.COMPLETED:
+                if order.parent is None:
+                    self._to_activate.extend(order.children)
+                else:
+                    for sibling in order.parent.children:
+                        self.cancel(sibling)
+            elif order.status == OrderStatus.MARGIN:
+                for child in order.children:
+                    self.cancel(child)
+
+        # End of bar: cash adjustment to the close of each open position
+        comminfo = self.comminfo
+        for data_index, position in enumerate(self.positions):
+            if position:
+                close = bars[data_index][3]
+                self.cash += comminfo.cashadjust(position.size, position.adjbase, close)
+                position.adjbase = close
+
+        self.value = self._get_value(bars)
+
+    def _execute(self, order: SimOrder, bar: tuple):
+        """BackBroker._execute for a full fill at the order price (plus/minus half the spread)."""
+        comminfo = self.comminfo
+        price = order.price
+        spread_price = self.spread_prices[order.data_index]
+        if spread_price > 0:
+            price = price + spread_price / 2 if order.is_buy else price - spread_price / 2
+
+        position = self.positions[order.data_index]
+        pprice_orig = position.price
+        psize, pprice, opened, closed = position.pseudoupdate(order.size, price)
+        pnl = comminfo.profitandloss(-closed, pprice_orig, price)
+        cash = self.cash
+
+        if closed:
+            closedvalue = comminfo.getvaluesize(-closed, pprice_orig)
+            closecash = closedvalue
+            if closedvalue > 0:
+                closecash /= comminfo.get_leverage()
+            cash += closecash + pnl * comminfo.stocklike
+            cash -= comminfo.getcommission(closed, price)
+            cash += comminfo.cashadjust(-closed, position.adjbase, price)
+            self.cash = cash
+
+        popened = opened
+        if opened:
+            openedvalue = comminfo.getvaluesize(opened, price)
+            opencash = openedvalue
+            if openedvalue > 0:
+                opencash /= comminfo.get_leverage()
+            cash -= opencash
+            cash -= comminfo.getcommission(opened, price)
+            if cash < 0.0:
+                # Not enough cash: the opening part is not executed
+                opened = 0
+            else:
+                if abs(psize) > abs(opened):
+                    cash += comminfo.cashadjust(psize - opened, position.adjbase, price)
+                position.adjbase = price
+                self.cash = cash
+
+        execsize = closed + opened
+        if execsize:
+            position.update(execsize, price)
+            order.executed_price = price
+            order.status = OrderStatus.COMPLETED
+            self.notifications.append(order)
+        if popened and not opened:
+            order.status = OrderStatus.MARGIN
+            self.notifications.append(order)
+
+    def _get_value(self, bars: List[Optional[tuple]]) -> float:
+        """Cash plus unlevered position value (BackBroker._get_value with shortcash)."""
+        comminfo = self.comminfo
+        pos_value_unlever = 0.0
+        for data_index, position in enumerate(self.positions):
+            if not position:
+                continue
+            close = bars[data_index][3]
+            dvalue = comminfo.getvaluesize(position.size, close)
+            dunrealized = comminfo.profitandloss(position.size, position.price, close)
+            if dvalue > 0:
+                dvalue -= dunrealized
+                pos_value_unlever += dvalue / comminfo.get_leverage()
+                pos_value_unlever += dunrealized
+            else:
+                pos_value_unlever += dvalue
+        return self.cash + pos_value_unlever
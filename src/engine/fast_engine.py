@@ -0,0 +1,438 @@
+"""
+BreakRetestStrategy rules on plain arrays.
+
+FastBreakRetestEngine replays the strategy end to end without backtrader's
+event loop: indicators are computed once per feed (see precompute.py), zones
+and breakouts are tracked per feed (zones.py) and bracket orders are filled
+by SimBroker with BacktestingBroker semantics (broker.py). The engine walks
+the same step timeline as cerebro (the union of all feed timestamps, stale
+feeds keep their last bar) and fills a TradeLedger with the same records as
+BreakRetestStrategy.get_all_trades, so its results can be checked against a
+backtrader run with src.engine.parity.
+"""
+
+import uuid
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.data.csv_data_feed import CSVDataFeed
+from src.models.order import OrderSide, TradeState
+from src.models.portfolio import PortfolioAccountant
+from src.models.timeframe import Timeframe
+from src.models.trade import TradeLedger, TradeRecord
+from src.models.trend import Trend
+from src.brokers.backtesting_broker import spread_to_price
+from src.engine.broker import OrderStatus, SimBroker, SimOrder
+from src.engine.precompute import RSI_PERIOD, FeedIndicators, IndicatorSettings, precompute_indicators
+from src.engine.zones import ZoneTracker
+from src.utils.analytics import performance_stats
+from src.utils.backtesting import prepare_backtesting
+from src.utils.environment_variables import EnvironmentVariables
+from src.utils.strategy_utils.general_utils import convert_atr_to_price
+from src.utils.trade_confirmations import RSIConfirmations
+
+
+class FeedArrays:
+    """Prices, indicators and zones of one data feed, plus its current bar on the step timeline."""
+
+    def __init__(self, symbol: str, df: pd.DataFrame, config, precomputed: FeedIndicators):
+        self.symbol = symbol
+        self.times: List[datetime] = list(df.index.to_pydatetime())
+        self.open = df['Open'].to_numpy(dtype=np.float64).tolist()
+        self.high = df['High'].to_numpy(dtype=np.float64).tolist()
+        self.low = df['Low'].to_numpy(dtype=np.float64).tolist()
+        self.close = df['Close'].to_numpy(dtype=np.float64).tolist()
+        self.volume = df['Volume'].to_numpy(dtype=np.float64).tolist()
+
+        # Same indicators as BaseStrategy builds per feed (cerebro.data_indicators)
+        self.atr = precomputed.atr
+        self.ema = precomputed.ema
+        self.rsi = precomputed.rsi
+        self.daily_rsi = precomputed.daily_rsi  # see FastBreakRetestEngine._next
+        self.volume_ma = precomputed.volume_ma
+        self.order_day = precomputed.order_day
+
+        self.zones = ZoneTracker(
+            self.open, self.close, self.atr,
+            EnvironmentVariables.access_config_value(EnvironmentVariables.ZONE_INVERSION_MARGIN_ATR, symbol),
+            EnvironmentVariables.access_config_value(EnvironmentVariables.BREAKOUT_MIN_STRENGTH_ATR, symbol),
+        )
+        # Zones run once the ATR has a value; the strategy waits for every indicator of the feed
+        self.zones_min_period = config.atr_length + 1
+        self.min_period = max(config.atr_length + 1, config.ema_length, config.volume_ma_length, RSI_PERIOD + 1)
+        self.bar = -1  # current bar (-1 before the first one)
+
+    def __len__(self) -> int:
+        return self.bar + 1
+
+    def advance(self, step_time: datetime):
+        """Move to the last bar at or before ``step_time``."""
+        times = self.times
+        while self.bar + 1 < len(times) and times[self.bar + 1] <= step_time:
+            self.bar += 1
+
+    def ohlc(self) -> Optional[tuple]:
+        bar = self.bar
+        if bar < 0:
+            return None
+        return self.open[bar], self.high[bar], self.low[bar], self.close[bar]
+
+    @property
+    def datetime(self) -> datetime:
+        return self.times[self.bar]
+
+
+class FastBreakRetestEngine:
+    """
+    BreakRetestStrategy on precomputed arrays.
+
+    Construct with one OHLCV DataFrame per symbol (as loaded by CSVDataFeed,
+    first symbol = data0), call ``run()`` and read ``trades`` (TradeLedger),
+    ``counter``, ``portfolio.equity_curve()`` and ``broker.value``.
+    """
+
+    def __init__(self, frames: Dict[str, pd.DataFrame], rr: float = None, risk_per_trade: float = None,
+                 initial_cash: float = None, spread_pips: float = 0.0):
+        # Read Config at call time: the tuner reloads it between trials
+        from src.utils.config import Config
+        self.config = Config
+        self.rr = Config.rr if rr is None else rr
+        self.risk_per_trade = Config.risk_per_trade if risk_per_trade is None else risk_per_trade
+        self.initial_cash = Config.initial_equity if initial_cash is None else initial_cash
+        self.check_for_daily_rsi = Config.check_for_daily_rsi
+
+        precomputed = precompute_indicators(frames, IndicatorSettings.from_config(Config),
+                                            Config.precompute_processes if Config.precompute_indicators else 1)
+        self.feeds = [FeedArrays(symbol, df, Config, precomputed[symbol]) for symbol, df in frames.items()]
+        self.broker = SimBroker(len(self.feeds), self.initial_cash,
+                                [spread_to_price(spread_pips, feed.symbol) for feed in self.feeds])
+        self.trades = TradeLedger()
+        self.portfolio = PortfolioAccountant()
+        for i, feed in enumerate(self.feeds):
+            self.portfolio.register(i, feed)
+        self.counter = {'tp': 0, 'sl': 0}
+        self.candle_index = 0
+        self.current_cash = self.initial_cash
+        self.last_processed_timestamp = None
+
+    # ---- Main loop (cerebro._runnext) ----
+    def run(self) -> 'FastBreakRetestEngine':
+        feeds = self.feeds
+        data0 = feeds[0]
+        steps = sorted(set().union(*(feed.times for feed in feeds)))
+        for step_time in steps:
+            for feed in feeds:
+                feed.advance(step_time)
+            self.broker.next([feed.ohlc() for feed in feeds])
+            for feed in feeds:
+                if len(feed) >= feed.zones_min_period:
+                    feed.zones.step(feed.bar)
+            self._notify(self.broker.notifications)
+            if all(len(feed) >= feed.min_period for feed in feeds) and data0.datetime != self.last_processed_timestamp:
+                self.last_processed_timestamp = data0.datetime
+                self._next()
+        return self
+
+    def _next(self):
+        """BaseStrategy.next + BreakRetestStrategy.next for one step."""
+        feeds = self.feeds
+        data0 = feeds[0]
+        self.candle_index = len(data0)
+        data_state = [feed.zones.state(feed.bar) for feed in feeds]
+
+        broker_value = self.broker.value
+        sizes, prices = self.portfolio.sizes, self.portfolio.prices
+        open_slots = np.flatnonzero(sizes)
+        unrealized_pnl = 0.0
+        if len(open_slots):
+            closes = np.fromiter((feeds[i].close[feeds[i].bar] for i in open_slots), dtype=np.float64, count=len(open_slots))
+            unrealized_pnl = float(np.dot(sizes[open_slots], closes - prices[open_slots]))
+        self.current_cash = broker_value + unrealized_pnl
+        self.portfolio.record_equity(data0.datetime, broker_value)
+
+        # The daily RSI is built on data0's replayed daily feed. CSV feeds keep
+        # backtrader's default Days timeframe, so the replay delivers every bar
+        # and the "daily" RSI follows data0's bars. This holds for feeds sharing
+        # one timeline; with gaps backtrader's replay clones skip bars.
+        # With Config.daily_rsi_from_timeframes it is the RSI of data0's closed D1 bars.
+        daily_rsi = data0.daily_rsi[data0.bar]
+
+        for i, (feed, pair_state) in enumerate(zip(feeds, data_state)):
+            bar = feed.bar
+            current_price = feed.close[bar]
+            trend = pair_state['breakout_trend']
+            is_candidate = pair_state['just_broke_out'] and (feed.order_day[bar] if bar < len(feed.order_day)
+                                                             else feed.datetime.weekday() != 0)
+            has_live_orders = bool(self.trades.for_feed(i, TradeState.PENDING, TradeState.RUNNING))
+
+            ema = feed.ema[bar]
+            order_confirmations = is_candidate and all((
+                ema <= current_price if trend == Trend.UPTREND else ema >= current_price,
+                RSIConfirmations.daily_rsi_allows_trade(daily_rsi, trend) if self.check_for_daily_rsi else True,
+            ))
+
+            take_trade = False
+            if order_confirmations:
+                take_trade = True
+                self._place_retest_order(i, pair_state)
+
+            if has_live_orders or take_trade:
+                self._invalidate_pending_trades(i, pair_state)
+                self._update_excursions(i)
+
+    # ---- Orders ----
+    def _place_retest_order(self, data_index: int, state: dict):
+        """BreakRetestStrategy.place_retest_order_for_data."""
+        feed = self.feeds[data_index]
+        symbol = feed.symbol
+        bar = feed.bar
+        if self.broker.value <= 0:
+            return
+        if not state['just_broke_out']:
+            return
+        support = state['support']
+        resistance = state['resistance']
+        breakout_trend = state['breakout_trend']
+        if support is None or resistance is None:
+            return
+
+        risk_distance = abs(resistance - support)
+        atr_value = feed.atr[bar]
+        if risk_distance < convert_atr_to_price(atr_value, EnvironmentVariables.MIN_RISK_DISTANCE_ATR, symbol):
+            return
+
+        sl_buffer = convert_atr_to_price(atr_value, EnvironmentVariables.SL_BUFFER_ATR, symbol)
+        if breakout_trend == Trend.UPTREND:
+            side = OrderSide.BUY
+            entry_price = resistance
+            sl = support - sl_buffer
+            tp = entry_price + risk_distance * self.rr
+        else:
+            side = OrderSide.SELL
+            entry_price = support
+            sl = resistance + sl_buffer
+            tp = entry_price - risk_distance * self.rr
+
+        size = self._position_size(risk_distance)
+        if not self._valid_bracket(side, entry_price, size, sl, tp):
+            return
+        main_order, sl_order, tp_order = self.broker.bracket(data_index, side == OrderSide.BUY, entry_price, size, sl, tp)
+
+        is_up = breakout_trend == Trend.UPTREND
+        popen, phigh, plow = feed.open[bar], feed.high[bar], feed.low[bar]
+        record = TradeRecord(
+            trade_id=str(uuid.uuid4()),
+            symbol=symbol,
+            order_side=side,
+            state=TradeState.PENDING,
+            placed_candle=self.candle_index - 1,
+            placed_datetime=feed.datetime,
+            entry_price=entry_price,
+            entry_executed_price=None,
+            size=size,
+            sl=sl,
+            tp=tp,
+            broken_resistance=resistance if is_up else None,
+            broken_support=support if breakout_trend == Trend.DOWNTREND else None,
+            main_order_ref=main_order.ref,
+            tp_order_ref=tp_order.ref,
+            sl_order_ref=sl_order.ref,
+            data_index=data_index,
+            # Same (mislabelled) mapping as BreakRetestStrategy: bracket order = [main, stop, limit]
+            orders={'main': main_order, 'tp': sl_order, 'sl': tp_order},
+            open_candle=None,
+            open_datetime=None,
+            close_candle=None,
+            close_datetime=None,
+            pnl=None,
+            close_reason=None,
+            rsi_at_break=feed.rsi[bar],
+            relative_volume=feed.volume[bar] / feed.volume_ma[bar],
+            atr_breakout_wick=(((phigh - max(popen, feed.close[bar])) if is_up else (min(popen, feed.close[bar]) - plow))
+                               / max(atr_value, 1e-6)),
+            time_to_fill=None,
+            highest_excursion_from_breakout=phigh - entry_price if is_up else entry_price - plow,
+            atr_sl_dist=abs(sl - entry_price) / atr_value,
+            atr_tp_dist=abs(tp - entry_price) / atr_value,
+        )
+        self.trades.add(record)
+        for order in (main_order, sl_order, tp_order):
+            order.trade_id = record.trade_id
+
+    def _position_size(self, risk_distance: float) -> int:
+        """BaseStrategy.calculate_position_size (without the realistic-execution adjustments)."""
+        if self.current_cash <= 0:
+            return 0
+        risk_amount = self.current_cash * self.risk_per_trade
+        return int(risk_amount / risk_distance) if risk_distance > 0 else 100000
+
+    @staticmethod
+    def _valid_bracket(side: OrderSide, price: float, size: float, sl: float, tp: float) -> bool:
+        """The input checks of BaseStrategy.place_order."""
+        if size <= 0:
+            return False
+        if price <= 0 or sl <= 0 or tp <= 0:
+            return False
+        if side == OrderSide.BUY:
+            return tp > price and sl < price
+        return sl > price and tp < price
+
+    def _invalidate_pending_trades(self, data_index: int, state: dict):
+        """BreakRetestStrategy.invalidate_pending_trades_if_sr_changed_or_completed."""
+        pending_trades = self.trades.for_feed(data_index, TradeState.PENDING)
+        if not pending_trades:
+            return
+        feed = self.feeds[data_index]
+        support = state['support']
+        resistance = state['resistance']
+        invalidation_price = convert_atr_to_price(feed.atr[feed.bar], EnvironmentVariables.SR_CANCELLATION_THRESHOLD_ATR, feed.symbol)
+        for trade in pending_trades:
+            if trade['order_side'] == OrderSide.BUY and support is not None and trade.get('broken_resistance') is not None:
+                if support > trade['broken_resistance'] + invalidation_price:
+                    self._cancel_trade(trade)
+            elif trade['order_side'] == OrderSide.SELL and resistance is not None and trade.get('broken_support') is not None:
+                if resistance < trade['broken_support'] - invalidation_price:
+                    self._cancel_trade(trade)
+
+    def _cancel_trade(self, trade: TradeRecord):
+        trade['state'] = TradeState.CANCELED
+        trade['close_reason'] = 'CANCELED'
+        trade['close_candle'] = self.candle_index
+        trade['close_datetime'] = self.feeds[trade['data_index']].datetime
+        for order in trade['orders'].values():
+            if order is not None and order.alive():
+                self.broker.cancel(order)
+
+    def _update_excursions(self, data_index: int):
+        """BreakRetestStrategy.process_pending_trade_updates."""
+        feed = self.feeds[data_index]
+        high_price = feed.high[feed.bar]
+        low_price = feed.low[feed.bar]
+        for trade in self.trades.for_feed(data_index, TradeState.PENDING, TradeState.RUNNING):
+            if trade.get('order_side') == OrderSide.BUY:
+                trade['highest_excursion_from_breakout'] = max(trade['highest_excursion_from_breakout'], abs(high_price - trade['entry_price']))
+            else:
+                trade['highest_excursion_from_breakout'] = max(trade['highest_excursion_from_breakout'], abs(low_price - trade['entry_price']))
+
+    # ---- Fills (notify_order) ----
+    def _notify(self, orders: List[SimOrder]):
+        for order in orders:
+            if order.status != OrderStatus.COMPLETED:
+                continue
+            position = self.broker.positions[order.data_index]
+            self.portfolio.on_fill(self.feeds[order.data_index], position.size, position.price)
+
+            trade = self.trades.by_order_ref(order.ref)
+            if trade is None or trade.state not in (TradeState.PENDING, TradeState.RUNNING):
+                continue
+            if order.ref == trade['main_order_ref']:
+                self._on_entry(trade, order)
+            elif order.ref == trade['tp_order_ref']:
+                self._on_exit(trade, order, TradeState.TP_HIT, 'tp')
+            elif order.ref == trade['sl_order_ref']:
+                self._on_exit(trade, order, TradeState.SL_HIT, 'sl')
+
+    def _on_entry(self, trade: TradeRecord, order: SimOrder):
+        feed = self.feeds[trade['data_index']]
+        trade['open_candle'] = self.candle_index
+        trade['open_datetime'] = feed.datetime
+        trade['entry_executed_price'] = order.executed_price
+        trade['state'] = TradeState.RUNNING
+        trade['entry_slippage'] = abs(order.executed_price - trade['entry_price'])
+        trade['time_to_fill'] = self.candle_index - trade['placed_candle'] + 1
+        trade['atr_rel_excursion'] = trade['highest_excursion_from_breakout'] / feed.atr[feed.bar]
+
+    def _on_exit(self, trade: TradeRecord, order: SimOrder, trade_state: TradeState, counter_key: str):
+        """BreakRetestStrategy._handle_trade_exit."""
+        feed = self.feeds[trade['data_index']]
+        exit_price = order.executed_price
+        entry_price = trade.get('entry_executed_price') or trade.get('entry_price')
+        size = abs(trade['size'])
+        if trade['order_side'] == OrderSide.BUY:
+            pnl = (exit_price - entry_price) * size
+        else:
+            pnl = (entry_price - exit_price) * size
+        self.counter[counter_key] += 1
+
+        trade['pnl'] = pnl
+        trade['close_candle'] = self.candle_index
+        trade['close_datetime'] = feed.datetime
+        trade['close_reason'] = 'TP' if trade_state == TradeState.TP_HIT else 'SL'
+        trade['exit_price'] = exit_price
+        trade['state'] = trade_state
+        if trade.get('open_candle') is None:
+            trade['open_candle'] = trade.get('placed_candle', self.candle_index)
+        if trade.get('open_datetime') is None:
+            trade['open_datetime'] = trade.get('placed_datetime', feed.datetime)
+        if trade.get('entry_executed_price') is None:
+            trade['entry_executed_price'] = trade.get('entry_price')
+
+        trade['entry_slippage'] = abs(trade['entry_executed_price'] - trade['entry_price'])
+        exit_order_price = trade.get('tp') if trade_state == TradeState.TP_HIT else trade.get('sl')
+        trade['close_slippage'] = abs(exit_price - exit_order_price)
+        trade['total_slippage'] = (trade['entry_slippage'] + trade['close_slippage']) * size
+        self.trades.mark_completed(trade)
+
+    # ---- Results ----
+    def get_all_trades(self) -> List[TradeRecord]:
+        """All trades as a list (same records as BreakRetestStrategy.get_all_trades)."""
+        return list(self.trades.values())
+
+    def get_completed_trades(self) -> List[TradeRecord]:
+        return list(self.trades.completed)
+
+
+def load_frames(symbols: List[str], timeframe: Timeframe, start_date: datetime, end_date: datetime,
+                max_candles: int = None) -> Dict[str, pd.DataFrame]:
+    """OHLCV DataFrames per symbol, loaded the same way main.backtesting builds its feeds."""
+    frames = {}
+    for symbol_config in prepare_backtesting(symbols, timeframe, start_date, end_date):
+        csv_feed = CSVDataFeed(csv_file_path=symbol_config['csv_file'], max_candles=max_candles)
+        frames[symbol_config['symbol']] = csv_feed.get_dataframe()
+    return frames
+
+
+def fast_backtesting(symbols: list[str], timeframe: Timeframe, start_date: datetime, end_date: datetime,
+                     max_candles: int = None, spread_pips: float = 0.0, frames: Dict[str, pd.DataFrame] = None):
+    """
+    Run BreakRetestStrategy on the fast engine.
+
+    Same arguments and ``stats`` keys as main.backtesting (fills follow
+    BacktestingBroker with ``spread_pips``). Pass ``frames`` to reuse data
+    already loaded with load_frames (e.g. across tuning trials).
+    """
+    if frames is None:
+        frames = load_frames(symbols, timeframe, start_date, end_date, max_candles)
+    engine = FastBreakRetestEngine(frames, spread_pips=spread_pips).run()
+
+    initial_cash = engine.initial_cash
+    final_equity = engine.broker.value
+    pnl = final_equity - initial_cash
+    completed_trades = engine.trades.completed_array()
+    summary = performance_stats(completed_trades, initial_cash, engine.portfolio.equity_curve(),
+                                symbols=[feed.symbol for feed in engine.feeds]) if len(completed_trades) else None
+    stats = {
+        'initial_cash': initial_cash,
+        'final_equity': final_equity,
+        'pnl': pnl,
+        'pnl_percentage': (pnl / initial_cash) * 100,
+        'total_trades': len(completed_trades),
+        'win_rate': summary['win_rate'] if summary else 0.0,
+        'avg_win': summary['avg_win'] if summary else 0.0,
+        'avg_loss': summary['avg_loss'] if summary else 0.0,
+        'profit_factor': summary['profit_factor'] if summary else 0.0,
+        'sharpe_ratio': summary['sharpe_ratio'] if summary else 0.0,
+        'sortino_ratio': summary['sortino_ratio'] if summary else 0.0,
+        'calmar_ratio': summary['calmar_ratio'] if summary else 0.0,
+        'max_drawdown': summary['max_drawdown'] if summary else 0.0,
+        'exposure': summary['exposure'] if summary else 0.0,
+        'per_symbol': summary['per_symbol'] if summary else {},
+    }
+    return {
+        'engine': engine,
+        'trades': engine.get_all_trades(),
+        'stats': stats,
+    }
@@ -0,0 +1,88 @@
+"""
+Indicator arrays for the fast engine.
+
+Each function returns a float64 array aligned with its input (NaN until the
+indicator's minimum period is reached) and reproduces backtrader's
+next-mode arithmetic step by step (``math.fsum`` seeds, ``prev * alpha1 +
+value * alpha`` smoothing), so values match the indicators the strategy
+builds in BaseStrategy bit for bit.
+"""
+
+import math
+from typing import Sequence
+
+import numpy as np
+
+NAN = float('nan')
+
+
+def sma(values: Sequence[float], period: int) -> np.ndarray:
+    """Simple moving average (bt.indicators.SMA)."""
+    values = list(values)
+    out = [NAN] * len(values)
+    for i in range(period - 1, len(values)):
+        out[i] = math.fsum(values[i - period + 1:i + 1]) / period
+    return np.asarray(out, dtype=np.float64)
+
+
+def _exp_smoothing(values: list, period: int, alpha: float, first: int = 0) -> list:
+    """Exponential smoothing seeded with the SMA of the first ``period`` values from ``first``."""
+    alpha1 = 1.0 - alpha
+    out = [NAN] * len(values)
+    seed = first + period - 1
+    if seed >= len(values):
+        return out
+    prev = out[seed] = math.fsum(values[first:seed + 1]) / period
+    for i in range(seed + 1, len(values)):
+        prev = out[i] = prev * alpha1 + values[i] * alpha
+    return out
+
+
+def ema(values: Sequence[float], period: int) -> np.ndarray:
+    """Exponential moving average (bt.indicators.EMA)."""
+    return np.asarray(_exp_smoothing(list(values), period, 2.0 / (1.0 + period)), dtype=np.float64)
+
+
+def smma(values: Sequence[float], period: int, first: int = 0) -> np.ndarray:
+    """Smoothed (Wilder) moving average (bt.indicators.SmoothedMovingAverage)."""
+    return np.asarray(_exp_smoothing(list(values), period, 1.0 / period, first), dtype=np.float64)
+
+
+def true_range(high: Sequence[float], low: Sequence[float], close: Sequence[float]) -> list:
+    """True range from the second bar on (bt.indicators.TrueRange)."""
+    out = [NAN] * len(close)
+    for i in range(1, len(close)):
+        prev_close = close[i - 1]
+        out[i] = max(high[i], prev_close) - min(low[i], prev_close)
+    return out
+
+
+def atr(high: Sequence[float], low: Sequence[float], close: Sequence[float], period: int) -> np.ndarray:
+    """Average true range (bt.indicators.ATR): first value on bar ``period``."""
+    return smma(true_range(high, low, close), period, first=1)
+
+
+def _up_down(close: Sequence[float]):
+    up = [NAN] * len(close)
+    down = [NAN] * len(close)
+    for i in range(1, len(close)):
+        up[i] = max(close[i] - close[i - 1], 0.0)
+        down[i] = max(close[i - 1] - close[i], 0.0)
+    return up, down
+
+
+def _rsi_value(maup: float, madown: float) -> float:
+    rs = maup / madown if madown else math.inf
+    return 100.0 - 100.0 / (1.0 + rs)
+
+
+def rsi(close: Sequence[float], period: int = 14) -> np.ndarray:
+    """Wilder RSI (bt.indicators.RSI): first value on bar ``period``."""
+    up, down = _up_down(list(close))
+    maup = smma(up, period, first=1)
+    madown = smma(down, period, first=1)
+    out = np.full(len(up), np.nan)
+    for i in range(period, len(up)):
+        out[i] = _rsi_value(maup[i], madown[i])
+    return out
+
@@ -0,0 +1,87 @@
+"""
+Parity harness: run BreakRetestStrategy on backtrader (with BacktestingBroker)
+and on the fast engine over the same recorded data and compare the ledgers.
+
+Command line: validate_fast_engine.py at the project root.
+"""
+
+import math
+import time
+from datetime import datetime
+from enum import Enum
+from typing import Iterable, List
+
+from src.models.timeframe import Timeframe
+from src.models.trade import TRADE_FIELDS
+from src.engine.fast_engine import fast_backtesting, load_frames
+
+# Fields that identify objects of one run (uuids, order objects and broker refs)
+IGNORED_FIELDS = frozenset(('trade_id', 'orders', 'main_order_ref', 'tp_order_ref', 'sl_order_ref'))
+STATS_KEYS = ('final_equity', 'pnl', 'total_trades', 'win_rate', 'avg_win', 'avg_loss', 'profit_factor', 'sharpe_ratio')
+
+
+def _same_value(a, b, rel_tol: float) -> bool:
+    if isinstance(a, Enum) or isinstance(b, Enum):
+        # Strategy modules can be imported under two package paths: compare enum names
+        return getattr(a, 'name', a) == getattr(b, 'name', b)
+    if isinstance(a, datetime) and isinstance(b, datetime):
+        return a.replace(microsecond=0) == b.replace(microsecond=0)
+    if isinstance(a, (int, float)) and isinstance(b, (int, float)) and not isinstance(a, bool):
+        if math.isnan(a) or math.isnan(b):
+            return math.isnan(a) and math.isnan(b)
+        return math.isclose(a, b, rel_tol=rel_tol, abs_tol=1e-12)
+    return a == b
+
+
+def compare_ledgers(reference: Iterable, candidate: Iterable, rel_tol: float = 1e-9) -> List[str]:
+    """
+    Differences between two trade lists in placement order (as returned by
+    get_all_trades). Run-specific fields (IGNORED_FIELDS) are skipped, enums
+    are compared by name, datetimes to the second and floats with ``rel_tol``.
+    Returns an empty list when the ledgers match.
+    """
+    reference, candidate = list(reference), list(candidate)
+    mismatches = []
+    if len(reference) != len(candidate):
+        mismatches.append(f"trade count: {len(reference)} != {len(candidate)}")
+    for n, (ref_trade, cand_trade) in enumerate(zip(reference, candidate)):
+        ref_keys = set(ref_trade.keys()) - IGNORED_FIELDS
+        cand_keys = set(cand_trade.keys()) - IGNORED_FIELDS
+        if ref_keys != cand_keys:
+            mismatches.append(f"trade #{n}: fields {sorted(ref_keys ^ cand_keys)} set on one side only")
+        for field in (f for f in TRADE_FIELDS if f in ref_keys & cand_keys):
+            a, b = ref_trade.get(field), cand_trade.get(field)
+            if not _same_value(a, b, rel_tol):
+                mismatches.append(f"trade #{n} ({ref_trade.get('placed_datetime')}): {field} {a!r} != {b!r}")
+    return mismatches
+
+
+def compare_stats(reference: dict, candidate: dict, rel_tol: float = 1e-9) -> List[str]:
+    return [f"stats {key}: {reference.get(key)!r} != {candidate.get(key)!r}"
+            for key in STATS_KEYS if not _same_value(reference.get(key), candidate.get(key), rel_tol)]
+
+
+def run_parity(symbols: list[str], timeframe: Timeframe, start_date: datetime, end_date: datetime,
+               max_candles: int = None, spread_pips: float = 0.0, rel_tol: float = 1e-9) -> dict:
+    """Run both engines on the same data and return their stats, timings and the differences found."""
+    from main import backtesting
+    from src.brokers.backtesting_broker import BacktestingBroker
+
+    start = time.perf_counter()
+    bt_results = backtesting(symbols, timeframe, start_date, end_date, max_candles=max_candles,
+                             spread_pips=spread_pips, broker=BacktestingBroker(spread_pips=spread_pips), lean=True)
+    bt_seconds = time.perf_counter() - start
+    bt_trades = list(bt_results['trades'].values())
+
+    frames = load_frames(symbols, timeframe, start_date, end_date, max_candles)
+    start = time.perf_counter()
+    fast_results = fast_backtesting(symbols, timeframe, start_date, end_date, spread_pips=spread_pips, frames=frames)
+    fast_seconds = time.perf_counter() - start
+
+    mismatches = compare_stats(bt_results['stats'], fast_results['stats'], rel_tol)
+    mismatches += compare_ledgers(bt_trades, fast_results['trades'], rel_tol)
+    return {
+        'backtrader': {'stats': bt_results['stats'], 'seconds': bt_seconds, 'trades': len(bt_trades)},
+        'fast': {'stats': fast_results['stats'], 'seconds': fast_seconds, 'trades': len(fast_results['trades'])},
+        'mismatches': mismatches,
+    }
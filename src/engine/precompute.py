@@ -0,0 +1,105 @@
+"""
+Per-feed indicator arrays computed before the event loop.
+
+ATR, EMA, RSI, the volume MA, the daily RSI and the order-day mask of a feed
+only depend on that feed's own bars, so they are computed up front for every
+symbol, in a process pool when there are several symbols. The fast engine
+reads the arrays directly; backtrader runs hand them to BaseStrategy as
+PrecomputedLine indicators (cerebro.precomputed_indicators), so the
+sequential loop is left with zones and order logic.
+
+Zones stay in the loop: they are re-evaluated on every step with the global
+candle counter (see zones.py), so they depend on the step timeline shared by
+all feeds, not only on the feed's own bars.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.data.timeframes import build_timeframes_from_frame
+from src.engine import indicators
+from src.utils.signal_prefilter import SignalPrefilter
+
+RSI_PERIOD = 14
+
+
+@dataclass(frozen=True)
+class IndicatorSettings:
+    """Indicator lengths (picklable, so worker processes do not read Config)."""
+    atr_length: int
+    ema_length: int
+    volume_ma_length: int
+    daily_rsi_from_timeframes: bool = False
+
+    @classmethod
+    def from_config(cls, config) -> 'IndicatorSettings':
+        return cls(config.atr_length, config.ema_length, config.volume_ma_length, config.daily_rsi_from_timeframes)
+
+    # Warm-up bars of the backtrader indicators the arrays replace
+    @property
+    def atr_minperiod(self) -> int:
+        return self.atr_length + 1
+
+    @property
+    def rsi_minperiod(self) -> int:
+        return RSI_PERIOD + 1
+
+
+@dataclass
+class FeedIndicators:
+    """Indicator arrays of one feed (lists, aligned with its bars)."""
+    atr: List[float]
+    ema: List[float]
+    rsi: List[float]
+    volume_ma: List[float]
+    daily_rsi: List[float]  # RSI of the closed D1 bars, or the per-bar RSI (replayed daily feed)
+    order_day: List[bool]  # empty without a DatetimeIndex
+
+
+def compute_feed_indicators(df: pd.DataFrame, settings: IndicatorSettings) -> FeedIndicators:
+    """Indicator arrays of one OHLCV DataFrame (as loaded by CSVDataFeed)."""
+    high, low, close, volume = (df[column].to_numpy(dtype=np.float64).tolist()
+                                for column in ('High', 'Low', 'Close', 'Volume'))
+    rsi = indicators.rsi(close, RSI_PERIOD).tolist()
+    if settings.daily_rsi_from_timeframes:
+        daily_bars = build_timeframes_from_frame(df, ('D1',))['D1']
+        daily_rsi = daily_bars.closed_values(indicators.rsi(daily_bars.close, RSI_PERIOD)).tolist()
+    else:
+        daily_rsi = rsi
+    mask = SignalPrefilter(df.index).order_day_mask
+    return FeedIndicators(
+        atr=indicators.atr(high, low, close, settings.atr_length).tolist(),
+        ema=indicators.ema(close, settings.ema_length).tolist(),
+        rsi=rsi,
+        volume_ma=indicators.sma(volume, settings.volume_ma_length).tolist(),
+        daily_rsi=daily_rsi,
+        order_day=mask.tolist() if mask is not None else [],
+    )
+
+
+def precompute_indicators(frames: Dict[str, pd.DataFrame], settings: IndicatorSettings,
+                          processes: Optional[int] = None) -> Dict[str, FeedIndicators]:
+    """
+    Indicator arrays of every symbol.
+
+    Args:
+        frames: OHLCV DataFrame per symbol
+        settings: Indicator lengths
+        processes: Worker processes (default: one per symbol, up to the CPU count);
+            1 computes in this process
+
+    Returns:
+        Dict[str, FeedIndicators]: Per symbol, in the order of ``frames``
+    """
+    if processes is None:
+        processes = min(len(frames), os.cpu_count() or 1)
+    if processes <= 1 or len(frames) <= 1:
+        return {symbol: compute_feed_indicators(df, settings) for symbol, df in frames.items()}
+    with ProcessPoolExecutor(max_workers=min(processes, len(frames))) as pool:
+        futures = {symbol: pool.submit(compute_feed_indicators, df, settings) for symbol, df in frames.items()}
+        return {symbol: future.result() for symbol, future in futures.items()}
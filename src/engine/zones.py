@@ -0,0 +1,170 @@
+"""
+Support/resistance zones and breakouts for the fast engine.
+
+ZoneTracker is a port of Zones.next + BreakoutIndicator.next (and
+get_total_movement_from_continuous_candles) onto plain per-feed lists. Like
+the backtrader indicators, ``step()`` is called once per engine step while
+the feed is past the ATR warm-up, including steps where the feed did not get
+a new bar: the zones of the current bar are then re-evaluated with the
+advanced candle counter, exactly as the indicator's next() is re-run.
+"""
+
+import math
+from typing import List, Optional, Sequence, Tuple
+
+from src.models.trend import Trend
+
+NAN = float('nan')
+SR_PADDING = 0.00001  # Zones.sr_padding
+FALLBACK_ATR = 0.0001  # convert_atr_to_price / Zones fallback for invalid ATR values
+
+
+def candle_types(opens: Sequence[float], closes: Sequence[float]) -> List[int]:
+    """+1 bullish, -1 bearish, 0 doji (Candlestick.candle_type is None)."""
+    return [1 if c > o else -1 if c < o else 0 for o, c in zip(opens, closes)]
+
+
+def _sanitize_atr(atr_value: float) -> float:
+    if atr_value is None or atr_value <= 0 or atr_value != atr_value:
+        return FALLBACK_ATR
+    return atr_value
+
+
+class ZoneTracker:
+    """Zone and breakout lines of one data feed."""
+
+    def __init__(self, opens: Sequence[float], closes: Sequence[float], atr: Sequence[float],
+                 zone_inversion_margin_atr: Optional[float], breakout_min_strength_atr: Optional[float]):
+        self.opens = opens
+        self.closes = closes
+        self.types = candle_types(opens, closes)
+        self.atr = atr
+        # ATR multipliers as returned by EnvironmentVariables.access_config_value (None -> threshold 0)
+        self.zone_inversion_margin_atr = zone_inversion_margin_atr
+        self.breakout_min_strength_atr = breakout_min_strength_atr
+
+        n = len(closes)
+        self.support = [NAN] * n
+        self.resistance = [NAN] * n
+        self.breakout = [NAN] * n
+        self.breakout_trend = [NAN] * n
+        self.candle_index = -1
+
+    # ---- Thresholds (convert_atr_to_price) ----
+    def _zone_threshold(self, atr_value: float) -> float:
+        if self.zone_inversion_margin_atr is None:
+            return 0.0
+        return _sanitize_atr(atr_value) * self.zone_inversion_margin_atr
+
+    def _breakout_threshold(self, atr_value: float) -> float:
+        if self.breakout_min_strength_atr is None:
+            return 0.0
+        return _sanitize_atr(atr_value) * self.breakout_min_strength_atr
+
+    # ---- Continuous movement (get_total_movement_from_continuous_candles) ----
+    def _movement(self, bar: int, start: int, atr_value: float, skip_small_movements: bool) -> Tuple[Optional[float], Optional[float], int]:
+        """(max_price, min_price, current_index) of the run of same-type candles ending ``start`` bars ago."""
+        opens, closes, types = self.opens, self.closes, self.types
+        end = -self.candle_index
+        if bar + 1 <= -start:
+            return None, None, start
+
+        i = bar + start
+        start_type = types[i]
+        min_price = min(closes[i], opens[i])
+        max_price = max(closes[i], opens[i])
+        current = start
+        current_type = start_type
+        while current_type == start_type and current != end:
+            i = bar + current
+            min_price = min(min_price, closes[i], opens[i])
+            max_price = max(max_price, closes[i], opens[i])
+            current -= 1
+            if bar + 1 <= -current:
+                break
+            current_type = types[bar + current]
+            if current_type != start_type and skip_small_movements:
+                opposite_high, opposite_low, opposite_index = self._movement(bar, current, atr_value, False)
+                if opposite_high is None or opposite_low is None:
+                    break
+                if opposite_high - opposite_low >= self._zone_threshold(atr_value):
+                    break
+                # Minor movement: continue from where the opposite movement started - 1
+                current = opposite_index - 1
+                if bar + 1 <= -current:
+                    break
+                i = bar + current
+                current_type = types[i]
+                min_price = min(min_price, closes[i], opens[i])
+                max_price = max(max_price, closes[i], opens[i])
+        if current == end:
+            return None, None, current
+        return max_price, min_price, current
+
+    # ---- Zones.next + BreakoutIndicator.next ----
+    def step(self, bar: int):
+        """Evaluate the zones and breakout of ``bar`` (the feed's current bar)."""
+        self.candle_index += 1
+        if bar + 1 <= 1:
+            return
+        support, resistance = self.support, self.resistance
+
+        current_atr = _sanitize_atr(self.atr[bar])
+        movement_high, movement_low, last_opposite_index = self._movement(bar, 0, current_atr, True)
+        if movement_high is not None and movement_low is not None and bar + 1 > abs(last_opposite_index):
+            if movement_high - movement_low >= self._zone_threshold(current_atr):
+                candle_type = self.types[bar]
+                if candle_type == -1 and math.isnan(resistance[bar]):
+                    resistance[bar] = movement_high + SR_PADDING
+                    if resistance[bar] <= support[bar]:
+                        support[bar] = NAN
+                if candle_type == 1 and math.isnan(support[bar]):
+                    support[bar] = movement_low - SR_PADDING
+                    if support[bar] >= resistance[bar]:
+                        resistance[bar] = NAN
+
+            # Extend S/R from the previous bar, keeping support < resistance
+            support_was_extended = False
+            resistance_was_extended = False
+            if math.isnan(support[bar]) and not math.isnan(support[bar - 1]):
+                support[bar] = support[bar - 1]
+                support_was_extended = True
+            if math.isnan(resistance[bar]) and not math.isnan(resistance[bar - 1]):
+                resistance[bar] = resistance[bar - 1]
+                resistance_was_extended = True
+            if not math.isnan(support[bar]) and not math.isnan(resistance[bar]) and support[bar] >= resistance[bar]:
+                if support_was_extended and not resistance_was_extended:
+                    support[bar] = NAN
+                elif resistance_was_extended and not support_was_extended:
+                    resistance[bar] = NAN
+                else:
+                    current_price = self.closes[bar]
+                    if abs(support[bar] - current_price) > abs(resistance[bar] - current_price):
+                        support[bar] = NAN
+                    else:
+                        resistance[bar] = NAN
+
+        if self.candle_index < 3:
+            return
+        self.breakout[bar] = NAN
+        self.breakout_trend[bar] = NAN
+        min_breakout_price = self._breakout_threshold(self.atr[bar])
+        previous_close = self.closes[bar - 1]
+        close = self.closes[bar]
+        if previous_close <= resistance[bar] + min_breakout_price and close >= resistance[bar] + min_breakout_price:
+            self.breakout[bar] = close
+            self.breakout_trend[bar] = Trend.UPTREND.value
+        elif previous_close >= support[bar] - min_breakout_price and close <= support[bar] - min_breakout_price:
+            self.breakout[bar] = close
+            self.breakout_trend[bar] = Trend.DOWNTREND.value
+
+    def state(self, bar: int) -> dict:
+        """The feed's data_state entry for ``bar`` (as built in BaseStrategy.next)."""
+        support = self.support[bar]
+        resistance = self.resistance[bar]
+        return {
+            'just_broke_out': not math.isnan(self.breakout[bar]),
+            'breakout_trend': Trend.from_value(self.breakout_trend[bar]),
+            'support': None if math.isnan(support) else support,
+            'resistance': None if math.isnan(resistance) else resistance,
+        }
@@ -58,14 +58,21 @@ class BreakoutIndicator(Zones):
     def update_sr_lists(self):
         if len(self.supports) == 0:
             self.supports[self.candle_index] = SR(id=self.candle_index, type=SRLevelType.SUPPORT, price=self.support, candle_index=self.candle_index)
-        elif self.support != list(self.supports.values())[-1].price:
+        elif self.support != next(reversed(self.supports.values())).price:
             self.supports[self.candle_index] = SR(id=self.candle_index, type=SRLevelType.SUPPORT, price=self.support, candle_index=self.candle_index)
 
         if len(self.resistances) == 0:
             self.resistances[self.candle_index] = SR(id=self.candle_index, type=SRLevelType.RESISTANCE, price=self.resistance, candle_index=self.candle_index)
-        elif self.resistance != list(self.resistances.values())[-1].price:
+        elif self.resistance != next(reversed(self.resistances.values())).price:
             self.resistances[self.candle_index] = SR(id=self.candle_index, type=SRLevelType.RESISTANCE, price=self.resistance, candle_index=self.candle_index)
 
+        if self.p.max_lookback is not None:
+            # Low-memory runs: drop the levels older than the look-back window
+            oldest = self.candle_index - self.p.max_lookback
+            for levels in (self.supports, self.resistances):
+                while len(levels) > 1 and next(iter(levels)) < oldest:
+                    del levels[next(iter(levels))]
+
     def check_for_breakout(self):
         if self.is_breakout() == Trend.UPTREND:
             self.add_breakout_point()
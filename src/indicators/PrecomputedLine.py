@@ -0,0 +1,25 @@
+import math
+
+import backtrader as bt
+
+
+class PrecomputedLine(bt.Indicator):
+    """
+    Per-bar values computed before the run (src.engine.precompute arrays,
+    TimeframeBars.closed_values of a daily RSI, ...) exposed as an indicator
+    line of the feed, in place of an indicator computed bar by bar or an
+    extra replayed or resampled backtrader feed. Bar i of the feed reads
+    values[i], so the values must be aligned with the bars the feed delivers.
+    ``minperiod`` keeps the warm-up of the indicator the values replace.
+    """
+    lines = ('value',)
+    params = (('values', None), ('minperiod', 1))
+    plotinfo = dict(plot=False)
+
+    def __init__(self):
+        self.addminperiod(self.p.minperiod)
+
+    def next(self):
+        bar = len(self.data) - 1
+        values = self.p.values
+        self.lines.value[0] = values[bar] if bar < len(values) else math.nan
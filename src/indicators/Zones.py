@@ -1,4 +1,5 @@
 import backtrader as bt
+from .PrecomputedLine import PrecomputedLine
 from src.models.trend import Trend
 from src.utils.config import Config
 from src.models.candlestick import CandleType, Candlestick
@@ -20,6 +21,13 @@ class Zones(bt.Indicator):
         resistance1=resistance_config,
         support1=support_config,
     )
+    params = (
+        # Bars get_total_movement_from_continuous_candles may walk back from the current
+        # bar; None = back to the first bar (the whole run stays in memory)
+        ('max_lookback', None),
+        # ATR values precomputed per bar (src.engine.precompute); None = bt.indicators.ATR
+        ('atr_values', None),
+    )
     support1 = None
     resistance1 = None
     sr_padding = 0.00001
@@ -32,8 +40,25 @@ class Zones(bt.Indicator):
         self.is_minor = is_minor_pair(symbol)
         self.extend_srs = True
         # Calculate ATR for movement significance checks
-        self.atr = bt.indicators.ATR(self.data, period=Config.atr_length)
+        if self.p.atr_values is not None:
+            self.atr = PrecomputedLine(self.data, values=self.p.atr_values, minperiod=Config.atr_length + 1)
+        else:
+            self.atr = bt.indicators.ATR(self.data, period=Config.atr_length)
         # self.addminperiod(self.lookback_period)
+
+    def qbuffer(self, savemem=0):
+        # exactbars runs: keep the bars the movement look-back reads in the data buffer
+        super().qbuffer(savemem=savemem)
+        if self.p.max_lookback is not None:
+            self.data.minbuffer(self.p.max_lookback + 1)
+            for line in self.lines:
+                line.minbuffer(2)  # support1[-1] / resistance1[-1]
+
+    def movement_lookback(self) -> int:
+        """Bars the continuous-candle movement may reach back from the current bar."""
+        if self.p.max_lookback is None:
+            return self.candle_index
+        return min(self.candle_index, self.p.max_lookback)
         
     def next(self):
         self.candle_index += 1
@@ -53,7 +78,7 @@ class Zones(bt.Indicator):
             if current_atr is None or current_atr <= 0 or (isinstance(current_atr, float) and (current_atr != current_atr)):  # Check for NaN
                 current_atr = 0.0001  # Small fallback value
 
-            continuous_movement_data = get_total_movement_from_continuous_candles(self.data, 0, self.candle_index, self.symbol, current_atr, skip_small_movements=True)
+            continuous_movement_data = get_total_movement_from_continuous_candles(self.data, 0, self.movement_lookback(), self.symbol, current_atr, skip_small_movements=True)
             continuous_movement_high = continuous_movement_data["max_price"]
             continuous_movement_low = continuous_movement_data["min_price"]
             last_opposite_candle_index = continuous_movement_data["current_index"]
@@ -1,5 +1,6 @@
 from .Zones import Zones
 from .BreakRetestIndicator import BreakRetestIndicator
 from .BreakoutIndicator import BreakoutIndicator
+from .PrecomputedLine import PrecomputedLine
 
-__all__ = ['Zones', 'BreakRetestIndicator', 'BreakoutIndicator']
\ No newline at end of file
+__all__ = ['Zones', 'BreakRetestIndicator', 'BreakoutIndicator', 'PrecomputedLine']
\ No newline at end of file
@@ -1,22 +1,41 @@
 import json
 import math
 import os
-from typing import Dict, Any, Optional
+import time
+from typing import Dict, Any, Iterator, List, Optional
 from datetime import datetime
 from pathlib import Path
 from ..models.chart_markers import ChartDataType, ChartMarkerType
+from ..utils.logging import get_logger
+from ..utils.profiling import get_phase_timer
+
+log = get_logger('chart')
+
+# Streaming mode: overlay entries kept in memory before they are appended to the stream file
+STREAM_BUFFER_ENTRIES = 1000
 
 class ChartOverlayManager:
     """
     Manages dynamic writing of chart overlay data to JSON file during strategy execution.
     Keeps minimal data by storing only essential parameters for each timestamp.
+
+    With ``stream=True`` (low-memory backtests) nothing accumulates: each save
+    appends the entries added since the previous save as JSON lines to
+    ``chart_overlays.jsonl`` next to the JSON path, and ``get_raw_data`` folds
+    the lines back into the ``{overlays, trades}`` structure.
     """
     
-    def __init__(self, json_file_path: str = "chart_overlays.json"):
+    def __init__(self, json_file_path: str = "chart_overlays.json", stream: bool = False):
         self.json_file_path = json_file_path
+        self.stream = stream
+        self.stream_file_path = str(Path(json_file_path).with_suffix('.jsonl'))
         self.overlays: Dict[int, Dict[int, Dict[str, Any]]] = {}
         self.trades: List[Dict[str, Any]] = []
-        self._load_existing_data()
+        if stream:
+            # A stream always starts empty
+            open(self.stream_file_path, 'w').close()
+        else:
+            self._load_existing_data()
     
     @classmethod
     def for_job_directory(cls, job_dir: Path) -> 'ChartOverlayManager':
@@ -107,9 +126,12 @@ class ChartOverlayManager:
                         if is_valid:
                             self.overlays[datetime_number][data_feed_index][param_key] = numeric_value
                         else:
-                            print(f"Warning: Skipping invalid {data_type.value} value: {value} at time {datetime_number}")
+                            log.warning("Skipping invalid {} value: {} at time {}", data_type.value, value, datetime_number)
                     except (ValueError, TypeError):
-                        print(f"Warning: Skipping non-numeric {data_type.value} value: {value} at time {datetime_number}")
+                        log.warning("Skipping non-numeric {} value: {} at time {}", data_type.value, value, datetime_number)
+
+        if self.stream and len(self.overlays) >= STREAM_BUFFER_ENTRIES:
+            self._append_to_stream()
     
     def add_trade(self, placed_on: int, executed_on: int = None, closed_on: int = None, closed_on_price: float = None, state: str = None, **kwargs):
         """
@@ -154,7 +176,14 @@ class ChartOverlayManager:
             self.trades.append(trade_data)
     
     def save_to_file(self):
-        """Save current overlays and trades to JSON file"""
+        """Save current overlays and trades to JSON file (streaming: append the new entries)"""
+        timer = get_phase_timer()
+        start = time.perf_counter() if timer.enabled else None
+        if self.stream:
+            self._append_to_stream()
+            if start is not None:
+                timer.add('overlay_io', time.perf_counter() - start)
+            return
         try:
             # Sort overlays by datetime for consistent output
             sorted_overlays = dict(sorted(self.overlays.items()))
@@ -167,20 +196,72 @@ class ChartOverlayManager:
             with open(self.json_file_path, 'w') as f:
                 json.dump(data, f, indent=2)
         except IOError as e:
-            print(f"Warning: Could not save chart overlays to {self.json_file_path}: {e}")
+            log.warning("Could not save chart overlays to {}: {}", self.json_file_path, e)
+        if start is not None:
+            timer.add('overlay_io', time.perf_counter() - start)
+    
+    def _append_to_stream(self):
+        """Append the pending overlay entries and trade updates to the stream file and drop them from memory"""
+        if not self.overlays and not self.trades:
+            return
+        try:
+            with open(self.stream_file_path, 'a') as f:
+                for datetime_number, feeds in self.overlays.items():
+                    for data_feed_index, values in feeds.items():
+                        f.write(json.dumps({'time': datetime_number, 'feed': data_feed_index, 'values': values}) + '\n')
+                for trade in self.trades:
+                    f.write(json.dumps({'trade': trade}) + '\n')
+        except IOError as e:
+            log.warning("Could not append chart overlays to {}: {}", self.stream_file_path, e)
+            return
+        self.overlays.clear()
+        self.trades.clear()
+
+    def _iter_stream(self) -> Iterator[Dict[str, Any]]:
+        """Records of the stream file, then the pending ones (in the order they were added)"""
+        if os.path.exists(self.stream_file_path):
+            with open(self.stream_file_path, 'r') as f:
+                for line in f:
+                    if line.strip():
+                        yield json.loads(line)
+        for datetime_number, feeds in self.overlays.items():
+            for data_feed_index, values in feeds.items():
+                yield {'time': datetime_number, 'feed': data_feed_index, 'values': values}
+        for trade in self.trades:
+            yield {'trade': trade}
+
+    def _fold_stream(self, start_time: int = None, end_time: int = None) -> Dict[str, Any]:
+        """Merge the streamed records into {overlays, trades}, later records updating earlier ones"""
+        overlays: Dict[int, Dict[int, Dict[str, Any]]] = {}
+        trades: Dict[Any, Dict[str, Any]] = {}
+        for record in self._iter_stream():
+            if 'trade' in record:
+                trades.setdefault(record['trade'].get('placed_on'), {}).update(record['trade'])
+                continue
+            datetime_number = record['time']
+            if (start_time is not None and datetime_number < start_time) or (end_time is not None and datetime_number > end_time):
+                continue
+            overlays.setdefault(datetime_number, {}).setdefault(record['feed'], {}).update(record['values'])
+        return {
+            'overlays': dict(sorted(overlays.items())),
+            'trades': list(trades.values())
+        }
     
     def clear_data(self):
         """Clear all overlay and trade data"""
         self.overlays.clear()
         self.trades.clear()
-        if os.path.exists(self.json_file_path):
-            try:
-                os.remove(self.json_file_path)
-            except IOError:
-                pass
+        for path in (self.json_file_path, self.stream_file_path):
+            if os.path.exists(path):
+                try:
+                    os.remove(path)
+                except IOError:
+                    pass
     
     def get_overlays_for_time_range(self, start_time: int, end_time: int) -> Dict[int, Dict[str, Any]]:
         """Get overlay data for a specific time range"""
+        if self.stream:
+            return self._fold_stream(start_time, end_time)['overlays']
         return {
             dt: data for dt, data in self.overlays.items()
             if start_time <= dt <= end_time
@@ -192,6 +273,8 @@ class ChartOverlayManager:
         Returns:
             Dict with structure: {overlays: {timestamp: {data_feed_index: {data_type: value}}}, trades: [...]}
         """
+        if self.stream:
+            return self._fold_stream()
         return {
             'overlays': self.overlays,
             'trades': self.trades
@@ -221,3 +304,13 @@ def set_chart_overlay_manager_for_job(job_dir: Path):
     """Set the chart overlay manager to use a specific job directory"""
     global _chart_overlay_manager
     _chart_overlay_manager = ChartOverlayManager.for_job_directory(job_dir)
+
+def set_chart_overlay_streaming(stream: bool) -> Optional[ChartOverlayManager]:
+    """Switch the global chart overlay manager to (or back from) streaming, keeping its file location"""
+    global _chart_overlay_manager
+    current_stream = _chart_overlay_manager.stream if _chart_overlay_manager is not None else False
+    if current_stream == stream:
+        return _chart_overlay_manager
+    json_file_path = _chart_overlay_manager.json_file_path if _chart_overlay_manager is not None else "chart_overlays.json"
+    _chart_overlay_manager = ChartOverlayManager(json_file_path, stream=stream)
+    return _chart_overlay_manager
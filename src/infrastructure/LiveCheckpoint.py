@@ -0,0 +1,235 @@
+"""
+Warm-restart checkpoints of a live session.
+
+After every live bar the strategy's state is written to a StateManager in
+one transaction: per feed the pair state (zones, breakout trend), the zone
+indicators' S/R history and current lines, and the last EMA/ATR/RSI/volume
+MA values; plus the strategy's active trades and last processed timestamp.
+
+A restarted session with the same symbols and timeframe reads the
+checkpoint before its feeds start: each MT5LiveFeed loads only
+``warmup_candles`` bars up to the checkpoint bar plus the bars missed since
+(resume_time()). When data0 reaches the checkpoint bar, restore() puts the
+saved state back and the missed bars are processed on top of it.
+
+Backtrader indicators keep their state in their lines, so EMA/ATR/RSI are
+not injected: the warm-up bars rebuild them (their influence decays
+geometrically) and restore() compares them with the saved values. Candle
+indexes differ between sessions; restored S/R levels and trades are
+rebased onto the new session's indexes.
+
+Backtrader orders and their refs belong to the previous process, so the
+checkpoint keeps the MT5 ticket of each active trade instead. restore()
+creates new main/TP/SL orders for a trade and hands them to the broker with
+the ticket (MT5Broker.adopt): a pending order is tracked again, and can be
+cancelled or reported filled, a running trade's position reports its SL/TP
+exit. Trades without a ticket (the order was still being sent) or restored
+on a broker that cannot adopt orders are not restored and only logged:
+whatever rests in MT5 for them is no longer managed.
+"""
+
+import math
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+import backtrader as bt
+
+from src.infrastructure.StateManager import StateManager
+from src.models.s_r import SR
+from src.models.order import OrderSide
+from src.models.trade import TradeRecord, TradeState
+from src.utils.logging import get_logger
+
+log = get_logger('checkpoint')
+
+_SEEDS = ('ema', 'atr', 'rsi', 'volume_ma')
+_CANDLE_FIELDS = ('placed_candle', 'open_candle', 'close_candle')
+_DROPPED_TRADE_FIELDS = ('orders', 'main_order_ref', 'tp_order_ref', 'sl_order_ref')  # Refs of the previous process
+
+
+def session_key(symbols, timeframe: str) -> str:
+    return f"live:{timeframe}:{','.join(symbols)}"
+
+
+class LiveCheckpoint:
+    """Saves the strategy state after each live bar and restores it in the next session."""
+
+    def __init__(self, state: StateManager, session: str, resume: bool = True):
+        """
+        Args:
+            state: Store of the checkpoints
+            session: Key of the session (see session_key())
+            resume: Restore the saved checkpoint (False: start fresh, only save)
+        """
+        self.state = state
+        self.session = session
+        self.saved: Optional[dict] = state.load_state(session) if resume else None
+        self.pending_restore = self.saved is not None
+        self.saves = 0
+
+    # ---- Resume ----
+    @property
+    def resume_from(self) -> Optional[datetime]:
+        """Time of the last processed data0 bar of the checkpoint."""
+        return self.saved['last_processed_timestamp'] if self.saved else None
+
+    def resume_time(self, symbol: str) -> Optional[datetime]:
+        """Time of ``symbol``'s bar in the checkpoint (its feed loads the warm-up up to it)."""
+        if not self.saved:
+            return None
+        feed = self.saved['feeds'].get(symbol)
+        return feed['bar_time'] if feed else None
+
+    def on_bar(self, strategy, live: bool):
+        """Per data0 bar, after the pair states were updated: restore at the checkpoint bar, save on live bars."""
+        if self.pending_restore:
+            bar_time = strategy.data.datetime.datetime(0)
+            if bar_time >= self.resume_from:
+                if bar_time > self.resume_from:
+                    log.warning("Checkpoint bar {} not in the backfill, restoring at {}", self.resume_from, bar_time)
+                self.restore(strategy)
+            return
+        if live:
+            self.save(strategy)
+
+    # ---- Save ----
+    def capture(self, strategy) -> dict:
+        data_indicators = strategy._get_data_indicators()
+        data_state = strategy._get_data_state()
+        feeds = {}
+        for i, indicators in data_indicators.items():
+            data = indicators['data']
+            breakout, break_retest = indicators['breakout'], indicators['break_retest']
+            feeds[indicators['symbol']] = {
+                'bar_time': data.datetime.datetime(0),
+                'bars': len(data),
+                'data_state': dict(data_state.get(i, {})),
+                'breakout': {
+                    'candle_index': breakout.candle_index,
+                    'support1': breakout.lines.support1[0],
+                    'resistance1': breakout.lines.resistance1[0],
+                    'supports': breakout.supports,
+                    'resistances': breakout.resistances,
+                    'last_breakout_trend': breakout.last_breakout_trend,
+                    'breakout_price': breakout.breakout_price,
+                },
+                'break_retest': {
+                    'support1': break_retest.lines.support1[0],
+                    'resistance1': break_retest.lines.resistance1[0],
+                },
+                'seeds': {name: float(indicators[name][0]) for name in _SEEDS if len(indicators[name])},
+            }
+        order_ticket = getattr(strategy.broker, 'order_ticket', None)
+        trades = {}
+        tickets = {}
+        for record in strategy.active_trades.values():
+            trade_id = record.get('trade_id')
+            if trade_id is not None and trade_id not in trades:
+                trades[trade_id] = {key: value for key, value in record.items() if key not in _DROPPED_TRADE_FIELDS}
+                ticket = order_ticket(record.get('main_order_ref')) if order_ticket is not None else None
+                if ticket is not None:
+                    tickets[trade_id] = ticket
+        return {
+            'saved_at': datetime.now(timezone.utc),
+            'last_processed_timestamp': strategy.last_processed_timestamp,
+            'bars': len(strategy.data),
+            'counter': dict(strategy.counter),
+            'feeds': feeds,
+            'active_trades': list(trades.values()),
+            'tickets': tickets,  # trade_id -> MT5 ticket of the trade's order / position
+        }
+
+    def save(self, strategy):
+        """Write the checkpoint of the current bar (one transaction)."""
+        with self.state.transaction():
+            self.state.save_state(self.session, self.capture(strategy))
+        self.saves += 1
+
+    # ---- Restore ----
+    def restore(self, strategy):
+        """Put the saved state back (data0 is at the checkpoint bar)."""
+        saved = self.saved
+        self.pending_restore = False
+        data_state = strategy._get_data_state()
+        restored = []
+        for i, indicators in strategy._get_data_indicators().items():
+            feed = saved['feeds'].get(indicators['symbol'])
+            if feed is None:
+                continue
+            self._restore_zones(indicators, feed)
+            data_state.setdefault(i, {}).update(feed['data_state'])
+            drift = self._seed_drift(indicators, feed['seeds'])
+            restored.append(f"{indicators['symbol']} (seed drift {drift:.1e})")
+
+        delta = len(strategy.data) - saved['bars']
+        tickets = saved.get('tickets', {})
+        adopted = 0
+        for fields in saved['active_trades']:
+            record = TradeRecord(**{key: value + delta if key in _CANDLE_FIELDS and value is not None else value
+                                    for key, value in fields.items()})
+            if self._adopt_trade(strategy, record, tickets.get(record['trade_id'])):
+                adopted += 1
+        strategy.counter.update(saved['counter'])
+        log.info("Restored checkpoint of {} ({} bars rebased by {}): {}; {}/{} active trades",
+                 saved['last_processed_timestamp'], saved['bars'], delta, ", ".join(restored) or "no feeds",
+                 adopted, len(saved['active_trades']))
+
+    @staticmethod
+    def _adopt_trade(strategy, record: TradeRecord, ticket: Optional[int]) -> bool:
+        """Give a saved trade new orders tracking its MT5 ticket. False (trade dropped) when it cannot be tracked."""
+        adopt = getattr(strategy.broker, 'adopt', None)
+        data = next((indicators['data'] for indicators in strategy._get_data_indicators().values()
+                     if indicators['symbol'] == record['symbol']), None)
+        if ticket is None or adopt is None or data is None:
+            log.warning("Not restoring trade {} ({} {}): {}", record['trade_id'], record['symbol'], record.state,
+                        "no MT5 ticket in the checkpoint" if ticket is None
+                        else "the broker cannot adopt orders" if adopt is None else "no data feed")
+            return False
+
+        buy = record['order_side'] == OrderSide.BUY
+        size = abs(record['size'])
+        entry, exit_ = (bt.BuyOrder, bt.SellOrder) if buy else (bt.SellOrder, bt.BuyOrder)
+        main = entry(data=data, size=size, price=record.get('entry_executed_price') or record['entry_price'],
+                     exectype=bt.Order.Limit, simulated=True)
+        tp = exit_(data=data, size=size, price=record['tp'], exectype=bt.Order.Limit, parent=main, simulated=True)
+        sl = exit_(data=data, size=size, price=record['sl'], exectype=bt.Order.Stop, parent=main, simulated=True)
+        adopt(main, ticket, record['symbol'], children={'tp': tp, 'sl': sl}, filled=record.state == TradeState.RUNNING)
+
+        record['orders'] = {'main': main, 'tp': tp, 'sl': sl}
+        record['main_order_ref'], record['tp_order_ref'], record['sl_order_ref'] = main.ref, tp.ref, sl.ref
+        strategy.trades.add(record)
+        for key in (record['trade_id'], main.ref, tp.ref, sl.ref):
+            strategy.active_trades[key] = record
+        return True
+
+    @staticmethod
+    def _restore_zones(indicators, feed: dict):
+        breakout, saved = indicators['breakout'], feed['breakout']
+        delta = breakout.candle_index - saved['candle_index']
+        breakout.supports = _rebase_levels(saved['supports'], delta)
+        breakout.resistances = _rebase_levels(saved['resistances'], delta)
+        breakout.last_breakout_trend = saved['last_breakout_trend']
+        breakout.breakout_price = saved['breakout_price']
+        for indicator, lines in ((breakout, saved), (indicators['break_retest'], feed['break_retest'])):
+            # The next bar extends these levels (Zones.next reads support1[-1] / resistance1[-1])
+            indicator.lines.support1[0] = lines['support1']
+            indicator.lines.resistance1[0] = lines['resistance1']
+
+    @staticmethod
+    def _seed_drift(indicators, seeds: Dict[str, float]) -> float:
+        """Largest relative difference between the rebuilt and the saved indicator values."""
+        drift = 0.0
+        for name, saved in seeds.items():
+            line = indicators.get(name)
+            if line is None or not len(line) or math.isnan(saved):
+                continue
+            value = float(line[0])
+            if not math.isnan(value):
+                drift = max(drift, abs(value - saved) / max(abs(saved), 1e-12))
+        return drift
+
+
+def _rebase_levels(levels: Dict[int, SR], delta: int) -> Dict[int, SR]:
+    return {index + delta: SR(id=level.id + delta, type=level.type, price=level.price,
+                              candle_index=level.candle_index + delta)
+            for index, level in levels.items()}
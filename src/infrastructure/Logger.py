@@ -23,7 +23,10 @@ class RepositoryType(str, Enum):
 class StrategyLogger:
     repositories: dict[str, str]  # storing file paths instead of open file handles
 
-    def __init__(self, repositories: dict[str, RepositoryType]):
+    def __init__(self, repositories: dict[str, RepositoryType], newest_first: bool = True):
+        # newest_first rewrites the whole file to put each message on top;
+        # otherwise messages are appended (constant cost, used by low-memory runs)
+        self.newest_first = newest_first
         self.repositories = {}
         # Ensure logs directory exists
         logs_dir = Path("notebooks")
@@ -46,6 +49,11 @@ class StrategyLogger:
         date: str = None
     ):
         file_path = Path(self.repositories[repository_name])
+        date = date or datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        if not self.newest_first:
+            with open(file_path, 'a', encoding='utf-8') as f:
+                f.write(f"{date} {level.value}: {message}<br />")
+            return
         # Read existing content (handle case where file doesn't exist yet)
         existing_content = ""
         if file_path.exists():
@@ -53,12 +61,11 @@ class StrategyLogger:
                 existing_content = f.read()
         # Write new content on top
         with open(file_path, 'w', encoding='utf-8') as f:
-            date = date or datetime.now().strftime("%Y-%m-%d %H:%M:%S")
             f.write(f"{date} {level.value}: {message}<br />{existing_content}")
     
     @staticmethod
-    def get_logger():
+    def get_logger(newest_first: bool = True):
         return StrategyLogger(repositories={
             RepositoryName.ZONES: RepositoryType.FILE,
             RepositoryName.WIP: RepositoryType.FILE
-            })
\ No newline at end of file
+            }, newest_first=newest_first)
\ No newline at end of file
@@ -1,59 +1,140 @@
-import sqlite3
 import json
+import pickle
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
 
 class StateManager:
+    """
+    Key/value store on one persistent sqlite3 connection.
+
+    The database runs in WAL mode with synchronous=NORMAL: a save is an
+    append to the write-ahead log, not a rewrite of the file. Values are
+    stored as pickled blobs and only written when their bytes changed.
+    save_state()/save_many() calls inside ``with state.transaction():``
+    share one commit (one per bar for the live checkpoints).
+    Rows written as JSON text by earlier versions still load.
+    """
+
     def __init__(self, db_path="state.db"):
-        self.db_path = db_path
+        self.db_path = str(db_path)
+        if self.db_path != ":memory:":
+            Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        # One connection for the life of the manager (shared by threads, guarded by the lock)
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+        self._lock = threading.RLock()
+        self._depth = 0  # Nesting of transaction()
+        self._cache = {}  # key -> value
+        self._blobs = {}  # key -> pickled value as stored
         self._init_db()
-        self._cache = {}
 
     def _init_db(self):
         """Create table if it doesn't exist"""
-        with sqlite3.connect(self.db_path) as conn:
-            c = conn.cursor()
-            c.execute("""
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute("""
                 CREATE TABLE IF NOT EXISTS strategy_state (
                     key TEXT PRIMARY KEY,
-                    value TEXT
+                    value BLOB,
+                    updated_at REAL
                 )
             """)
-            conn.commit()
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(strategy_state)")}
+            if 'updated_at' not in columns:
+                self._conn.execute("ALTER TABLE strategy_state ADD COLUMN updated_at REAL")
+
+    @contextmanager
+    def transaction(self):
+        """Group the saves of the block into one commit (rolled back if the block raises)."""
+        with self._lock:
+            if self._depth == 0:
+                self._conn.execute("BEGIN")
+            self._depth += 1
+            try:
+                yield self
+            except BaseException:
+                self._depth -= 1
+                if self._depth == 0:
+                    self._conn.execute("ROLLBACK")
+                    # The cache may hold values of the rolled back saves
+                    self._cache.clear()
+                    self._blobs.clear()
+                raise
+            self._depth -= 1
+            if self._depth == 0:
+                self._conn.execute("COMMIT")
+
+    @staticmethod
+    def _decode(value):
+        if isinstance(value, (bytes, memoryview)):
+            return pickle.loads(bytes(value))
+        return json.loads(value)  # Rows of the JSON text format
 
     def load_state(self, key, default=None):
         """Load state from DB, fallback to default"""
         if key in self._cache:
             return self._cache[key]
 
-        with sqlite3.connect(self.db_path) as conn:
-            c = conn.cursor()
-            c.execute("SELECT value FROM strategy_state WHERE key=?", (key,))
-            row = c.fetchone()
-            if row:
-                value = json.loads(row[0])
-            else:
-                value = default
-            self._cache[key] = value
-            return value
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM strategy_state WHERE key=?", (key,)).fetchone()
+        if row is None:
+            return default
+        value = self._decode(row[0])
+        self._cache[key] = value
+        if isinstance(row[0], (bytes, memoryview)):
+            self._blobs[key] = bytes(row[0])
+        return value
 
     def save_state(self, key, value):
         """Save only if value changed to reduce writes"""
-        if self._cache.get(key) == value:
-            return
+        self.save_many({key: value})
 
-        self._cache[key] = value
-        with sqlite3.connect(self.db_path) as conn:
-            c = conn.cursor()
-            c.execute("""
-                INSERT INTO strategy_state(key, value)
-                VALUES (?, ?)
-                ON CONFLICT(key) DO UPDATE SET value=excluded.value
-            """, (key, json.dumps(value)))
-            conn.commit()
+    def save_many(self, values: dict) -> int:
+        """Save several keys in one transaction. Returns the number of rows written (changed values)."""
+        rows = []
+        now = time.time()
+        for key, value in values.items():
+            blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+            if self._blobs.get(key) == blob:
+                continue
+            rows.append((key, blob, now))
+        if not rows:
+            return 0
+        with self.transaction():
+            self._conn.executemany("""
+                INSERT INTO strategy_state(key, value, updated_at)
+                VALUES (?, ?, ?)
+                ON CONFLICT(key) DO UPDATE SET value=excluded.value, updated_at=excluded.updated_at
+            """, rows)
+        for key, blob, _ in rows:
+            self._blobs[key] = blob
+            self._cache[key] = values[key]
+        return len(rows)
+
+    def delete_state(self, *keys):
+        with self.transaction():
+            self._conn.executemany("DELETE FROM strategy_state WHERE key=?", [(key,) for key in keys])
+        for key in keys:
+            self._cache.pop(key, None)
+            self._blobs.pop(key, None)
 
     def reset(self):
         """Clear all stored state"""
-        with sqlite3.connect(self.db_path) as conn:
-            c = conn.cursor()
-            c.execute("DELETE FROM strategy_state")
-            conn.commit()
-        self._cache.clear()
\ No newline at end of file
+        with self.transaction():
+            self._conn.execute("DELETE FROM strategy_state")
+        self._cache.clear()
+        self._blobs.clear()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,113 @@
+"""
+Incremental portfolio accounting: open positions per data feed kept in arrays
+(updated on fills) and a per-bar (or per-day) equity curve.
+"""
+
+from datetime import datetime
+from typing import Dict, List
+
+import numpy as np
+
+# Columnar layout of the per-bar equity curve
+EQUITY_DTYPE = np.dtype([
+    ('time', 'datetime64[s]'),
+    ('equity', np.float64),
+])
+
+_INITIAL_CAPACITY = 1024
+
+
+class PortfolioAccountant:
+    """
+    Open positions of a strategy, one slot per data feed index.
+
+    ``sizes`` and ``prices`` mirror the broker's positions and are only
+    written when an order fills, so the unrealized PnL of a bar is a single
+    dot product over the open slots instead of a ``getposition`` call per
+    feed. ``record_equity`` appends the broker value of every bar to a
+    preallocated structured array (see ``equity_curve()``).
+
+    With ``daily=True`` (low-memory backtests) the curve keeps the first bar
+    of the run (the starting equity) and then only the last bar of each day,
+    so it grows with the number of days instead of bars; the per-bar max drawdown is tracked on the fly
+    (see ``drawdown()``).
+    """
+
+    def __init__(self, daily: bool = False):
+        self.datas: List[object] = []
+        self._index_of: Dict[int, int] = {}  # id(data) -> data feed index
+        self.sizes = np.zeros(0, dtype=np.float64)
+        self.prices = np.zeros(0, dtype=np.float64)
+        self._curve = np.zeros(_INITIAL_CAPACITY, dtype=EQUITY_DTYPE)
+        self._n_bars = 0
+        self.daily = daily
+        self._peak = None
+        self._max_drawdown = 0.0
+        self._max_drawdown_value = 0.0
+
+    # ---- Positions ----
+    def register(self, data_index: int, data):
+        """Track a data feed under its index (flat until the first fill)."""
+        if data_index >= len(self.datas):
+            grow = data_index + 1 - len(self.datas)
+            self.datas.extend([None] * grow)
+            self.sizes = np.concatenate((self.sizes, np.zeros(grow)))
+            self.prices = np.concatenate((self.prices, np.zeros(grow)))
+        self.datas[data_index] = data
+        self._index_of[id(data)] = data_index
+
+    def index_of(self, data):
+        return self._index_of.get(id(data))
+
+    def on_fill(self, data, size: float, price: float):
+        """Store the position of ``data`` after a fill (size and average price as reported by the broker)."""
+        data_index = self._index_of.get(id(data))
+        if data_index is None:
+            return
+        self.sizes[data_index] = size
+        self.prices[data_index] = price if size else 0.0
+
+    def size(self, data_index: int) -> float:
+        return float(self.sizes[data_index]) if data_index < len(self.sizes) else 0.0
+
+    def unrealized_pnl(self) -> float:
+        """Unrealized PnL of all open positions at the current close of each feed."""
+        open_slots = np.flatnonzero(self.sizes)
+        if not len(open_slots):
+            return 0.0
+        closes = np.fromiter((self.datas[i].close[0] for i in open_slots), dtype=np.float64, count=len(open_slots))
+        return float(np.dot(self.sizes[open_slots], closes - self.prices[open_slots]))
+
+    # ---- Equity curve ----
+    def record_equity(self, dt: datetime, equity: float):
+        """Append the equity of the current bar (daily curves overwrite the previous bar of the same day)."""
+        if self.daily:
+            self._track_drawdown(equity)
+            time = np.datetime64(dt, 's')
+            if self._n_bars > 1 and self._curve['time'][self._n_bars - 1].astype('datetime64[D]') == time.astype('datetime64[D]'):
+                self._curve[self._n_bars - 1] = (time, equity)
+                return
+        if self._n_bars == len(self._curve):
+            grown = np.zeros(len(self._curve) * 2, dtype=EQUITY_DTYPE)
+            grown[:self._n_bars] = self._curve
+            self._curve = grown
+        self._curve[self._n_bars] = (np.datetime64(dt, 's'), equity)
+        self._n_bars += 1
+
+    def equity_curve(self) -> np.ndarray:
+        """Structured array (time, equity) with one row per bar, or per day when daily (view, no copy)."""
+        return self._curve[:self._n_bars]
+
+    def _track_drawdown(self, equity: float):
+        if self._peak is None or equity > self._peak:
+            self._peak = equity
+        drawdown = (self._peak - equity) / self._peak if self._peak > 0 else 0.0
+        if drawdown > self._max_drawdown:
+            self._max_drawdown = drawdown
+            self._max_drawdown_value = self._peak - equity
+
+    def drawdown(self):
+        """(max drawdown, max drawdown value) over every recorded bar of a daily curve; None for per-bar curves."""
+        if not self.daily:
+            return None
+        return self._max_drawdown, self._max_drawdown_value
@@ -0,0 +1,297 @@
+"""
+Trade ledger: slotted trade records with secondary indexes and a columnar
+view of completed trades.
+"""
+
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.models.order import OrderSide, TradeState
+
+# All fields a trade record can carry. Fields that are not set yet behave like
+# missing dict keys (``record.get(field, default)`` returns the default).
+TRADE_FIELDS = (
+    'trade_id', 'symbol', 'order_side', 'state',
+    'placed_candle', 'placed_datetime',
+    'entry_price', 'entry_executed_price',
+    'size', 'sl', 'tp',
+    'broken_resistance', 'broken_support',
+    'main_order_ref', 'tp_order_ref', 'sl_order_ref',
+    'data_index', 'orders',
+    'open_candle', 'open_datetime',
+    'close_candle', 'close_datetime',
+    'exit_price', 'pnl', 'close_reason',
+    'entry_slippage', 'close_slippage', 'total_slippage',
+    # AI training
+    'rsi_at_break', 'relative_volume', 'atr_breakout_wick', 'time_to_fill',
+    'highest_excursion_from_breakout', 'atr_rel_excursion', 'atr_sl_dist', 'atr_tp_dist',
+)
+_TRADE_FIELD_SET = frozenset(TRADE_FIELDS)
+
+# Columnar layout of completed trades. ``side`` is +1 for BUY and -1 for SELL,
+# ``state`` holds the TradeState value. Missing prices are NaN, missing
+# slippage is 0.0 and missing candle indexes are -1.
+COMPLETED_TRADE_DTYPE = np.dtype([
+    ('data_index', np.int32),
+    ('side', np.int8),
+    ('state', np.int8),
+    ('placed_candle', np.int64),
+    ('open_candle', np.int64),
+    ('close_candle', np.int64),
+    ('placed_time', 'datetime64[s]'),
+    ('open_time', 'datetime64[s]'),
+    ('close_time', 'datetime64[s]'),
+    ('entry_price', np.float64),
+    ('entry_executed_price', np.float64),
+    ('exit_price', np.float64),
+    ('size', np.float64),
+    ('tp', np.float64),
+    ('sl', np.float64),
+    ('pnl', np.float64),
+    ('entry_slippage', np.float64),
+    ('close_slippage', np.float64),
+    ('total_slippage', np.float64),
+])
+
+_INITIAL_CAPACITY = 64
+
+
+class TradeRecord:
+    """
+    A single trade tracked by the strategy.
+
+    Records keep the dict-style access used across the codebase
+    (``record['pnl']``, ``record.get('exit_price')``, ``'pnl' in record``) while
+    storing fields in ``__slots__``. Changing ``state`` keeps the owning
+    ledger's state index up to date.
+    """
+
+    __slots__ = tuple(f for f in TRADE_FIELDS if f != 'state') + ('_state', '_ledger')
+
+    def __init__(self, **fields):
+        self._ledger = None
+        self._state = None
+        for key, value in fields.items():
+            self[key] = value
+
+    @property
+    def state(self) -> Optional[TradeState]:
+        return self._state
+
+    @state.setter
+    def state(self, value: Optional[TradeState]):
+        previous = self._state
+        self._state = value
+        if self._ledger is not None and previous is not value:
+            self._ledger._reindex_state(self, previous)
+
+    def __getitem__(self, key):
+        if key not in _TRADE_FIELD_SET:
+            raise KeyError(key)
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def __setitem__(self, key, value):
+        if key not in _TRADE_FIELD_SET:
+            raise KeyError(f"Unknown trade field: {key}")
+        setattr(self, key, value)
+
+    def __contains__(self, key) -> bool:
+        return key in _TRADE_FIELD_SET and hasattr(self, key)
+
+    def get(self, key, default=None):
+        if key not in _TRADE_FIELD_SET:
+            return default
+        return getattr(self, key, default)
+
+    def keys(self) -> List[str]:
+        return [f for f in TRADE_FIELDS if hasattr(self, f)]
+
+    def items(self):
+        return [(f, getattr(self, f)) for f in self.keys()]
+
+    def update(self, other=(), **kwargs):
+        pairs = other.items() if hasattr(other, 'items') else other
+        for key, value in pairs:
+            self[key] = value
+        for key, value in kwargs.items():
+            self[key] = value
+
+    def to_dict(self) -> dict:
+        return dict(self.items())
+
+    copy = to_dict
+
+    def __repr__(self) -> str:
+        return (f"TradeRecord(trade_id={self.get('trade_id')}, symbol={self.get('symbol')}, "
+                f"side={self.get('order_side')}, state={self._state}, pnl={self.get('pnl')})")
+
+
+def _as_float(value) -> float:
+    return float('nan') if value is None else float(value)
+
+
+def _as_candle(value) -> int:
+    return -1 if value is None else int(value)
+
+
+def _as_time(value) -> np.datetime64:
+    if value is None:
+        return np.datetime64('NaT', 's')
+    if isinstance(value, datetime) and value.tzinfo is not None:
+        value = value.replace(tzinfo=None) - value.utcoffset()
+    return np.datetime64(value, 's')
+
+
+def _to_row(record: TradeRecord) -> tuple:
+    get = record.get
+    side = get('order_side')
+    state = record.state
+    return (
+        _as_candle(get('data_index')),
+        1 if side == OrderSide.BUY else -1 if side == OrderSide.SELL else 0,
+        state.value if isinstance(state, TradeState) else 0,
+        _as_candle(get('placed_candle')),
+        _as_candle(get('open_candle')),
+        _as_candle(get('close_candle')),
+        _as_time(get('placed_datetime')),
+        _as_time(get('open_datetime')),
+        _as_time(get('close_datetime')),
+        _as_float(get('entry_price')),
+        _as_float(get('entry_executed_price')),
+        _as_float(get('exit_price')),
+        _as_float(get('size')),
+        _as_float(get('tp')),
+        _as_float(get('sl')),
+        _as_float(get('pnl')),
+        float(get('entry_slippage') or 0.0),
+        float(get('close_slippage') or 0.0),
+        float(get('total_slippage') or 0.0),
+    )
+
+
+class TradeLedger:
+    """
+    Registry of all trades placed by a strategy.
+
+    Behaves as a read-only mapping ``trade_id -> TradeRecord`` (so existing
+    ``self.trades[trade_id]`` / ``self.trades.values()`` code keeps working) and
+    maintains secondary indexes by state, data feed index, (data feed index,
+    state) and order ref. The indexes are updated whenever a record's state
+    changes, so per-bar checks only touch the trades they care about.
+    Completed trades are additionally appended to a preallocated structured
+    array; ``completed_array()`` returns a view of it without copying.
+    """
+
+    def __init__(self):
+        self._records: Dict[str, TradeRecord] = {}
+        self._by_state: Dict[Optional[TradeState], Dict[str, TradeRecord]] = {}
+        self._by_data_index: Dict[Optional[int], Dict[str, TradeRecord]] = {}
+        self._by_feed_state: Dict[tuple, Dict[str, TradeRecord]] = {}
+        self._by_order_ref: Dict[int, TradeRecord] = {}
+        self.completed: List[TradeRecord] = []
+        self._columns = np.zeros(_INITIAL_CAPACITY, dtype=COMPLETED_TRADE_DTYPE)
+        self._n_completed = 0
+
+    # ---- Registration ----
+    def add(self, record: TradeRecord) -> TradeRecord:
+        """Register a new trade and index it by state, data_index and order refs."""
+        trade_id = record.trade_id
+        record._ledger = self
+        self._records[trade_id] = record
+        self._by_state.setdefault(record.state, {})[trade_id] = record
+        self._by_data_index.setdefault(record.get('data_index'), {})[trade_id] = record
+        self._by_feed_state.setdefault((record.get('data_index'), record.state), {})[trade_id] = record
+        for ref in (record.get('main_order_ref'), record.get('tp_order_ref'), record.get('sl_order_ref')):
+            if ref is not None:
+                self._by_order_ref[ref] = record
+        return record
+
+    def _reindex_state(self, record: TradeRecord, previous: Optional[TradeState]):
+        trade_id = record.trade_id
+        data_index = record.get('data_index')
+        for index, old_key, new_key in ((self._by_state, previous, record.state),
+                                        (self._by_feed_state, (data_index, previous), (data_index, record.state))):
+            bucket = index.get(old_key)
+            if bucket is not None:
+                bucket.pop(trade_id, None)
+            index.setdefault(new_key, {})[trade_id] = record
+
+    def mark_completed(self, record: TradeRecord):
+        """Append a closed trade (pnl set) to the completed list and columns."""
+        if self._n_completed == len(self._columns):
+            grown = np.zeros(len(self._columns) * 2, dtype=COMPLETED_TRADE_DTYPE)
+            grown[:self._n_completed] = self._columns
+            self._columns = grown
+        self._columns[self._n_completed] = _to_row(record)
+        self._n_completed += 1
+        self.completed.append(record)
+
+    # ---- Lookups ----
+    def by_order_ref(self, ref, default=None) -> Optional[TradeRecord]:
+        return self._by_order_ref.get(ref, default)
+
+    def with_state(self, state: TradeState) -> List[TradeRecord]:
+        return list(self._by_state.get(state, {}).values())
+
+    def count(self, state: TradeState) -> int:
+        return len(self._by_state.get(state, ()))
+
+    def for_data_index(self, data_index: int) -> List[TradeRecord]:
+        return list(self._by_data_index.get(data_index, {}).values())
+
+    def for_feed(self, data_index: int, *states: TradeState) -> List[TradeRecord]:
+        """Trades on one data feed in any of the given states (grouped by state, then placement order)."""
+        return [t for state in states for t in self._by_feed_state.get((data_index, state), {}).values()]
+
+    # ---- Columnar export ----
+    def completed_array(self) -> np.ndarray:
+        """Structured array of completed trades in close order (view, no copy)."""
+        return self._columns[:self._n_completed]
+
+    def to_array(self, records=None) -> np.ndarray:
+        """Structured array for arbitrary records (defaults to all trades)."""
+        records = self._records.values() if records is None else records
+        return np.array([_to_row(r) for r in records], dtype=COMPLETED_TRADE_DTYPE)
+
+    def to_dataframe(self, completed_only: bool = True) -> pd.DataFrame:
+        """DataFrame of trades with ``trade_id`` and ``symbol`` columns added."""
+        records = self.completed if completed_only else list(self._records.values())
+        array = self.completed_array() if completed_only else self.to_array(records)
+        df = pd.DataFrame(array)
+        df.insert(0, 'symbol', [r.get('symbol') for r in records])
+        df.insert(0, 'trade_id', [r.get('trade_id') for r in records])
+        return df
+
+    # ---- Mapping protocol (trade_id -> TradeRecord) ----
+    def __getitem__(self, trade_id) -> TradeRecord:
+        return self._records[trade_id]
+
+    def __contains__(self, trade_id) -> bool:
+        return trade_id in self._records
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._records)
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __bool__(self) -> bool:
+        return bool(self._records)
+
+    def get(self, trade_id, default=None) -> Optional[TradeRecord]:
+        return self._records.get(trade_id, default)
+
+    def keys(self):
+        return self._records.keys()
+
+    def values(self):
+        return self._records.values()
+
+    def items(self):
+        return self._records.items()
@@ -0,0 +1,3 @@
+from .fake_mt5 import FakeTerminal, install
+
+__all__ = ['FakeTerminal', 'install']
@@ -0,0 +1,19 @@
+"""
+Drop-in ``MetaTrader5`` module backed by src.sim.fake_mt5.
+
+Put this directory first on PYTHONPATH to run a live entry point against the
+simulated terminal (configured through FAKE_MT5_* environment variables):
+
+    PYTHONPATH=src/sim/dropin FAKE_MT5_SPEED=3600 python main.py -m
+"""
+
+import sys
+from pathlib import Path
+
+_ROOT = Path(__file__).resolve().parents[3]
+if str(_ROOT) not in sys.path:
+    sys.path.insert(0, str(_ROOT))
+
+from src.sim import fake_mt5  # noqa: E402
+
+sys.modules[__name__] = fake_mt5.install()
@@ -0,0 +1,745 @@
+"""
+Simulated MetaTrader 5 terminal for running the live stack offline.
+
+FakeTerminal replays recorded candles (the CSVs under data/backtests/data, as
+written by data/fetch.py and the backtest setup) on an accelerated clock and
+implements the part of the MetaTrader5 API the live stack uses: connection
+(initialize, login, shutdown, last_error, version, terminal_info), market
+data (copy_rates_from_pos, copy_rates_from, copy_rates_range, symbol_info,
+symbol_info_tick, symbols_get, symbol_select), trading (order_send,
+orders_get, positions_get, history_deals_get) and account_info, with the
+real constants. Results are namedtuples like the real package's.
+
+Use it either in-process::
+
+    from src.sim import fake_mt5
+    fake_mt5.install(speed=3600)  # registers sys.modules['MetaTrader5']
+
+or as a drop-in for a whole process (main.py -m, fastapi-app/run_live.py,
+the web-app runner), configured through FAKE_MT5_* environment variables::
+
+    PYTHONPATH=src/sim/dropin FAKE_MT5_SPEED=3600 python main.py -m
+
+Replay: the server clock starts at ``start`` (default: ``history_bars`` bars
+into the first symbol's data) and runs ``speed`` times faster than wall
+time. Bars up to the clock are visible; the newest one is forming and shows
+its open price only. Requested timeframes longer than the recorded one are
+aggregated with src.data.timeframes.
+
+Fills: market deals fill at the current price (ask/bid with ``spread_points``)
+plus ``slippage_points`` against the trader; pending orders and position
+SL/TP are checked against every closed bar (SL before TP within one bar).
+``latency_ms`` delays every API call, ``order_latency_ms`` delays order_send
+on top, and ``reject_rate`` rejects that share of order_send requests
+(seeded). stats() reports call counts and bar-to-order latency: the wall time
+from the close of the symbol's last bar to each order_send.
+"""
+
+import calendar
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter, namedtuple
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.data.timeframes import TIMEFRAME_SECONDS, build_timeframes
+
+# ---- Constants (values of the MetaTrader5 package) ----
+TIMEFRAME_M1 = 1
+TIMEFRAME_M5 = 5
+TIMEFRAME_M15 = 15
+TIMEFRAME_M30 = 30
+TIMEFRAME_H1 = 16385
+TIMEFRAME_H4 = 16388
+TIMEFRAME_D1 = 16408
+TIMEFRAME_W1 = 32769
+TIMEFRAME_MN1 = 49153
+
+ORDER_TYPE_BUY = 0
+ORDER_TYPE_SELL = 1
+ORDER_TYPE_BUY_LIMIT = 2
+ORDER_TYPE_SELL_LIMIT = 3
+ORDER_TYPE_BUY_STOP = 4
+ORDER_TYPE_SELL_STOP = 5
+ORDER_TYPE_BUY_STOP_LIMIT = 6
+ORDER_TYPE_SELL_STOP_LIMIT = 7
+
+POSITION_TYPE_BUY = 0
+POSITION_TYPE_SELL = 1
+
+TRADE_ACTION_DEAL = 1
+TRADE_ACTION_PENDING = 5
+TRADE_ACTION_SLTP = 6
+TRADE_ACTION_MODIFY = 7
+TRADE_ACTION_REMOVE = 8
+
+ORDER_FILLING_FOK = 0
+ORDER_FILLING_IOC = 1
+ORDER_FILLING_RETURN = 2
+
+ORDER_TIME_GTC = 0
+ORDER_TIME_DAY = 1
+
+DEAL_ENTRY_IN = 0
+DEAL_ENTRY_OUT = 1
+
+TRADE_RETCODE_REJECT = 10006
+TRADE_RETCODE_DONE = 10009
+TRADE_RETCODE_INVALID = 10013
+TRADE_RETCODE_INVALID_VOLUME = 10014
+TRADE_RETCODE_INVALID_PRICE = 10015
+TRADE_RETCODE_MARKET_CLOSED = 10018
+
+RES_S_OK = 1
+RES_E_FAIL = -1
+RES_E_INVALID_PARAMS = -2
+RES_E_NOT_FOUND = -4
+
+_TIMEFRAME_NAMES = {
+    TIMEFRAME_M1: 'M1', TIMEFRAME_M5: 'M5', TIMEFRAME_M15: 'M15', TIMEFRAME_M30: 'M30',
+    TIMEFRAME_H1: 'H1', TIMEFRAME_H4: 'H4', TIMEFRAME_D1: 'D1', TIMEFRAME_W1: 'W1',
+}
+
+RATES_DTYPE = np.dtype([('time', '<i8'), ('open', '<f8'), ('high', '<f8'), ('low', '<f8'), ('close', '<f8'),
+                        ('tick_volume', '<u8'), ('spread', '<i4'), ('real_volume', '<u8')])
+
+# ---- Result types (namedtuples, like the MetaTrader5 package) ----
+AccountInfo = namedtuple('AccountInfo', 'login trade_mode leverage limit_orders margin_so_mode trade_allowed '
+                         'trade_expert balance credit profit equity margin margin_free margin_level '
+                         'currency server name company')
+TerminalInfo = namedtuple('TerminalInfo', 'connected trade_allowed tradeapi_disabled build name path company')
+SymbolInfo = namedtuple('SymbolInfo', 'name description visible select digits point spread trade_tick_size '
+                        'trade_tick_value trade_contract_size trade_stops_level volume_min volume_max '
+                        'volume_step filling_mode trade_mode time bid ask currency_base currency_profit')
+Tick = namedtuple('Tick', 'time bid ask last volume time_msc flags volume_real')
+TradeOrder = namedtuple('TradeOrder', 'ticket time_setup type state symbol volume_initial volume_current '
+                        'price_open sl tp price_current magic comment')
+TradePosition = namedtuple('TradePosition', 'ticket time type magic identifier volume price_open sl tp '
+                           'price_current profit symbol comment')
+TradeDeal = namedtuple('TradeDeal', 'ticket order time type entry magic position_id volume price profit '
+                       'symbol comment')
+OrderSendResult = namedtuple('OrderSendResult', 'retcode deal order volume price bid ask comment request_id '
+                             'retcode_external request')
+
+DEFAULT_DATA_DIR = Path('data/backtests/data')
+_BUY_TYPES = (ORDER_TYPE_BUY, ORDER_TYPE_BUY_LIMIT, ORDER_TYPE_BUY_STOP)
+
+
+def _epoch(value) -> int:
+    """Epoch seconds of a datetime (naive: server time) or a number."""
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            return calendar.timegm(value.timetuple())
+        return int(value.timestamp())
+    return int(value)
+
+
+class FakeTerminal:
+    """One simulated terminal: replay clock, recorded rates, account, orders and positions."""
+
+    def __init__(self, data_dir=None, start=None, speed: float = 1.0, history_bars: int = 1000,
+                 server_offset: float = 0.0, latency_ms: float = 0.0, order_latency_ms: float = 0.0,
+                 slippage_points: int = 0, spread_points: int = 10, reject_rate: float = 0.0,
+                 balance: float = 10000.0, leverage: int = 100, seed: int = 0):
+        """
+        Args:
+            data_dir: Directory of the recorded candle CSVs (default: data/backtests/data)
+            start: Server time the replay starts at (default: ``history_bars`` bars into the data)
+            speed: Server seconds per wall second
+            history_bars: Bars visible before the replay start when ``start`` is not given
+            server_offset: Server time minus UTC in hours
+            latency_ms: Delay of every API call
+            order_latency_ms: Additional delay of order_send
+            slippage_points: Market fills are this many points worse than the quote
+            spread_points: Ask minus bid in points
+            reject_rate: Share of order_send requests rejected (TRADE_RETCODE_REJECT)
+            balance: Initial account balance
+            leverage: Account leverage
+            seed: Seed of the rejection draws
+        """
+        self.data_dir = Path(data_dir) if data_dir else DEFAULT_DATA_DIR
+        self.start = _epoch(start) if start is not None else None
+        self.speed = float(speed)
+        self.history_bars = history_bars
+        self.server_offset = float(server_offset) * 3600
+        self.latency_ms = latency_ms
+        self.order_latency_ms = order_latency_ms
+        self.slippage_points = slippage_points
+        self.spread_points = spread_points
+        self.reject_rate = reject_rate
+        self.balance = float(balance)
+        self.leverage = leverage
+        self._random = random.Random(seed)
+        self._lock = threading.RLock()
+        self._origin: Optional[float] = None  # time.monotonic() at the replay start
+        self._files = self._find_files()
+        self._rates: Dict[Tuple[str, int], np.ndarray] = {}
+        self._checked: Dict[str, int] = {}  # per symbol: time of the last bar checked for fills
+        self._orders: Dict[int, dict] = {}
+        self._positions: Dict[int, dict] = {}
+        self._deals: List[TradeDeal] = []
+        self._next_ticket = 1
+        self._last_error = (RES_S_OK, 'Success')
+        self._calls: Counter = Counter()
+        self._bar_to_order_ms: List[float] = []
+        self.connected = False
+
+    # ---- Clock ----
+    def server_time(self) -> float:
+        """Replay clock: epoch seconds in server time."""
+        with self._lock:
+            if self._origin is None:
+                if self.start is None:
+                    self.start = self._default_start()
+                self._origin = time.monotonic()
+            return self.start + (time.monotonic() - self._origin) * self.speed
+
+    def utc_now(self) -> float:
+        """Replay clock in UTC epoch seconds."""
+        return self.server_time() - self.server_offset
+
+    def replay_clock(self) -> dict:
+        """Clock arguments for MT5BarPoller (clock, speed), so it schedules on replay time."""
+        return {'clock': self.utc_now, 'speed': self.speed}
+
+    def wall_delay(self, server_seconds: float) -> float:
+        """Wall seconds for ``server_seconds`` of replay time."""
+        return server_seconds / self.speed
+
+    def _default_start(self) -> int:
+        if not self._files:
+            return int(time.time() + self.server_offset)
+        symbol = min(self._files)
+        times = self._symbol_rates(symbol, self._base_timeframe(symbol))['time']
+        return int(times[min(self.history_bars, len(times) - 1)])
+
+    # ---- Data ----
+    def _find_files(self) -> Dict[str, Dict[str, Path]]:
+        """CSV per symbol and timeframe: ``<SYMBOL>._<TF>_<start>_<end>.csv``."""
+        files: Dict[str, Dict[str, Path]] = {}
+        if not self.data_dir.is_dir():
+            return files
+        for path in sorted(self.data_dir.glob('*.csv')):
+            parts = path.stem.split('_')
+            if len(parts) < 2 or parts[1] not in TIMEFRAME_SECONDS:
+                continue
+            symbol = parts[0].rstrip('.')
+            files.setdefault(symbol, {})[parts[1]] = path
+        return files
+
+    @staticmethod
+    def _load_file(path: Path) -> np.ndarray:
+        df = pd.read_csv(path)
+        df.columns = [column.lower() for column in df.columns]
+        time_column = 'time' if 'time' in df.columns else 'datetime'
+        rates = np.zeros(len(df), dtype=RATES_DTYPE)
+        rates['time'] = pd.to_datetime(df[time_column]).to_numpy(dtype='datetime64[s]').astype(np.int64)
+        for column in ('open', 'high', 'low', 'close'):
+            rates[column] = df[column].to_numpy(dtype=np.float64)
+        volume = df['tick_volume'] if 'tick_volume' in df.columns else df.get('volume')
+        rates['tick_volume'] = volume.to_numpy() if volume is not None else 1
+        return rates
+
+    def _symbol_rates(self, symbol: str, timeframe: int) -> Optional[np.ndarray]:
+        """All recorded bars of ``symbol`` in ``timeframe`` (aggregated when only shorter bars exist)."""
+        key = (symbol, timeframe)
+        if key in self._rates:
+            return self._rates[key]
+        name = _TIMEFRAME_NAMES.get(timeframe)
+        files = self._files.get(symbol, {})
+        if name is None or not files:
+            return None
+        if name in files:
+            rates = self._load_file(files[name])
+        else:
+            shorter = [tf for tf in files if TIMEFRAME_SECONDS[tf] < TIMEFRAME_SECONDS[name]
+                       and TIMEFRAME_SECONDS[name] % TIMEFRAME_SECONDS[tf] == 0]
+            if not shorter:
+                return None
+            base_name = max(shorter, key=TIMEFRAME_SECONDS.get)
+            base = self._load_file(files[base_name])
+            bars = build_timeframes(base['time'], base['open'], base['high'], base['low'], base['close'],
+                                    base['tick_volume'], timeframes=(name,),
+                                    base_seconds=TIMEFRAME_SECONDS[base_name]).frames[name]
+            rates = np.zeros(len(bars), dtype=RATES_DTYPE)
+            for column in ('time', 'open', 'high', 'low', 'close'):
+                rates[column] = getattr(bars, column)
+            rates['tick_volume'] = bars.volume
+        self._rates[key] = rates
+        return rates
+
+    def _visible(self, symbol: str, timeframe: int) -> Tuple[Optional[np.ndarray], int]:
+        """Recorded bars and how many of them the replay clock has opened (the last one is forming)."""
+        rates = self._symbol_rates(symbol, timeframe)
+        if rates is None:
+            return None, 0
+        return rates, int(np.searchsorted(rates['time'], self.server_time(), side='right'))
+
+    @staticmethod
+    def _window(rates: np.ndarray, end: int, lo: int, hi: int) -> np.ndarray:
+        """Copy of rates[lo:hi] (hi <= end); the forming bar at end - 1 shows its open price only."""
+        lo, hi = max(0, lo), max(0, min(hi, end))
+        window = rates[lo:hi].copy()
+        if hi == end and hi > lo:
+            for column in ('high', 'low', 'close'):
+                window[column][-1] = window['open'][-1]
+            window['tick_volume'][-1] = 1
+        return window
+
+    def _base_timeframe(self, symbol: str) -> Optional[int]:
+        files = self._files.get(symbol)
+        if not files:
+            return None
+        name = min(files, key=TIMEFRAME_SECONDS.get)
+        return next(tf for tf, tf_name in _TIMEFRAME_NAMES.items() if tf_name == name)
+
+    def _point(self, symbol: str) -> float:
+        rates = self._symbol_rates(symbol, self._base_timeframe(symbol))
+        price = float(rates['close'][-1]) if rates is not None and len(rates) else 1.0
+        return 0.001 if price >= 20 else 0.00001
+
+    def _quote(self, symbol: str) -> Tuple[float, float]:
+        """(bid, ask) at the replay clock: the open of the forming base bar."""
+        rates, end = self._visible(symbol, self._base_timeframe(symbol))
+        if rates is None or not end:
+            return 0.0, 0.0
+        bid = float(rates['open'][end - 1])
+        return bid, bid + self.spread_points * self._point(symbol)
+
+    # ---- API plumbing ----
+    def _call(self, name: str):
+        self._calls[name] += 1
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000.0)
+
+    def _fail(self, code: int, message: str):
+        self._last_error = (code, message)
+        return None
+
+    # ---- Connection ----
+    def initialize(self, path=None, login=None, password=None, server=None, timeout=None, portable=False):
+        with self._lock:
+            self._call('initialize')
+            self.connected = True
+            self._last_error = (RES_S_OK, 'Success')
+            return True
+
+    def login(self, login=None, password=None, server=None, timeout=None):
+        with self._lock:
+            self._call('login')
+            return self.connected
+
+    def shutdown(self):
+        with self._lock:
+            self._call('shutdown')
+            self.connected = False
+            return True
+
+    def last_error(self):
+        return self._last_error
+
+    def version(self):
+        return (500, 5000, '01 Jan 2025')
+
+    def terminal_info(self):
+        with self._lock:
+            self._call('terminal_info')
+            return TerminalInfo(self.connected, True, False, 5000, 'FakeTerminal', str(self.data_dir), 'Simulation')
+
+    # ---- Market data ----
+    def copy_rates_from_pos(self, symbol, timeframe, start_pos, count):
+        with self._lock:
+            self._call('copy_rates_from_pos')
+            rates, end = self._visible(symbol, timeframe)
+            if rates is None:
+                return self._fail(RES_E_NOT_FOUND, f'Terminal: Not found {symbol}')
+            hi = end - int(start_pos)
+            return self._window(rates, end, hi - int(count), hi)
+
+    def copy_rates_from(self, symbol, timeframe, date_from, count):
+        with self._lock:
+            self._call('copy_rates_from')
+            rates, end = self._visible(symbol, timeframe)
+            if rates is None:
+                return self._fail(RES_E_NOT_FOUND, f'Terminal: Not found {symbol}')
+            hi = int(np.searchsorted(rates['time'], _epoch(date_from), side='right'))
+            return self._window(rates, end, hi - int(count), hi)
+
+    def copy_rates_range(self, symbol, timeframe, date_from, date_to):
+        with self._lock:
+            self._call('copy_rates_range')
+            rates, end = self._visible(symbol, timeframe)
+            if rates is None:
+                return self._fail(RES_E_NOT_FOUND, f'Terminal: Not found {symbol}')
+            lo = int(np.searchsorted(rates['time'], _epoch(date_from), side='left'))
+            hi = int(np.searchsorted(rates['time'], _epoch(date_to), side='right'))
+            return self._window(rates, end, lo, hi)
+
+    def symbols_get(self, group=None):
+        with self._lock:
+            self._call('symbols_get')
+            return tuple(self._symbol_info(symbol) for symbol in sorted(self._files))
+
+    def symbol_select(self, symbol, enable=True):
+        with self._lock:
+            self._call('symbol_select')
+            return symbol in self._files
+
+    def symbol_info(self, symbol):
+        with self._lock:
+            self._call('symbol_info')
+            if symbol not in self._files:
+                return self._fail(RES_E_NOT_FOUND, f'Terminal: Not found {symbol}')
+            return self._symbol_info(symbol)
+
+    def _symbol_info(self, symbol: str) -> SymbolInfo:
+        point = self._point(symbol)
+        bid, ask = self._quote(symbol)
+        digits = int(round(-np.log10(point)))
+        contract_size = self._contract_size(symbol)
+        return SymbolInfo(
+            name=symbol, description=symbol, visible=True, select=True, digits=digits, point=point,
+            spread=self.spread_points, trade_tick_size=point, trade_tick_value=point * contract_size,
+            trade_contract_size=contract_size, trade_stops_level=0, volume_min=0.01, volume_max=100.0,
+            volume_step=0.01, filling_mode=2, trade_mode=4, time=int(self.server_time()), bid=bid, ask=ask,
+            currency_base=symbol[:3], currency_profit=symbol[3:6],
+        )
+
+    def symbol_info_tick(self, symbol):
+        with self._lock:
+            self._call('symbol_info_tick')
+            if symbol not in self._files:
+                return self._fail(RES_E_NOT_FOUND, f'Terminal: Not found {symbol}')
+            now = self.server_time()
+            bid, ask = self._quote(symbol)
+            return Tick(int(now), bid, ask, bid, 1, int(now * 1000), 6, 1.0)
+
+    # ---- Account ----
+    def account_info(self):
+        with self._lock:
+            self._call('account_info')
+            self._process_fills()
+            profit = sum(self._floating_profit(position) for position in self._positions.values())
+            margin = sum(position['volume'] * self._contract_size(position['symbol']) * position['price_open']
+                         for position in self._positions.values()) / self.leverage
+            equity = self.balance + profit
+            return AccountInfo(
+                login=1, trade_mode=0, leverage=self.leverage, limit_orders=200, margin_so_mode=0,
+                trade_allowed=True, trade_expert=True, balance=self.balance, credit=0.0, profit=profit,
+                equity=equity, margin=margin, margin_free=equity - margin,
+                margin_level=equity / margin * 100 if margin else 0.0, currency='USD', server='FakeTerminal',
+                name='Simulation', company='Simulation',
+            )
+
+    def _contract_size(self, symbol: str) -> float:
+        return 100.0 if symbol.startswith(('XAU', 'XAG')) else 100000.0
+
+    def _floating_profit(self, position: dict) -> float:
+        bid, ask = self._quote(position['symbol'])
+        price = bid if position['type'] == POSITION_TYPE_BUY else ask
+        return self._profit(position, price)
+
+    def _profit(self, position: dict, price: float) -> float:
+        direction = 1 if position['type'] == POSITION_TYPE_BUY else -1
+        return (price - position['price_open']) * direction * position['volume'] * self._contract_size(position['symbol'])
+
+    # ---- Orders and positions ----
+    def orders_get(self, symbol=None, group=None, ticket=None):
+        with self._lock:
+            self._call('orders_get')
+            self._process_fills()
+            return tuple(self._order_tuple(order) for order in self._orders.values()
+                         if (symbol is None or order['symbol'] == symbol)
+                         and (ticket is None or order['ticket'] == ticket))
+
+    def positions_get(self, symbol=None, group=None, ticket=None):
+        with self._lock:
+            self._call('positions_get')
+            self._process_fills()
+            return tuple(self._position_tuple(position) for position in self._positions.values()
+                         if (symbol is None or position['symbol'] == symbol)
+                         and (ticket is None or position['ticket'] == ticket))
+
+    def history_deals_get(self, date_from=None, date_to=None, group=None, ticket=None, position=None):
+        with self._lock:
+            self._call('history_deals_get')
+            self._process_fills()
+            start = _epoch(date_from) if date_from is not None else None
+            end = _epoch(date_to) if date_to is not None else None
+            return tuple(deal for deal in self._deals
+                         if (start is None or deal.time >= start) and (end is None or deal.time <= end)
+                         and (ticket is None or deal.order == ticket)
+                         and (position is None or deal.position_id == position))
+
+    def _order_tuple(self, order: dict) -> TradeOrder:
+        bid, ask = self._quote(order['symbol'])
+        return TradeOrder(order['ticket'], order['time'], order['type'], 1, order['symbol'], order['volume'],
+                          order['volume'], order['price'], order['sl'], order['tp'],
+                          ask if order['type'] in _BUY_TYPES else bid, order['magic'], order['comment'])
+
+    def _position_tuple(self, position: dict) -> TradePosition:
+        bid, ask = self._quote(position['symbol'])
+        return TradePosition(position['ticket'], position['time'], position['type'], position['magic'],
+                             position['ticket'], position['volume'], position['price_open'], position['sl'],
+                             position['tp'], bid if position['type'] == POSITION_TYPE_BUY else ask,
+                             self._floating_profit(position), position['symbol'], position['comment'])
+
+    def order_send(self, request):
+        with self._lock:
+            self._call('order_send')
+            if self.order_latency_ms:
+                time.sleep(self.order_latency_ms / 1000.0)
+            self._process_fills()
+            symbol = request.get('symbol')
+            if symbol is not None and symbol in self._files:
+                self._record_bar_to_order(symbol)
+            if self.reject_rate and self._random.random() < self.reject_rate:
+                return self._result(TRADE_RETCODE_REJECT, request, comment='Rejected (simulated)')
+
+            action = request.get('action')
+            if action == TRADE_ACTION_DEAL:
+                return self._deal(request)
+            if action == TRADE_ACTION_PENDING:
+                return self._place_pending(request)
+            if action == TRADE_ACTION_MODIFY:
+                order = self._orders.get(request.get('order'))
+                if order is None:
+                    return self._result(TRADE_RETCODE_INVALID, request, comment='Order not found')
+                for field in ('price', 'sl', 'tp'):
+                    if request.get(field) is not None:
+                        order[field] = float(request[field])
+                return self._result(TRADE_RETCODE_DONE, request, order=order['ticket'])
+            if action == TRADE_ACTION_SLTP:
+                position = self._positions.get(request.get('position'))
+                if position is None:
+                    return self._result(TRADE_RETCODE_INVALID, request, comment='Position not found')
+                position['sl'] = float(request.get('sl') or 0.0)
+                position['tp'] = float(request.get('tp') or 0.0)
+                return self._result(TRADE_RETCODE_DONE, request, order=position['ticket'])
+            if action == TRADE_ACTION_REMOVE:
+                if self._orders.pop(request.get('order'), None) is None:
+                    return self._result(TRADE_RETCODE_INVALID, request, comment='Order not found')
+                return self._result(TRADE_RETCODE_DONE, request, order=request.get('order'))
+            return self._result(TRADE_RETCODE_INVALID, request, comment=f'Unsupported action {action}')
+
+    def _result(self, retcode: int, request: dict, deal: int = 0, order: int = 0, volume: float = 0.0,
+                price: float = 0.0, comment: str = 'Request executed') -> OrderSendResult:
+        bid, ask = self._quote(request['symbol']) if request.get('symbol') in self._files else (0.0, 0.0)
+        return OrderSendResult(retcode, deal, order, volume, price, bid, ask, comment, 0, 0, request)
+
+    def _deal(self, request: dict) -> OrderSendResult:
+        symbol = request.get('symbol')
+        if symbol not in self._files:
+            return self._result(TRADE_RETCODE_INVALID, request, comment=f'Unknown symbol {symbol}')
+        volume = float(request.get('volume') or 0.0)
+        if volume <= 0:
+            return self._result(TRADE_RETCODE_INVALID_VOLUME, request, comment='Invalid volume')
+        order_type = request.get('type')
+        bid, ask = self._quote(symbol)
+        slippage = self.slippage_points * self._point(symbol)
+        price = ask + slippage if order_type == ORDER_TYPE_BUY else bid - slippage
+
+        position = self._positions.get(request.get('position'))
+        if position is not None:
+            # Closing deal of an existing position
+            self._close_position(position, price, request.get('comment', ''))
+            return self._result(TRADE_RETCODE_DONE, request, deal=self._deals[-1].ticket,
+                                order=position['ticket'], volume=volume, price=price)
+
+        ticket = self._open_position(symbol, order_type, volume, price, request)
+        return self._result(TRADE_RETCODE_DONE, request, deal=self._deals[-1].ticket, order=ticket,
+                            volume=volume, price=price)
+
+    def _place_pending(self, request: dict) -> OrderSendResult:
+        symbol = request.get('symbol')
+        if symbol not in self._files:
+            return self._result(TRADE_RETCODE_INVALID, request, comment=f'Unknown symbol {symbol}')
+        if request.get('type') not in (ORDER_TYPE_BUY_LIMIT, ORDER_TYPE_SELL_LIMIT,
+                                       ORDER_TYPE_BUY_STOP, ORDER_TYPE_SELL_STOP):
+            return self._result(TRADE_RETCODE_INVALID, request, comment='Unsupported pending order type')
+        ticket = self._new_ticket()
+        self._orders[ticket] = {
+            'ticket': ticket, 'time': int(self.server_time()), 'type': request['type'], 'symbol': symbol,
+            'volume': float(request.get('volume') or 0.0), 'price': float(request['price']),
+            'sl': float(request.get('sl') or 0.0), 'tp': float(request.get('tp') or 0.0),
+            'magic': request.get('magic', 0), 'comment': request.get('comment', ''),
+        }
+        self._checked.setdefault(symbol, self._last_closed_time(symbol))
+        return self._result(TRADE_RETCODE_DONE, request, order=ticket, volume=self._orders[ticket]['volume'],
+                            price=self._orders[ticket]['price'])
+
+    def _new_ticket(self) -> int:
+        ticket = self._next_ticket
+        self._next_ticket += 1
+        return ticket
+
+    def _open_position(self, symbol: str, order_type: int, volume: float, price: float, request: dict,
+                       ticket: Optional[int] = None, when: Optional[int] = None) -> int:
+        ticket = ticket if ticket is not None else self._new_ticket()
+        when = when if when is not None else int(self.server_time())
+        position_type = POSITION_TYPE_BUY if order_type in _BUY_TYPES else POSITION_TYPE_SELL
+        self._positions[ticket] = {
+            'ticket': ticket, 'time': when, 'type': position_type, 'symbol': symbol, 'volume': volume,
+            'price_open': price, 'sl': float(request.get('sl') or 0.0), 'tp': float(request.get('tp') or 0.0),
+            'magic': request.get('magic', 0), 'comment': request.get('comment', ''),
+        }
+        self._deals.append(TradeDeal(self._new_ticket(), ticket, when, position_type, DEAL_ENTRY_IN,
+                                     request.get('magic', 0), ticket, volume, price, 0.0, symbol,
+                                     request.get('comment', '')))
+        self._checked.setdefault(symbol, self._last_closed_time(symbol))
+        return ticket
+
+    def _close_position(self, position: dict, price: float, comment: str, when: Optional[int] = None):
+        profit = self._profit(position, price)
+        self.balance += profit
+        del self._positions[position['ticket']]
+        close_type = POSITION_TYPE_SELL if position['type'] == POSITION_TYPE_BUY else POSITION_TYPE_BUY
+        self._deals.append(TradeDeal(self._new_ticket(), position['ticket'],
+                                     when if when is not None else int(self.server_time()), close_type,
+                                     DEAL_ENTRY_OUT, position['magic'], position['ticket'], position['volume'],
+                                     price, profit, position['symbol'], comment))
+
+    # ---- Fill simulation ----
+    def _last_closed_time(self, symbol: str) -> int:
+        rates, end = self._visible(symbol, self._base_timeframe(symbol))
+        return int(rates['time'][end - 2]) if rates is not None and end > 1 else 0
+
+    def _process_fills(self):
+        """Trigger pending orders and position SL/TP on the base bars closed since the last check."""
+        for symbol, checked in list(self._checked.items()):
+            rates, end = self._visible(symbol, self._base_timeframe(symbol))
+            if rates is None or end < 2:
+                continue
+            new = rates[int(np.searchsorted(rates['time'], checked, side='right')):end - 1]
+            for bar in new:
+                self._fill_on_bar(symbol, bar)
+            if len(new):
+                self._checked[symbol] = int(new['time'][-1])
+
+    def _fill_on_bar(self, symbol: str, bar):
+        high, low, when = float(bar['high']), float(bar['low']), int(bar['time'])
+        for order in [order for order in self._orders.values() if order['symbol'] == symbol]:
+            price, order_type = order['price'], order['type']
+            triggered = ((order_type == ORDER_TYPE_BUY_STOP and high >= price)
+                         or (order_type == ORDER_TYPE_SELL_STOP and low <= price)
+                         or (order_type == ORDER_TYPE_BUY_LIMIT and low <= price)
+                         or (order_type == ORDER_TYPE_SELL_LIMIT and high >= price))
+            if triggered:
+                del self._orders[order['ticket']]
+                self._open_position(symbol, order_type, order['volume'], price, order, ticket=order['ticket'],
+                                    when=when)
+        for position in [position for position in self._positions.values() if position['symbol'] == symbol]:
+            if position['time'] > when:
+                continue
+            long = position['type'] == POSITION_TYPE_BUY
+            sl, tp = position['sl'], position['tp']
+            if sl and (low <= sl if long else high >= sl):
+                self._close_position(position, sl, '[sl]', when=when)
+            elif tp and (high >= tp if long else low <= tp):
+                self._close_position(position, tp, '[tp]', when=when)
+
+    # ---- Metrics ----
+    def _record_bar_to_order(self, symbol: str):
+        rates, end = self._visible(symbol, self._base_timeframe(symbol))
+        if rates is None or not end:
+            return
+        # The forming bar opened when the previous bar closed
+        self._bar_to_order_ms.append(self.wall_delay(self.server_time() - int(rates['time'][end - 1])) * 1000.0)
+
+    def stats(self) -> dict:
+        """API call counts, order_send bar-to-order latencies (ms) and trading totals."""
+        with self._lock:
+            latencies = self._bar_to_order_ms
+            return {
+                'calls': dict(self._calls),
+                'orders_sent': len(latencies),
+                'bar_to_order_ms_mean': float(np.mean(latencies)) if latencies else 0.0,
+                'bar_to_order_ms_max': float(np.max(latencies)) if latencies else 0.0,
+                'bar_to_order_ms_p95': float(np.percentile(latencies, 95)) if latencies else 0.0,
+                'open_orders': len(self._orders),
+                'open_positions': len(self._positions),
+                'deals': len(self._deals),
+                'balance': self.balance,
+            }
+
+
+# ---- Module-level API (the MetaTrader5 functions), backed by one default terminal ----
+_terminal: Optional[FakeTerminal] = None
+
+_API = ('initialize', 'login', 'shutdown', 'last_error', 'version', 'terminal_info', 'copy_rates_from_pos',
+        'copy_rates_from', 'copy_rates_range', 'symbols_get', 'symbol_select', 'symbol_info', 'symbol_info_tick',
+        'account_info', 'orders_get', 'positions_get', 'history_deals_get', 'order_send')
+
+
+def terminal_from_env() -> FakeTerminal:
+    """FakeTerminal configured from FAKE_MT5_* environment variables."""
+    env = os.environ.get
+    return FakeTerminal(
+        data_dir=env('FAKE_MT5_DATA_DIR'),
+        start=pd.Timestamp(env('FAKE_MT5_START')).to_pydatetime() if env('FAKE_MT5_START') else None,
+        speed=float(env('FAKE_MT5_SPEED', '1')),
+        history_bars=int(env('FAKE_MT5_HISTORY_BARS', '1000')),
+        server_offset=float(env('FAKE_MT5_SERVER_OFFSET', '0')),
+        latency_ms=float(env('FAKE_MT5_LATENCY_MS', '0')),
+        order_latency_ms=float(env('FAKE_MT5_ORDER_LATENCY_MS', '0')),
+        slippage_points=int(env('FAKE_MT5_SLIPPAGE_POINTS', '0')),
+        spread_points=int(env('FAKE_MT5_SPREAD_POINTS', '10')),
+        reject_rate=float(env('FAKE_MT5_REJECT_RATE', '0')),
+        balance=float(env('FAKE_MT5_BALANCE', '10000')),
+        seed=int(env('FAKE_MT5_SEED', '0')),
+    )
+
+
+def terminal() -> FakeTerminal:
+    """The terminal behind the module-level API (created from the environment on first use)."""
+    global _terminal
+    if _terminal is None:
+        _terminal = terminal_from_env()
+    return _terminal
+
+
+def configure(**options) -> FakeTerminal:
+    """Replace the default terminal with ``FakeTerminal(**options)``."""
+    global _terminal
+    _terminal = FakeTerminal(**options)
+    return _terminal
+
+
+def replay_clock() -> dict:
+    return terminal().replay_clock()
+
+
+def stats() -> dict:
+    return terminal().stats()
+
+
+def _bind(name: str):
+    def call(*args, **kwargs):
+        return getattr(terminal(), name)(*args, **kwargs)
+    call.__name__ = name
+    call.__doc__ = f"MetaTrader5.{name} on the default FakeTerminal."
+    return call
+
+
+for _name in _API:
+    globals()[_name] = _bind(_name)
+
+
+def install(**options):
+    """
+    Register this module as ``MetaTrader5`` (sys.modules), so the live stack
+    imports it; ``options`` configure a new default terminal (FakeTerminal
+    arguments), otherwise it is configured from the environment.
+    """
+    if options:
+        configure(**options)
+    module = sys.modules[__name__]
+    sys.modules['MetaTrader5'] = module
+    return module
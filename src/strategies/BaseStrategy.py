@@ -2,27 +2,44 @@ import backtrader as bt
 import csv
 import math
 import os
+import time
 from datetime import datetime, timezone
 from pathlib import Path
 from src.indicators.BreakoutIndicator import BreakoutIndicator
 from src.indicators.BreakRetestIndicator import BreakRetestIndicator
+from src.indicators.PrecomputedLine import PrecomputedLine
 from src.models.candlestick import Candlestick
 from src.models.chart_markers import ChartDataType, ChartData, ChartDataPoint, ChartMarkerType
 from src.models.order import OrderType, OrderSide, TradeState
+from src.models.portfolio import PortfolioAccountant
+from src.models.trade import TradeLedger
+from src.engine import indicators as fast_indicators
+from src.utils.analytics import performance_stats
 from src.utils.config import Config
 from src.utils.strategy_utils.general_utils import convert_pips_to_price
 from src.infrastructure import StrategyLogger, RepositoryType, LogLevel, RepositoryName
 from src.infrastructure.ChartOverlayManager import get_chart_overlay_manager
-from src.utils.logging import configure_windows_console_for_utf8
+from src.utils.logging import LEVELS, configure_windows_console_for_utf8, get_logger
+from src.utils.profiling import get_phase_timer
 
 configure_windows_console_for_utf8()
 
+log = get_logger('strategy')
+repo_log = get_logger('strategy.repo')  # HTML log repositories (zones, wip)
+
 class BaseStrategy(bt.Strategy):
     # Store the original params tuple for inheritance
     _base_params = (
         ('symbol', None),
         ('risk_per_trade', Config.risk_per_trade),
         ('rr', Config.rr),
+        # Headless runs (tuning, batch backtests): no chart/overlay data, candle_data, logs or warning banners
+        ('lean', False),
+        # Bounded-memory runs (exactbars): zone look-back capped at Config.low_memory_lookback,
+        # only the current candle_data entry kept, chart overlays streamed to disk
+        ('low_memory', False),
+        # Live runs: LiveCheckpoint saving the state after each live bar (and restoring a saved one)
+        ('checkpoint', None),
     )
     
     params = _base_params
@@ -31,9 +48,15 @@ class BaseStrategy(bt.Strategy):
         self.candle_index = 0
         self.current_candle = None
         self.open_positions_summary = {} # Tracks the current position on each data feed
-        self.trades = {}
-        self.logger = StrategyLogger.get_logger()
+        self.trades = TradeLedger() # trade_id -> TradeRecord
+        self.portfolio = PortfolioAccountant(daily=self.params.low_memory) # open positions per data feed + equity curve (per bar, per day in low-memory runs)
+        self.lean = self.params.lean
+        self.low_memory = self.params.low_memory
+        self.checkpoint = self.params.checkpoint
+        self.logger = StrategyLogger.get_logger(newest_first=not self.low_memory)
         self.mode = Config.mode
+        self.timer = get_phase_timer()  # per-phase timings when profiling is enabled
+        self.candle_counts = {}  # data feed index -> bars seen (lean and low-memory runs keep no candle_data history)
         
         # Get cerebro to access daily_data_mapping
         cerebro = getattr(self.broker, '_owner', None)
@@ -79,10 +102,24 @@ class BaseStrategy(bt.Strategy):
                 daily_data.close,
                 period=14
             )
-            print(f"Daily data feed available: {getattr(daily_data, '_name', 'unknown')}")
+            if not self.lean:
+                log.debug("Daily data feed available: {}", getattr(daily_data, '_name', 'unknown'))
+        elif 'D1' in getattr(cerebro, 'timeframes', {}).get(0, ()):
+            # RSI of the closed D1 bars built from data0's candles, read per base bar
+            daily_bars = cerebro.timeframes[0]['D1']
+            self.indicators['daily_rsi'] = PrecomputedLine(
+                self.data,
+                values=daily_bars.closed_values(fast_indicators.rsi(daily_bars.close, 14))
+            )
+            if not self.lean:
+                log.debug("Daily RSI from {} closed D1 bars", len(daily_bars))
+        elif Config.check_for_daily_rsi:
+            # Without it every trade would pass the daily RSI check
+            raise ValueError("check_for_daily_rsi is on but there is no daily data to compute the daily RSI from")
         else:
             self.indicators['daily_rsi'] = None
-            print("Daily RSI not initialized - daily_data is None")
+            if not self.lean:
+                log.warning("Daily RSI not initialized - daily_data is None")
 
         # Access cerebro through broker's _owner attribute
         cerebro = getattr(self.broker, '_owner', None)
@@ -123,13 +160,30 @@ class BaseStrategy(bt.Strategy):
                 
                 # Only initialize if not already present (to preserve state across runs)
                 if original_data_index not in cerebro.data_indicators:
+                    max_lookback = Config.low_memory_lookback if self.low_memory else None
+                    precomputed = getattr(cerebro, 'precomputed_indicators', {}).get(original_data_index)
+                    atr_values = precomputed.atr if precomputed is not None else None
+                    feed_indicators = {
+                        'breakout': BreakoutIndicator(data, symbol=symbol, max_lookback=max_lookback, atr_values=atr_values),
+                        'break_retest': BreakRetestIndicator(data, symbol=symbol, max_lookback=max_lookback, atr_values=atr_values),
+                    }
+                    if precomputed is not None:
+                        # Arrays computed before the run (src.engine.precompute), same values bar by bar
+                        feed_indicators.update({
+                            'atr': PrecomputedLine(data, values=precomputed.atr, minperiod=Config.atr_length + 1),
+                            'ema': PrecomputedLine(data, values=precomputed.ema, minperiod=Config.ema_length),
+                            'volume_ma': PrecomputedLine(data, values=precomputed.volume_ma, minperiod=Config.volume_ma_length),
+                            'rsi': PrecomputedLine(data, values=precomputed.rsi, minperiod=15),
+                        })
+                    else:
+                        feed_indicators.update({
+                            'atr': bt.indicators.ATR(data, period=Config.atr_length),
+                            'ema': bt.indicators.EMA(data.close, period=Config.ema_length),
+                            'volume_ma': bt.indicators.SMA(data.volume, period=Config.volume_ma_length),
+                            'rsi': bt.indicators.RSI(data.close, period=14),
+                        })
                     cerebro.data_indicators[original_data_index] = {
-                        'breakout': BreakoutIndicator(data, symbol=symbol),
-                        'break_retest': BreakRetestIndicator(data, symbol=symbol),
-                        'atr': bt.indicators.ATR(data, period=Config.atr_length),
-                        'ema': bt.indicators.EMA(data.close, period=Config.ema_length),
-                        'volume_ma': bt.indicators.SMA(data.volume, period=Config.volume_ma_length),
-                        'rsi': bt.indicators.RSI(data.close, period=14),
+                        **feed_indicators,
                         'symbol': symbol,
                         'data': data
                     }
@@ -175,15 +229,35 @@ class BaseStrategy(bt.Strategy):
         self.initial_cash = None
         self.current_cash = None
         self.unrealized_pnl = 0
-        self.completed_trades = []
         self.counter = {'tp': 0, 'sl': 0}
+        # When set, chart overlay writes stay in memory until the next flush (see _save_chart_overlays)
+        self.defer_chart_flush = False
+        self._chart_flush_pending = False
 
         
     def start(self):
         """Called when the strategy starts - track initial cash"""
         self.initial_cash = self.broker.getvalue()
         self.current_cash = self.initial_cash
-    
+        for i, indicators_info in self._get_data_indicators().items():
+            self.portfolio.register(i, indicators_info['data'])
+        self._sync_positions()
+
+    def stop(self):
+        """Called when the strategy stops - write any deferred chart overlay data"""
+        self.flush_chart_overlays()
+
+    def clear(self):
+        """Called by backtrader after each bar's notifications"""
+        super().clear()
+        if self.low_memory:
+            # backtrader keeps every order notification and closed trade for post-run
+            # analysis; only the current trade of each data feed is read again
+            self._orders.clear()
+            for data_trades in self._trades.values():
+                for trades in data_trades.values():
+                    del trades[:-1]
+
     def _is_backtesting(self):
         return self.mode == 'backtest'
         
@@ -235,6 +309,7 @@ class BaseStrategy(bt.Strategy):
         return int(dt.timestamp())
 
     def next(self):
+        start = time.perf_counter() if self.timer.enabled else None
         self.candle_index = len(self.data) 
         
         self.update_open_positions_summary()
@@ -251,9 +326,15 @@ class BaseStrategy(bt.Strategy):
             breakout_ind = indicators_info['breakout']
             
             # Initialize data dict for this candle for this data feed
-            if i not in candle_data:
-                candle_data[i] = []
-            candle_data[i].append({})
+            if self.lean:
+                self.candle_counts[i] = self.candle_counts.get(i, 0) + 1
+            elif self.low_memory:
+                self.candle_counts[i] = self.candle_counts.get(i, 0) + 1
+                candle_data[i] = [{}]  # current candle only
+            else:
+                if i not in candle_data:
+                    candle_data[i] = []
+                candle_data[i].append({})
             
             # Update state for this data feed
             just_broke_out, breakout_trend = breakout_ind.just_broke_out()
@@ -306,30 +387,44 @@ class BaseStrategy(bt.Strategy):
             self.resistance = data_state[0]['resistance']
         
         # Calculate uPnl & current cash (aggregate across all positions)
-        total_unrealized_pnl = 0
-        for i, indicators_info in data_indicators.items():
-            data = indicators_info['data']
-            open_position = self.getposition(data)
-            if open_position.size != 0:
-                total_unrealized_pnl += open_position.size * (data.close[0] - open_position.price)
-        
-        self.unrealized_pnl = total_unrealized_pnl
-        self.current_cash = self.broker.getvalue() + self.unrealized_pnl
+        broker_value = self.broker.getvalue()
+        self.unrealized_pnl = self.portfolio.unrealized_pnl()
+        self.current_cash = broker_value + self.unrealized_pnl
+        self.portfolio.record_equity(self.data.datetime.datetime(0), broker_value)
+        if start is not None:
+            self.timer.add('strategy.state', time.perf_counter() - start)
+
+    def notify_order(self, order):
+        """Keep the portfolio's position of the order's data feed in sync on every fill"""
+        if order.status in (order.Partial, order.Completed):
+            position = self.getposition(order.data)
+            self.portfolio.on_fill(order.data, position.size, position.price)
+
+    @property
+    def completed_trades(self):
+        """Closed trades in the order they were closed."""
+        return self.trades.completed
 
     def get_trade_summary(self):
         if not self.trades:
             return "No completed trades yet"
         
         total_trades = len(self.trades)
-        total_pnl = sum([t['pnl'] for t in self.trades.values() if 'pnl' in t])
+        total_pnl = float(self.trades.completed_array()['pnl'].sum())
         
         return f"Total trades: {total_trades}, Total PnL: {total_pnl:.2f}"
     
     def add_trade(self, trade):
-        self.trades[trade.ref] = trade
+        self.trades.add(trade)
     
     def add_completed_trade(self, trade):
-        self.completed_trades.append(trade)
+        self.trades.mark_completed(trade)
+        self.release_trade_orders(trade)
+
+    def release_trade_orders(self, trade):
+        """Low-memory runs: drop the backtrader orders of a finished trade (the ledger keeps its fields)."""
+        if self.low_memory:
+            trade['orders'] = {}
 
     def place_order(self, data: bt.LineSeries, order_type: OrderType, order_side: OrderSide, price: float, size: float, sl: float, tp: float):
         """
@@ -358,30 +453,24 @@ class BaseStrategy(bt.Strategy):
         """
         # Validate inputs before placing order
         if size <= 0:
-            print("\n" + "="*80)
-            print("⚠️  WARNING: INVALID ORDER SIZE ⚠️")
-            print("="*80)
-            print(f"❌ Order size is invalid: {size}")
-            print(f"   Order side: {order_side.name}")
-            print(f"   Entry price: {price}")
-            print(f"   Stop loss: {sl}")
-            print(f"   Take profit: {tp}")
-            print("   ⚠️  Order NOT placed. This indicates a problem with position sizing calculation!")
-            print("="*80 + "\n")
+            self._print_warning("INVALID ORDER SIZE",
+                                f"❌ Order size is invalid: {size}",
+                                f"   Order side: {order_side.name}",
+                                f"   Entry price: {price}",
+                                f"   Stop loss: {sl}",
+                                f"   Take profit: {tp}",
+                                "   ⚠️  Order NOT placed. This indicates a problem with position sizing calculation!")
             self.log(f"⚠️ WARNING: Invalid order size: {size}. Order not placed.")
             return None
         
         if price <= 0 or sl <= 0 or tp <= 0:
-            print("\n" + "="*80)
-            print("⚠️  WARNING: INVALID PRICES ⚠️")
-            print("="*80)
-            print(f"❌ One or more prices are invalid:")
-            print(f"   Entry price: {price}")
-            print(f"   Stop loss: {sl}")
-            print(f"   Take profit: {tp}")
-            print(f"   Order side: {order_side.name}")
-            print("   ⚠️  Order NOT placed. This indicates a problem with price calculation!")
-            print("="*80 + "\n")
+            self._print_warning("INVALID PRICES",
+                                f"❌ One or more prices are invalid:",
+                                f"   Entry price: {price}",
+                                f"   Stop loss: {sl}",
+                                f"   Take profit: {tp}",
+                                f"   Order side: {order_side.name}",
+                                "   ⚠️  Order NOT placed. This indicates a problem with price calculation!")
             self.log(f"⚠️ WARNING: Invalid prices: price={price}, sl={sl}, tp={tp}. Order not placed.")
             return None
         
@@ -389,53 +478,41 @@ class BaseStrategy(bt.Strategy):
         if order_side == OrderSide.BUY:
             # For BUY: entry should be between SL (below) and TP (above), or at least TP should be above entry
             if tp <= price:
-                print("\n" + "="*80)
-                print("⚠️  WARNING: INVALID BUY BRACKET ORDER ⚠️")
-                print("="*80)
-                print(f"❌ Take Profit ({tp}) must be ABOVE entry price ({price}) for BUY orders")
-                print(f"   Entry price: {price}")
-                print(f"   Stop loss: {sl}")
-                print(f"   Take profit: {tp}")
-                print("   ⚠️  Order NOT placed. This indicates a problem with TP calculation!")
-                print("="*80 + "\n")
+                self._print_warning("INVALID BUY BRACKET ORDER",
+                                    f"❌ Take Profit ({tp}) must be ABOVE entry price ({price}) for BUY orders",
+                                    f"   Entry price: {price}",
+                                    f"   Stop loss: {sl}",
+                                    f"   Take profit: {tp}",
+                                    "   ⚠️  Order NOT placed. This indicates a problem with TP calculation!")
                 self.log(f"⚠️ WARNING: Invalid BUY bracket: TP ({tp}) must be above entry ({price}). Order not placed.")
                 return None
             if sl >= price:
-                print("\n" + "="*80)
-                print("⚠️  WARNING: INVALID BUY BRACKET ORDER ⚠️")
-                print("="*80)
-                print(f"❌ Stop Loss ({sl}) must be BELOW entry price ({price}) for BUY orders")
-                print(f"   Entry price: {price}")
-                print(f"   Stop loss: {sl}")
-                print(f"   Take profit: {tp}")
-                print("   ⚠️  Order NOT placed. This indicates a problem with SL calculation!")
-                print("="*80 + "\n")
+                self._print_warning("INVALID BUY BRACKET ORDER",
+                                    f"❌ Stop Loss ({sl}) must be BELOW entry price ({price}) for BUY orders",
+                                    f"   Entry price: {price}",
+                                    f"   Stop loss: {sl}",
+                                    f"   Take profit: {tp}",
+                                    "   ⚠️  Order NOT placed. This indicates a problem with SL calculation!")
                 self.log(f"⚠️ WARNING: Invalid BUY bracket: SL ({sl}) must be below entry ({price}). Order not placed.")
                 return None
         else:  # SELL
             # For SELL: entry should be between TP (below) and SL (above), or at least SL should be above entry
             if sl <= price:
-                print("\n" + "="*80)
-                print("⚠️  WARNING: INVALID SELL BRACKET ORDER ⚠️")
-                print("="*80)
-                print(f"❌ Stop Loss ({sl}) must be ABOVE entry price ({price}) for SELL orders")
-                print(f"   Entry price: {price}")
-                print(f"   Stop loss: {sl}")
-                print(f"   Take profit: {tp}")
-                print("   ⚠️  Order NOT placed. This indicates a problem with SL calculation!")
-                print("="*80 + "\n")
+                self._print_warning("INVALID SELL BRACKET ORDER",
+                                    f"❌ Stop Loss ({sl}) must be ABOVE entry price ({price}) for SELL orders",
+                                    f"   Entry price: {price}",
+                                    f"   Stop loss: {sl}",
+                                    f"   Take profit: {tp}",
+                                    "   ⚠️  Order NOT placed. This indicates a problem with SL calculation!")
                 self.log(f"⚠️ WARNING: Invalid SELL bracket: SL ({sl}) must be above entry ({price}). Order not placed.")
                 return None
             if tp >= price:
-                print("\n" + "="*80)
-                print("⚠️  WARNING: INVALID SELL BRACKET ORDER ⚠️")
-                print("="*80)
-                print(f"❌ Take Profit ({tp}) must be BELOW entry price ({price}) for SELL orders")
-                print(f"   Entry price: {price}")
-                print(f"   Stop loss: {sl}")
-                print(f"   Take profit: {tp}")
-                print("   ⚠️  Order NOT placed. This indicates a problem with TP calculation!")
-                print("="*80 + "\n")
+                self._print_warning("INVALID SELL BRACKET ORDER",
+                                    f"❌ Take Profit ({tp}) must be BELOW entry price ({price}) for SELL orders",
+                                    f"   Entry price: {price}",
+                                    f"   Stop loss: {sl}",
+                                    f"   Take profit: {tp}",
+                                    "   ⚠️  Order NOT placed. This indicates a problem with TP calculation!")
                 self.log(f"⚠️ WARNING: Invalid SELL bracket: TP ({tp}) must be below entry ({price}). Order not placed.")
                 return None
         
@@ -457,53 +534,44 @@ class BaseStrategy(bt.Strategy):
                 valid=None
             )
         except Exception as e:
-            print("\n" + "="*80)
-            print("⚠️  WARNING: EXCEPTION DURING ORDER PLACEMENT ⚠️")
-            print("="*80)
-            print(f"❌ Exception occurred while placing bracket order:")
-            print(f"   Error: {type(e).__name__}: {e}")
-            print(f"   Order side: {order_side.name}")
-            print(f"   Entry price: {price}")
-            print(f"   Size: {size}")
-            print(f"   Stop loss: {sl}")
-            print(f"   Take profit: {tp}")
-            print("   ⚠️  Order NOT placed. This indicates a broker/system error!")
-            print("="*80 + "\n")
+            self._print_warning("EXCEPTION DURING ORDER PLACEMENT",
+                                f"❌ Exception occurred while placing bracket order:",
+                                f"   Error: {type(e).__name__}: {e}",
+                                f"   Order side: {order_side.name}",
+                                f"   Entry price: {price}",
+                                f"   Size: {size}",
+                                f"   Stop loss: {sl}",
+                                f"   Take profit: {tp}",
+                                "   ⚠️  Order NOT placed. This indicates a broker/system error!")
             self.log(f"⚠️ WARNING: Error placing bracket order: {e}. Order not placed.")
             return None
         
         # Check if order was successfully created
         if orders is None:
-            print("\n" + "="*80)
-            print("⚠️  WARNING: BRACKET ORDER RETURNED NONE ⚠️")
-            print("="*80)
-            print(f"❌ Bracket order function returned None (order rejected by broker)")
-            print(f"   Order side: {order_side.name}")
-            print(f"   Entry price: {price}")
-            print(f"   Size: {size}")
-            print(f"   Stop loss: {sl}")
-            print(f"   Take profit: {tp}")
-            print("   ⚠️  Order NOT placed. Possible reasons:")
-            print("      - Insufficient funds/margin")
-            print("      - Invalid order parameters")
-            print("      - Broker rejection")
-            print("="*80 + "\n")
+            self._print_warning("BRACKET ORDER RETURNED NONE",
+                                f"❌ Bracket order function returned None (order rejected by broker)",
+                                f"   Order side: {order_side.name}",
+                                f"   Entry price: {price}",
+                                f"   Size: {size}",
+                                f"   Stop loss: {sl}",
+                                f"   Take profit: {tp}",
+                                "   ⚠️  Order NOT placed. Possible reasons:",
+                                "      - Insufficient funds/margin",
+                                "      - Invalid order parameters",
+                                "      - Broker rejection")
             self.log(f"⚠️ WARNING: Bracket order returned None. Order not placed.")
             return None
         
         if len(orders) == 0 or orders[0] is None:
-            print("\n" + "="*80)
-            print("⚠️  WARNING: BRACKET ORDER FAILED TO CREATE MAIN ORDER ⚠️")
-            print("="*80)
-            print(f"❌ Bracket order returned empty list or None main order")
-            print(f"   Orders returned: {orders}")
-            print(f"   Order side: {order_side.name}")
-            print(f"   Entry price: {price}")
-            print(f"   Size: {size}")
-            print(f"   Stop loss: {sl}")
-            print(f"   Take profit: {tp}")
-            print("   ⚠️  Order NOT placed. This indicates a broker/system error!")
-            print("="*80 + "\n")
+            self._print_warning("BRACKET ORDER FAILED TO CREATE MAIN ORDER",
+                                f"❌ Bracket order returned empty list or None main order",
+                                f"   Orders returned: {orders}",
+                                f"   Order side: {order_side.name}",
+                                f"   Entry price: {price}",
+                                f"   Size: {size}",
+                                f"   Stop loss: {sl}",
+                                f"   Take profit: {tp}",
+                                "   ⚠️  Order NOT placed. This indicates a broker/system error!")
             self.log(f"⚠️ WARNING: Bracket order failed to create main order. Order not placed.")
             return None
 
@@ -593,7 +661,7 @@ class BaseStrategy(bt.Strategy):
     def export_trades_to_csv(self, filename=None):
         """Export all completed trades to CSV file"""
         # Get only completed trades (those with pnl set)
-        completed_trades = [t for t in self.trades.values() if t.get('pnl') is not None]
+        completed_trades = self.trades.completed
         
         if not completed_trades:
             self.log("No completed trades to export")
@@ -676,53 +744,12 @@ class BaseStrategy(bt.Strategy):
                         trades_written += 1
                         
                     except Exception as e:
-                        self.log(f"Error writing trade {trade.get('trade_id', 'unknown')} to CSV: {e}")
-                        import traceback
-                        self.log(traceback.format_exc())
+                        log.exception("Error writing trade {} to CSV: {}", trade.get('trade_id', 'unknown'), e)
                         continue
                 
-                # Calculate statistics
-                winning_trades = [t for t in completed_trades if t.get('pnl', 0) > 0]
-                losing_trades = [t for t in completed_trades if t.get('pnl', 0) < 0]
-                total_trades = len(completed_trades)
-                win_ratio = len(winning_trades) / total_trades if total_trades > 0 else 0
-                total_tps = len(winning_trades)
-                total_sls = len(losing_trades)
-                
-                # Safely calculate PnL sums
-                def safe_pnl_sum(trades_list):
-                    return sum([float(t.get('pnl', 0) or 0) for t in trades_list if t.get('pnl') is not None])
-                
-                total_pnl = safe_pnl_sum(completed_trades)
-                total_win_pnl = safe_pnl_sum(winning_trades)
-                total_loss_pnl = safe_pnl_sum(losing_trades)
-                
-                # Calculate equity curve for drawdown
-                equity_curve = []
-                equity = self.initial_cash
-                for trade in sorted_trades:
-                    equity_curve.append(equity)
-                    pnl_val = trade.get('pnl')
-                    if pnl_val is not None:
-                        equity += pnl_val
-                equity_curve.append(self.broker.getvalue())
-                
-                # Calculate max drawdown
-                max_dd = 0.0
-                peak = equity_curve[0] if equity_curve else self.initial_cash
-                for value in equity_curve:
-                    if value > peak:
-                        peak = value
-                    dd = (peak - value) / peak if peak > 0 else 0.0
-                    if dd > max_dd:
-                        max_dd = dd
-                
-                # Calculate Sharpe ratio
-                import pandas as pd
-                returns = pd.Series([t.get('pnl', 0) / self.initial_cash for t in completed_trades if t.get('pnl') is not None])
-                sharpe_ratio = 0.0
-                if len(returns) > 0 and returns.std() > 0:
-                    sharpe_ratio = (returns.mean() / returns.std()) * (252 ** 0.5)
+                # Calculate statistics (vectorized over the ledger's completed-trade columns)
+                stats = performance_stats(self.trades.completed_array(), self.initial_cash, self.portfolio.equity_curve(),
+                                          drawdown=self.portfolio.drawdown())
                 
                 # Write statistics footer
                 final_equity = self.broker.getvalue()
@@ -731,33 +758,43 @@ class BaseStrategy(bt.Strategy):
                 csvfile.write(f"\n")
                 csvfile.write("-------- TRADE LOG --------\n")
                 csvfile.write(f"# RR: {self.params.rr}\n")
-                csvfile.write(f"# Win Ratio: {win_ratio:.2%}\n")
-                csvfile.write(f"# TPs: {total_tps}\n")
-                csvfile.write(f"# SLs: {total_sls}\n")
-                csvfile.write(f"# Total Trades: {total_trades}\n")
-                csvfile.write(f"# Total PnL: {total_pnl}\n")
-                csvfile.write(f"# Total Win PnL: {total_win_pnl}\n")
-                csvfile.write(f"# Total Loss PnL: {total_loss_pnl}\n")
+                csvfile.write(f"# Win Ratio: {stats['win_rate']:.2%}\n")
+                csvfile.write(f"# TPs: {stats['wins']}\n")
+                csvfile.write(f"# SLs: {stats['losses']}\n")
+                csvfile.write(f"# Total Trades: {stats['total_trades']}\n")
+                csvfile.write(f"# Total PnL: {stats['total_pnl']}\n")
+                csvfile.write(f"# Total Win PnL: {stats['gross_profit']}\n")
+                csvfile.write(f"# Total Loss PnL: {stats['gross_loss']}\n")
                 csvfile.write(f"# Init: {self.initial_cash}, Final: {final_equity}, Pnl%: {pnl_percentage:.2f}%\n")
-                csvfile.write(f"# Max Drawdown: {max_dd:.2%}\n")
-                csvfile.write(f"# Sharpe Ratio: {sharpe_ratio:.2f}\n")
+                csvfile.write(f"# Max Drawdown: {stats['max_drawdown']:.2%}\n")
+                csvfile.write(f"# Sharpe Ratio: {stats['sharpe_ratio']:.2f}\n")
+                csvfile.write(f"# Sortino Ratio: {stats['sortino_ratio']:.2f}\n")
+                csvfile.write(f"# Calmar Ratio: {stats['calmar_ratio']:.2f}\n")
+                csvfile.write(f"# Exposure: {stats['exposure']:.2%}\n")
                 csvfile.write(f"#\n")
             
             self.log(f"Trades exported to: {filepath}")
             return filepath
             
         except Exception as e:
-            self.log(f"Error exporting trades to CSV: {e}")
-            import traceback
-            self.log(traceback.format_exc())
+            log.exception("Error exporting trades to CSV: {}", e)
             return None
     
+    def _print_warning(self, title: str, *lines: str):
+        """Log a warning banner (skipped in lean runs)."""
+        if not self.lean:
+            log.banner('WARNING', f"WARNING: {title}", *lines)
+
     def log(self, txt, dt=None):
+        if self.lean or log.level_no > LEVELS['INFO']:
+            return
         if dt is None:
             dt = self.datas[0].datetime.datetime(0)
-        print(f'{dt.strftime("%Y-%m-%d %H:%M")}: {txt}')
+        log.info("{}: {}", dt.strftime("%Y-%m-%d %H:%M"), txt)
 
     def log_trade(self, state: TradeState, candle_index: int, order_side: OrderSide, additional_info: str = ''):
+        if self.lean or log.level_no > LEVELS['INFO']:
+            return
         emoji = ''
         if state == TradeState.RUNNING:
             emoji = 'RUNNING'
@@ -782,6 +819,13 @@ class BaseStrategy(bt.Strategy):
         
         self.log(f"{emoji}  {order_side.name}({candle_index}) {additional_info} Cash: {int(self.current_cash)}")
     
+    def current_candle_index(self, data_feed_index: int = 0) -> int:
+        """Index of the current candle of a data feed (-1 before its first candle)."""
+        if self.lean or self.low_memory:
+            return self.candle_counts.get(data_feed_index, 0) - 1
+        candle_data = self._get_candle_data()
+        return len(candle_data[data_feed_index]) - 1 if candle_data.get(data_feed_index) else -1
+    
     def get_data_feed_index(self, data: bt.LineSeries) -> int:
         """
         Get the data feed index for a given data object.
@@ -823,6 +867,8 @@ class BaseStrategy(bt.Strategy):
         
         The data will be stored and can be extracted by plot.py for visualization.
         """
+        if self.lean:
+            return
         candle_data = self._get_candle_data()
         if data_feed_index in candle_data and candle_data[data_feed_index]:
             candle_data[data_feed_index][-1].update(kwargs)
@@ -959,6 +1005,8 @@ class BaseStrategy(bt.Strategy):
                               symbol="EURUSD",
                               points=[{'time': t, 'value': v} for t, v in zip(times, ema_values)])
         """
+        if self.lean:
+            return
         cerebro = self._get_cerebro()
         
         # Determine symbol name - use provided symbol, or fallback to data feed index
@@ -984,11 +1032,11 @@ class BaseStrategy(bt.Strategy):
         # Get the chart data container
         chart_data = cerebro.chart_data if cerebro is not None else self.broker.chart_data
         
-        # Create or get the data container for this type
-        if data_type.value not in chart_data[symbol]:
+        # Create or get the data container for this type (low-memory runs only stream to the overlay file)
+        if data_type.value not in chart_data[symbol] and not self.low_memory:
             chart_data[symbol][data_type.value] = ChartData(data_type, **kwargs)
         
-        data_container = chart_data[symbol][data_type.value]
+        data_container = chart_data[symbol].get(data_type.value)
         
         # Handle different data types
         if data_type == ChartDataType.MARKER:
@@ -1008,12 +1056,13 @@ class BaseStrategy(bt.Strategy):
                 time_value = None
                 
             if time_value is not None:
-                data_container.add_point_at_time(
-                    time=time_value,
-                    value=price,
-                    marker_type=marker_type,
-                    candle_index=candle_index
-                )
+                if data_container is not None:
+                    data_container.add_point_at_time(
+                        time=time_value,
+                        value=price,
+                        marker_type=marker_type,
+                        candle_index=candle_index
+                    )
                 
                 # Write to ChartOverlayManager using new symbol-keyed format
                 overlay_manager = get_chart_overlay_manager()
@@ -1027,12 +1076,12 @@ class BaseStrategy(bt.Strategy):
                     marker_type=marker_type,
                     direction=kwargs.get('direction')  # Add direction parameter
                 )
-                overlay_manager.save_to_file()
+                self._save_chart_overlays(overlay_manager)
         
         elif data_type in [ChartDataType.SUPPORT, ChartDataType.RESISTANCE, ChartDataType.EMA]:
             # Handle line/zone data
             points = kwargs.get('points', [])
-            for point in points:
+            for point in points if data_container is not None else ():
                 if isinstance(point, dict) and 'time' in point and 'value' in point:
                     data_container.add_point_at_time(
                         time=point['time'],
@@ -1052,7 +1101,7 @@ class BaseStrategy(bt.Strategy):
                             data_feed_index=data_feed_index,  # Keep for backward compatibility
                             points=[point]
                         )
-                overlay_manager.save_to_file()
+                self._save_chart_overlays(overlay_manager)
     
     def add_chart_trade(self, placed_on: int, executed_on: int = None, closed_on: int = None, closed_on_price: float = None, state = None, **kwargs):
         """
@@ -1067,6 +1116,8 @@ class BaseStrategy(bt.Strategy):
             state: Trade state (TradeState enum or string)
             **kwargs: Additional trade data
         """
+        if self.lean:
+            return
         # Convert state to string if it's an enum
         state_str = str(state) if state is not None else None
         
@@ -1080,7 +1131,21 @@ class BaseStrategy(bt.Strategy):
             state=state_str,
             **kwargs
         )
+        self._save_chart_overlays(overlay_manager)
+
+    def _save_chart_overlays(self, overlay_manager):
+        """Save chart overlays to file, or mark them pending while defer_chart_flush is set."""
+        if self.defer_chart_flush:
+            self._chart_flush_pending = True
+            return
         overlay_manager.save_to_file()
+        self._chart_flush_pending = False
+
+    def flush_chart_overlays(self):
+        """Write chart overlay data that was deferred on quiet bars."""
+        if self._chart_flush_pending:
+            get_chart_overlay_manager().save_to_file()
+            self._chart_flush_pending = False
     
     def _get_symbol_for_data_feed_index(self, data_feed_index: int = 0) -> str:
         """
@@ -1146,7 +1211,7 @@ class BaseStrategy(bt.Strategy):
                         return int(dt)
                         
         except (AttributeError, IndexError, ValueError) as e:
-            print(f"Warning: Could not get timestamp for candle {candle_index}: {e}")
+            log.warning("Could not get timestamp for candle {}: {}", candle_index, e)
         
         # Return None instead of wrong timestamp - safer for trading systems
         return None
@@ -1268,13 +1333,27 @@ class BaseStrategy(bt.Strategy):
             # Don't let chart data sync errors break the strategy
             pass
     
+    def _sync_positions(self):
+        """Reload every feed's position from the broker into the portfolio"""
+        for data in self.portfolio.datas:
+            if data is not None:
+                position = self.getposition(data)
+                self.portfolio.on_fill(data, position.size, position.price)
+
     def update_open_positions_summary(self):
-        # Access data_indicators from cerebro (persists across strategy re-instantiation)
-        data_indicators = self._get_data_indicators()
-        for i, indicators_info in data_indicators.items():
-            data = indicators_info['data']
-            open_position = self.getposition(data)
-            self.open_positions_summary[i] = open_position.size
+        # Backtests update the portfolio on fills (notify_order); live brokers can
+        # change positions outside of order notifications, so reload them every bar
+        if not self._is_backtesting():
+            self._sync_positions()
+        for i, data in enumerate(self.portfolio.datas):
+            if data is not None:
+                self.open_positions_summary[i] = self.portfolio.size(i)
     
+    def wants_repo_log(self, level: LogLevel = LogLevel.INFO) -> bool:
+        """Whether log_to_repo writes ``level`` records (check it before building the message)."""
+        return not self.lean and repo_log.is_enabled(LEVELS.get(level.value, LEVELS['INFO']))
+
     def log_to_repo(self, level: LogLevel, message: str, repository_name: str, date: str = None):
+        if not self.wants_repo_log(level):
+            return
         self.logger.log(level, message, repository_name, date)
\ No newline at end of file
@@ -1,15 +1,18 @@
 from pathlib import Path
 import sys
 import math
+import time
 from src.models.trend import Trend
 from src.strategies.BaseStrategy import BaseStrategy
 from src.models.order import OrderType, TradeState, OrderSide, log_trade
+from src.models.trade import TradeRecord
 from src.utils.strategy_utils.general_utils import convert_atr_to_price
-from src.utils.logging import format_price
+from src.utils.logging import format_price, get_logger
 from src.utils.config import Config
 from src.infrastructure import LogLevel, RepositoryName
 from src.utils.environment_variables import EnvironmentVariables
 from src.utils.trade_confirmations import RSIConfirmations
+from src.utils.signal_prefilter import SignalPrefilter
 import uuid
 from src.models.chart_markers import ChartDataType, ChartMarkerType
 
@@ -20,30 +23,52 @@ if str(_root) not in sys.path:
 from ml.AiOrderFilter import AiOrderFilter
 from ml.order_filter_features import build_order_filter_features
 
+log = get_logger('strategy')
+
 class BreakRetestStrategy(BaseStrategy):
     params = BaseStrategy._base_params + ()
 
     def __init__(self):  
         super().__init__()  
 
-        # Trade tracking  
-        self.trades = {}  # trade_id → trade record  
-        self.active_trades = {}  # trade_id → active trade  
+        # Trade tracking (self.trades is the TradeLedger created in BaseStrategy)
+        self.active_trades = {}  # trade_id / order ref → active trade (per-bar checks use self.trades.for_feed)
         self.counter = {'tp': 0, 'sl': 0}
         
-        # Track last processed timestamp to prevent duplicate processing
-        # Use timestamp only since bar numbers reset on each run()
+        # Timestamp of the last data0 bar processed: steps where only other feeds got
+        # a new bar call next() again with data0 unchanged (the fast engine does the same)
         self.last_processed_timestamp = None
 
+        # Sparse stepping: per-feed candidate-bar pre-filters and last logged zones
+        self.signal_prefilters = {}
+        self.last_zones = {}
+
         # self.ai_filter = AiOrderFilter(model_path=str(Path(Config.ai_order_filter_model_path))) 
 
+    def start(self):
+        super().start()
+        # Precompute the candidate-bar masks over the whole series (backtests preload their feeds)
+        precomputed = getattr(self._get_cerebro(), 'precomputed_indicators', None) or {}
+        self.signal_prefilters = {
+            i: SignalPrefilter.from_feed(indicators_info['data'],
+                                         ema=precomputed[i].ema if i in precomputed else None)
+            for i, indicators_info in self._get_data_indicators().items()
+        }
+
     # ----------------------- NEXT -----------------------  
-    def next(self):  
+    def next(self):
+        if not self.timer.enabled:
+            self._next_bar()
+            return
+        start = time.perf_counter()
+        self._next_bar()
+        self.timer.add_bar(time.perf_counter() - start)
+
+    def _next_bar(self):  
         current_bar_time = self.data.datetime.datetime(0)
         is_backfilling_live_mode = not self._is_backtesting() and not getattr(self.data, 'live_mode', False)
         
-        # Check if we've already processed this timestamp (prevent duplicate calls)
-        # Use timestamp only since bar numbers can change between runs
+        # data0 has no new bar in this step: already processed
         if self.last_processed_timestamp == current_bar_time:
             return
         
@@ -64,28 +89,46 @@ class BreakRetestStrategy(BaseStrategy):
                 continue
             data = data_indicators[i]['data']
             current_price = data.close[0]
-            log_dict = {
-                **pair_state,
-                'support': format_price(pair_state['support']),
-                'resistance': format_price(pair_state['resistance']),
-                'breakout_trend': f'<b>{str(pair_state['breakout_trend'])}</b>' if pair_state['breakout_trend'] is not None else '',
-            }
-            self.log_to_repo(LogLevel.INFO, f"<b>[{data_indicators[i]['symbol']}={format_price(current_price)}]</b> ({'Backtesting' if self._is_backtesting() else 'Backfill' if is_backfilling_live_mode else 'Live'}): {log_dict}", RepositoryName.ZONES, date=current_bar_time)
-            daily_rsi = self.indicators['daily_rsi'][0] if self.indicators['daily_rsi'] is not None else None
+            
+            # Sparse stepping: only candidate bars, bars with live orders on this symbol
+            # or bars where the zones moved need the full per-bar work
+            prefilter = self.signal_prefilters.get(i)
+            if prefilter is None:
+                prefilter = self.signal_prefilters[i] = SignalPrefilter.from_feed(data)
+            is_candidate = prefilter.is_candidate(data, pair_state['just_broke_out'], pair_state['breakout_trend'])
+            has_live_orders = bool(self.trades.for_feed(i, TradeState.PENDING, TradeState.RUNNING))
+            zones = (pair_state['support'], pair_state['resistance'], pair_state['breakout_trend'])
+            zones_changed = self.last_zones.get(i) != zones
+            self.last_zones[i] = zones
+            is_quiet = Config.sparse_stepping and not (is_candidate or has_live_orders or zones_changed)
+            # Backtests only flush chart overlays to disk on busy bars (and in stop())
+            self.defer_chart_flush = is_quiet and self._is_backtesting()
+            
+            if not is_quiet and self.wants_repo_log(LogLevel.INFO):
+                log_dict = {
+                    **pair_state,
+                    'support': format_price(pair_state['support']),
+                    'resistance': format_price(pair_state['resistance']),
+                    'breakout_trend': f'<b>{str(pair_state['breakout_trend'])}</b>' if pair_state['breakout_trend'] is not None else '',
+                }
+                self.log_to_repo(LogLevel.INFO, f"<b>[{data_indicators[i]['symbol']}={format_price(current_price)}]</b> ({'Backtesting' if self._is_backtesting() else 'Backfill' if is_backfilling_live_mode else 'Live'}): {log_dict}", RepositoryName.ZONES, date=current_bar_time)
+            
+            # Breakout, order day and (precomputed EMA) the EMA side are checked by the
+            # pre-filter; EMA side and daily RSI are evaluated on candidate bars
             ema = data_indicators[i]['ema']
-            order_confirmations = [
-                pair_state['just_broke_out'],
+            order_confirmations = is_candidate and all((
                 # We don't have a current pending limit order on the same symbol and the same zone
-                
                 ema[0] <= current_price if pair_state['breakout_trend'] == Trend.UPTREND else \
                     ema[0] >= current_price,
-                RSIConfirmations.daily_rsi_allows_trade(daily_rsi, pair_state['breakout_trend']) if Config.check_for_daily_rsi else True,
-                current_bar_time.weekday() != 0,  # Don't take orders on Monday (0 = Monday)
-            ]
+                RSIConfirmations.daily_rsi_allows_trade(
+                    self.indicators['daily_rsi'][0],
+                    pair_state['breakout_trend']
+                ) if Config.check_for_daily_rsi else True,
+            ))
             
             # Get current candle's datetime first (needed for both markers and EMA)
             current_bar_time = data.datetime.datetime(0) if hasattr(data, 'datetime') else None
-            current_time = self._utc_timestamp(current_bar_time) if current_bar_time else self._get_time_for_candle_index(self.candle_index, i)
+            current_time = None if self.lean else self._utc_timestamp(current_bar_time) if current_bar_time else self._get_time_for_candle_index(self.candle_index, i)
             
             # Add EMA data for current candle (dynamic chart overlay)
             ema = data_indicators[i]['ema']
@@ -93,7 +136,7 @@ class BreakRetestStrategy(BaseStrategy):
             # Initialize take_trade variable
             take_trade = False
             
-            if not is_backfilling_live_mode and all(order_confirmations):
+            if not is_backfilling_live_mode and order_confirmations:
                 take_trade = True
                 # if self.ai_filter and pair_state.get('support') is not None and pair_state.get('resistance') is not None:
                 #     entry_price, sl, tp = self._entry_sl_tp_for_zone(pair_state, data_indicators[i])
@@ -106,15 +149,17 @@ class BreakRetestStrategy(BaseStrategy):
                 if take_trade:
                     self.place_retest_order_for_data(i)
                     trend = pair_state['breakout_trend']
-                    self.set_chart_data(ChartDataType.MARKER, 
-                                      data_feed_index=i,
-                                      time=current_time,  # Use same timestamp as EMA/support/resistance
-                                      price=current_price, 
-                                      marker_type=ChartMarkerType.RETEST_ORDER_PLACED,
-                                      direction=trend)  # Add trend direction as metadata
+                    if not self.lean:
+                        self.set_chart_data(ChartDataType.MARKER, 
+                                          data_feed_index=i,
+                                          time=current_time,  # Use same timestamp as EMA/support/resistance
+                                          price=current_price, 
+                                          marker_type=ChartMarkerType.RETEST_ORDER_PLACED,
+                                          direction=trend)  # Add trend direction as metadata
             
-            self.invalidate_pending_trades_if_sr_changed_or_completed(i)  
-            self.process_pending_trade_updates(i)
+            if has_live_orders or take_trade:
+                self.invalidate_pending_trades_if_sr_changed_or_completed(i)  
+                self.process_pending_trade_updates(i)
             
             if current_time is not None and len(ema) > 0:
                 self.set_chart_data(ChartDataType.EMA,
@@ -126,12 +171,12 @@ class BreakRetestStrategy(BaseStrategy):
             resistance_value = pair_state.get('resistance')
             
             # Only add support/resistance data if values are meaningful (not None, not 0, and finite)
-            if support_value is not None and support_value != 0 and math.isfinite(float(support_value)):
+            if current_time is not None and support_value is not None and support_value != 0 and math.isfinite(float(support_value)):
                 self.set_chart_data(ChartDataType.SUPPORT,
                                   data_feed_index=i,
                                   points=[{'time': current_time, 'value': support_value}])
             
-            if resistance_value is not None and resistance_value != 0 and math.isfinite(float(resistance_value)):
+            if current_time is not None and resistance_value is not None and resistance_value != 0 and math.isfinite(float(resistance_value)):
                 self.set_chart_data(ChartDataType.RESISTANCE,
                                   data_feed_index=i,
                                   points=[{'time': current_time, 'value': resistance_value}])
@@ -139,6 +184,12 @@ class BreakRetestStrategy(BaseStrategy):
             # Sync current indicator data to chart for live trading visualization
             if not self._is_backtesting():
                 self.sync_indicator_data_to_chart(i)
+        
+        self.defer_chart_flush = False
+        
+        # Warm restarts: restore the saved state at its bar, then checkpoint every live bar
+        if self.checkpoint is not None:
+            self.checkpoint.on_bar(self, live=not is_backfilling_live_mode)
 
     def process_pending_trade_updates(self, data_index):
         # Update atr_rel_excursion on pending orders for this pair
@@ -146,15 +197,11 @@ class BreakRetestStrategy(BaseStrategy):
         data = data_indicators[data_index]['data']
         high_price = data.high[0]
         low_price = data.low[0]
-        for trade_key, trade in list(self.active_trades.items()):  
-            if trade.get('data_index') != data_index:
-                continue
-            if trade.get('state') == TradeState.PENDING or trade.get('state') == TradeState.RUNNING or \
-                trade.get('open_candle') == self.candle_index:
-                if trade.get('order_side') == OrderSide.BUY:
-                    trade['highest_excursion_from_breakout'] = max(trade['highest_excursion_from_breakout'], abs(high_price - trade['entry_price']))
-                else:
-                    trade['highest_excursion_from_breakout'] = max(trade['highest_excursion_from_breakout'], abs(low_price - trade['entry_price']))
+        for trade in self.trades.for_feed(data_index, TradeState.PENDING, TradeState.RUNNING):
+            if trade.get('order_side') == OrderSide.BUY:
+                trade['highest_excursion_from_breakout'] = max(trade['highest_excursion_from_breakout'], abs(high_price - trade['entry_price']))
+            else:
+                trade['highest_excursion_from_breakout'] = max(trade['highest_excursion_from_breakout'], abs(low_price - trade['entry_price']))
 
     def _entry_sl_tp_for_zone(self, pair_state, indicators):
         """Return (entry_price, sl, tp) for the zone; (None, None, None) if not computable."""
@@ -222,19 +269,15 @@ class BreakRetestStrategy(BaseStrategy):
             return
         order_datetime = data.datetime.datetime(0)
         
-        # Get candle_data to verify we're updating the correct candle
-        candle_data = self._get_candle_data()
-        candle_index = len(candle_data.get(data_index, [])) - 1 if data_index in candle_data and candle_data[data_index] else -1
-        
-        # Store the datetime in the candle_data so we can verify it matches
-        self.set_candle_data(data_feed_index=data_index, order_placed=True, order_datetime=order_datetime)
-        
-        # Verify the datetime was stored correctly
-        stored_datetime = None
-        if data_index in candle_data and candle_data[data_index] and candle_index >= 0:
-            stored_datetime = candle_data[data_index][candle_index].get('order_datetime')
-        
-        self.logger.log(LogLevel.INFO, f"Placing retest order for {symbol} (data_index={data_index}) on date {order_datetime}, candle_index={candle_index}, stored_datetime={stored_datetime}", RepositoryName.WIP)  
+        if not self.lean:
+            # Store the datetime in the candle_data so we can verify it matches
+            candle_data = self._get_candle_data()
+            candle_index = self.current_candle_index(data_index)
+            self.set_candle_data(data_feed_index=data_index, order_placed=True, order_datetime=order_datetime)
+            
+            # Verify the datetime was stored correctly
+            stored_datetime = candle_data[data_index][-1].get('order_datetime') if candle_index >= 0 else None
+            self.log_to_repo(LogLevel.INFO, f"Placing retest order for {symbol} (data_index={data_index}) on date {order_datetime}, candle_index={candle_index}, stored_datetime={stored_datetime}", RepositoryName.WIP)  
 
         # Determine trade side  
         if breakout_trend == Trend.UPTREND:  
@@ -260,22 +303,19 @@ class BreakRetestStrategy(BaseStrategy):
 
         # Check if order was successfully created
         if orders is None or len(orders) == 0 or orders[0] is None:
-            print("\n" + "="*80)
-            print("⚠️  WARNING: ORDER PLACEMENT FAILED IN STRATEGY ⚠️")
-            print("="*80)
-            print(f"❌ Failed to place retest order for symbol: {symbol}")
-            print(f"   Order side: {side.name}")
-            print(f"   Entry price: {format_price(entry_price)}")
-            print(f"   Size: {size}")
-            print(f"   Stop loss: {format_price(sl)}")
-            print(f"   Take profit: {format_price(tp)}")
-            print(f"   Support: {format_price(support)}")
-            print(f"   Resistance: {format_price(resistance)}")
-            print(f"   Breakout trend: {breakout_trend}")
-            print(f"   Risk distance: {format_price(risk_distance)}")
-            print(f"   Candle index: {self.candle_index}")
-            print("   ⚠️  Order NOT placed. Check validation warnings above for details!")
-            print("="*80 + "\n")
+            self._print_warning("ORDER PLACEMENT FAILED IN STRATEGY",
+                                f"❌ Failed to place retest order for symbol: {symbol}",
+                                f"   Order side: {side.name}",
+                                f"   Entry price: {format_price(entry_price)}",
+                                f"   Size: {size}",
+                                f"   Stop loss: {format_price(sl)}",
+                                f"   Take profit: {format_price(tp)}",
+                                f"   Support: {format_price(support)}",
+                                f"   Resistance: {format_price(resistance)}",
+                                f"   Breakout trend: {breakout_trend}",
+                                f"   Risk distance: {format_price(risk_distance)}",
+                                f"   Candle index: {self.candle_index}",
+                                "   ⚠️  Order NOT placed. Check validation warnings above for details!")
             self.log_trade(TradeState.CANCELED, self.candle_index, side,
                         f"[{symbol}] Failed to place order: Entry={format_price(entry_price)}, Size={size}, TP={format_price(tp)}, SL={format_price(sl)}")
             return
@@ -286,17 +326,14 @@ class BreakRetestStrategy(BaseStrategy):
         
         # Additional safety check
         if main_order is None:
-            print("\n" + "="*80)
-            print("⚠️  WARNING: MAIN ORDER IS NONE AFTER PLACEMENT ⚠️")
-            print("="*80)
-            print(f"❌ Main order is None even though orders list exists")
-            print(f"   Symbol: {symbol}")
-            print(f"   Order side: {side.name}")
-            print(f"   Orders returned: {orders}")
-            print(f"   Entry price: {format_price(entry_price)}")
-            print(f"   Size: {size}")
-            print("   ⚠️  This should not happen! Order structure is invalid!")
-            print("="*80 + "\n")
+            self._print_warning("MAIN ORDER IS NONE AFTER PLACEMENT",
+                                f"❌ Main order is None even though orders list exists",
+                                f"   Symbol: {symbol}",
+                                f"   Order side: {side.name}",
+                                f"   Orders returned: {orders}",
+                                f"   Entry price: {format_price(entry_price)}",
+                                f"   Size: {size}",
+                                "   ⚠️  This should not happen! Order structure is invalid!")
             self.log_trade(TradeState.CANCELED, self.candle_index, side,
                         f"[{symbol}] Main order is None. Order not placed.")
             return
@@ -311,46 +348,46 @@ class BreakRetestStrategy(BaseStrategy):
         broken_support = support if breakout_trend == Trend.DOWNTREND else None
         
         # Store trade record  
-        trade_record = {  
-            'trade_id': trade_id,  
-            'symbol': symbol,
-            'order_side': side,  
-            'state': TradeState.PENDING,  
-            'placed_candle': self.candle_index - 1,
-            'placed_datetime': current_datetime,
-            'entry_price': entry_price,  # Order price (may differ from executed price)
-            'entry_executed_price': None,  # Will be set when order fills
-            'size': size,  
-            'sl': sl,  
-            'tp': tp,  
-            'broken_resistance': broken_resistance,  # Track for invalidation
-            'broken_support': broken_support,  # Track for invalidation
-            'main_order_ref': main_order.ref,
-            'tp_order_ref': tp_order.ref if tp_order else None,
-            'sl_order_ref': sl_order.ref if sl_order else None,
-            'data_index': data_index,  # Store data_index for multi-symbol support
-            'orders': {  
+        trade_record = TradeRecord(
+            trade_id=trade_id,  
+            symbol=symbol,
+            order_side=side,  
+            state=TradeState.PENDING,  
+            placed_candle=self.candle_index - 1,
+            placed_datetime=current_datetime,
+            entry_price=entry_price,  # Order price (may differ from executed price)
+            entry_executed_price=None,  # Will be set when order fills
+            size=size,  
+            sl=sl,  
+            tp=tp,  
+            broken_resistance=broken_resistance,  # Track for invalidation
+            broken_support=broken_support,  # Track for invalidation
+            main_order_ref=main_order.ref,
+            tp_order_ref=tp_order.ref if tp_order else None,
+            sl_order_ref=sl_order.ref if sl_order else None,
+            data_index=data_index,  # Store data_index for multi-symbol support
+            orders={  
                 'main': orders[0] if len(orders) > 0 else None,  
                 'tp': orders[1] if len(orders) > 1 else None,  
                 'sl': orders[2] if len(orders) > 2 else None  
             },  
-            'open_candle': None,
-            'open_datetime': None,
-            'close_candle': None,
-            'close_datetime': None,
-            'pnl': None,
-            'close_reason': None,  # Will be set to 'TP' or 'SL' when trade closes
+            open_candle=None,
+            open_datetime=None,
+            close_candle=None,
+            close_datetime=None,
+            pnl=None,
+            close_reason=None,  # Will be set to 'TP' or 'SL' when trade closes
             # Metadata
-            'rsi_at_break': data_indicators[data_index]['rsi'][0],
-            'relative_volume': data.volume[0] / data_indicators[data_index]['volume_ma'][0], 
-            'atr_breakout_wick': (((data.high[0] - max(data.open[0], data.close[0])) if breakout_trend == Trend.UPTREND else (min(data.open[0], data.close[0]) - data.low[0])) / max(data_indicators[data_index]['atr'][0], 1e-6)),
-            'time_to_fill': None,
-            'highest_excursion_from_breakout': data.high[0] - entry_price if breakout_trend == Trend.UPTREND else entry_price - data.low[0],
-            'atr_sl_dist': abs(sl - entry_price) / data_indicators[data_index]['atr'][0],
-            'atr_tp_dist': abs(tp - entry_price) / data_indicators[data_index]['atr'][0],
-        }  
+            rsi_at_break=data_indicators[data_index]['rsi'][0],
+            relative_volume=data.volume[0] / data_indicators[data_index]['volume_ma'][0], 
+            atr_breakout_wick=(((data.high[0] - max(data.open[0], data.close[0])) if breakout_trend == Trend.UPTREND else (min(data.open[0], data.close[0]) - data.low[0])) / max(data_indicators[data_index]['atr'][0], 1e-6)),
+            time_to_fill=None,
+            highest_excursion_from_breakout=data.high[0] - entry_price if breakout_trend == Trend.UPTREND else entry_price - data.low[0],
+            atr_sl_dist=abs(sl - entry_price) / data_indicators[data_index]['atr'][0],
+            atr_tp_dist=abs(tp - entry_price) / data_indicators[data_index]['atr'][0],
+        )
 
-        self.trades[trade_id] = trade_record
+        self.trades.add(trade_record)
         
         # Store in active_trades using trade_id (not order.ref) for consistency
         # Also store order refs for quick lookup in notify_order
@@ -397,36 +434,25 @@ class BreakRetestStrategy(BaseStrategy):
         resistance = state['resistance']
         symbol = data_indicators[data_index]['symbol']
         
-        for trade_key, trade in list(self.active_trades.items()):  
-            # Skip if this is an order ref lookup (not a trade_id)
-            # Order refs are integers, trade_ids are UUID strings
+        # Only this feed's pending trades (a copy, since cancelling updates the index)
+        pending_trades = self.trades.for_feed(data_index, TradeState.PENDING)
+        if not pending_trades:
+            return
+        atr_value = data_indicators[data_index]['atr'][0] if len(data_indicators[data_index]['atr']) > 0 else 0.0
+        invalidation_price = convert_atr_to_price(atr_value, EnvironmentVariables.SR_CANCELLATION_THRESHOLD_ATR, symbol)
+        
+        for trade in pending_trades:
             trade_id = trade.get('trade_id')
-            if trade_id is None:
-                # This is an order ref entry, skip it (we'll process via trade_id)
-                continue
-            
-            # Only process trades with trade_id matching the key (not order ref lookups)
-            if trade_key != trade_id:
-                continue
-            
-            if trade.get('data_index') != data_index:
-                continue
-            if trade.get('state') == TradeState.PENDING:  
-                atr_value = data_indicators[data_index]['atr'][0] if len(data_indicators[data_index]['atr']) > 0 else 0.0
-                invalidation_price = convert_atr_to_price(atr_value, EnvironmentVariables.SR_CANCELLATION_THRESHOLD_ATR, symbol)
-                trade_id = trade.get('trade_id')
-                if trade['order_side'] == OrderSide.BUY and support is not None and trade.get('broken_resistance') is not None:  
-                    if support > trade['broken_resistance'] + invalidation_price:  
-                        symbol = trade.get('symbol', 'UNKNOWN')
-                        self.log_trade(TradeState.CANCELED, self.candle_index, trade['order_side'],  
-                                    f"[{symbol}] Invalidated BUY trade {trade_id} due to new support {format_price(support)}")  
-                        self._cancel_trade_orders(trade)  
-                elif trade['order_side'] == OrderSide.SELL and resistance is not None and trade.get('broken_support') is not None:  
-                    if resistance < trade['broken_support'] - invalidation_price:  
-                        symbol = trade.get('symbol', 'UNKNOWN')
-                        self.log_trade(TradeState.CANCELED, self.candle_index, trade['order_side'],  
-                                    f"[{symbol}] Invalidated SELL trade {trade_id} due to new resistance {format_price(resistance)}")  
-                        self._cancel_trade_orders(trade)  
+            if trade['order_side'] == OrderSide.BUY and support is not None and trade.get('broken_resistance') is not None:  
+                if support > trade['broken_resistance'] + invalidation_price:  
+                    self.log_trade(TradeState.CANCELED, self.candle_index, trade['order_side'],  
+                                f"[{symbol}] Invalidated BUY trade {trade_id} due to new support {format_price(support)}")  
+                    self._cancel_trade_orders(trade)  
+            elif trade['order_side'] == OrderSide.SELL and resistance is not None and trade.get('broken_support') is not None:  
+                if resistance < trade['broken_support'] - invalidation_price:  
+                    self.log_trade(TradeState.CANCELED, self.candle_index, trade['order_side'],  
+                                f"[{symbol}] Invalidated SELL trade {trade_id} due to new resistance {format_price(resistance)}")  
+                    self._cancel_trade_orders(trade)  
 
     def _cancel_trade_orders(self, trade):  
         # Update trade state to CANCELED
@@ -467,6 +493,7 @@ class BreakRetestStrategy(BaseStrategy):
                     self.cancel(o)  
                 except Exception as e:  
                     self.log(f"Error cancelling order {o.ref}: {e}")
+        self.release_trade_orders(trade)
         
         # Clean up active_trades - remove all references
         if trade_id:
@@ -481,21 +508,19 @@ class BreakRetestStrategy(BaseStrategy):
                 self.active_trades.pop(ref, None)  
 
     def notify_order(self, order):
-        if Config.show_debug_logs:
-            print(f"*** NOTIFY_ORDER: {order.getstatusname()} - {order.info} - Size: {order.size}, Price: {order.price} ***")
         if order is None:
             return
+        log.debug("NOTIFY_ORDER: {} - {} - Size: {}, Price: {}", order.getstatusname(), order.info, order.size, order.price)
+        super().notify_order(order)
 
         # -----------------------------
         # Identify event type
         # -----------------------------
         if order.status == order.Submitted:
-            if Config.show_debug_logs:
-                print(f"  Order Submitted: {order}")
+            log.debug("Order Submitted: {}", order)
             return
         if order.status == order.Accepted:
-            if Config.show_debug_logs:
-                print(f"  Order Accepted: {order}")
+            log.debug("Order Accepted: {}", order)
             return
 
         # -----------------------------
@@ -508,15 +533,9 @@ class BreakRetestStrategy(BaseStrategy):
 
             # Order does NOT belong to a tracked trade
             if trade_record is None:
-                print(f"[UNKNOWN] Completed order (ref={ref}) not tracked")
+                log.warning("[UNKNOWN] Completed order (ref={}) not tracked", ref)
                 return
             
-            # If we got trade_record via order ref, try to get the full record via trade_id
-            trade_id = trade_record.get('trade_id')
-            if trade_id and trade_id in self.trades:
-                # Use the full trade record from self.trades
-                trade_record = self.trades[trade_id]
-
             main_ref   = trade_record.get("main_order_ref")
             tp_ref     = trade_record.get("tp_order_ref")
             sl_ref     = trade_record.get("sl_order_ref")
@@ -534,27 +553,16 @@ class BreakRetestStrategy(BaseStrategy):
                 else:
                     current_datetime = self.data.datetime.datetime(0)
                 
-                # Update the full trade record with open_candle and executed price
-                if hasattr(order, 'trade_id') and order.trade_id in self.trades:
-                    self.trades[order.trade_id]['open_candle'] = self.candle_index
-                    self.trades[order.trade_id]['open_datetime'] = current_datetime
-                    self.trades[order.trade_id]['entry_executed_price'] = order.executed.price
-                    self.trades[order.trade_id]['state'] = TradeState.RUNNING
-                    
-                    # Calculate entry slippage (difference between order price and executed price)
-                    entry_price = self.trades[order.trade_id].get('entry_price')
-                    if entry_price is not None and order.executed.price is not None:
-                        entry_slippage = abs(order.executed.price - entry_price)
-                        self.trades[order.trade_id]['entry_slippage'] = entry_slippage
-                    
-                    # Also update trade_record reference if it's the same object
-                    if trade_record.get('trade_id') == order.trade_id:
-                        trade_record['open_candle'] = self.candle_index
-                        trade_record['open_datetime'] = current_datetime
-                        trade_record['entry_executed_price'] = order.executed.price
-                        trade_record['state'] = TradeState.RUNNING
-                        if 'entry_slippage' in self.trades[order.trade_id]:
-                            trade_record['entry_slippage'] = self.trades[order.trade_id]['entry_slippage']
+                # Update the trade record (shared with self.trades) with open_candle and executed price
+                trade_record['open_candle'] = self.candle_index
+                trade_record['open_datetime'] = current_datetime
+                trade_record['entry_executed_price'] = order.executed.price
+                trade_record['state'] = TradeState.RUNNING
+
+                # Calculate entry slippage (difference between order price and executed price)
+                entry_price = trade_record.get('entry_price')
+                if entry_price is not None and order.executed.price is not None:
+                    trade_record['entry_slippage'] = abs(order.executed.price - entry_price)
                 
                 symbol = trade_record.get('symbol', '')
                 symbol_str = f"[{symbol}] " if symbol else ""
@@ -570,7 +578,7 @@ class BreakRetestStrategy(BaseStrategy):
                     placed_on=self._utc_timestamp(trade_record['placed_datetime']),
                     executed_on=self._utc_timestamp(current_datetime),
                     state=TradeState.RUNNING,
-                    trade_id=order.trade_id,
+                    trade_id=trade_record['trade_id'],
                     entry_executed_price=order.executed.price,
                     data_index=trade_record.get('data_index')
                 )
@@ -590,8 +598,7 @@ class BreakRetestStrategy(BaseStrategy):
 
 
         if order.status in [order.Canceled, order.Rejected]: # Canceled orders because of invalidation or rejection
-            if Config.show_debug_logs:
-                print(f"  Order Canceled/Rejected: {order} - Info: {order.info}")
+            log.debug("Order Canceled/Rejected: {} - Info: {}", order, order.info)
             trade_record = self.active_trades.pop(order.ref, None)
 
     def _handle_trade_exit(self, order, trade_record, trade_state, counter_key, exit_type):
@@ -649,18 +656,9 @@ class BreakRetestStrategy(BaseStrategy):
         )
         self.counter[counter_key] += 1
         
-        # Get the full trade record from self.trades if available (has placed_candle and other fields)
-        # Orders have trade_id attribute set when created
-        full_trade_record = None
-        trade_id = None
-        if hasattr(order, 'trade_id') and order.trade_id in self.trades:
-            trade_id = order.trade_id
-            full_trade_record = self.trades[trade_id].copy()
-        else:
-            # Fallback to trade_record from active_trades if trade_id not available
-            trade_id = trade_record.get('trade_id')
-            full_trade_record = trade_record.copy()
-        
+        # trade_record is the ledger's record, so it is updated in place
+        full_trade_record = trade_record
+
         # Determine close reason
         close_reason = 'TP' if trade_state == TradeState.TP_HIT else 'SL'
         
@@ -715,10 +713,6 @@ class BreakRetestStrategy(BaseStrategy):
         total_slippage_cost = total_slippage_price * size
         full_trade_record['total_slippage'] = total_slippage_cost
         
-        # IMPORTANT: Update the trade in self.trades dict (not just the copy)
-        if trade_id and trade_id in self.trades:
-            self.trades[trade_id].update(full_trade_record)
-        
         self.add_completed_trade(full_trade_record)
         
         # Clean up active_trades - remove all references (by trade_id and order refs)
@@ -749,28 +743,22 @@ class BreakRetestStrategy(BaseStrategy):
         
         # Debug: Show what we have
         total_trades = len(self.trades)
-        trades_with_pnl = [t for t in self.trades.values() if t.get('pnl') is not None]
-        pending_trades = [t for t in self.trades.values() if t.get('state') == TradeState.PENDING]
-        running_trades = [t for t in self.trades.values() if t.get('state') == TradeState.RUNNING]
-        canceled_trades = [t for t in self.trades.values() if t.get('state') == TradeState.CANCELED]
-        
-        print(f"Debug: Total trades in dict: {total_trades}")
-        print(f"Debug: Trades with PnL (completed): {len(trades_with_pnl)}")
-        print(f"Debug: Pending trades: {len(pending_trades)}")
-        print(f"Debug: Running trades: {len(running_trades)}")
-        print(f"Debug: Canceled trades: {len(canceled_trades)}")
-        print(f"Debug: Completed trades list: {len(self.completed_trades)}")
+        canceled_count = self.trades.count(TradeState.CANCELED)
+
+        log.debug("Trades in dict: {}, with PnL (completed): {}, pending: {}, running: {}, canceled: {}, completed list: {}",
+                  total_trades, len(self.trades.completed), self.trades.count(TradeState.PENDING),
+                  self.trades.count(TradeState.RUNNING), canceled_count, len(self.completed_trades))
         
         # Show breakdown
-        if len(canceled_trades) > 0:
-            print(f"\nNote: {len(canceled_trades)} trades were canceled (never filled)")
+        if canceled_count > 0:
+            print(f"\nNote: {canceled_count} trades were canceled (never filled)")
             print(f"      These are included in CSV export but not shown in completed trades table")
         
         # Filter trades
         if include_pending:
             trades_to_show = list(self.trades.values())
         else:
-            trades_to_show = [t for t in self.trades.values() if t.get('pnl') is not None]
+            trades_to_show = list(self.trades.completed)
         
         if not trades_to_show:
             print("\nNo completed trades found (trades with PnL).")
@@ -827,15 +815,15 @@ class BreakRetestStrategy(BaseStrategy):
     
     def get_completed_trades(self):
         """Get only completed trades (with PnL)."""
-        return [t for t in self.trades.values() if t.get('pnl') is not None]
+        return list(self.trades.completed)
     
     def get_pending_trades(self):
         """Get pending trades."""
-        return [t for t in self.trades.values() if t.get('state') == TradeState.PENDING]
+        return self.trades.with_state(TradeState.PENDING)
     
     def get_running_trades(self):
         """Get running trades."""
-        return [t for t in self.trades.values() if t.get('state') == TradeState.RUNNING]
+        return self.trades.with_state(TradeState.RUNNING)
     
     def verify_trades(self, verbose=False):
         completed_trades = self.get_completed_trades()
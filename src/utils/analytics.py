@@ -0,0 +1,199 @@
+"""
+Performance analytics over a columnar trade ledger.
+
+``performance_stats`` takes the completed-trade columns of a TradeLedger
+(``TradeLedger.completed_array()``) and, optionally, the per-bar equity curve
+(``PortfolioAccountant.equity_curve()``) and computes the full statistics set
+with vectorized NumPy ops: trade statistics, drawdown, Sharpe, Sortino and
+Calmar ratios, market exposure and a per-symbol breakdown. Without an equity
+curve the curve-based statistics use the closed-trade equity at each exit.
+"""
+
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.models.portfolio import EQUITY_DTYPE
+
+
+def closed_trade_curve(trades: np.ndarray, initial_cash: float) -> np.ndarray:
+    """Equity after each exit (EQUITY_DTYPE rows ordered by close time)."""
+    order = np.argsort(trades['close_time'], kind='stable')
+    curve = np.empty(len(trades), dtype=EQUITY_DTYPE)
+    curve['time'] = trades['close_time'][order]
+    curve['equity'] = initial_cash + np.cumsum(trades['pnl'][order])
+    return curve
+
+
+def equity_curve_stats(curve: np.ndarray, initial_cash: float, periods_per_year: int = 252,
+                       drawdown: Optional[Tuple[float, float]] = None) -> dict:
+    """
+    Drawdown and risk-adjusted return ratios of an equity curve.
+
+    Drawdown is measured on every row (the peak starts at ``initial_cash``),
+    unless ``drawdown`` gives the (max drawdown, value) tracked per bar for a
+    daily curve (``PortfolioAccountant.drawdown()``). Sharpe and Sortino use
+    returns of the last equity of each calendar day and are annualized with
+    ``periods_per_year``; Calmar is the annualized return over the max drawdown.
+    """
+    equity = np.concatenate(([initial_cash], curve['equity']))
+    peak = np.maximum.accumulate(equity)
+    drawdowns = np.where(peak > 0, (peak - equity) / np.where(peak > 0, peak, 1.0), 0.0)
+    max_dd_index = int(np.argmax(drawdowns))
+    max_drawdown = float(drawdowns[max_dd_index])
+    max_drawdown_value = float(peak[max_dd_index] - equity[max_dd_index])
+    if drawdown is not None and drawdown[0] > max_drawdown:
+        max_drawdown, max_drawdown_value = float(drawdown[0]), float(drawdown[1])
+
+    days = curve['time'].astype('datetime64[D]')
+    # Last row of each day (times are chronological)
+    day_close = np.flatnonzero(np.append(days[1:] != days[:-1], True)) if len(days) else np.zeros(0, dtype=np.intp)
+    daily_equity = np.concatenate(([initial_cash], curve['equity'][day_close]))
+    returns = np.diff(daily_equity) / np.where(daily_equity[:-1] != 0, daily_equity[:-1], 1.0)
+    n_returns = len(returns)
+    mean_return = returns.mean() if n_returns else 0.0
+    returns_std = returns.std(ddof=1) if n_returns > 1 else 0.0
+    downside_std = np.sqrt(np.mean(np.minimum(returns, 0.0) ** 2)) if n_returns else 0.0
+
+    total_return = equity[-1] / initial_cash if initial_cash > 0 else 0.0
+    annual_return = total_return ** (periods_per_year / n_returns) - 1.0 if n_returns and total_return > 0 else 0.0
+
+    return {
+        'max_drawdown': max_drawdown,
+        'max_drawdown_value': max_drawdown_value,
+        'annual_return': float(annual_return),
+        'sharpe_ratio': float(mean_return / returns_std * (periods_per_year ** 0.5)) if returns_std > 0 else 0.0,
+        'sortino_ratio': float(mean_return / downside_std * (periods_per_year ** 0.5)) if downside_std > 0 else 0.0,
+        'calmar_ratio': float(annual_return / max_drawdown) if max_drawdown > 0 else 0.0,
+    }
+
+
+def exposure(trades: np.ndarray, start: np.datetime64 = None, end: np.datetime64 = None) -> float:
+    """Share of the period [start, end] with at least one trade in the market (open to close)."""
+    if not len(trades):
+        return 0.0
+    opens = trades['open_time'].astype(np.int64)
+    closes = trades['close_time'].astype(np.int64)
+    start = int(np.datetime64(start, 's').astype(np.int64)) if start is not None else int(opens.min())
+    end = int(np.datetime64(end, 's').astype(np.int64)) if end is not None else int(closes.max())
+    if end <= start:
+        return 0.0
+
+    # Union of the [open, close] intervals: a new block starts where an open
+    # comes after every earlier close
+    order = np.argsort(opens, kind='stable')
+    opens = np.clip(opens[order], start, end)
+    closes = np.clip(closes[order], start, end)
+    reach = np.maximum.accumulate(closes)
+    new_block = np.empty(len(opens), dtype=bool)
+    new_block[0] = True
+    new_block[1:] = opens[1:] > reach[:-1]
+    block_ends = np.append(np.flatnonzero(new_block)[1:] - 1, len(opens) - 1)
+    covered = (reach[block_ends] - opens[new_block]).sum()
+    return float(covered / (end - start))
+
+
+def _trade_stats(pnl: np.ndarray) -> dict:
+    wins = pnl > 0
+    losses = pnl < 0
+    n = len(pnl)
+    gross_profit = float(pnl[wins].sum())
+    gross_loss = float(pnl[losses].sum())
+    n_wins = int(wins.sum())
+    n_losses = int(losses.sum())
+    avg_win = gross_profit / n_wins if n_wins else 0.0
+    avg_loss = gross_loss / n_losses if n_losses else 0.0
+    return {
+        'total_trades': n,
+        'wins': n_wins,
+        'losses': n_losses,
+        'win_rate': n_wins / n if n else 0.0,
+        'total_pnl': float(pnl.sum()),
+        'gross_profit': gross_profit,
+        'gross_loss': gross_loss,
+        'avg_win': avg_win,
+        'avg_loss': avg_loss,
+        'expectancy': float(pnl.mean()) if n else 0.0,
+        'payoff_ratio': abs(avg_win / avg_loss) if avg_loss else 0.0,
+        'profit_factor': abs(gross_profit / gross_loss) if gross_loss != 0 else float('inf'),
+    }
+
+
+def per_symbol_stats(trades: np.ndarray, symbols: Optional[Sequence[str]] = None) -> Dict[str, dict]:
+    """Trade statistics per data feed (keyed by symbol name, or data index when no names are given)."""
+    data_index = trades['data_index']
+    breakdown = {}
+    for index in np.unique(data_index):
+        name = symbols[index] if symbols is not None and 0 <= index < len(symbols) else str(int(index))
+        breakdown[name] = _trade_stats(trades['pnl'][data_index == index])
+    return breakdown
+
+
+def rolling_trade_stats(trades: np.ndarray, window: int = 20) -> Dict[str, np.ndarray]:
+    """
+    Rolling win rate, PnL and profit factor over the last ``window`` trades
+    (in close-time order), one value per trade from the ``window``-th on.
+    """
+    pnl = trades['pnl'][np.argsort(trades['close_time'], kind='stable')]
+    if len(pnl) < window:
+        empty = np.zeros(0, dtype=np.float64)
+        return {'close_time': np.zeros(0, dtype='datetime64[s]'), 'win_rate': empty, 'pnl': empty, 'profit_factor': empty}
+
+    def rolling_sum(values: np.ndarray) -> np.ndarray:
+        cumsum = np.concatenate(([0.0], np.cumsum(values)))
+        return cumsum[window:] - cumsum[:-window]
+
+    profit = rolling_sum(np.where(pnl > 0, pnl, 0.0))
+    loss = -rolling_sum(np.where(pnl < 0, pnl, 0.0))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        profit_factor = np.where(loss > 0, profit / loss, np.inf)
+    return {
+        'close_time': np.sort(trades['close_time'], kind='stable')[window - 1:],
+        'win_rate': rolling_sum((pnl > 0).astype(np.float64)) / window,
+        'pnl': rolling_sum(pnl),
+        'profit_factor': profit_factor,
+    }
+
+
+def performance_stats(trades: np.ndarray, initial_cash: float, equity_curve: np.ndarray = None,
+                      symbols: Optional[Sequence[str]] = None, periods_per_year: int = 252,
+                      drawdown: Optional[Tuple[float, float]] = None) -> dict:
+    """
+    Full statistics set of a backtest in one pass over the trade columns.
+
+    Args:
+        trades: Completed-trade columns (``TradeLedger.completed_array()``)
+        initial_cash: Starting equity
+        equity_curve: Per-bar equity curve (``PortfolioAccountant.equity_curve()``);
+            the closed-trade equity is used when omitted
+        symbols: Symbol name of each data feed index for the per-symbol breakdown
+        periods_per_year: Annualization factor of the daily returns
+        drawdown: Per-bar (max drawdown, value) of a daily equity curve
+            (``PortfolioAccountant.drawdown()``)
+    """
+    pnl = trades['pnl']
+    stats = _trade_stats(pnl)
+    wins = pnl > 0
+    losses = pnl < 0
+    n = len(pnl)
+
+    has_curve = equity_curve is not None and len(equity_curve)
+    curve = equity_curve if has_curve else closed_trade_curve(trades, initial_cash)
+    # The closed-trade curve starts at the first exit: exposure then spans the trades (first open to last close)
+    start, end = (curve['time'][0], curve['time'][-1]) if has_curve else (None, None)
+
+    stats.update({
+        'max_win': float(pnl[wins].max()) if stats['wins'] else 0.0,
+        'max_win_candle': int(trades['placed_candle'][wins].max()) if stats['wins'] else 0,
+        'max_loss': float(pnl[losses].min()) if stats['losses'] else 0.0,
+        'max_loss_candle': int(trades['placed_candle'][losses].min()) if stats['losses'] else 0,
+        'long_trades': int((trades['side'] > 0).sum()),
+        'short_trades': int((trades['side'] < 0).sum()),
+        **equity_curve_stats(curve, initial_cash, periods_per_year, drawdown),
+        'exposure': exposure(trades, start, end),
+        'avg_entry_slippage': float(trades['entry_slippage'].mean()) if n else 0.0,
+        'avg_close_slippage': float(trades['close_slippage'].mean()) if n else 0.0,
+        'total_slippage': float(trades['total_slippage'].sum()),
+        'per_symbol': per_symbol_stats(trades, symbols),
+    })
+    return stats
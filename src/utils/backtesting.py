@@ -6,6 +6,9 @@ from pathlib import Path
 import pandas as pd
 from typing import Literal
 from src.utils.config import Config
+from src.utils.logging import get_logger
+
+log = get_logger('backtest')
 
 # Ensure root directory is in path for data.fetch import
 _root_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -56,10 +59,10 @@ def prepare_backtesting(symbols: list[str], timeframe: Timeframe, start_date: da
     for symbol in symbols:
         file_path = generate_csv_filename(symbol, timeframe, start_date, end_date)
         
-        print(f"file_path: {file_path}")
+        log.debug("file_path: {}", file_path)
         # Check if file exists AND has valid OHLC format
         if os.path.exists(file_path) and _is_valid_ohlc_csv(file_path):
-            print(f"Using cached candlestick data for {symbol}")
+            log.info("Using cached candlestick data for {}", symbol)
             symbols_list.append({
                 "symbol": symbol,
                 "csv_file": str(file_path)
@@ -67,7 +70,7 @@ def prepare_backtesting(symbols: list[str], timeframe: Timeframe, start_date: da
             continue
         elif os.path.exists(file_path):
             # File exists but doesn't have OHLC format - skip cache and fetch new data
-            print(f"Warning: Cached file {file_path.name} exists but doesn't contain OHLC data. Fetching new data...")
+            log.warning("Cached file {} exists but doesn't contain OHLC data. Fetching new data...", file_path.name)
         
         # Fetch data based on platform
         if sys.platform == "win32":
@@ -99,7 +102,7 @@ def prepare_backtesting(symbols: list[str], timeframe: Timeframe, start_date: da
             start_str = start_date.strftime("%Y-%m-%d %H:%M")
             end_str = end_date.strftime("%Y-%m-%d %H:%M")
             
-            print(f"Fetching {symbol} data from remote server at {server_url}...")
+            log.info("Fetching {} data from remote server at {}...", symbol, server_url)
             try:
                 csv_path = fetch_from_server(
                     server_url=server_url,
@@ -128,4 +131,4 @@ def generate_csv_filename(symbol: str, timeframe: Timeframe, start_date: datetim
     filename = _generate_csv_filename_base(symbol_formatted, timeframe_str, start_date, end_date)
     # Add the full path
     cwd = Path.cwd()
-    return cwd / "data/backtests" / type_ / filename
\ No newline at end of file
+    return cwd / "data/backtests" / type_ / filename
@@ -7,9 +7,13 @@ from pydantic_settings import BaseSettings
 from pydantic import Field, ValidationError
 from typing import Literal, Optional
 
+from src.utils.logging import get_logger
+
 VALID_MARKET_TYPES = {"forex", "crypto", "stocks"}
 VALID_TRADING_MODES = {"backtest", "live"}
 
+log = get_logger('config')
+
 
 class Configuration(BaseSettings):
     price_precision: int = Field(..., ge=1, le=10)
@@ -33,6 +37,7 @@ class Configuration(BaseSettings):
     min_risk_distance_atr: float = Field(default=10.0, ge=0.0, le=100.0)  # Minimum risk distance in pips for placing a trade
     pair_specific_config: dict = Field(default={})  # Pair specific configuration
     check_for_daily_rsi: bool = Field(default=True)
+    daily_rsi_from_timeframes: bool = Field(default=False)  # Backtests: daily RSI of the closed D1 bars built from the base feed instead of backtrader's replayed daily feed
     
     # MetaTrader 5 credentials (optional, required for live trading with -m flag)
     mt5_login: Optional[int] = Field(default=None)  # MT5 account number
@@ -41,10 +46,25 @@ class Configuration(BaseSettings):
     mt5_path: Optional[str] = Field(default=None)  # Path to MT5 terminal (optional, auto-detected if not provided)
     mt5_symbol: Optional[str] = Field(default=None)  # Symbol(s) to trade - comma-separated (e.g., 'AUDCHF' or 'AUDCHF,EURUSD,GBPCAD')
     mt5_timeframe: Optional[str] = Field(default='H1')  # Timeframe ('M1', 'M5', 'M15', 'M30', 'H1', 'H4', 'D1')
+    mt5_server_utc_offset: Optional[float] = Field(default=None)  # Broker server time minus UTC in hours (measured from the last tick at each new bar when not set)
+    live_state_db: Optional[str] = Field(default='data/live_state.db')  # Checkpoints of live sessions (None: no checkpoints)
+    warm_restart: bool = Field(default=True)  # Resume a live session from its checkpoint (warm-up bars + missed bars only)
+    warmup_candles: int = Field(default=500, ge=10)  # Warm restarts: bars loaded up to the checkpoint bar to rebuild EMA/ATR/RSI
+    candle_store_dir: Optional[str] = Field(default='data/candles')  # Local history of the live feeds, only newer bars are fetched (None: full fetch each start)
 
     # Logs
     zones_log_repo: Optional[str] = Field(default=None)
     show_debug_logs: bool = Field(default=False)
+    log_level: str = Field(default='INFO')  # Default level of every logging subsystem
+    log_levels: dict = Field(default={})  # Per-subsystem levels, e.g. {"feed.mt5": "WARNING", "broker": "DEBUG"}
+    log_json_file: Optional[str] = Field(default=None)  # JSON lines log sink
+    log_queue_size: int = Field(default=10000, ge=0)  # Bounded queue in front of the log sinks (0 = synchronous)
+
+    # Performance
+    sparse_stepping: bool = Field(default=True)  # Skip confirmation checks, zone logs and chart file writes on quiet bars
+    low_memory_lookback: int = Field(default=2000, ge=10)  # Bars the zone indicators may look back in low-memory backtests
+    precompute_indicators: bool = Field(default=False)  # Backtests: compute each feed's ATR/EMA/RSI/volume MA arrays before the run, in parallel across symbols
+    precompute_processes: Optional[int] = Field(default=None, ge=1)  # Worker processes of the precompute (default: one per symbol, up to the CPU count)
 
     # Indicators
     ema_length: int = Field(default=9)
@@ -74,15 +94,13 @@ def load_config() -> Configuration:
         config.mode = "live" if "-m" in sys.argv else "backtest"
         return config
     except ValidationError as e:
-        print("Configuration Error: Missing or invalid required environment variables!")
+        log.error("Configuration Error: Missing or invalid required environment variables!")
         for error in e.errors():
-            field = error['loc'][0] if error['loc'] else 'unknown'
-            message = error['msg']
-            print(f"  - {field}: {message}")
-        print("\nPlease check your .env file and ensure all required variables are set.")
+            log.error("  - {}: {}", error['loc'][0] if error['loc'] else 'unknown', error['msg'])
+        log.error("Please check your .env file and ensure all required variables are set.")
         sys.exit(1)
     except Exception as e:
-        print(f"Unexpected error loading configuration: {e}")
+        log.error("Unexpected error loading configuration: {}", e)
         sys.exit(1)
 
 
@@ -1,10 +1,276 @@
-import sys
+"""
+Logging helpers.
+
+``get_logger(subsystem)`` returns a structured logger over loguru whose level
+is checked before anything else happens, so a disabled call costs one
+comparison per bar. Messages are ``str.format`` templates filled from the
+positional args and keyword fields only when the record is emitted; keyword
+fields are also attached to the record (``record["extra"]``) and show up in
+the JSON sink. A message can also be a zero-argument callable for text that
+is expensive to build.
+
+    log = get_logger('strategy')
+    log.debug("[{symbol}] Order {ref} accepted", symbol=symbol, ref=order.ref)
+
+Levels are set per subsystem (dotted names inherit from their parents, e.g.
+``feed`` covers ``feed.mt5``) with ``configure_logging`` or ``set_level``.
+``configure_logging`` also installs the console sink, an optional JSON lines
+file sink and a bounded queue that moves sink I/O to a background thread.
+"""
+
+import atexit
 import os
+import queue
+import sys
+import threading
+from typing import Callable, Dict, Optional, TextIO, Union
+
+from loguru import logger
+
+LEVELS = {
+    'TRACE': 5,
+    'DEBUG': 10,
+    'INFO': 20,
+    'SUCCESS': 25,
+    'WARNING': 30,
+    'ERROR': 40,
+    'CRITICAL': 50,
+}
+
+CONSOLE_FORMAT = (
+    "<green>{time:YYYY-MM-DD HH:mm:ss.SSS}</green> | <level>{level: <8}</level> | "
+    "<cyan>{extra[subsystem]}</cyan> - <level>{message}</level>"
+)
+
+Message = Union[str, Callable[[], str]]
+
+
+def _level_no(level: Union[str, int]) -> int:
+    if isinstance(level, int):
+        return level
+    try:
+        return LEVELS[level.upper()]
+    except KeyError:
+        raise ValueError(f"Unknown log level: {level!r} (expected one of {', '.join(LEVELS)})") from None
+
+
+class StructuredLogger:
+    """Level-gated logger of one subsystem (see the module docstring)."""
+
+    __slots__ = ('subsystem', 'level_no', '_logger')
+
+    def __init__(self, subsystem: str, level_no: int):
+        self.subsystem = subsystem
+        self.level_no = level_no
+        self._logger = logger.bind(subsystem=subsystem)
+
+    def is_enabled(self, level: Union[str, int]) -> bool:
+        """Whether records of ``level`` are emitted (use it to skip building expensive fields)."""
+        return _level_no(level) >= self.level_no
+
+    def _emit(self, level: str, message: Message, args: tuple, fields: dict, exception: bool = False):
+        if callable(message):
+            message = message()
+        self._logger.opt(depth=2, exception=exception).log(level, message, *args, **fields)
+
+    def log(self, level: str, message: Message, *args, **fields):
+        if _level_no(level) >= self.level_no:
+            self._emit(level.upper(), message, args, fields)
+
+    def trace(self, message: Message, *args, **fields):
+        if self.level_no <= 5:
+            self._emit('TRACE', message, args, fields)
+
+    def debug(self, message: Message, *args, **fields):
+        if self.level_no <= 10:
+            self._emit('DEBUG', message, args, fields)
+
+    def info(self, message: Message, *args, **fields):
+        if self.level_no <= 20:
+            self._emit('INFO', message, args, fields)
+
+    def success(self, message: Message, *args, **fields):
+        if self.level_no <= 25:
+            self._emit('SUCCESS', message, args, fields)
+
+    def warning(self, message: Message, *args, **fields):
+        if self.level_no <= 30:
+            self._emit('WARNING', message, args, fields)
+
+    def error(self, message: Message, *args, **fields):
+        if self.level_no <= 40:
+            self._emit('ERROR', message, args, fields)
+
+    def critical(self, message: Message, *args, **fields):
+        if self.level_no <= 50:
+            self._emit('CRITICAL', message, args, fields)
+
+    def exception(self, message: Message, *args, **fields):
+        """ERROR record with the traceback of the exception being handled."""
+        if self.level_no <= 40:
+            self._emit('ERROR', message, args, fields, exception=True)
+
+    def banner(self, level: str, title: str, *lines: str):
+        """Multi-line framed message (invalid orders, unexpected broker states)."""
+        if _level_no(level) >= self.level_no:
+            rule = "=" * 80
+            self._emit(level.upper(), lambda: "\n".join((rule, f"⚠️  {title} ⚠️", rule, *lines, rule)), (), {})
+
+
+class BoundedQueueSink:
+    """
+    Loguru sink that hands formatted records to a background writer thread
+    through a bounded queue. When the queue is full the record is dropped
+    (and counted in ``dropped``) instead of blocking the trading loop.
+    """
+
+    def __init__(self, stream: TextIO, maxsize: int = 10_000):
+        self.stream = stream
+        self.dropped = 0
+        self._queue = queue.Queue(maxsize=maxsize)
+        self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self._thread.start()
+
+    def __call__(self, message: str):
+        try:
+            self._queue.put_nowait(message)
+        except queue.Full:
+            self.dropped += 1
+
+    def _run(self):
+        while True:
+            message = self._queue.get()
+            if message is None:
+                break
+            self.stream.write(message)
+            if self._queue.empty():
+                self.stream.flush()
+
+    def stop(self):
+        """Write the queued records and stop the writer thread."""
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+        self.stream.flush()
+
+
+_default_level_no = LEVELS['INFO']
+_levels: Dict[str, int] = {}
+_loggers: Dict[str, StructuredLogger] = {}
+_queue_sinks: list = []
+
+
+def _resolve_level(subsystem: str) -> int:
+    """Level of the closest configured ancestor (``a.b.c`` -> ``a.b`` -> ``a``) or the default."""
+    name = subsystem
+    while name:
+        if name in _levels:
+            return _levels[name]
+        name = name.rpartition('.')[0]
+    return _default_level_no
+
+
+def get_logger(subsystem: str) -> StructuredLogger:
+    """Structured logger of a subsystem (one shared instance per name)."""
+    log = _loggers.get(subsystem)
+    if log is None:
+        log = _loggers[subsystem] = StructuredLogger(subsystem, _resolve_level(subsystem))
+    return log
+
+
+def set_level(level: Union[str, int], subsystem: str = None):
+    """Set the level of a subsystem and its children, or the default level when no subsystem is given."""
+    global _default_level_no
+    if subsystem is None:
+        _default_level_no = _level_no(level)
+    else:
+        _levels[subsystem] = _level_no(level)
+    for name, log in _loggers.items():
+        log.level_no = _resolve_level(name)
+
+
+def silence(level: Union[str, int] = 'CRITICAL') -> tuple:
+    """Raise every subsystem to ``level`` (headless runs); returns the previous levels for ``restore_levels``."""
+    global _default_level_no
+    snapshot = (_default_level_no, dict(_levels))
+    _default_level_no = _level_no(level)
+    _levels.clear()
+    for log in _loggers.values():
+        log.level_no = _default_level_no
+    return snapshot
+
+
+def restore_levels(snapshot: tuple):
+    """Restore the levels returned by ``silence``."""
+    global _default_level_no
+    _default_level_no, levels = snapshot
+    _levels.clear()
+    _levels.update(levels)
+    for name, log in _loggers.items():
+        log.level_no = _resolve_level(name)
+
+
+def _stop_queue_sinks():
+    while _queue_sinks:
+        _queue_sinks.pop().stop()
+
+
+def configure_logging(level: str = 'INFO', levels: Optional[Dict[str, str]] = None, json_file: str = None,
+                      queue_size: int = 10_000, console: bool = True):
+    """
+    Install the log sinks and the subsystem levels.
+
+    Args:
+        level: Default level of every subsystem
+        levels: Per-subsystem levels, e.g. {'feed.mt5': 'WARNING', 'broker': 'DEBUG'}
+        json_file: Path of a JSON lines sink (one serialized record per line)
+        queue_size: Capacity of the queue between the loggers and the sink I/O thread;
+            0 writes synchronously
+        console: Keep a human-readable sink on stderr
+    """
+    global _default_level_no
+    _default_level_no = _level_no(level)
+    _levels.clear()
+    _levels.update({name: _level_no(value) for name, value in (levels or {}).items()})
+    for name, log in _loggers.items():
+        log.level_no = _resolve_level(name)
+
+    # Loggers are gated by the facade; sinks only drop what no subsystem can emit
+    sink_level = min((_default_level_no, *_levels.values()))
+    logger.remove()
+    _stop_queue_sinks()
+    logger.configure(extra={'subsystem': '-'})
+
+    def add_sink(stream: TextIO, **options):
+        if queue_size > 0:
+            sink = BoundedQueueSink(stream, queue_size)
+            _queue_sinks.append(sink)
+            logger.add(sink, level=sink_level, **options)
+        else:
+            logger.add(stream, level=sink_level, **options)
+
+    if console:
+        add_sink(sys.stderr, format=CONSOLE_FORMAT, colorize=sys.stderr.isatty())
+    if json_file:
+        os.makedirs(os.path.dirname(os.path.abspath(json_file)), exist_ok=True)
+        add_sink(open(json_file, 'a', encoding='utf-8'), serialize=True)
+
+
+def configure_logging_from_config(config) -> None:
+    """``configure_logging`` with the LOG_* settings (SHOW_DEBUG_LOGS lowers the default level to DEBUG)."""
+    configure_logging(
+        level='DEBUG' if config.show_debug_logs else config.log_level,
+        levels=config.log_levels,
+        json_file=config.log_json_file,
+        queue_size=config.log_queue_size,
+    )
+
+
+atexit.register(_stop_queue_sinks)
+
 
 def log(self, txt, dt=None):
-    dt = dt or self.datas[0].datetime.date(0)
-   # print(f'{dt.isoformat()}: {txt}')
-    print(f'{txt}')
+    get_logger('strategy').info(txt)
 
 
 def format_price(value: float) -> str:
@@ -25,4 +291,4 @@ def configure_windows_console_for_utf8():
             kernel32.SetConsoleCP(65001)
             os.environ['PYTHONUTF8'] = '1'
         except Exception:
-            pass
\ No newline at end of file
+            pass
@@ -0,0 +1,123 @@
+"""
+Monte Carlo robustness analysis of a trade ledger.
+
+The PnL column of the completed trades (``TradeLedger.completed_array()``) is
+resampled into an (n_sims x n_trades) matrix, either as random permutations
+of the trade order or as bootstrap draws with replacement, and every metric is
+computed with array ops along the trade axis. Simulations are processed in
+row chunks to bound memory.
+"""
+
+from typing import Literal, Sequence
+
+import numpy as np
+
+Method = Literal['shuffle', 'bootstrap']
+
+DEFAULT_PERCENTILES = (1, 5, 25, 50, 75, 95, 99)
+_CHUNK_CELLS = 4_000_000  # ~32 MB of float64 per matrix
+
+
+def resample_pnl(pnl: np.ndarray, n_sims: int, rng: np.random.Generator, method: Method = 'shuffle') -> np.ndarray:
+    """(n_sims x n_trades) matrix of trade PnL sequences."""
+    n_trades = len(pnl)
+    if method == 'shuffle':
+        return rng.permuted(np.broadcast_to(pnl, (n_sims, n_trades)), axis=1)
+    if method == 'bootstrap':
+        return pnl[rng.integers(0, n_trades, size=(n_sims, n_trades))]
+    raise ValueError(f"Unknown Monte Carlo method: {method!r} (expected 'shuffle' or 'bootstrap')")
+
+
+def path_metrics(paths: np.ndarray, initial_cash: float, ruin_equity: float) -> dict:
+    """
+    Final equity, max drawdown (fraction of the running peak), longest losing
+    streak and ruin flag of each row of a PnL matrix.
+    """
+    n_trades = paths.shape[1]
+    equity = np.cumsum(paths, axis=1)
+    equity += initial_cash
+    lowest_equity = equity.min(axis=1)
+    final_equity = equity[:, -1].copy()
+
+    # Drawdown = 1 - equity / running peak (the peak starts at initial_cash)
+    peak = np.maximum.accumulate(equity, axis=1)
+    np.maximum(peak, initial_cash, out=peak)
+    np.divide(equity, peak, out=equity)
+    max_drawdown = 1.0 - equity.min(axis=1)
+
+    # Streak length at trade j = j - index of the last non-losing trade before or at j
+    trade_index = np.arange(n_trades, dtype=np.int32)
+    last_reset = np.where(paths < 0, np.int32(-1), trade_index)
+    np.maximum.accumulate(last_reset, axis=1, out=last_reset)
+    np.subtract(trade_index, last_reset, out=last_reset)
+    longest_losing_streak = last_reset.max(axis=1)
+
+    return {
+        'final_equity': final_equity,
+        'max_drawdown': max_drawdown,
+        'longest_losing_streak': longest_losing_streak,
+        'ruined': lowest_equity <= ruin_equity,
+    }
+
+
+def simulate(pnl: Sequence[float], initial_cash: float, n_sims: int = 10_000, method: Method = 'shuffle',
+             ruin_fraction: float = 0.5, seed: int = None) -> dict:
+    """
+    Per-simulation metrics (arrays of length ``n_sims``) of resampled trade
+    sequences. A simulation is ruined when its equity falls to
+    ``initial_cash * (1 - ruin_fraction)`` or below at any trade.
+    """
+    pnl = np.ascontiguousarray(pnl, dtype=np.float64)
+    if not len(pnl):
+        raise ValueError("Monte Carlo analysis needs at least one completed trade")
+    if n_sims <= 0:
+        raise ValueError(f"n_sims must be positive, got {n_sims}")
+
+    rng = np.random.default_rng(seed)
+    ruin_equity = initial_cash * (1.0 - ruin_fraction)
+    results = {
+        'final_equity': np.empty(n_sims, dtype=np.float64),
+        'max_drawdown': np.empty(n_sims, dtype=np.float64),
+        'longest_losing_streak': np.empty(n_sims, dtype=np.int64),
+        'ruined': np.empty(n_sims, dtype=bool),
+    }
+    chunk = max(1, _CHUNK_CELLS // len(pnl))
+    for start in range(0, n_sims, chunk):
+        stop = min(start + chunk, n_sims)
+        metrics = path_metrics(resample_pnl(pnl, stop - start, rng, method), initial_cash, ruin_equity)
+        for key, values in metrics.items():
+            results[key][start:stop] = values
+    return results
+
+
+def monte_carlo(pnl: Sequence[float], initial_cash: float, n_sims: int = 10_000, method: Method = 'shuffle',
+                ruin_fraction: float = 0.5, seed: int = None,
+                percentiles: Sequence[float] = DEFAULT_PERCENTILES) -> dict:
+    """
+    Distribution summary of ``simulate``: mean and percentiles of final
+    equity, max drawdown and longest losing streak plus the risk of ruin
+    (share of ruined simulations). The result is JSON serializable.
+    """
+    sims = simulate(pnl, initial_cash, n_sims=n_sims, method=method, ruin_fraction=ruin_fraction, seed=seed)
+
+    def distribution(values: np.ndarray) -> dict:
+        return {
+            'mean': float(values.mean()),
+            'std': float(values.std()),
+            'min': float(values.min()),
+            'max': float(values.max()),
+            'percentiles': {f"p{p:g}": float(v) for p, v in zip(percentiles, np.percentile(values, percentiles))},
+        }
+
+    return {
+        'n_sims': n_sims,
+        'n_trades': len(pnl),
+        'method': method,
+        'seed': seed,
+        'initial_cash': initial_cash,
+        'ruin_fraction': ruin_fraction,
+        'final_equity': distribution(sims['final_equity']),
+        'max_drawdown': distribution(sims['max_drawdown']),
+        'longest_losing_streak': distribution(sims['longest_losing_streak']),
+        'risk_of_ruin': float(sims['ruined'].mean()),
+    }
@@ -1,11 +1,12 @@
-import logging
 from typing import Optional, Iterable
 import backtrader as bt
 import numpy as np
 import pandas as pd
 from lightweight_charts import Chart
 
-logger = logging.getLogger(__name__)
+from src.utils.logging import get_logger
+
+log = get_logger('chart')
 
 # ============================================================
 # Utilities & Extraction
@@ -36,7 +37,7 @@ def extract_ema(strategy, data_len: int):
     try:
         ema = np.asarray(ema_line.array) if hasattr(ema_line, "array") else np.asarray(list(ema_line))
     except Exception:
-        logger.exception("Failed to extract EMA")
+        log.exception("Failed to extract EMA")
         return False, None
     if len(ema) < data_len:
         ema = np.concatenate([np.full(data_len - len(ema), np.nan), ema])
@@ -58,7 +59,7 @@ def _extract_orders_from_strategy(strategy, symbol: str) -> list[dict]:
             and trade.get("close_datetime")
         ])
     except Exception as e:
-        logger.warning(f"Error extracting orders: {e}")
+        log.warning("Error extracting orders: {}", e)
     return orders_to_plot
 
 # ============================================================
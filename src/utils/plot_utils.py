@@ -5,6 +5,10 @@ from lightweight_charts import Chart
 from datetime import datetime, timedelta
 import random
 
+from src.utils.logging import get_logger
+
+log = get_logger('chart')
+
 def generate_random_candles(
     n: int = 100,
     start_price: float = 100.0,
@@ -82,11 +86,11 @@ class TradingChart:
         
         if url is None:
             # Fallback for when the built-in server is being shy
-            print("Chart server starting... if no window appears, check console.")
+            log.info("Chart server starting... if no window appears, check console.")
             # Give it a tiny bit of time to initialize
             time.sleep(1) 
         else:
-            print(f"Chart available at: {url}")
+            log.info("Chart available at: {}", url)
             webbrowser.open(url)
 
         # Keep alive
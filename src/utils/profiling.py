@@ -0,0 +1,169 @@
+"""
+Per-phase timing of backtest runs.
+
+``get_phase_timer()`` returns the process-wide PhaseTimer. It is disabled by
+default and every instrumented site checks ``timer.enabled`` (or uses
+``timer.phase(...)``, a shared no-op context when disabled) before reading
+the clock. When enabled it accumulates monotonic-clock durations per named
+phase and the latency of every strategy bar, and ``summary()`` reports
+bars/sec, per-bar latency percentiles and a log2 latency histogram, and the
+time spent in each phase.
+
+``lap(phase)`` records the time since the previous lap under ``phase``,
+which times consecutive sections of one function without nesting them.
+
+Phases recorded by the backtest:
+    load_data        CSV discovery and loading (main.backtesting)
+    setup            Cerebro, feeds, broker and strategy setup
+    run              cerebro.run(); contains strategy.next and broker
+    strategy.next    strategy bar processing (BreakRetestStrategy.next)
+    strategy.state   zone/breakout state update (BaseStrategy.next, within strategy.next)
+    broker           order matching (cerebro.broker.next of any broker, see time_broker)
+    overlay_io       chart overlay JSON writes (ChartOverlayManager.save_to_file, within strategy.next)
+    stats            performance statistics
+    report           CLI report, trade verification and CSV export
+The web runner adds ``payload`` (result.json assembly) and ``monte_carlo``.
+``run.other`` in the summary is the rest of ``run``: feeds, indicators and
+backtrader's own bookkeeping.
+"""
+
+import time
+from array import array
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+
+import numpy as np
+
+_NO_PHASE = nullcontext()
+
+
+class PhaseTimer:
+    """Accumulates phase durations and per-bar latencies while ``enabled``."""
+
+    def __init__(self):
+        self.enabled = False
+        self.reset()
+
+    def reset(self):
+        self.seconds = defaultdict(float)
+        self.calls = defaultdict(int)
+        self.bar_seconds = array('d')
+        self.started_at = self._lap_at = time.perf_counter()
+
+    def start(self):
+        """Clear the recorded timings and enable the timer."""
+        self.reset()
+        self.enabled = True
+
+    def stop(self):
+        self.enabled = False
+
+    def add(self, phase: str, seconds: float):
+        self.seconds[phase] += seconds
+        self.calls[phase] += 1
+
+    def lap(self, phase: str):
+        """Record the time since the previous lap (or ``start()``) under ``phase``."""
+        if self.enabled:
+            now = time.perf_counter()
+            self.add(phase, now - self._lap_at)
+            self._lap_at = now
+
+    def add_bar(self, seconds: float):
+        """Record one strategy bar (also counted in the ``strategy.next`` phase)."""
+        self.bar_seconds.append(seconds)
+        self.add('strategy.next', seconds)
+
+    @contextmanager
+    def _timed(self, phase: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(phase, time.perf_counter() - start)
+
+    def phase(self, name: str):
+        """Context manager timing a phase (a shared no-op context when disabled)."""
+        return self._timed(name) if self.enabled else _NO_PHASE
+
+    def summary(self) -> dict:
+        """JSON-serializable timing summary (see the module docstring)."""
+        wall = time.perf_counter() - self.started_at
+        bars = np.frombuffer(self.bar_seconds, dtype=np.float64) if len(self.bar_seconds) else np.zeros(0)
+        run_seconds = self.seconds.get('run', 0.0)
+
+        phases = {
+            name: {'seconds': seconds, 'calls': self.calls[name], 'share': seconds / wall if wall > 0 else 0.0}
+            for name, seconds in self.seconds.items()
+        }
+        if run_seconds:
+            other = run_seconds - sum(self.seconds.get(name, 0.0) for name in ('strategy.next', 'broker'))
+            phases['run.other'] = {'seconds': max(other, 0.0), 'calls': self.calls['run'],
+                                   'share': max(other, 0.0) / wall if wall > 0 else 0.0}
+
+        latency = {}
+        histogram = []
+        if len(bars):
+            p50, p90, p99 = np.percentile(bars, (50, 90, 99)) * 1e3
+            latency = {'mean': float(bars.mean() * 1e3), 'p50': float(p50), 'p90': float(p90),
+                       'p99': float(p99), 'max': float(bars.max() * 1e3)}
+            # log2 buckets of microseconds: bucket k holds latencies in (2**(k-1), 2**k] us
+            buckets = np.ceil(np.log2(np.maximum(bars * 1e6, 1.0))).astype(np.int64)
+            counts = np.bincount(buckets)
+            histogram = [{'le_us': 2 ** int(k), 'count': int(c)} for k, c in enumerate(counts) if c]
+
+        return {
+            'wall_seconds': wall,
+            'bars': len(bars),
+            'bars_per_sec': len(bars) / run_seconds if run_seconds > 0 else 0.0,
+            'bar_latency_ms': latency,
+            'bar_latency_histogram': histogram,
+            'phases': dict(sorted(phases.items(), key=lambda item: -item[1]['seconds'])),
+        }
+
+
+def format_summary(summary: dict) -> list:
+    """Report lines of a ``PhaseTimer.summary()``."""
+    lines = [f"Wall time: {summary['wall_seconds']:.3f}s, bars: {summary['bars']}, "
+             f"{summary['bars_per_sec']:.0f} bars/sec"]
+    latency = summary['bar_latency_ms']
+    if latency:
+        lines.append(f"Bar latency (ms): mean={latency['mean']:.3f} p50={latency['p50']:.3f} "
+                     f"p90={latency['p90']:.3f} p99={latency['p99']:.3f} max={latency['max']:.3f}")
+    for name, phase in summary['phases'].items():
+        lines.append(f"  {name:<16} {phase['seconds']:>9.3f}s {phase['share']:>7.1%}  ({phase['calls']} calls)")
+    return lines
+
+
+def time_broker(broker, timer: PhaseTimer = None):
+    """
+    Time every ``broker.next()`` under the ``broker`` phase, whatever the
+    broker class. Cerebro calls ``self._broker.next()`` once per bar, so the
+    timed method is set on the instance (once: a broker reused across runs
+    is not wrapped again). Returns ``broker``.
+    """
+    timer = timer or _phase_timer
+    untimed = broker.next
+    if getattr(untimed, 'phase_timer', None) is timer:
+        return broker
+
+    def next():
+        if not timer.enabled:
+            return untimed()
+        start = time.perf_counter()
+        try:
+            return untimed()
+        finally:
+            timer.add('broker', time.perf_counter() - start)
+
+    next.phase_timer = timer
+    broker.next = next
+    return broker
+
+
+_phase_timer = PhaseTimer()
+
+
+def get_phase_timer() -> PhaseTimer:
+    """The process-wide phase timer."""
+    return _phase_timer
@@ -0,0 +1,84 @@
+"""
+Candidate-bar pre-filter for sparse stepping in BreakRetestStrategy.
+
+Most bars carry no signal: no breakout, no live order on the symbol and no
+change in the support/resistance zones. The pre-filter lets the strategy
+recognise those quiet bars cheaply and skip confirmation checks, invalidation
+and per-bar zone logging on them.
+
+The order-day rule (no new orders on Mondays) only depends on the bar
+timestamps, so it is evaluated as one array over the whole preloaded series.
+So is the EMA side when the EMA is precomputed (src.engine.precompute): one
+mask per breakout direction, close above the EMA for up-trends and below it
+for down-trends, with the comparisons of the per-bar check (a NaN EMA fails
+both). A breakout bar on the wrong side of the EMA is then not a candidate.
+
+The breakout flag comes from BreakoutIndicator, whose zone state is
+path-dependent (and daily data is replayed, which disables runonce), so it is
+read per bar. The daily RSI stays a per-bar check on candidate bars: it is
+data0's RSI, read on every feed's bars, and the replayed daily feed has no
+values before the run.
+"""
+
+from typing import Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from src.models.trend import Trend
+
+
+class SignalPrefilter:
+    """Per data feed candidate-bar mask built once over the whole series."""
+
+    def __init__(self, index: Optional[pd.DatetimeIndex] = None, close: Optional[Sequence[float]] = None,
+                 ema: Optional[Sequence[float]] = None):
+        """
+        Args:
+            index: Bar times
+            close: Close prices, aligned with ``ema``
+            ema: EMA values per bar (precomputed)
+        """
+        # order_day_mask[bar] is True where new orders may be placed
+        self.order_day_mask: Optional[np.ndarray] = None
+        if index is not None and len(index):
+            self.order_day_mask = np.asarray(index.weekday) != 0
+        # long_mask[bar] / short_mask[bar]: the close is on the side of the EMA an up / down breakout needs
+        self.long_mask: Optional[np.ndarray] = None
+        self.short_mask: Optional[np.ndarray] = None
+        if close is not None and ema is not None and len(close) == len(ema):
+            close = np.asarray(close, dtype=np.float64)
+            ema = np.asarray(ema, dtype=np.float64)
+            self.long_mask = ema <= close
+            self.short_mask = ema >= close
+
+    @classmethod
+    def from_feed(cls, data, ema: Optional[Sequence[float]] = None) -> 'SignalPrefilter':
+        """
+        Build the pre-filter from a preloaded pandas feed (and its precomputed
+        EMA); live feeds fall back to per-bar checks.
+        """
+        df = getattr(getattr(data, 'p', None), 'dataname', None)
+        if isinstance(df, pd.DataFrame) and isinstance(df.index, pd.DatetimeIndex):
+            close = df['Close'].to_numpy() if ema is not None and 'Close' in df else None
+            return cls(df.index, close, ema)
+        return cls()
+
+    def allows_orders(self, data) -> bool:
+        """Order-day rule for the feed's current bar."""
+        bar = len(data) - 1
+        if self.order_day_mask is not None and 0 <= bar < len(self.order_day_mask):
+            return bool(self.order_day_mask[bar])
+        return data.datetime.datetime(0).weekday() != 0  # 0 = Monday
+
+    def ema_side_allows(self, data, trend: Optional[Trend]) -> bool:
+        """EMA side of the feed's current bar for a ``trend`` breakout (True without the masks)."""
+        mask = self.long_mask if trend == Trend.UPTREND else self.short_mask
+        bar = len(data) - 1
+        if mask is not None and 0 <= bar < len(mask):
+            return bool(mask[bar])
+        return True
+
+    def is_candidate(self, data, just_broke_out, trend: Optional[Trend] = None) -> bool:
+        """A bar can only produce an order if it broke out on an order day, on the EMA side of its trend."""
+        return bool(just_broke_out) and self.allows_orders(data) and self.ema_side_allows(data, trend)
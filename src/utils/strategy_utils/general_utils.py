@@ -1,20 +1,10 @@
 from src.models.candlestick import Candlestick, CandleType
 from src.utils.environment_variables import EnvironmentVariables
+from src.utils.symbol_specs import get_spec
 
 def convert_micropips_to_price(pips: float, symbol: str) -> float:
-    symbol = symbol.upper()
-    
-    if symbol.startswith("XAU") or symbol.startswith("XAG"):
-        # Metals (Gold, Silver)
-        micropip_value = 0.001
-    elif symbol.endswith("JPY"):
-        # JPY forex pairs
-        micropip_value = 0.001
-    else:
-        # Most other forex pairs
-        micropip_value = 0.00001
-    
-    return pips * micropip_value
+    # Metals and JPY pairs: 0.001, other forex pairs: 0.00001 (see symbol_specs)
+    return pips * get_spec(symbol).micropip_size
 
 
 def convert_pips_to_price(pips: float, instrument_type: str = "forex") -> float:
@@ -121,4 +111,4 @@ def get_total_movement_from_continuous_candles(bt_data, start_index: int, candle
     return {"max_price": max_price, "min_price": min_price, "current_index": current_index}
 
 def is_minor_pair(symbol: str) -> bool:
-    return not symbol.upper().startswith("USD") and not symbol.upper().endswith("USD")
+    return get_spec(symbol).is_minor
@@ -0,0 +1,201 @@
+"""
+Symbol specifications: pip size, digits, tick size, contract size, volume
+limits and currencies per trading symbol.
+
+Every symbol gets a static spec on first use, derived from its name with the
+conventions the strategies were tuned on (metals: 1 pip = 1 micropip =
+0.001; JPY pairs: 1 pip = 0.01, 1 micropip = 0.001; other pairs: 1 pip =
+0.0001, 1 micropip = 0.00001). Live trading overlays the broker's trading
+fields (digits, tick size, contract size, volume limits, filling modes) once
+via load_mt5(), and saves the table to disk so a later run starts from it.
+Pip and micropip sizes always keep the static convention, so configured
+pip/micropip thresholds mean the same in backtests and live.
+
+Lookups are dict hits; nothing here calls the terminal per order.
+"""
+
+import json
+from dataclasses import asdict, dataclass, replace
+from pathlib import Path
+from typing import Dict, Iterable, Union
+
+from src.utils.logging import get_logger
+
+log = get_logger('symbol_specs')
+
+DEFAULT_PATH = Path("data/symbol_specs.json")
+
+
+@dataclass(frozen=True)
+class SymbolSpec:
+    """Trading specification of one symbol."""
+    symbol: str
+    pip_size: float  # Price of one pip
+    micropip_size: float  # Price of one micropip
+    digits: int
+    tick_size: float
+    contract_size: float  # Units per lot
+    volume_min: float
+    volume_step: float
+    volume_max: float
+    base_currency: str
+    quote_currency: str
+    point: float = 0.0
+    stops_level: int = 0  # Minimum TP/SL distance in points
+    filling_mode: int = 0  # MT5 bitmask: 1=FOK, 2=IOC, 4=RETURN (0: unknown)
+    source: str = 'static'  # 'static' or 'mt5'
+
+    @property
+    def is_metal(self) -> bool:
+        return self.symbol.startswith(("XAU", "XAG"))
+
+    @property
+    def is_minor(self) -> bool:
+        """Neither side is USD."""
+        return not self.symbol.startswith("USD") and not self.symbol.endswith("USD")
+
+    def normalize_price(self, price: float) -> float:
+        """Round ``price`` to the nearest tick."""
+        if self.tick_size > 0:
+            return round(price / self.tick_size) * self.tick_size
+        return price
+
+    def units_to_lots(self, size: float) -> float:
+        """Order size in units -> volume in lots, on the volume step and within the volume limits."""
+        volume = abs(size) / self.contract_size
+        if self.volume_step > 0:
+            volume = round(volume / self.volume_step) * self.volume_step
+        if volume < self.volume_min:
+            log.warning("{}: order size {} units ({} lots) too small, using minimum {} lot", self.symbol, size, volume, self.volume_min)
+            return self.volume_min
+        if volume > self.volume_max:
+            log.warning("{}: order size {} units ({} lots) too large, using maximum {} lot", self.symbol, size, volume, self.volume_max)
+            return self.volume_max
+        return volume
+
+
+def static_spec(symbol: str) -> SymbolSpec:
+    """Spec of ``symbol`` from its name alone (no broker data)."""
+    symbol = symbol.upper()
+    if symbol.startswith("XAU") or symbol.startswith("XAG"):
+        pip_size, micropip_size, digits = 0.001, 0.001, 3
+        contract_size = 100.0 if symbol.startswith("XAU") else 5000.0
+    elif symbol.endswith("JPY"):
+        pip_size, micropip_size, digits = 0.01, 0.001, 3
+        contract_size = 100000.0
+    else:
+        pip_size, micropip_size, digits = 0.0001, 0.00001, 5
+        contract_size = 100000.0
+    return SymbolSpec(
+        symbol=symbol, pip_size=pip_size, micropip_size=micropip_size, digits=digits,
+        tick_size=micropip_size, contract_size=contract_size, volume_min=0.01, volume_step=0.01,
+        volume_max=100.0, base_currency=symbol[:3], quote_currency=symbol[3:6], point=micropip_size,
+    )
+
+
+class SymbolSpecRegistry:
+    """Symbol -> SymbolSpec, filled from the static conventions, MT5 and a JSON file."""
+
+    def __init__(self, path: Union[str, Path, None] = None):
+        self.path = Path(path) if path is not None else DEFAULT_PATH
+        self._specs: Dict[str, SymbolSpec] = {}
+
+    def get(self, symbol: str) -> SymbolSpec:
+        """Spec of ``symbol`` (the static spec unless a broker spec was loaded)."""
+        spec = self._specs.get(symbol)
+        if spec is None:
+            spec = self._specs.get(symbol.upper())
+            if spec is None:
+                spec = static_spec(symbol)
+                self._specs[spec.symbol] = spec
+            self._specs[symbol] = spec
+        return spec
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._specs or symbol.upper() in self._specs
+
+    def update(self, spec: SymbolSpec):
+        """Register ``spec``, replacing any spec of the same symbol (and its aliases)."""
+        aliases = [key for key, old in self._specs.items() if old.symbol == spec.symbol]
+        for key in aliases:
+            self._specs[key] = spec
+        self._specs[spec.symbol] = spec
+
+    def specs(self) -> Dict[str, SymbolSpec]:
+        """One spec per symbol."""
+        return {spec.symbol: spec for spec in self._specs.values()}
+
+    # ---- MetaTrader 5 ----
+    def load_mt5(self, symbols: Iterable[str], save: bool = True) -> int:
+        """
+        Overlay the broker's trading fields of ``symbols`` (one symbol_info()
+        call each) and save the table. Symbols MT5 does not know keep their
+        saved or static spec. Returns the number of symbols loaded.
+        """
+        import MetaTrader5 as mt5
+
+        loaded = 0
+        for symbol in symbols:
+            try:
+                info = mt5.symbol_info(symbol)
+            except Exception as e:
+                log.error("symbol_info({}) failed: {}", symbol, e)
+                continue
+            if info is None:
+                log.warning("No symbol info for {} in MT5, using {} spec", symbol, self.get(symbol).source)
+                continue
+            self.update(self.from_mt5_info(info, self.get(symbol)))
+            loaded += 1
+        if save and loaded:
+            self.save()
+        return loaded
+
+    @staticmethod
+    def from_mt5_info(info, base: SymbolSpec) -> SymbolSpec:
+        """``base`` with the trading fields of an MT5 SymbolInfo (pip sizes stay as in ``base``)."""
+        return replace(
+            base,
+            digits=int(info.digits),
+            point=float(info.point),
+            tick_size=float(getattr(info, 'trade_tick_size', 0.0) or info.point),
+            contract_size=float(getattr(info, 'trade_contract_size', 0.0) or base.contract_size),
+            volume_min=float(info.volume_min),
+            volume_step=float(info.volume_step),
+            volume_max=float(info.volume_max),
+            base_currency=str(getattr(info, 'currency_base', '') or base.base_currency),
+            quote_currency=str(getattr(info, 'currency_profit', '') or base.quote_currency),
+            stops_level=int(getattr(info, 'trade_stops_level', getattr(info, 'stops_level', 0)) or 0),
+            filling_mode=int(getattr(info, 'filling_mode', 0) or 0),
+            source='mt5',
+        )
+
+    # ---- Persistence ----
+    def load(self, path: Union[str, Path, None] = None) -> int:
+        """Read specs saved by save(); a missing file loads nothing. Returns the number loaded."""
+        path = Path(path) if path is not None else self.path
+        if not path.exists():
+            return 0
+        try:
+            rows = json.loads(path.read_text())
+            specs = [SymbolSpec(**row) for row in rows.values()]
+        except (OSError, ValueError, TypeError) as e:
+            log.warning("Ignoring unreadable symbol specs file {}: {}", path, e)
+            return 0
+        for spec in specs:
+            self.update(spec)
+        return len(specs)
+
+    def save(self, path: Union[str, Path, None] = None):
+        path = Path(path) if path is not None else self.path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        rows = {symbol: asdict(spec) for symbol, spec in sorted(self.specs().items())}
+        path.write_text(json.dumps(rows, indent=2))
+        log.debug("Saved {} symbol specs to {}", len(rows), path)
+
+
+registry = SymbolSpecRegistry()
+
+
+def get_spec(symbol: str) -> SymbolSpec:
+    """Spec of ``symbol`` from the shared registry."""
+    return registry.get(symbol)
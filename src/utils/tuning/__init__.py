@@ -2,11 +2,12 @@
 Parameter tuning utilities for strategy optimization.
 """
 
-from .metrics import MetricCalculator, TotalPnLMetric
+from .metrics import METRICS, MetricCalculator, TotalPnLMetric
 from .parameter_space import ParameterSpace
 from .search_strategies import SearchStrategy, GridSearchStrategy, BayesianSearchStrategy, BinarySearchStrategy
 
 __all__ = [
+    'METRICS',
     'MetricCalculator',
     'TotalPnLMetric',
     'ParameterSpace',
@@ -1,5 +1,8 @@
 """
 Metric calculators for evaluating backtest results.
+
+Metrics read the ``stats`` dict returned by the backtest (built by
+src.utils.analytics.performance_stats), so evaluating a trial costs a lookup.
 """
 
 from abc import ABC, abstractmethod
@@ -54,6 +57,45 @@ class SharpeRatioMetric(MetricCalculator):
         return "Sharpe Ratio"
 
 
+class SortinoRatioMetric(MetricCalculator):
+    """Calculate Sortino ratio as the optimization metric."""
+    
+    def calculate(self, stats: Dict[str, Any]) -> float:
+        """Get Sortino ratio (annualized, downside deviation of daily returns)."""
+        sortino_ratio = stats.get('sortino_ratio', 0.0)
+        return sortino_ratio if sortino_ratio is not None else 0.0
+    
+    @property
+    def name(self) -> str:
+        return "Sortino Ratio"
+
+
+class CalmarRatioMetric(MetricCalculator):
+    """Calculate Calmar ratio as the optimization metric."""
+    
+    def calculate(self, stats: Dict[str, Any]) -> float:
+        """Get Calmar ratio (annualized return over max drawdown)."""
+        calmar_ratio = stats.get('calmar_ratio', 0.0)
+        return calmar_ratio if calmar_ratio is not None else 0.0
+    
+    @property
+    def name(self) -> str:
+        return "Calmar Ratio"
+
+
+class MaxDrawdownMetric(MetricCalculator):
+    """Use the max drawdown as the optimization metric (negated: smaller drawdowns rank higher)."""
+    
+    def calculate(self, stats: Dict[str, Any]) -> float:
+        """Calculate negated max drawdown."""
+        max_drawdown = stats.get('max_drawdown', 0.0)
+        return -max_drawdown if max_drawdown is not None else 0.0
+    
+    @property
+    def name(self) -> str:
+        return "Max Drawdown"
+
+
 class ProfitFactorMetric(MetricCalculator):
     """Calculate profit factor as the optimization metric."""
     
@@ -113,3 +155,15 @@ class CombinedMetric(MetricCalculator):
         weights = list(self.normalized_weights.values())
         return f"Combined ({', '.join(f'{n}:{w:.2f}' for n, w in zip(metric_names, weights))})"
 
+
+
+# Metric calculators by command line name
+METRICS = {
+    'pnl': TotalPnLMetric,
+    'sharpe': SharpeRatioMetric,
+    'sortino': SortinoRatioMetric,
+    'calmar': CalmarRatioMetric,
+    'max_drawdown': MaxDrawdownMetric,
+    'profit_factor': ProfitFactorMetric,
+    'win_rate': WinRateMetric,
+}
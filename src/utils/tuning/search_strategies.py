@@ -9,6 +9,8 @@ from .metrics import MetricCalculator
 from .parameter_space import ParameterSpace
 import numpy as np
 
+from src.utils.logging import get_logger
+
 # Make tqdm optional
 try:
     from tqdm import tqdm
@@ -19,6 +21,8 @@ except ImportError:
     def tqdm(iterable, desc=None, **kwargs):
         return iterable
 
+log = get_logger('tuning')
+
 
 @dataclass
 class SearchResult:
@@ -92,7 +96,7 @@ class GridSearchStrategy(SearchStrategy):
                     pair=pair
                 ))
             except Exception as e:
-                print(f"⚠️  Error testing parameters {params}: {e}")
+                log.error("Error testing parameters {}: {}", params, e)
                 continue
         
         # Sort by metric value (descending - best first)
@@ -182,7 +186,7 @@ class BayesianSearchStrategy(SearchStrategy):
                 # Return negative because gp_minimize minimizes
                 return -metric_value
             except Exception as e:
-                print(f"⚠️  Error testing parameters {params}: {e}")
+                log.error("Error testing parameters {}: {}", params, e)
                 return 1e10  # Large penalty for failed runs
         
         # Run Bayesian optimization
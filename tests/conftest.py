@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# Tests import the project as ``src.*`` (like main.py)
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
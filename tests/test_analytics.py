@@ -0,0 +1,22 @@
+import numpy as np
+
+from src.models.trade import COMPLETED_TRADE_DTYPE
+from src.utils.analytics import performance_stats
+
+
+def trades(*periods):
+    array = np.zeros(len(periods), dtype=COMPLETED_TRADE_DTYPE)
+    for row, (opened, closed, pnl) in zip(array, periods):
+        row['open_time'] = np.datetime64(opened, 's')
+        row['close_time'] = np.datetime64(closed, 's')
+        row['pnl'] = pnl
+    return array
+
+
+def test_exposure_without_equity_curve_starts_at_first_open():
+    single = trades(('2024-01-01T00:00', '2024-01-01T10:00', 10.0))
+    assert performance_stats(single, 10000.0)['exposure'] == 1.0
+
+    two = trades(('2024-01-01T00:00', '2024-01-01T10:00', 10.0),
+                 ('2024-01-01T15:00', '2024-01-01T20:00', -5.0))
+    assert performance_stats(two, 10000.0)['exposure'] == 0.75
@@ -0,0 +1,80 @@
+"""CandleStore delta syncs against the simulated terminal (src/sim/fake_mt5.py)."""
+
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.sim import fake_mt5
+
+fake_mt5.install()
+
+from src.data.candle_store import CANDLE_DTYPE, CandleStore, merge_candles  # noqa: E402
+
+SYMBOL = 'EURUSD'
+BARS = 400
+HISTORY = 300
+
+
+@pytest.fixture
+def terminal(tmp_path):
+    # Bars up to a few hours from now: the replay starts HISTORY bars in, ~100 bars behind the wall clock
+    end = pd.Timestamp.now(tz='UTC').tz_localize(None).floor('h') + timedelta(hours=4)
+    times = pd.date_range(end=end, periods=BARS, freq='h')
+    close = 1.10 + 0.0001 * np.arange(BARS)
+    pd.DataFrame({'time': times, 'open': close, 'high': close + 0.0005, 'low': close - 0.0005,
+                  'close': close, 'tick_volume': 100}).to_csv(tmp_path / f'{SYMBOL}._H1_test.csv', index=False)
+    return fake_mt5.configure(data_dir=tmp_path, history_bars=HISTORY)
+
+
+def advance(terminal, bars):
+    terminal.server_time()
+    terminal.start += bars * 3600
+
+
+def candles(times, close=1.0):
+    result = np.zeros(len(times), dtype=CANDLE_DTYPE)
+    result['time'] = times
+    result['close'] = close
+    return result
+
+
+def test_merge_keeps_the_fetched_bar():
+    merged = merge_candles(candles([1, 2, 3], close=1.0), candles([3, 4], close=2.0))
+    assert merged['time'].tolist() == [1, 2, 3, 4]
+    assert merged['close'].tolist() == [1.0, 1.0, 2.0, 2.0]
+
+
+def test_sync_fetches_only_the_new_bars(terminal, tmp_path):
+    store = CandleStore(tmp_path / 'candles', max_bars=1000)
+    first = store.sync(SYMBOL, 'H1', fake_mt5.TIMEFRAME_H1)
+    assert len(first) == HISTORY + 1  # History and the forming bar
+    forming = first[-1].copy()
+    assert forming['high'] == forming['open']
+
+    advance(terminal, 5)
+    fetched = store.fetched
+    second = store.sync(SYMBOL, 'H1', fake_mt5.TIMEFRAME_H1)
+    assert store.fetched - fetched == 6  # The formerly forming bar and the 5 new ones
+    assert len(second) == HISTORY + 6
+    assert second['time'][HISTORY] == forming['time']
+    assert second['high'][HISTORY] > forming['high']  # Closed now: replaced by the fetched bar
+    assert np.array_equal(store.load(SYMBOL, 'H1'), second)
+
+
+def test_store_staler_than_max_bars_is_reloaded(terminal, tmp_path):
+    store = CandleStore(tmp_path / 'candles', max_bars=50)
+    old = int((datetime(2020, 1, 1) - datetime(1970, 1, 1)).total_seconds())
+    store.save(SYMBOL, 'H1', candles([old, old + 3600]))
+
+    synced = store.sync(SYMBOL, 'H1', fake_mt5.TIMEFRAME_H1)
+    assert len(synced) == 50
+    assert synced['time'][0] > old  # The old bars are dropped: their gap to the history is unknown
+    assert np.all(np.diff(synced['time']) == 3600)
+
+
+def test_unreadable_store_is_empty(tmp_path):
+    store = CandleStore(tmp_path)
+    store.path(SYMBOL, 'H1').write_bytes(b'not numpy')
+    assert len(store.load(SYMBOL, 'H1')) == 0
@@ -0,0 +1,37 @@
+from datetime import datetime, timedelta
+
+from src.data.live_bars import LiveBarGate
+
+T0 = datetime(2024, 1, 2, 10)
+
+
+def bar(dt, close=1.0):
+    return {'datetime': dt, 'open': close, 'high': close, 'low': close, 'close': close, 'volume': 1}
+
+
+def test_step_delivered_to_every_feed_once():
+    gate = LiveBarGate(['EURUSD', 'GBPUSD'])
+    gate.push('EURUSD', bar(T0))
+    gate.push('GBPUSD', bar(T0))
+
+    assert gate.next_bar('EURUSD')['datetime'] == T0
+    assert gate.next_bar('GBPUSD')['datetime'] == T0
+    assert gate.next_bar('EURUSD') is None
+    assert gate.next_bar('GBPUSD') is None
+
+
+def test_follower_missing_a_loop_keeps_its_bar():
+    gate = LiveBarGate(['EURUSD', 'GBPUSD'])
+    t1 = T0 + timedelta(hours=1)
+    for dt, close in ((T0, 1.0), (t1, 2.0)):
+        gate.push('EURUSD', bar(dt, close))
+        gate.push('GBPUSD', bar(dt, close))
+
+    # Loop 1: only the leader is asked (the follower is still in its backfill)
+    assert gate.next_bar('EURUSD')['datetime'] == T0
+    # Loop 2: the leader is held until the follower took its bar of the step
+    assert gate.next_bar('EURUSD') is None
+    assert gate.next_bar('GBPUSD')['datetime'] == T0
+    # Loop 3: the next step reaches both feeds
+    assert gate.next_bar('EURUSD')['datetime'] == t1
+    assert gate.next_bar('GBPUSD')['close'] == 2.0
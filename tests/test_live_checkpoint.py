@@ -0,0 +1,130 @@
+"""StateManager (WAL key/value store) and the trades of LiveCheckpoint."""
+
+import sqlite3
+from collections import Counter
+from datetime import datetime
+from types import SimpleNamespace
+
+import backtrader as bt
+import pandas as pd
+import pytest
+
+from src.infrastructure.LiveCheckpoint import LiveCheckpoint
+from src.infrastructure.StateManager import StateManager
+from src.models.order import OrderSide, TradeState
+from src.models.trade import TradeLedger, TradeRecord
+
+SYMBOL = 'EURUSD'
+T0 = datetime(2024, 1, 2, 10)
+
+
+# ---- StateManager ----
+def test_state_manager_uses_wal_and_persists(tmp_path):
+    path = tmp_path / 'state.db'
+    with StateManager(path) as state:
+        assert state._conn.execute("PRAGMA journal_mode").fetchone()[0] == 'wal'
+        state.save_state('a', {'x': 1})
+    with StateManager(path) as state:
+        assert state.load_state('a') == {'x': 1}
+        assert state.load_state('missing', 'default') == 'default'
+
+
+def test_state_manager_writes_changed_values_only(tmp_path):
+    with StateManager(tmp_path / 'state.db') as state:
+        assert state.save_many({'a': 1, 'b': 2}) == 2
+        assert state.save_many({'a': 1, 'b': 3}) == 1
+        assert state.save_many({'a': 1, 'b': 3}) == 0
+
+
+def test_state_manager_transaction_rolls_back(tmp_path):
+    path = tmp_path / 'state.db'
+    with StateManager(path) as state:
+        state.save_state('a', 1)
+        with pytest.raises(RuntimeError):
+            with state.transaction():
+                state.save_state('a', 2)
+                state.save_state('b', 2)
+                raise RuntimeError
+        assert state.load_state('a') == 1
+        assert state.load_state('b') is None
+
+
+def test_state_manager_reads_json_rows(tmp_path):
+    path = tmp_path / 'state.db'
+    StateManager(path).close()
+    with sqlite3.connect(path) as conn:
+        conn.execute("INSERT INTO strategy_state(key, value) VALUES ('old', '{\"x\": 1}')")
+    with StateManager(path) as state:
+        assert state.load_state('old') == {'x': 1}
+
+
+# ---- Checkpoint trades ----
+class Broker:
+    """Records adopted orders; knows the MT5 tickets of ``tickets`` (order ref -> ticket)."""
+
+    def __init__(self, tickets=None):
+        self.tickets = tickets or {}
+        self.adopted = []
+
+    def order_ticket(self, ref):
+        return self.tickets.get(ref)
+
+    def adopt(self, order, ticket, symbol, children=None, filled=False):
+        self.adopted.append((order, ticket, symbol, children, filled))
+
+
+@pytest.fixture
+def data():
+    frame = pd.DataFrame({'open': 1.1, 'high': 1.1, 'low': 1.1, 'close': 1.1, 'volume': 1},
+                         index=pd.date_range(T0, periods=3, freq='h'))
+    data = bt.feeds.PandasData(dataname=frame, name=SYMBOL)
+    data.setenvironment(bt.Cerebro())
+    data._start()
+    data.next()
+    return data
+
+
+def strategy(broker, indicators=None, bars=100):
+    return SimpleNamespace(broker=broker, active_trades={}, trades=TradeLedger(), counter=Counter(),
+                           data=[None] * bars, last_processed_timestamp=T0,
+                           _get_data_indicators=lambda: indicators or {}, _get_data_state=lambda: {})
+
+
+def trade(trade_id, state, main_ref):
+    record = TradeRecord(trade_id=trade_id, symbol=SYMBOL, order_side=OrderSide.BUY, state=state,
+                         placed_candle=90, entry_price=1.1, entry_executed_price=None, size=10000,
+                         sl=1.09, tp=1.12, main_order_ref=main_ref, tp_order_ref=main_ref + 1,
+                         sl_order_ref=main_ref + 2, data_index=0, orders={})
+    if state == TradeState.RUNNING:
+        record['open_candle'] = 95
+        record['entry_executed_price'] = 1.1002
+    return record
+
+
+def test_restored_trades_adopt_their_mt5_tickets(tmp_path, data):
+    state = StateManager(tmp_path / 'state.db')
+    previous = strategy(Broker({10001: 501, 10004: 502}))
+    for record in (trade('pending', TradeState.PENDING, 10001), trade('running', TradeState.RUNNING, 10004),
+                   trade('sending', TradeState.PENDING, 10007)):
+        previous.active_trades[record['trade_id']] = record
+        previous.active_trades[record['main_order_ref']] = record
+    LiveCheckpoint(state, 'session').save(previous)
+
+    broker = Broker()
+    restored = strategy(broker, {0: {'symbol': SYMBOL, 'data': data}}, bars=110)
+    LiveCheckpoint(state, 'session').restore(restored)
+
+    adopted = {ticket: (order, children, filled) for order, ticket, _, children, filled in broker.adopted}
+    assert set(adopted) == {501, 502}
+    assert not adopted[501][2] and adopted[502][2]
+    # New refs, mapped to the trade
+    running = restored.trades['running']
+    main, children, _ = adopted[502]
+    assert running['main_order_ref'] == main.ref != 10004
+    assert running['open_candle'] == 105  # Rebased by the 10 extra bars
+    assert main.price == pytest.approx(1.1002)
+    for order in (main, children['tp'], children['sl']):
+        assert restored.active_trades[order.ref] is running
+    # Without a ticket the trade is dropped, not tracked blindly
+    assert 'sending' not in restored.active_trades
+    state.close()
@@ -0,0 +1,190 @@
+"""MT5Broker against the simulated terminal (src/sim/fake_mt5.py)."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.sim import fake_mt5
+
+fake_mt5.install()
+
+import backtrader as bt  # noqa: E402
+
+from src.brokers.mt5_broker import MT5Broker  # noqa: E402
+from src.brokers.mt5_reconciler import MT5Reconciler  # noqa: E402
+from src.utils.symbol_specs import SymbolSpecRegistry  # noqa: E402
+
+SYMBOL = 'EURUSD'
+BARS = 200
+
+
+@pytest.fixture
+def terminal(tmp_path):
+    times = pd.date_range('2024-01-01', periods=BARS, freq='h')
+    close = 1.10 + 0.0001 * np.arange(BARS)
+    pd.DataFrame({'time': times, 'open': close, 'high': close + 0.0005, 'low': close - 0.0005,
+                  'close': close, 'tick_volume': 100}).to_csv(tmp_path / f'{SYMBOL}._H1_test.csv', index=False)
+    return fake_mt5.configure(data_dir=tmp_path, history_bars=100, order_latency_ms=100)
+
+
+@pytest.fixture
+def broker(terminal, tmp_path):
+    broker = MT5Broker(symbols=[SYMBOL], reconcile_interval=0.0)
+    broker.specs = SymbolSpecRegistry(tmp_path / 'symbol_specs.json')
+    broker.gateway.start()
+    yield broker
+    broker.gateway.stop()
+
+
+@pytest.fixture
+def data():
+    index = pd.date_range('2024-01-01', periods=3, freq='h')
+    frame = pd.DataFrame({'open': 1.1, 'high': 1.1, 'low': 1.1, 'close': 1.1, 'volume': 1}, index=index)
+    data = bt.feeds.PandasData(dataname=frame, name=SYMBOL)
+    data.setenvironment(bt.Cerebro())
+    data._start()
+    data.next()
+    data.live_mode = True
+    return data
+
+
+def advance(terminal, bars):
+    """Move the replay clock ``bars`` H1 bars forward."""
+    terminal.server_time()
+    terminal.start += bars * 3600
+
+
+def send(terminal, order_type, price=None, sl=0.0, tp=0.0, volume=0.1):
+    """Place an order straight in the terminal (as a previous session did). Returns its ticket."""
+    action = fake_mt5.TRADE_ACTION_DEAL if price is None else fake_mt5.TRADE_ACTION_PENDING
+    result = terminal.order_send({'action': action, 'symbol': SYMBOL, 'type': order_type, 'volume': volume,
+                                  'price': price, 'sl': sl, 'tp': tp})
+    assert result.retcode == fake_mt5.TRADE_RETCODE_DONE
+    return result.order
+
+
+def step(broker):
+    """Let the queued requests finish, then run one broker cycle."""
+    broker.gateway.flush(5.0)
+    broker.next()
+
+
+def test_cancel_before_placement_completes(broker, data, terminal):
+    order = bt.BuyOrder(data=data, size=10000, price=1.0, exectype=bt.Order.Limit, simulated=True)
+    broker.submit(order)
+    # The placement is still on the gateway (order_latency_ms): no MT5 ticket yet
+    assert order.ref not in broker.pending_orders
+    broker.cancel(order)
+
+    step(broker)  # Placement applied, cancel sent
+    step(broker)  # Cancel applied
+    assert order.status == bt.Order.Canceled
+    assert not terminal.orders_get()
+
+
+def test_refused_cancel_keeps_the_order(broker, data, terminal):
+    order = bt.BuyOrder(data=data, size=10000, price=1.0, exectype=bt.Order.Limit, simulated=True)
+    broker.submit(order)
+    step(broker)
+    assert order.status == bt.Order.Accepted
+
+    terminal.reject_rate = 1.0
+    broker.cancel(order)
+    step(broker)
+    assert order.status == bt.Order.Accepted
+    assert order.ref in broker.pending_orders
+
+
+def test_short_fill_then_next(broker, data):
+    order = bt.SellOrder(data=data, size=10000, exectype=bt.Order.Market, simulated=True)
+    broker.submit(order)
+    step(broker)  # Placement applied
+    step(broker)  # Fill reconciled
+    assert order.status == bt.Order.Completed
+    assert broker.getposition(data).size == -10000
+
+    broker.next()  # Credit interest of the open short position
+
+
+def test_reconciler_pending_order_filled_and_closed_between_cycles(terminal):
+    # Prices rise 1 pip per bar from 1.1100: the stop fills ~5 bars on, the TP ~15 bars on
+    ticket = send(terminal, fake_mt5.ORDER_TYPE_BUY_STOP, price=1.1110, sl=1.1050, tp=1.1120)
+    reconciler = MT5Reconciler(interval=0.0)
+    reconciler.track(7, ticket, SYMBOL)
+    assert reconciler.reconcile() == []
+
+    advance(terminal, 20)
+    events = reconciler.reconcile()
+    assert [(event.kind, event.ref, event.ticket) for event in events] == [('fill', 7, ticket), ('tp', 7, ticket)]
+    assert events[0].price == pytest.approx(1.1110)
+    assert events[1].price == pytest.approx(1.1120)
+    assert len(reconciler) == 0
+
+
+def test_reconciler_reports_sl_exit(terminal):
+    ticket = send(terminal, fake_mt5.ORDER_TYPE_SELL, sl=1.1110)
+    reconciler = MT5Reconciler(interval=0.0)
+    reconciler.track(3, ticket, SYMBOL)
+    assert [event.kind for event in reconciler.reconcile()] == ['fill']  # A market order is a position at once
+
+    advance(terminal, 20)
+    events = reconciler.reconcile()
+    assert [(event.kind, event.ref) for event in events] == [('sl', 3)]
+    assert events[0].price == pytest.approx(1.1110)
+    assert reconciler.ticket_of(3) is None
+
+
+def test_adopted_order_reports_fill_and_exit(broker, data, terminal):
+    ticket = send(terminal, fake_mt5.ORDER_TYPE_BUY_STOP, price=1.1110, sl=1.1050, tp=1.1120, volume=0.1)
+    main = bt.BuyOrder(data=data, size=10000, price=1.1110, exectype=bt.Order.Limit, simulated=True)
+    tp = bt.SellOrder(data=data, size=10000, price=1.1120, exectype=bt.Order.Limit, parent=main, simulated=True)
+    sl = bt.SellOrder(data=data, size=10000, price=1.1050, exectype=bt.Order.Stop, parent=main, simulated=True)
+    broker.adopt(main, ticket, SYMBOL, children={'tp': tp, 'sl': sl})
+    assert broker.order_ticket(main.ref) == ticket
+
+    advance(terminal, 20)
+    step(broker)
+    assert main.status == bt.Order.Completed
+    assert tp.status == bt.Order.Completed and tp.executed.price == pytest.approx(1.1120)
+    assert sl.status == bt.Order.Canceled
+    assert broker.getposition(data).size == 0
+    assert broker.order_ticket(main.ref) is None
+
+
+def test_adopted_pending_order_can_be_cancelled(broker, data, terminal):
+    ticket = send(terminal, fake_mt5.ORDER_TYPE_BUY_LIMIT, price=1.0, volume=0.1)
+    order = bt.BuyOrder(data=data, size=10000, price=1.0, exectype=bt.Order.Limit, simulated=True)
+    broker.adopt(order, ticket, SYMBOL)
+
+    broker.cancel(order)
+    step(broker)
+    assert order.status == bt.Order.Canceled
+    assert not terminal.orders_get()
+
+
+def test_reconciler_reports_cancels_only_for_its_orders(terminal):
+    ours = send(terminal, fake_mt5.ORDER_TYPE_BUY_LIMIT, price=1.0)
+    foreign = send(terminal, fake_mt5.ORDER_TYPE_BUY_LIMIT, price=1.0)
+    reconciler = MT5Reconciler(interval=0.0)
+    reconciler.track(5, ours, SYMBOL)
+
+    for ticket in (ours, foreign):
+        terminal.order_send({'action': fake_mt5.TRADE_ACTION_REMOVE, 'order': ticket})
+    events = reconciler.reconcile()
+    assert [(event.kind, event.ref, event.ticket) for event in events] == [('cancel', 5, ours)]
+    assert reconciler.reconcile(force=True) == []
+
+
+def test_reconciler_polls_once_per_interval(terminal):
+    now = [0.0]
+    reconciler = MT5Reconciler(interval=1.0, clock=lambda: now[0])
+    reconciler.track(1, send(terminal, fake_mt5.ORDER_TYPE_BUY_LIMIT, price=1.0), SYMBOL)
+
+    reconciler.reconcile()
+    now[0] = 0.5
+    reconciler.reconcile()
+    assert (reconciler.cycles, reconciler.calls) == (1, 2)  # One orders_get and one positions_get
+
+    now[0] = 1.0
+    reconciler.reconcile()
+    assert reconciler.cycles == 2
@@ -0,0 +1,64 @@
+"""Server time offset of MT5BarPoller against the simulated terminal (src/sim/fake_mt5.py)."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.sim import fake_mt5
+
+fake_mt5.install()
+
+from src.data.mt5_poller import MT5BarPoller  # noqa: E402
+
+SYMBOL = 'EURUSD'
+BARS = 200
+
+
+@pytest.fixture
+def terminal(tmp_path):
+    times = pd.date_range('2024-01-01', periods=BARS, freq='h')
+    close = 1.10 + 0.0001 * np.arange(BARS)
+    pd.DataFrame({'time': times, 'open': close, 'high': close + 0.0005, 'low': close - 0.0005,
+                  'close': close, 'tick_volume': 100}).to_csv(tmp_path / f'{SYMBOL}._H1_test.csv', index=False)
+    return fake_mt5.configure(data_dir=tmp_path, history_bars=100, server_offset=2)
+
+
+def advance(terminal, seconds):
+    terminal.server_time()
+    terminal.start += seconds
+
+
+def poller(terminal, **options):
+    poller = MT5BarPoller(clock=terminal.utc_now, **options)
+    poller.subscribe(SYMBOL, fake_mt5.TIMEFRAME_H1, 'H1', 0, lambda symbol, bar: None)
+    poller.poll_once()  # First poll: the forming bar is known, no bar open seen yet
+    return poller
+
+
+def test_offset_measured_from_the_tick_when_a_bar_is_seen_late(terminal):
+    bars = poller(terminal)
+    assert bars.server_offset is None
+
+    # The next bar is first seen 20 minutes after its open: its open time would round to UTC+1.5h
+    advance(terminal, 3600 + 20 * 60)
+    bars.poll_once()
+    assert bars.server_offset == 2 * 3600
+
+
+def test_offset_follows_a_server_change(terminal):
+    bars = poller(terminal)
+    advance(terminal, 3600)
+    bars.poll_once()
+    assert bars.server_offset == 2 * 3600
+
+    terminal.server_offset = 3 * 3600  # E.g. the server moved to summer time
+    advance(terminal, 3600)
+    bars.poll_once()
+    assert bars.server_offset == 3 * 3600
+
+
+def test_configured_offset_is_kept(terminal):
+    bars = poller(terminal, server_offset=3 * 3600)
+    advance(terminal, 3600)
+    bars.poll_once()
+    assert bars.server_offset == 3 * 3600
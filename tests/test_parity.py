@@ -0,0 +1,24 @@
+"""Fast engine against backtrader (src/engine/parity.py) on seeded synthetic bars."""
+
+from benchmarks.harness import END_DATE, START_DATE
+from benchmarks.synthetic import write_backtest_csv
+from src.engine.parity import run_parity
+from src.models.timeframe import Timeframe
+from src.utils.config import Config
+
+SYMBOLS = ['EURUSD', 'XAUUSD']
+BARS = 2000
+
+
+def test_fast_engine_matches_backtrader(tmp_path, monkeypatch):
+    # main.backtesting reads the cached CSVs under the current directory
+    monkeypatch.chdir(tmp_path)
+    # The synthetic zones are narrow: with the default 10 ATR no order is ever placed
+    monkeypatch.setattr(Config, 'min_risk_distance_atr', 1.0)
+    for seed, symbol in enumerate(SYMBOLS):
+        write_backtest_csv(symbol, Timeframe.H1, START_DATE, END_DATE, BARS, seed)
+
+    result = run_parity(SYMBOLS, Timeframe.H1, START_DATE, END_DATE, spread_pips=1.0)
+
+    assert result['backtrader']['trades'] > 0
+    assert result['mismatches'] == []
@@ -0,0 +1,19 @@
+"""Phase timing of any broker (src/utils/profiling.py)."""
+
+import backtrader as bt
+
+from src.utils.profiling import PhaseTimer, time_broker
+
+
+def test_time_broker_times_any_broker_once():
+    timer = PhaseTimer()
+    broker = time_broker(time_broker(bt.brokers.BackBroker(), timer), timer)
+    broker.start()
+
+    broker.next()
+    assert 'broker' not in timer.seconds  # Disabled: no clock reads
+
+    timer.start()
+    broker.next()
+    broker.next()
+    assert timer.calls['broker'] == 2
@@ -0,0 +1,48 @@
+"""Candidate-bar masks of SignalPrefilter."""
+
+import math
+
+import backtrader as bt
+import pandas as pd
+
+from src.models.trend import Trend
+from src.utils.signal_prefilter import SignalPrefilter
+
+# Sunday 22:00 to Monday 01:00: the first two bars are order-day bars, the Monday ones are not
+INDEX = pd.date_range('2024-01-07 22:00', periods=4, freq='h')
+CLOSE = [1.0, 1.2, 1.0, 1.2]
+EMA = [math.nan, 1.1, 1.1, 1.1]
+
+
+def feed_at(bar):
+    frame = pd.DataFrame({'Open': CLOSE, 'High': CLOSE, 'Low': CLOSE, 'Close': CLOSE, 'Volume': 1}, index=INDEX)
+    data = bt.feeds.PandasData(dataname=frame, open='Open', high='High', low='Low', close='Close',
+                               volume='Volume', openinterest=-1)
+    data.setenvironment(bt.Cerebro())
+    data._start()
+    for _ in range(bar + 1):
+        data.next()
+    return data
+
+
+def test_ema_side_masks_follow_the_per_bar_check():
+    prefilter = SignalPrefilter(INDEX, CLOSE, EMA)
+    assert prefilter.long_mask.tolist() == [False, True, False, True]  # NaN EMA fails both sides
+    assert prefilter.short_mask.tolist() == [False, False, True, False]
+    assert prefilter.order_day_mask.tolist() == [True, True, False, False]
+
+
+def test_candidate_needs_breakout_order_day_and_ema_side():
+    data = feed_at(1)
+    prefilter = SignalPrefilter.from_feed(data, ema=EMA)
+    assert prefilter.is_candidate(data, True, Trend.UPTREND)
+    assert not prefilter.is_candidate(data, True, Trend.DOWNTREND)
+    assert not prefilter.is_candidate(data, False, Trend.UPTREND)
+    assert not prefilter.is_candidate(feed_at(3), True, Trend.UPTREND)  # Monday
+
+
+def test_without_ema_only_the_order_day_is_masked():
+    data = feed_at(1)
+    prefilter = SignalPrefilter.from_feed(data)
+    assert prefilter.long_mask is None
+    assert prefilter.is_candidate(data, True, Trend.DOWNTREND)
@@ -31,10 +31,13 @@ from src.utils.tuning import (
     BayesianSearchStrategy,
     BinarySearchStrategy,
     TotalPnLMetric,
-    MetricCalculator
+    MetricCalculator,
+    METRICS
 )
 from src.models.timeframe import Timeframe
 from main import backtesting
+from src.engine import fast_backtesting, load_frames
+from src.utils.logging import restore_levels, silence
 
 
 class ParameterTuner:
@@ -52,7 +55,8 @@ class ParameterTuner:
         metric: MetricCalculator = None,
         max_candles: int = None,
         show_progress: bool = True,
-        show_backtest_logs: bool = False
+        show_backtest_logs: bool = False,
+        engine: str = "backtrader"
     ):
         """
         Initialize parameter tuner.
@@ -69,6 +73,7 @@ class ParameterTuner:
             max_candles: Maximum candles to use in backtest
             show_progress: Whether to show progress bars
             show_backtest_logs: Whether to show logs from individual backtest runs (default: False)
+            engine: Backtest engine ("backtrader" or "fast"; the fast engine fills like BacktestingBroker)
         """
         self.symbols = symbols
         self.timeframe = timeframe
@@ -81,6 +86,10 @@ class ParameterTuner:
         self.max_candles = max_candles
         self.show_progress = show_progress
         self.show_backtest_logs = show_backtest_logs
+        if engine not in ("backtrader", "fast"):
+            raise ValueError(f"Unknown engine: {engine}. Use 'backtrader' or 'fast'")
+        self.engine = engine
+        self._frames = {}  # pair -> OHLCV frames, loaded once for the fast engine
         
         # Initialize parameter space
         self.parameter_space = ParameterSpace(tuning_parameters)
@@ -159,16 +168,10 @@ class ParameterTuner:
                 config_value = getattr(Config, param_name.lower(), None)
                 print(f"  {param_name}: env={os.environ.get(param_name)}, config={config_value}", file=original_stdout)
         
-        # Suppress loguru logs if needed
-        loguru_logger = None
+        # Suppress logs if needed (level gating: disabled records are never formatted)
+        saved_log_levels = None
         if not self.show_backtest_logs:
-            try:
-                from loguru import logger
-                # Remove default handler and add a null handler
-                logger.remove()
-                logger.add(lambda msg: None, level="DEBUG")
-            except ImportError:
-                pass
+            saved_log_levels = silence()
             
             # Redirect stdout/stderr to devnull to hide backtest logs
             # Progress bars will still work as they use their own output mechanism
@@ -179,33 +182,29 @@ class ParameterTuner:
             # Run backtest
             # Note: backtesting() calls load_config() internally, which will read
             # the environment variables we set in _apply_parameters()
-            results = backtesting(
-                symbols=[pair],
-                timeframe=self.timeframe,
-                start_date=self.start_date,
-                end_date=self.end_date,
-                max_candles=self.max_candles,
-                print_trades=False
-            )
+            if self.engine == "fast":
+                if pair not in self._frames:
+                    self._frames[pair] = load_frames([pair], self.timeframe, self.start_date, self.end_date, self.max_candles)
+                results = fast_backtesting(
+                    symbols=[pair],
+                    timeframe=self.timeframe,
+                    start_date=self.start_date,
+                    end_date=self.end_date,
+                    frames=self._frames[pair]
+                )
+            else:
+                results = backtesting(
+                    symbols=[pair],
+                    timeframe=self.timeframe,
+                    start_date=self.start_date,
+                    end_date=self.end_date,
+                    max_candles=self.max_candles,
+                    print_trades=False,
+                    lean=not self.show_backtest_logs
+                )
             
             stats = results['stats']
             
-            # Calculate additional metrics if needed
-            if 'sharpe_ratio' not in stats:
-                # Calculate Sharpe ratio if we have trade data
-                completed_trades = results.get('cerebro', {}).strategy.completed_trades if hasattr(results.get('cerebro', {}), 'strategy') else []
-                if completed_trades and len(completed_trades) > 0:
-                    import pandas as pd
-                    initial_cash = stats.get('initial_cash', 10000)
-                    returns = pd.Series([t['pnl'] / initial_cash for t in completed_trades])
-                    if len(returns) > 0 and returns.std() > 0:
-                        sharpe_ratio = (returns.mean() / returns.std()) * (252 ** 0.5)
-                        stats['sharpe_ratio'] = sharpe_ratio
-                    else:
-                        stats['sharpe_ratio'] = 0.0
-                else:
-                    stats['sharpe_ratio'] = 0.0
-            
             return stats
             
         except Exception as e:
@@ -237,15 +236,9 @@ class ParameterTuner:
             sys.stdout = original_stdout
             sys.stderr = original_stderr
             
-            # Restore loguru logger if we suppressed it
-            if not self.show_backtest_logs:
-                try:
-                    from loguru import logger
-                    # Re-add default handler
-                    logger.remove()
-                    logger.add(sys.stderr, level="INFO")
-                except ImportError:
-                    pass
+            # Restore log levels if we suppressed them
+            if saved_log_levels is not None:
+                restore_levels(saved_log_levels)
     
     def tune_pair(self, pair: str) -> List[Any]:
         """
@@ -527,6 +520,18 @@ Example:
         default=None,
         help='Number of worst results to display (defaults to --top-n value)'
     )
+    parser.add_argument(
+        '--engine',
+        choices=['backtrader', 'fast'],
+        default='backtrader',
+        help='Backtest engine: backtrader or the fast array engine (BacktestingBroker fills)'
+    )
+    parser.add_argument(
+        '--metric',
+        choices=sorted(METRICS),
+        default='pnl',
+        help='Metric to optimize (default: pnl)'
+    )
     
     args = parser.parse_args()
     
@@ -548,7 +553,9 @@ Example:
         linear_step=args.linear_step,
         max_candles=args.max_candles,
         show_progress=not args.no_progress,
-        show_backtest_logs=args.show_logs
+        show_backtest_logs=args.show_logs,
+        metric=METRICS[args.metric](),
+        engine=args.engine
     )
     
     # Run tuning
@@ -0,0 +1,71 @@
+"""
+Parity check for the fast simulation engine.
+Runs BreakRetestStrategy on backtrader (with BacktestingBroker) and on src.engine over the
+same CSV data and compares both trade ledgers and the summary statistics.
+
+Usage:
+    python validate_fast_engine.py --symbols EURUSD XAUUSD --max-candles 700 --spread-pips 2
+
+Run it as a script: load_config() switches to live mode when "-m" is in sys.argv.
+"""
+
+import argparse
+import os
+import sys
+from datetime import datetime
+
+# Add the src directory and the project root to the Python path (as main.py does)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from src.models.timeframe import Timeframe
+from src.engine.parity import run_parity
+
+
+def parse_date(s: str) -> datetime:
+    """Parse date string."""
+    for fmt in ('%Y-%m-%d', '%Y-%m-%d %H:%M:%S'):
+        try:
+            return datetime.strptime(s, fmt)
+        except ValueError:
+            pass
+    raise argparse.ArgumentTypeError(
+        'Date must be YYYY-MM-DD or YYYY-MM-DD HH:MM:SS'
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare the fast engine with the backtrader backtest')
+    parser.add_argument('--symbols', '-s', nargs='+', required=True, help='Symbols to backtest')
+    parser.add_argument('--timeframe', '-t', type=Timeframe.from_value, default=Timeframe.H1,
+                        help='Timeframe (M1, M5, M15, M30, H1, H4, D1)')
+    parser.add_argument('--start-date', '-st', type=parse_date, default=datetime(2025, 1, 1),
+                        help='Start date (YYYY-MM-DD)')
+    parser.add_argument('--end-date', '-en', type=parse_date, default=datetime(2025, 12, 15),
+                        help='End date (YYYY-MM-DD)')
+    parser.add_argument('--max-candles', '-mc', type=int, default=None, help='Max candles per symbol')
+    parser.add_argument('--spread-pips', type=float, default=0.0, help='Spread in pips')
+    parser.add_argument('--rel-tol', type=float, default=1e-9, help='Relative tolerance for float fields')
+    args = parser.parse_args()
+
+    result = run_parity(args.symbols, args.timeframe, args.start_date, args.end_date,
+                        max_candles=args.max_candles, spread_pips=args.spread_pips, rel_tol=args.rel_tol)
+
+    print('=' * 80)
+    print('PARITY: backtrader vs fast engine')
+    print('=' * 80)
+    for name in ('backtrader', 'fast'):
+        run = result[name]
+        print(f"{name:<12} trades={run['trades']:<6} final_equity={run['stats']['final_equity']:.2f} time={run['seconds']:.2f}s")
+    speedup = result['backtrader']['seconds'] / max(result['fast']['seconds'], 1e-9)
+    print(f"Speedup: {speedup:.0f}x")
+    if result['mismatches']:
+        print(f"{len(result['mismatches'])} mismatches:")
+        for mismatch in result['mismatches'][:50]:
+            print(f"  {mismatch}")
+        sys.exit(1)
+    print('Ledgers match')
+
+
+if __name__ == '__main__':
+    main()
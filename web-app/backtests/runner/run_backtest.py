@@ -23,6 +23,7 @@ sys.path.insert(0, str(project_root))
 # Import chart overlay utilities
 from src.infrastructure.ChartOverlayManager import get_chart_overlay_manager, set_chart_overlay_manager_for_job
 from utils.chart_overlay import generate_chart_overlay_data
+from src.utils.profiling import get_phase_timer
 
 
 def _write_json(path: Path, payload: Any) -> None:
@@ -230,6 +231,27 @@ def main() -> int:
                 "trades": trades_by_data_feed
             }
 
+        # backtest_args["profile"] enables the phase timer in main.backtesting
+        timer = get_phase_timer()
+        timer.lap("payload")
+
+        # Monte Carlo robustness of the trade ledger (options from params["monte_carlo"])
+        from src.utils.monte_carlo import monte_carlo
+
+        mc_params = params.get("monte_carlo") or {}
+        completed_trades = strat.trades.completed_array()
+        monte_carlo_result = None
+        if len(completed_trades) and mc_params.get("n_sims", 10_000):
+            monte_carlo_result = monte_carlo(
+                completed_trades["pnl"],
+                stats.get("initial_cash", 0.0),
+                n_sims=int(mc_params.get("n_sims", 10_000)),
+                method=mc_params.get("method", "shuffle"),
+                ruin_fraction=float(mc_params.get("ruin_fraction", 0.5)),
+                seed=mc_params.get("seed"),
+            )
+        timer.lap("monte_carlo")
+
         payload = {
             "params": {
                 "symbols": symbols,
@@ -240,8 +262,12 @@ def main() -> int:
                 "spread_pips": params.get("backtest_args", {}).get("spread_pips"),
             },
             "stats": stats,
+            "monte_carlo": monte_carlo_result,
             "symbols": out_symbols,
         }
+        if timer.enabled:
+            payload["timings"] = timer.summary()
+            timer.stop()
 
         _write_json(result_path, payload)
         _write_json(